@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+# Crypto.Games — проверка инвариантов спина прямо в цикле бота (O(1) состояния на бота)
+#
+# Зачем:
+# - Отчёт по логу (crypto_games_logparse, bot.txt.report.txt) находит расхождения bet/result,
+#   «L уменьшился на LOSS», пропуски записей и скачки счётчиков спустя десятки тысяч спинов.
+# - SpinMonitor.check(...) вызывается на каждый результат ставки и сравнивает его с тем, что
+#   бот отправлял и что видел на прошлом спине:
+#     bet_mismatch    — Profit не равен -bet (LOSS) или bet·(payout−1) (WIN);
+#     missing_result  — в ответе API нет Profit или Balance (бот подставил значения по умолчанию);
+#     balance_drift   — Balance ≠ прошлый Balance + Profit (другой клиент на том же счёте, потерянный ответ);
+#     spin_gap        — spin_count не вырос ровно на 1 с прошлого результата (аналог скачка spins2);
+#     loss_decrease   — loss_sum уменьшился после LOSS без WIN (аналог «L decreased on LOSS»);
+#     seed_change     — сменился client_seed посреди работы (аналог смены SID); смену, которую бот делает
+#                       сам (автосмена раз в 5 спинов, ввод seed во вкладке), он сообщает через note_seed().
+#   spin_count == 0 (старт, TP restart → reset_stats) — начало нового прогона: «прошлый спин» забывается.
+# - Нарушение: счётчик, строка [ANOMALY] в лог бота (первые LOG_FIRST раз на вид, дальше каждое
+#   LOG_EVERY-е) и событие 'anomaly' в SQLite-хранилище (crypto_games_spindb, если включено).
+# - Пауза бота — только для видов из pause_on (по умолчанию из CG_ANOMALY_PAUSE, например
+#   "bet_mismatch,missing_result"; пусто — никогда не останавливать).
+
+import os
+from decimal import Decimal
+
+from crypto_games_spindb import record_event
+
+KINDS = ("bet_mismatch", "missing_result", "balance_drift", "spin_gap", "loss_decrease", "seed_change")
+LOG_FIRST = 5
+LOG_EVERY = 100
+ABS_TOL = Decimal("0.00000002")
+REL_TOL = Decimal("0.000001")
+
+
+def _d(x):
+    if isinstance(x, Decimal):
+        return x
+    try:
+        return Decimal(str(x))
+    except Exception:
+        return None
+
+
+def pause_kinds_from_env() -> frozenset:
+    spec = os.environ.get("CG_ANOMALY_PAUSE", "")
+    return frozenset(k.strip() for k in spec.split(",") if k.strip() in KINDS)
+
+
+class SpinMonitor:
+    """Инварианты одного бота; состояние — несколько последних значений, без истории."""
+    __slots__ = ("bot_id", "pause_on", "counts", "total", "_balance", "_spin", "_loss", "_last_win",
+                 "_seed")
+
+    def __init__(self, bot_id, pause_on=None):
+        self.bot_id = bot_id
+        self.pause_on = pause_kinds_from_env() if pause_on is None else frozenset(pause_on)
+        self.counts = dict.fromkeys(KINDS, 0)
+        self.total = 0
+        self.reset()
+
+    def reset(self):
+        """Забыть «прошлый спин» (новый старт бота); счётчики сохраняются."""
+        self._balance = None
+        self._spin = None
+        self._loss = None
+        self._last_win = True
+        self._seed = None
+
+    def note_seed(self, seed):
+        """Бот сам сменил client_seed — это не аномалия."""
+        self._seed = seed
+
+    def check(self, bot, res, payout, bet, profit, balance, win, counters: bool = True):
+        """
+        Проверить результат ставки. bot — CryptoGamesBot (spin_count, loss_sum, client_seed);
+        counters=False — доп. ставка внутри того же спина (Press): только bet/balance.
+        Возвращает список нарушений этого спина (обычно пустой).
+        """
+        found = []
+        try:
+            if counters and getattr(bot, "spin_count", None) == 0:
+                self.reset()
+            if not isinstance(res, dict) or "Profit" not in res or "Balance" not in res:
+                # Profit/Balance подставлены ботом — сравнивать нечего, опорный баланс теряется
+                found.append(("missing_result", f"keys={sorted(res) if isinstance(res, dict) else type(res).__name__}"))
+                self._balance = None
+                bet = balance = None
+            bet_d, profit_d, payout_d, bal_d = _d(bet), _d(profit), _d(payout), _d(balance)
+            if bet_d is not None and profit_d is not None and payout_d is not None:
+                expected = bet_d * (payout_d - 1) if win else -bet_d
+                if abs(profit_d - expected) > max(ABS_TOL, abs(expected) * REL_TOL):
+                    found.append(("bet_mismatch", f"bet={bet_d:.8f} payout={payout_d} profit={profit_d:.8f} "
+                                                  f"expected={expected:.8f}"))
+            if bal_d is not None and profit_d is not None:
+                if self._balance is not None and abs(self._balance + profit_d - bal_d) > ABS_TOL:
+                    found.append(("balance_drift", f"prev={self._balance:.8f} profit={profit_d:.8f} "
+                                                   f"balance={bal_d:.8f}"))
+                self._balance = bal_d
+            seed = getattr(bot, "client_seed", None)
+            if self._seed is not None and seed != self._seed:
+                found.append(("seed_change", f"{self._seed} -> {seed}"))
+            self._seed = seed
+            if counters:
+                self._check_counters(bot, win, found)
+        except Exception as e:
+            found.append(("bet_mismatch", f"check error: {e}"))
+        if found:
+            self._report(bot, found)
+        return found
+
+    def _check_counters(self, bot, win, found):
+        spin = getattr(bot, "spin_count", None)
+        if isinstance(spin, int):
+            if self._spin is not None and spin != self._spin + 1:
+                found.append(("spin_gap", f"spin_count {self._spin} -> {spin}"))
+            self._spin = spin
+        loss = _d(getattr(bot, "loss_sum", None))
+        if loss is not None:
+            if self._loss is not None and not self._last_win and loss < self._loss:
+                found.append(("loss_decrease", f"loss_sum {self._loss:.8f} -> {loss:.8f} without WIN"))
+            self._loss = loss
+        self._last_win = bool(win)
+
+    def _report(self, bot, found):
+        pause = False
+        for kind, detail in found:
+            n = self.counts[kind] = self.counts[kind] + 1
+            self.total += 1
+            record_event(self.bot_id, "anomaly", f"{kind}: {detail}")
+            if n <= LOG_FIRST or n % LOG_EVERY == 0:
+                self._log(bot, f"[ANOMALY] {kind} #{n}: {detail}")
+            pause = pause or kind in self.pause_on
+        if pause and not getattr(bot, "paused", False):
+            bot.paused = True
+            self._log(bot, f"[ANOMALY] ⏸ бот на паузе ({', '.join(k for k, _ in found)}); счётчики: {self.describe()}")
+
+    def _log(self, bot, msg):
+        try:
+            bot._log(f"[{self.bot_id}] {msg}")
+        except Exception:
+            pass
+
+    def describe(self) -> str:
+        return " ".join(f"{k}={v}" for k, v in self.counts.items() if v) or "ok"
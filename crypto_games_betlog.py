@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+# Crypto.Games — журнал ставок вкладки: инкрементальная вставка в Text вместо полной перерисовки
+#
+# Зачем:
+# - BotTab.log_bet на каждую строку вызывал _render_bet_log: delete("1.0", "end") и вставка всех
+#   строк _bet_lines заново — O(n) работы Tk на спин, O(n²) в сумме; при сотнях спинов/с
+#   и многих вкладках UI-поток не успевал.
+# - BetLogBuffer копит строки, пришедшие за один тик UI (все tab.log из _process_ui_queue),
+#   и вставляет их одним вызовом insert после тика (after_idle); голова Text обрезается
+#   до maxlen строк (кольцевой буфер на самом виджете).
+# - Прокрутка к концу — только если пользователь и так был внизу (можно листать назад).
+
+from collections import deque
+
+
+class BetLogBuffer:
+    """
+    Ограниченный журнал строк поверх tk.Text / ScrolledText.
+    append() — из UI-потока, сколько угодно раз за тик; flush() вставляет пачку.
+    """
+    def __init__(self, text, maxlen: int = 200, follow: bool = True, readonly: bool = False):
+        self.text = text
+        self.maxlen = max(1, int(maxlen))
+        self.follow = follow
+        self.readonly = readonly                    # Text в state="disabled" между вставками
+        self._pending = deque(maxlen=self.maxlen)   # за тик больше maxlen строк всё равно не показать
+        self._lines = 0
+        self._scheduled = None
+        self.inserted = 0
+        self.skipped = 0                            # вытеснены из пачки, не дойдя до виджета
+        self.batches = 0
+
+    def __len__(self) -> int:
+        return self._lines + len(self._pending)
+
+    def append(self, line: str, tag=None):
+        if len(self._pending) == self.maxlen:
+            self.skipped += 1
+        self._pending.append((line, tag))
+        if self._scheduled is None:
+            try:
+                self._scheduled = self.text.after_idle(self.flush)
+            except Exception:
+                self.flush()
+
+    def _at_bottom(self) -> bool:
+        try:
+            return self.text.yview()[1] >= 0.999
+        except Exception:
+            return True
+
+    def flush(self):
+        self._scheduled = None
+        if not self._pending:
+            return
+        batch = list(self._pending)
+        self._pending.clear()
+        args = []
+        for line, tag in batch:
+            args.append(line + "\n")
+            args.append(tag if tag else ())
+        try:
+            follow = self.follow and self._at_bottom()
+            if self.readonly:
+                self.text.configure(state="normal")
+            self.text.insert("end", *args)
+            self._lines += len(batch)
+            excess = self._lines - self.maxlen
+            if excess > 0:
+                self.text.delete("1.0", f"{excess + 1}.0")
+                self._lines -= excess
+            if follow:
+                self.text.see("end")
+        except Exception as e:
+            print(f"[BetLogBuffer] UI log render error: {e}")
+            return
+        finally:
+            if self.readonly:
+                try:
+                    self.text.configure(state="disabled")
+                except Exception:
+                    pass
+        self.inserted += len(batch)
+        self.batches += 1
+
+    def clear(self):
+        self._pending.clear()
+        self._lines = 0
+        try:
+            if self.readonly:
+                self.text.configure(state="normal")
+            self.text.delete("1.0", "end")
+            if self.readonly:
+                self.text.configure(state="disabled")
+        except Exception:
+            pass
+
+    def lines(self) -> list:
+        """Текст строк в виджете (плюс ещё не вставленные) — для копирования/тестов."""
+        try:
+            shown = self.text.get("1.0", "end-1c").split("\n")[:-1] if self._lines else []
+        except Exception:
+            shown = []
+        return shown + [line for line, _ in self._pending]
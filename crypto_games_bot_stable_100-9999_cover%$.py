@@ -37,18 +37,40 @@ import tkinter as tk
 from tkinter import ttk, messagebox, scrolledtext
 import threading
 import time
-import random
-import string
-import requests
 import os
 import traceback
 import queue
-from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from decimal import Decimal, getcontext, ROUND_DOWN, InvalidOperation
+from decimal import Decimal, getcontext, InvalidOperation
 from typing import Optional
 
+from crypto_games_engine import APIClient, LinearPayoutStrategy, quantize_bet, safe_decimal
+from crypto_games_engine import (DoublePress, LinearBase, ModuleAttr, SharedRefRecovery, SpinContext,
+                                 SpinEngine, SpinResult)
+from crypto_games_betlog import BetLogBuffer
+from crypto_games_uiqueue import UIEventQueue
+from crypto_games_fleet import FleetBanks
+from crypto_games_overview import FleetOverview, LazyBotTab
+from crypto_games_filelog import file_logger
+from crypto_games_console import console
+from crypto_games_journal import open_journal
+from crypto_games_spindb import record_event
+from crypto_games_anomaly import SpinMonitor
+
+try:
+    # Полная история лога: индекс на диске + виртуальный список (опционально)
+    from crypto_games_logview import open_log_history
+except Exception:
+    open_log_history = None
+
+try:
+    # Графики баланса ботов и флота (опционально)
+    from crypto_games_charts import FleetBalanceHistory, open_balance_chart
+except Exception:
+    FleetBalanceHistory = None
+    open_balance_chart = None
+
 getcontext().prec = 40
 
 API_BASE = "https://api.crypto.games/v1"
@@ -71,94 +93,24 @@ class BetConfig:
     recovery_usdt_per_win: Decimal = Decimal("0")
     use_shared_s_ref: bool = True
 
-MIN_API_CHANCE = Decimal("0.01")
-MAX_API_CHANCE = Decimal("9920")
-
-class APIClient:
-    def __init__(self, api_base: str = API_BASE, timeout: int = 15):
-        self.base = api_base.rstrip("/")
-        self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "CryptoGamesBot/1.0",
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        })
-
-    def _get(self, path: str):
-        url = f"{self.base}{path}"
-        try:
-            r = self.session.get(url, timeout=self.timeout)
-            r.raise_for_status()
-            return r.json()
-        except requests.RequestException as e:
-            try:
-                return {"error": r.json()}
-            except Exception:
-                return {"error": str(e)}
 
-    def _post(self, path: str, payload: dict):
-        url = f"{self.base}{path}"
-        try:
-            r = self.session.post(url, json=payload, timeout=self.timeout)
-            r.raise_for_status()
-            return r.json()
-        except requests.RequestException as e:
-            try:
-                return {"error": r.json()}
-            except Exception:
-                return {"error": str(e)}
-
-    def settings(self, coin: str):
-        return self._get(f"/settings/{coin}")
-
-    def balance(self, coin: str, key: str):
-        return self._get(f"/balance/{coin}/{key}")
-
-    def user(self, coin: str, key: str):
-        return self._get(f"/user/{coin}/{key}")
-
-    def placebet(self, coin: str, key: str, bet_amount, payout, underover_bool, client_seed):
-        payload = {"Bet": float(bet_amount), "Payout": float(payout), "UnderOver": bool(underover_bool), "ClientSeed": client_seed}
-        return self._post(f"/placebet/{coin}/{key}", payload)
-
-    def generate_client_seed(self) -> str:
-        return ''.join(random.choice(string.ascii_letters + string.digits) for _ in range(16))
-
-def quantize_bet(bet: Decimal, max_scale=8):
-    q = Decimal(1).scaleb(-max_scale)
-    try:
-        return bet.quantize(q, rounding=ROUND_DOWN)
-    except Exception:
-        return bet
-
-def safe_decimal(val, default="0"):
-    if val is None:
-        return Decimal(default)
-    try:
-        return Decimal(str(val))
-    except Exception:
-        return Decimal(default)
-
-class LinearPayoutStrategy:
-    def __init__(self, start_payout=Decimal("100"), max_payout=Decimal("9999")):
-        self.start_payout = Decimal(start_payout)
-        self.max_payout = Decimal(max_payout)
-        self.current_payout = Decimal(start_payout)
-
-    def reset(self):
-        self.current_payout = Decimal(self.start_payout)
-
-    def next_payout_and_bet(self, state):
-        payout = self.current_payout
-        nxt = payout + Decimal(1)
-        if nxt > self.max_payout:
-            nxt = Decimal(self.start_payout)
-        self.current_payout = nxt
-        bet = Decimal(state.get("min_bet", Decimal("0.001"))) or Decimal("0.001")
-        return payout, bet, 1, False
+# APIClient, quantize_bet, safe_decimal, LinearPayoutStrategy — общее ядро в crypto_games_engine
 
 class CryptoGamesBot:
+    # Состояние Double-Press и Recovery живёт в модулях общего ядра; прежние имена — прокси
+    press_active = ModuleAttr("press", "active")
+    press_left = ModuleAttr("press", "left")
+    press_payout = ModuleAttr("press", "payout")
+    press_bet = ModuleAttr("press", "press_bet")
+    enable_highroll_99 = ModuleAttr("press", "enable_highroll_99")
+    recovery_active = ModuleAttr("recovery", "active")
+    recovery_payout = ModuleAttr("recovery", "payout")
+    recovery_min_payout = ModuleAttr("recovery", "min_payout")
+    recovery_max_payout = ModuleAttr("recovery", "max_payout")
+    recovery_shared_S_ref = ModuleAttr("recovery", "S_ref")
+    recovery_divisor = ModuleAttr("recovery", "divisor")
+    recovery_target_end = ModuleAttr("recovery", "target_end")
+
     def __init__(self, bot_id: str, api: APIClient, config: BetConfig,
                  log_cb, bank_cb, stats_cb, ui_callbacks=None,
                  pause_on_fail=False, stop_on_win=False,
@@ -189,20 +141,15 @@ class CryptoGamesBot:
         self.payout_wraps = 0
         self._prev_payout = None
         self.manager_ref = None
+        self.journal = None                 # SpinJournal (logs/<bot>.cgj), подключает BotTab
+        self.monitor = SpinMonitor(bot_id)  # онлайн-инварианты спина (crypto_games_anomaly)
 
-        self.press_active = False
-        self.press_left = 0
-        self.press_payout = None
-        self.press_bet = Decimal("0.1")
-        self.enable_highroll_99 = False
-
-        self.recovery_active = False
-        self.recovery_payout = Decimal("50")
-        self.recovery_min_payout = Decimal(self.config.recovery_min_payout)
-        self.recovery_max_payout = Decimal(self.config.recovery_max_payout)
-        self.recovery_shared_S_ref: Optional[Decimal] = None
-        self.recovery_divisor: int = 1
-        self.recovery_target_end: Optional[Decimal] = None
+        # Порядок модулей = приоритет: Recovery → Double-Press → линейный скан (base)
+        self.press = DoublePress(press_bet=Decimal("0.1"), spins=2)
+        self.recovery = SharedRefRecovery(self.config.recovery_min_payout, self.config.recovery_max_payout)
+        self.engine = SpinEngine(None, [self.recovery, self.press],
+                                 log=lambda msg: self._log(f"[{self.bot_id}] {msg}"),
+                                 max_bet_limit=self.config.max_bet_limit)
 
     def pause_toggle(self):
         self.paused = not self.paused
@@ -210,6 +157,7 @@ class CryptoGamesBot:
 
     def set_strategy(self, strategy_obj):
         self.strategy = strategy_obj
+        self.engine.base = LinearBase(strategy_obj)
         try:
             self.strategy.reset()
         except Exception:
@@ -229,6 +177,7 @@ class CryptoGamesBot:
 
     def restart_after_tp(self, new_initial: Decimal):
         self.initial_bank = safe_decimal(new_initial)
+        record_event(self.bot_id, "tp_restart", f"new_initial={self.initial_bank:.8f}", self.initial_bank)
         self.last_successful_bank = self.initial_bank
         self.profit_global = Decimal("0")
         self.reset_stats()
@@ -243,7 +192,7 @@ class CryptoGamesBot:
         try:
             self.log_cb(msg)
         except Exception:
-            print(f"[{self.bot_id}] {msg}")
+            console().emit(f"[{self.bot_id}] {msg}")
 
     def _push_bank_payload(self, bal: Decimal):
         if self.initial_bank is None:
@@ -314,44 +263,33 @@ class CryptoGamesBot:
 
     def enter_recovery(self, shared_S_ref: Decimal, divisor: int):
         try:
-            sref = safe_decimal(shared_S_ref, "0")
-            if sref <= 0:
+            if not self.recovery.enter(shared_S_ref, divisor):
                 return
-            self.recovery_shared_S_ref = sref
-            self.recovery_divisor = max(1, int(divisor))
-            self.recovery_target_end = sref
-            self.recovery_payout = Decimal(self.recovery_min_payout)
-            self.press_active = False
-            self.press_left = 0
-            self.press_payout = None
-            self.recovery_active = True
+            self.press.reset()
             self._log(f"[{self.bot_id}] [RECOVERY] ▶ Start(shared): S_ref={self.recovery_shared_S_ref:.8f} divisor={self.recovery_divisor} target_end={self.recovery_target_end:.8f} payout_start={int(self.recovery_min_payout)}")
         except Exception as e:
             self._log(f"[{self.bot_id}] [RECOVERY] enter error: {e}")
 
     def _maybe_exit_recovery(self, current_balance: Decimal):
-        if self.recovery_active and self.recovery_target_end is not None:
-            if current_balance >= self.recovery_target_end:
-                try:
-                    if self.manager_ref and hasattr(self.manager_ref, "force_end_recovery"):
-                        self.manager_ref.force_end_recovery(initiator_id=self.bot_id)
-                except Exception:
-                    pass
-                self.recovery_active = False
-                if self.strategy:
-                    try:
-                        self.strategy.reset()
-                        self._log(f"[{self.bot_id}] [RECOVERY] ✅ Completed → reset base strategy to start")
-                    except Exception:
-                        self._log(f"[{self.bot_id}] [RECOVERY] ✅ Completed (base strategy reset failed)")
-                else:
-                    self._log(f"[{self.bot_id}] [RECOVERY] ✅ Completed")
+        if not self.recovery.reached(current_balance):
+            return
+        try:
+            if self.manager_ref and hasattr(self.manager_ref, "force_end_recovery"):
+                self.manager_ref.force_end_recovery(initiator_id=self.bot_id)
+        except Exception:
+            pass
+        self.recovery_active = False
+        if self.strategy:
+            try:
+                self.strategy.reset()
+                self._log(f"[{self.bot_id}] [RECOVERY] ✅ Completed → reset base strategy to start")
+            except Exception:
+                self._log(f"[{self.bot_id}] [RECOVERY] ✅ Completed (base strategy reset failed)")
+        else:
+            self._log(f"[{self.bot_id}] [RECOVERY] ✅ Completed")
 
     def _activate_press(self, payout: Decimal, reason: str):
-        self.press_active = True
-        self.press_left = 2
-        self.press_payout = Decimal(payout)
-        self._log(f"[{self.bot_id}] ▶ Press start: payout={int(self.press_payout)} bet={self.press_bet:.6f} (2 spins) reason={reason}")
+        self.press.activate(payout, reason, self.engine)
 
     def start(self):
         if not self.config.api_key:
@@ -378,66 +316,24 @@ class CryptoGamesBot:
             self.fetch_settings_if_needed()
             current_balance = self.get_current_balance()
 
-            mode = "BASE"
-            bet = Decimal("0")
-            payout = Decimal("50")
-
-            if self.recovery_active and self.recovery_shared_S_ref and self.recovery_target_end:
-                mode = "RECOVERY"
-                payout = Decimal(self.recovery_payout)
-
-                R = self.recovery_target_end - current_balance
-                if R <= 0:
-                    self._maybe_exit_recovery(current_balance)
-                    continue
-
-                target_from_percent = (self.config.recovery_percent_per_win / Decimal("100")) * self.recovery_shared_S_ref / Decimal(self.recovery_divisor)
-                target_from_usdt = self.config.recovery_usdt_per_win / Decimal(max(1, self.recovery_divisor)) if self.config.recovery_usdt_per_win > 0 else Decimal("0")
-                target_unit = target_from_usdt if target_from_usdt > 0 else target_from_percent
-                target_profit = target_unit if target_unit <= R else R
-
-                denom = payout - Decimal("1")
-                if denom <= 0:
-                    denom = Decimal("1")
-                bet = target_profit / denom
-
-                bet = max(bet, self.config.min_bet_enforced, self.min_bet or Decimal("0.001"))
-                if self.config.max_bet_limit and bet > self.config.max_bet_limit:
-                    bet = self.config.max_bet_limit
-                if bet > current_balance:
-                    bet = current_balance
-
-            elif self.press_active and self.press_left > 0 and self.press_payout is not None:
-                payout = Decimal(self.press_payout)
-                bet = Decimal(self.press_bet)
-                mode = "PRESS"
-            else:
-                try:
-                    payout, _, _, _ = self.strategy.next_payout_and_bet({"min_bet": self.min_bet})
-                except Exception as e:
-                    self._log(f"[{self.bot_id}] Strategy error: {e}")
-                    time.sleep(1)
-                    continue
-                bet = Decimal(max(self.config.base_bet, self.config.min_bet_enforced))
-                mode = "BASE"
-
-            if mode != "RECOVERY" and self.strategy and hasattr(self.strategy, "max_payout"):
-                try:
-                    if self._prev_payout is not None and Decimal(self._prev_payout) == self.strategy.max_payout and payout == self.strategy.start_payout:
-                        self.payout_wraps += 1
-                        self._log(f"[{self.bot_id}] [WRAP] max→reset count={self.payout_wraps}")
-                except Exception:
-                    pass
-            self._prev_payout = payout
+            if self.recovery.reached(current_balance):
+                self._maybe_exit_recovery(current_balance)
+                continue
 
+            # Recovery → Press → линейный скан: первый активный модуль выбирает спин
+            ctx = SpinContext(current_balance, self.min_bet, self.config)
             try:
-                chance_decimal = (Decimal("100") / payout)
-            except Exception:
-                chance_decimal = Decimal("99.99")
-            if chance_decimal < MIN_API_CHANCE:
-                chance_decimal = MIN_API_CHANCE
-            if chance_decimal > MAX_API_CHANCE:
-                chance_decimal = MAX_API_CHANCE
+                plan = self.engine.plan(ctx)
+            except Exception as e:
+                self._log(f"[{self.bot_id}] Strategy error: {e}")
+                time.sleep(1)
+                continue
+            payout, bet, mode = plan.payout, plan.bet, plan.mode
+
+            if plan.wrapped:
+                self.payout_wraps += 1
+                self._log(f"[{self.bot_id}] [WRAP] max→reset count={self.payout_wraps}")
+            self._prev_payout = payout
 
             bet = quantize_bet(bet)
 
@@ -459,6 +355,9 @@ class CryptoGamesBot:
             roll_val = res.get("Roll", None)
             roll_str = f"{roll_val:.10f}" if isinstance(roll_val, float) else ("n/a" if roll_val is None else str(roll_val))
             win = profit > 0
+            if self.journal is not None:
+                self.journal.append(payout, roll_val, bet, profit, new_balance, mode=mode)
+            self.monitor.check(self, res, payout, bet, profit, new_balance, win)
 
             if mode == "RECOVERY":
                 prefix = "[WIN-RECOVERY]" if win else "[LOSS-RECOVERY]"
@@ -493,51 +392,16 @@ class CryptoGamesBot:
             self._stats()
             self._bank(new_balance)
 
+            # Модули обновляют своё состояние: лестница payout Recovery, счётчик/активация Press
+            try:
+                roll_dec = Decimal(str(roll_val)) if roll_val is not None else None
+            except Exception:
+                roll_dec = None
+            self.engine.settle(plan, ctx, SpinResult(win, profit, new_balance, roll_dec))
             if mode == "RECOVERY":
-                if win:
-                    # На WIN — сброс на минимальный payout
-                    self.recovery_payout = Decimal(self.recovery_min_payout)
-                else:
-                    # На LOSS — увеличиваем payout на 1
-                    try:
-                        np = int(self.recovery_payout) + 1
-                        # Если достигли или превысили Recovery Max payout — СБРОС НА МИНИМАЛЬНЫЙ (wrap)
-                        if np > int(self.recovery_max_payout) or int(self.recovery_payout) >= int(self.recovery_max_payout):
-                            np = int(self.recovery_min_payout)
-                        self.recovery_payout = Decimal(np)
-                    except Exception:
-                        self.recovery_payout = Decimal(self.recovery_min_payout)
                 # Проверка выхода / глобального завершения
                 self._maybe_exit_recovery(new_balance)
 
-            elif mode == "PRESS":
-                if win:
-                    self.press_active = False
-                    self.press_left = 0
-                    self.press_payout = None
-                else:
-                    self.press_left -= 1
-                    if self.press_left <= 0:
-                        self.press_active = False
-                        self.press_payout = None
-            else:
-                if win:
-                    if self.enable_highroll_99 and (roll_val is not None):
-                        try:
-                            if Decimal(str(roll_val)) >= Decimal("99.000"):
-                                self._activate_press(Decimal("100"), reason="highroll99")
-                            else:
-                                if Decimal("5") <= Decimal(payout) <= Decimal("8") and Decimal(str(roll_val)) >= Decimal("90.000"):
-                                    self._activate_press(Decimal("10"), reason="win-5-8-roll>=90")
-                        except Exception:
-                            pass
-                    else:
-                        try:
-                            if Decimal("5") <= Decimal(payout) <= Decimal("8") and (roll_val is not None) and Decimal(str(roll_val)) >= Decimal("90.000"):
-                                self._activate_press(Decimal("10"), reason="win-5-8-roll>=90")
-                        except Exception:
-                            pass
-
             self.spin_count += 1
             self.local_nonce += 1
             time.sleep(max(0.01, self.config.speed_ms / 1000.0))
@@ -617,6 +481,8 @@ class BotTab:
         self.pause_btn.pack(in_=btnf, side="left", padx=4)
         self.stop_btn.pack(in_=btnf, side="left", padx=4)
         self.seed_btn.pack(in_=btnf, side="left", padx=4)
+        self.history_btn = ttk.Button(left, text="History", command=self.open_history)
+        self.history_btn.pack(in_=btnf, side="left", padx=4)
 
         bank_frame = ttk.LabelFrame(right, text="Bank", padding=6)
         bank_frame.pack(fill="x", pady=(0,6))
@@ -630,7 +496,7 @@ class BotTab:
         self.log_text.tag_config("win", foreground="green")
         self.log_text.tag_config("loss", foreground="red")
 
-        self._bet_lines = deque(maxlen=20)
+        self.bet_log = BetLogBuffer(self.log_text, maxlen=20)
 
         os.makedirs("logs", exist_ok=True)
         safe_name = self.bot_name.replace("/", "_").replace("\\", "_")
@@ -664,20 +530,12 @@ class BotTab:
         self.bot_thread = None
 
     def _file_log(self, msg: str):
+        # запись — только постановка в очередь; файл пишет фоновый поток (crypto_games_filelog)
         try:
             ts = time.strftime("%Y-%m-%d %H:%M:%S")
-            with open(self.log_file_path, "a", encoding="utf-8") as f:
-                f.write(f"{ts} {msg}\n")
+            file_logger().write(self.log_file_path, f"{ts} {msg}\n")
         except Exception as e:
-            print(f"[{self.bot_name}] File log error: {e}")
-
-    def _render_bet_log(self):
-        self.log_text.configure(state="normal")
-        self.log_text.delete("1.0", "end")
-        for line, tag in self._bet_lines:
-            self.log_text.insert("end", line + "\n", (tag if tag else ()))
-        self.log_text.see("end")
-        self.log_text.configure(state="normal")
+            console().emit(f"[{self.bot_name}] File log error: {e}")
 
     def log_bet(self, raw_line: str):
         ll = raw_line.lower()
@@ -686,12 +544,11 @@ class BotTab:
             tag = "win"
         elif ll.startswith("[loss"):
             tag = "loss"
-        self._bet_lines.append((raw_line, tag))
-        self._render_bet_log()
+        self.bet_log.append(raw_line, tag)
 
     def log(self, msg):
         ts = time.strftime("%H:%M:%S")
-        print(f"{ts} [{self.bot_name}] {msg}")
+        console().emit(f"{ts} [{self.bot_name}] {msg}")
         self._file_log(f"[{self.bot_name}] {msg}")
         if msg.startswith("[WIN") or msg.startswith("[LOSS"):
             self.log_bet(msg)
@@ -803,8 +660,13 @@ class BotTab:
             seed = self.seed_entry.get().strip()
             if seed:
                 self.bot.client_seed = seed
+                self.bot.monitor.note_seed(seed)
 
             self.bot.manager_ref = self.manager
+            try:
+                self.bot.journal = open_journal(self.log_file_path)
+            except Exception as e:
+                self.log(f"[{self.bot_name}] journal disabled: {e}")
 
             self.start_btn.config(state="disabled")
             self.pause_btn.config(state="normal")
@@ -843,6 +705,15 @@ class BotTab:
         self.seed_entry.insert(0, seed)
         self.manager.enqueue(('log', self.bot_name, f"Client seed: {seed}"))
 
+    def open_history(self):
+        if open_log_history is None:
+            messagebox.showinfo("History", f"Лог бота: {os.path.abspath(self.log_file_path)}")
+            return
+        try:
+            open_log_history(self.frame, self.log_file_path, title=f"History — {self.bot_name}")
+        except Exception as e:
+            messagebox.showerror("History", f"Не удалось открыть лог: {e}")
+
     def _on_pause_on_fail_toggled(self):
         val = bool(self.pause_on_fail_var.get())
         if self.bot:
@@ -883,9 +754,11 @@ class BotManagerApp:
         self.root.geometry("1200x860")
         self.bot_tabs = {}
         self.active_bots = {}
-        self.all_banks = {}
+        self.all_banks = FleetBanks()
+        self.balance_history = FleetBalanceHistory() if FleetBalanceHistory is not None else None
+        self.chart_win = None
         self.lock = threading.Lock()
-        self.ui_queue = queue.Queue()
+        self.ui_queue = UIEventQueue()
         max_workers = min(32, (os.cpu_count() or 4) * 5)
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
         self.ui_poll_ms = ui_poll_ms
@@ -910,8 +783,14 @@ class BotManagerApp:
         self.agg_label.pack(side="left", padx=(4,14))
 
         ttk.Button(top, text="New Bot", command=self.new_bot_tab).pack(side="left")
+        self.add_count_var = tk.StringVar(value="10")
+        ttk.Spinbox(top, from_=1, to=500, increment=1, width=4, textvariable=self.add_count_var).pack(side="left", padx=(6, 2))
+        ttk.Button(top, text="Add bots", command=self.add_bot_rows).pack(side="left")
+        self.queue_label = ttk.Label(top, text="")
+        self.queue_label.pack(side="right", padx=6)
         ttk.Button(top, text="Start All", command=self.start_all_bots).pack(side="left", padx=6)
         ttk.Button(top, text="Stop All", command=self.stop_all_bots).pack(side="left", padx=6)
+        ttk.Button(top, text="Chart", command=self.open_chart).pack(side="left", padx=6)
 
         sep = ttk.Label(top, text=" | "); sep.pack(side="left", padx=6)
         ttk.Label(top, text="Global TP %:").pack(side="left", padx=(6,4))
@@ -929,12 +808,46 @@ class BotManagerApp:
         self.recovery_dd_usdt_entry = ttk.Entry(top, textvariable=self.recovery_dd_usdt_var, width=10); self.recovery_dd_usdt_entry.pack(side="left", padx=2)
 
         self.bot_notebook = ttk.Notebook(self.root); self.bot_notebook.pack(fill="both", expand=True, padx=6, pady=(0,6))
+        self.overview = FleetOverview(self.bot_notebook, on_open=self.open_bot_tab, status_fn=self._bot_status)
+        self.bot_notebook.add(self.overview, text="Fleet")
 
     def new_bot_tab(self):
+        tab = self.add_bot_row()
+        self.open_bot_tab(tab.bot_name)
+
+    def add_bot_row(self):
+        """Строка в обзоре флота; сама вкладка BotTab строится при первом открытии."""
         idx = len(self.bot_tabs) + 1
-        tab = BotTab(self.bot_notebook, self, idx)
+        tab = LazyBotTab(self.bot_notebook, lambda nb, idx=idx: BotTab(nb, self, idx), f"Bot-{idx}")
         self.bot_tabs[tab.bot_name] = tab
-        self.bot_notebook.select(tab.frame)
+        self.overview.add_bot(tab.bot_name)
+        return tab
+
+    def add_bot_rows(self):
+        try:
+            n = int(str(self.add_count_var.get()).strip())
+        except Exception:
+            n = 1
+        for _ in range(max(1, min(n, 500))):
+            self.add_bot_row()
+
+    def open_bot_tab(self, bot_id):
+        tab = self.bot_tabs.get(bot_id)
+        if tab is None:
+            return
+        try:
+            self.bot_notebook.select(tab.frame)
+        except Exception as e:
+            console().emit(f"[Manager] open tab error: {e}")
+
+    def _bot_status(self, bot_id) -> str:
+        tab = self.bot_tabs.get(bot_id)
+        bot = getattr(tab, "bot", None) if tab is not None else None
+        if bot is None:
+            return "idle" if getattr(tab, "built", True) else "new"
+        if not getattr(bot, "is_running", False):
+            return "stopped"
+        return "paused" if getattr(bot, "paused", False) else "running"
 
     def register_bot(self, bot: CryptoGamesBot, bottab: BotTab):
         with self.lock:
@@ -959,15 +872,10 @@ class BotManagerApp:
             pass
 
     def _process_ui_queue(self):
-        processed = 0
         max_per_cycle = 600
-        while processed < max_per_cycle:
-            try:
-                typ, bot_id, payload = self.ui_queue.get_nowait()
-            except queue.Empty:
-                break
-
+        for typ, bot_id, payload in self.ui_queue.drain(max_per_cycle):
             if typ == 'log':
+                self.overview.note_line(bot_id, payload)
                 tab = self.bot_tabs.get(bot_id)
                 if tab:
                     try:
@@ -976,7 +884,7 @@ class BotManagerApp:
                         pass
 
             elif typ == 'trace':
-                print(payload)
+                console().emit(str(payload), force=True)
 
             elif typ == 'bank':
                 stats = payload
@@ -987,7 +895,13 @@ class BotManagerApp:
                     if init <= 0:
                         init = curr
                     with self.lock:
-                        self.all_banks[bot_id] = {"current_bank": curr, "initial_bank": init, "last_successful_bank": last}
+                        # запоздалый bank после unregister_bot: бот уже не во флоте — только его вкладка
+                        if bot_id in self.active_bots:
+                            self.all_banks[bot_id] = {"current_bank": curr, "initial_bank": init,
+                                                      "last_successful_bank": last}
+                            if self.balance_history is not None:
+                                self.balance_history.add(bot_id, curr, self.all_banks.total_current)
+                            self.overview.note_bank(bot_id, curr, init)
                     tab = self.bot_tabs.get(bot_id)
                     if tab:
                         tab.update_bank_ui(stats)
@@ -995,24 +909,16 @@ class BotManagerApp:
                 except Exception:
                     pass
 
-            processed += 1
 
         self._check_global_limits()
         self._check_global_recovery()
+        if self.ui_queue.ticks % 10 == 0:
+            self.queue_label.config(text=self.ui_queue.describe())
         self.root.after(self.ui_poll_ms, self._process_ui_queue)
 
     def _aggregate_initial_and_current(self):
         with self.lock:
-            total_current = Decimal("0")
-            total_initial = Decimal("0")
-            for v in self.all_banks.values():
-                curr = safe_decimal(v.get("current_bank"))
-                init = safe_decimal(v.get("initial_bank"))
-                if init <= 0:
-                    init = curr
-                total_current += curr
-                total_initial += init
-        return total_initial, total_current
+            return self.all_banks.initial_and_current()
 
     def _check_global_limits(self):
         if self.global_stop_fired is True:
@@ -1049,19 +955,13 @@ class BotManagerApp:
 
     def _check_global_recovery(self):
         with self.lock:
-            active = list(self.active_bots.values())
-            N = len(active)
+            N = len(self.active_bots)
             if N == 0:
                 return
-            shared_S_ref = Decimal("0")
-            sum_current = Decimal("0")
-            for bot in active:
-                rec = self.all_banks.get(bot.bot_id, {})
-                curr = safe_decimal(rec.get("current_bank"), "0")
-                sref = safe_decimal(rec.get("last_successful_bank"), "0")
-                sum_current += curr
-                if sref > shared_S_ref:
-                    shared_S_ref = sref
+            # all_banks и active_bots заполняются/чистятся вместе: register_bot / unregister_bot, а bank-события
+            # от уже снятых ботов отбрасываются в _process_ui_queue
+            shared_S_ref = max(Decimal("0"), self.all_banks.max_of("last_successful_bank"))
+            sum_current = self.all_banks.total_current
 
         if shared_S_ref <= 0:
             return
@@ -1090,12 +990,13 @@ class BotManagerApp:
         if (not self.recovery_global_active) and (trigger_by_pct or trigger_by_usdt):
             self.recovery_global_active = True
             with self.lock:
+                active = list(self.active_bots.values())
                 for bot in active:
                     try:
                         bot.enter_recovery(shared_S_ref, N)
                     except Exception:
                         pass
-            print(f"[Manager] [RECOVERY] Global start: dd%={dd_pct:.2f}% (thr%={trig_pct}) deficit={deficit_abs:.8f} (thrUSDT={trig_usdt}) S_ref={shared_S_ref:.8f} bots={N}")
+            console().emit(f"[Manager] [RECOVERY] Global start: dd%={dd_pct:.2f}% (thr%={trig_pct}) deficit={deficit_abs:.8f} (thrUSDT={trig_usdt}) S_ref={shared_S_ref:.8f} bots={N}")
             return
 
         if self.recovery_global_active:
@@ -1107,7 +1008,7 @@ class BotManagerApp:
                         break
             if not any_in_recovery:
                 self.recovery_global_active = False
-                print("[Manager] [RECOVERY] Global completed: all bots back to normal")
+                console().emit("[Manager] [RECOVERY] Global completed: all bots back to normal")
 
     def force_end_recovery(self, initiator_id: Optional[str] = None):
         with self.lock:
@@ -1146,7 +1047,7 @@ class BotManagerApp:
                     pass
             self.recovery_global_active = False
 
-        print(f"[Manager] [RECOVERY] Force-completed by {initiator_id or 'unknown'}: all bots back to normal")
+        console().emit(f"[Manager] [RECOVERY] Force-completed by {initiator_id or 'unknown'}: all bots back to normal")
 
         with self.lock:
             bots_seq = list(self.active_bots.values())
@@ -1166,7 +1067,7 @@ class BotManagerApp:
     def _trigger_global_stop(self, kind: str, growth: Decimal, limit: Decimal):
         self.global_stop_fired = True
         msg = f"[Manager] Global {kind} triggered: growth={growth:.2f}% limit={limit:.2f}% → STOP ALL"
-        print(msg)
+        console().emit(msg)
         try:
             messagebox.showinfo("Global limit", msg)
         except Exception:
@@ -1183,6 +1084,21 @@ class BotManagerApp:
         except:
             pass
 
+    def open_chart(self):
+        if open_balance_chart is None or self.balance_history is None:
+            messagebox.showinfo("Chart", "Графики недоступны (нет crypto_games_charts)")
+            return
+        try:
+            if self.chart_win is not None and self.chart_win.winfo_exists():
+                self.chart_win.lift()
+                return
+        except Exception:
+            pass
+        try:
+            self.chart_win = open_balance_chart(self.root, self.balance_history, title="Balance — fleet")
+        except Exception as e:
+            messagebox.showerror("Chart", f"Не удалось открыть график: {e}")
+
     def stop_all_bots(self):
         with self.lock:
             bots = list(self.active_bots.values())
@@ -1191,7 +1107,7 @@ class BotManagerApp:
                 b.stop()
             except Exception:
                 pass
-        print("All bots stop requested")
+        console().emit("All bots stop requested")
 
     def start_all_bots(self):
         tabs_seq = list(self.bot_tabs.values())
@@ -11,22 +11,55 @@ from tkinter import ttk, messagebox, scrolledtext
 import threading
 import time
 import random
-import string
-import requests
 import os
 import traceback
 import queue
-from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from decimal import Decimal, getcontext, ROUND_DOWN, InvalidOperation
+from decimal import Decimal, getcontext, InvalidOperation
 from typing import Optional
 import secrets
 
+from crypto_games_payouts import ArithmeticRange
+from crypto_games_engine import APIClient, LinearPayoutStrategy, safe_decimal
+from crypto_games_kernel import (MODE_BASE, MODE_NAMES, MODE_RECOVERY_TRIGGER, NO_FUNDS, NO_FUNDS_RECOVERY,
+                                 NO_ROLL, PRESS_5_8_ROLL_90, PRESS_HIGHROLL_99, activation_loss,
+                                 auto_recovery_due, decide, press_after, press_plan, press_trigger,
+                                 recovery_after)
+from crypto_games_betlog import BetLogBuffer
+from crypto_games_uiqueue import UIEventQueue
+from crypto_games_fleet import FleetBanks
+from crypto_games_overview import FleetOverview, LazyBotTab
+from crypto_games_filelog import file_logger
+from crypto_games_console import console
+from crypto_games_journal import open_journal
+from crypto_games_spindb import record_event
+from crypto_games_anomaly import SpinMonitor
+
+try:
+    # Полная история лога: индекс на диске + виртуальный список (опционально)
+    from crypto_games_logview import open_log_history
+except Exception:
+    open_log_history = None
+
+try:
+    # Графики баланса ботов и флота (опционально)
+    from crypto_games_charts import FleetBalanceHistory, open_balance_chart
+except Exception:
+    FleetBalanceHistory = None
+    open_balance_chart = None
+
+try:
+    # Перцентили баланса / просадки / серий LOSS в ограниченной памяти (опционально)
+    from crypto_games_sketch import PathStats
+except Exception:
+    PathStats = None
+
 getcontext().prec = 40
 
 API_BASE = "https://api.crypto.games/v1"
 SIM_DEFAULT_INITIAL_BANK = Decimal("100.0")
+RECOVERY_TRIGGER_PAYOUT = Decimal(5)
 
 @dataclass
 class BetConfig:
@@ -39,98 +72,8 @@ class BetConfig:
     min_bet_refresh_secs: int = 30
     target_min_bets_on_win: int = 10
 
-MIN_API_CHANCE = Decimal("0.01")
-MAX_API_CHANCE = Decimal("9920")
-
-# ------------------ API ------------------
-class APIClient:
-    def __init__(self, api_base: str = API_BASE, timeout: int = 15):
-        self.base = api_base.rstrip("/")
-        self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "CryptoGamesBot/1.0",
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        })
-
-    def _get(self, path: str):
-        url = f"{self.base}{path}"
-        try:
-            r = self.session.get(url, timeout=self.timeout)
-            r.raise_for_status()
-            return r.json()
-        except requests.RequestException as e:
-            try:
-                return {"error": r.json()}
-            except Exception:
-                return {"error": str(e)}
 
-    def _post(self, path: str, payload: dict):
-        url = f"{self.base}{path}"
-        try:
-            r = self.session.post(url, json=payload, timeout=self.timeout)
-            r.raise_for_status()
-            return r.json()
-        except requests.RequestException as e:
-            try:
-                return {"error": r.json()}
-            except Exception:
-                return {"error": str(e)}
-
-    def settings(self, coin: str):
-        return self._get(f"/settings/{coin}")
-
-    def balance(self, coin: str, key: str):
-        return self._get(f"/balance/{coin}/{key}")
-
-    def user(self, coin: str, key: str):
-        return self._get(f"/user/{coin}/{key}")
-
-    def placebet(self, coin: str, key: str, bet_amount, payout, underover_bool, client_seed):
-        payload = {"Bet": float(bet_amount), "Payout": float(payout), "UnderOver": bool(underover_bool), "ClientSeed": client_seed}
-        return self._post(f"/placebet/{coin}/{key}", payload)
-
-    def generate_client_seed(self) -> str:
-        return ''.join(random.choice(string.ascii_letters + string.digits) for _ in range(16))
-
-# ------------------ Utils ------------------
-def quantize_bet(bet: Decimal, max_scale=8):
-    q = Decimal(1).scaleb(-max_scale)
-    try:
-        return bet.quantize(q, rounding=ROUND_DOWN)
-    except Exception:
-        return bet
-
-def safe_decimal(val, default="0"):
-    if val is None:
-        return Decimal(default)
-    try:
-        return Decimal(str(val))
-    except Exception:
-        return Decimal(default)
-
-# ------------------ Strategy (сканирование payout) ------------------
-class LinearPayoutStrategy:
-    """
-    Линейная стратегия сканирования payout: от min_payout до max_payout, +1 на каждый спин, на WRAP — сброс.
-    """
-    def __init__(self, start_payout=Decimal("100"), max_payout=Decimal("9999")):
-        self.start_payout = Decimal(start_payout)
-        self.max_payout = Decimal(max_payout)
-        self.current_payout = Decimal(start_payout)
-
-    def reset(self):
-        self.current_payout = Decimal(self.start_payout)
-
-    def next_payout_and_bet(self, state):
-        payout = self.current_payout
-        nxt = payout + Decimal(1)
-        if nxt > self.max_payout:
-            nxt = Decimal(self.start_payout)
-        self.current_payout = nxt
-        bet = Decimal(state.get("min_bet", Decimal("0.001"))) or Decimal("0.001")
-        return payout, bet, 1, False
+# APIClient, quantize_bet, safe_decimal, LinearPayoutStrategy — общее ядро в crypto_games_engine
 
 # ------------------ Core Bot ------------------
 class CryptoGamesBot:
@@ -149,6 +92,10 @@ class CryptoGamesBot:
         self.paused = False
         self.client_seed = self.api.generate_client_seed()
         self.reset_stats()
+        # Скетчи траектории банка: не сбрасываются reset_stats, копия уходит менеджеру через stats_cb
+        self.path_stats = PathStats() if PathStats is not None else None
+        self.path_stats_publish_every = 200
+        self._path_stats_pub_at = 0
         self.initial_bank = None
         self.last_successful_bank = None
         self.profit_global = Decimal("0")
@@ -164,6 +111,8 @@ class CryptoGamesBot:
         self.payout_wraps = 0
         self._prev_payout = None
         self.manager_ref = None
+        self.journal = None                 # SpinJournal (logs/<bot>.cgj), подключает BotTab
+        self.monitor = SpinMonitor(bot_id)  # онлайн-инварианты спина (crypto_games_anomaly)
 
         # Double-Press
         self.press_active = False
@@ -208,6 +157,16 @@ class CryptoGamesBot:
         # SIM mode
         self.sim_mode = False
         self.sim_balance = Decimal("0")
+        # Turbo SIM: без паузы между спинами и без UI-событий на каждый спин
+        self.sim_turbo = False
+        self.sim_snapshot_every_spins = 5000   # снапшот stats/bank каждые N спинов...
+        self.sim_snapshot_every_ms = 500       # ...или каждые T мс (что наступит раньше)
+        self.sim_log_sampled = True            # в turbo логировать только WIN и смену режима
+        self._sim_rng = random.Random(secrets.randbits(64))   # пересевается на старте turbo (client_seed)
+        self._turbo_start_t = 0.0
+        self._turbo_snap_t = 0.0
+        self._turbo_snap_spin = 0
+        self._turbo_prev_mode = None
 
     def pause_toggle(self):
         self.paused = not self.paused
@@ -234,9 +193,13 @@ class CryptoGamesBot:
 
     def restart_after_tp(self, new_initial: Decimal):
         self.initial_bank = safe_decimal(new_initial)
+        record_event(self.bot_id, "tp_restart", f"new_initial={self.initial_bank:.8f}", self.initial_bank)
         self.last_successful_bank = self.initial_bank
         self.profit_global = Decimal("0")
         self.reset_stats()
+        if self.path_stats is not None:
+            self.path_stats.new_session(float(self.initial_bank))
+            self._path_stats_pub_at = 0
         if self.strategy:
             try:
                 self.strategy.reset()
@@ -248,7 +211,7 @@ class CryptoGamesBot:
     def _gen_recovery_Ms(self, desc=True, min_payout: Optional[Decimal]=None,
                          max_payout: Optional[Decimal]=None, step: Optional[Decimal]=None):
         """
-        Сгенерировать список Ms (payout) для Recovery по настройкам:
+        Расписание Ms (payout) для Recovery по настройкам (ArithmeticRange, без списка):
         - min_payout, max_payout (включительно)
         - step (шаг между значениями payout)
         - desc: направление (True — убывание max→min, False — возрастание min→max)
@@ -273,19 +236,10 @@ class CryptoGamesBot:
         if st_abs <= 0:
             st_abs = 1
 
-        Ms = []
-        if desc:
-            cur = mx
-            while cur >= mn:
-                Ms.append(Decimal(int(cur)))
-                cur = cur - st_abs
-        else:
-            cur = mn
-            while cur <= mx:
-                Ms.append(Decimal(int(cur)))
-                cur = cur + st_abs
+        # O(1) по памяти: элементы считаются по индексу, разворот — новый объект без списка
+        Ms = ArithmeticRange.between(mn, mx, st_abs, desc=desc, as_int=True)
         if not Ms:
-            Ms = [Decimal("50")]
+            Ms = ArithmeticRange(50, 50)
         return Ms
 
     def _recovery_min_bet_eff(self):
@@ -295,65 +249,26 @@ class CryptoGamesBot:
         eff = max(eff, self.config.min_bet_enforced)
         return eff
 
-    def _compute_recovery_bet(self, current_balance: Decimal,
-                              payout: Decimal,
-                              target_T: Decimal,
-                              min_bet_eff: Decimal,
-                              baseline_for_drawdown: Optional[Decimal] = None) -> Decimal:
+    def _recovery_baseline(self, current_balance: Decimal) -> Decimal:
+        """База relative drawdown для recovery-ставки: last_successful_bank → initial_bank → текущий баланс."""
+        if self.last_successful_bank is not None:
+            return self.last_successful_bank
+        return self.initial_bank or current_balance
+
+    def _log_recovery_calc(self, current_balance: Decimal, payout: Decimal, baseline_for_drawdown: Decimal,
+                           target_T: Decimal, relative_dd: Decimal, adj_T: Decimal, need: Decimal,
+                           cap_abs: Decimal, bet: Decimal):
         """
-        Sizing recovery-ставки и логирование параметров:
-        - relative_dd, adj_T, need, cap_abs и финальный bet будут залогированы.
+        Лог расчёта recovery-ставки (сама ставка — crypto_games_kernel.decide / recovery_bet):
+        relative_dd, adj_T, need, cap_abs и финальный bet.
         """
         if current_balance <= 0:
-            bet = min_bet_eff
             # Лог при нулевом/отрицательном балансе
             self._log(f"[{self.bot_id}] [RECOVERY-CALC] balance<=0 → bet={bet:.8f}")
-            return bet
-
-        if payout <= 1:
-            payout = Decimal(2)
-
-        if baseline_for_drawdown is None:
-            baseline_for_drawdown = self.last_successful_bank if self.last_successful_bank is not None else (self.initial_bank or current_balance)
-
-        # relative drawdown
-        try:
-            denom = baseline_for_drawdown if baseline_for_drawdown and baseline_for_drawdown > 0 else current_balance
-            relative_dd = (baseline_for_drawdown - current_balance) / denom
-            if relative_dd < 0:
-                relative_dd = Decimal("0")
-            if relative_dd > 1:
-                relative_dd = Decimal("1")
-        except Exception:
-            relative_dd = Decimal("0")
-
-        # адаптация цели
-        adj_T = target_T * (Decimal("1") + (self.recovery_drawdown_intensity * relative_dd))
-
-        # базовая потребность ставки
-        need = (adj_T / (payout - Decimal(1))) if adj_T > 0 else min_bet_eff
-
-        # жёсткий кап от текущего банка
-        cap_pct = self.recovery_bet_cap_pct_of_bank
-        if cap_pct <= 0:
-            cap_pct = Decimal("0.01")
-        cap_abs = current_balance * cap_pct
-
-        # итоговая ставка
-        bet = min(need, cap_abs)
-        bet = max(bet, min_bet_eff)
-        bet = quantize_bet(bet)
-
-        try:
-            if bet > self.config.max_bet_limit:
-                bet = Decimal(self.config.max_bet_limit)
-        except Exception:
-            pass
-
-        if bet > current_balance:
-            bet = quantize_bet(current_balance)
-
-        # Подробный лог расчёта
+            return
+        if self.sim_mode and self.sim_turbo:
+            return
+        cap_pct = self.recovery_bet_cap_pct_of_bank if self.recovery_bet_cap_pct_of_bank > 0 else Decimal("0.01")
         try:
             self._log(f"[{self.bot_id}] [RECOVERY-CALC] payout={int(payout)} baseline={baseline_for_drawdown:.8f} "
                       f"current={current_balance:.8f} relative_dd={relative_dd:.6f} "
@@ -365,8 +280,6 @@ class CryptoGamesBot:
                       f"target_T={target_T} adj_T={adj_T} need={need} "
                       f"cap_pct={cap_pct} cap_abs={cap_abs} bet={bet}")
 
-        return bet
-
     def start_recovery(self, pct_activation: Decimal, pct_total_losses: Decimal,
                        trigger_threshold: Decimal, trigger_pct_bank: Decimal):
         self.recovery_enabled = True
@@ -428,9 +341,13 @@ class CryptoGamesBot:
 
     # SIM helpers
     def _sim_roll_value(self) -> float:
+        if self.sim_turbo:
+            return self._sim_rng.randrange(1000000) / 10000.0
         return secrets.randbelow(1000000) / 10000.0
 
     def _sim_win_for_M(self, M: int) -> bool:
+        if self.sim_turbo:
+            return self._sim_rng.randrange(int(M)) == 0
         return secrets.randbelow(int(M)) == 0
 
     def _simulate_placebet(self, bet: Decimal, payout: Decimal):
@@ -441,14 +358,47 @@ class CryptoGamesBot:
         else:
             profit = -bet
         self.sim_balance = (self.sim_balance + profit).quantize(Decimal("0.00000001"))
+        if self.sim_turbo:
+            # без float → str → Decimal на каждом спине
+            return {"Profit": profit, "Balance": self.sim_balance, "Roll": roll}
         return {"Profit": float(profit), "Balance": float(self.sim_balance), "Roll": roll}
 
+    def _turbo_snapshot(self, balance: Decimal, force: bool = False):
+        """
+        Turbo SIM: вместо log/bank/stats на каждый спин — сводка раз в N спинов или T мс.
+        """
+        now = time.monotonic()
+        spins_since = self.spin_count - self._turbo_snap_spin
+        if not force and spins_since < self.sim_snapshot_every_spins and \
+                (now - self._turbo_snap_t) * 1000.0 < self.sim_snapshot_every_ms:
+            return
+        if force:
+            # итог — средняя скорость за весь прогон, а не за хвост после последнего снапшота
+            spins_since, dt = self.spin_count, now - self._turbo_start_t
+        else:
+            dt = now - self._turbo_snap_t if self._turbo_snap_t > 0 else 0.0
+        rate = (spins_since / dt) if dt > 0 else 0.0
+        self._turbo_snap_t = now
+        self._turbo_snap_spin = self.spin_count
+        self._stats()
+        self._bank(balance)
+        self._log(f"[{self.bot_id}] [SIM-TURBO] spins={self.stats['total_bets']} wins={self.stats['wins']} "
+                  f"losses={self.stats['losses']} bal={balance:.8f} rate={rate:.0f}/s")
+        if force and self.path_stats is not None:
+            self._log(f"[{self.bot_id}] [PATH] {self.path_stats.format()}")
+
+    def _turbo_mode_change(self, mode: str):
+        prev = self._turbo_prev_mode
+        self._turbo_prev_mode = mode
+        if prev is not None and prev != mode and self.sim_log_sampled:
+            self._log(f"[{self.bot_id}] [MODE] {prev}→{mode} spin {self.spin_count + 1}")
+
     # Logging & stats
     def _log(self, msg):
         try:
             self.log_cb(msg)
         except Exception:
-            print(f"[{self.bot_id}] {msg}")
+            console().emit(f"[{self.bot_id}] {msg}")
 
     def _push_bank_payload(self, bal: Decimal):
         if self.initial_bank is None:
@@ -477,6 +427,14 @@ class CryptoGamesBot:
              "total_wagered": float(self.stats["total_wagered"]),
              "strategy_resets": self.stats["strategy_resets"],
              "bot_id": self.bot_id}
+        ps = self.path_stats
+        if ps is not None:
+            s["max_dd_pct"] = ps.dd.max_dd_pct
+            if self.stats["total_bets"] - self._path_stats_pub_at >= self.path_stats_publish_every \
+                    or self._path_stats_pub_at == 0:
+                # копия: бот продолжает писать в свои скетчи, менеджер сливает снимки
+                self._path_stats_pub_at = max(1, self.stats["total_bets"])
+                s["path_stats"] = ps.copy()
         try:
             self.stats_cb(s)
         except:
@@ -485,7 +443,8 @@ class CryptoGamesBot:
     # API data
     def get_current_balance(self):
         if self.sim_mode:
-            self._push_bank_payload(self.sim_balance)
+            if not self.sim_turbo:
+                self._push_bank_payload(self.sim_balance)
             return self.sim_balance
         if not self.config.api_key:
             return Decimal("0")
@@ -528,6 +487,8 @@ class CryptoGamesBot:
         self.press_active = True
         self.press_left = 2
         self.press_payout = Decimal(payout)
+        if self.sim_mode and self.sim_turbo and not self.sim_log_sampled:
+            return
         self._log(f"[{self.bot_id}] ▶ Press start: payout={int(self.press_payout)} bet={self.press_bet:.6f} (2 spins) reason={reason}")
 
     # Main loop
@@ -555,6 +516,15 @@ class CryptoGamesBot:
         if self.last_successful_bank is None:
             self.last_successful_bank = self.initial_bank
 
+        turbo = self.sim_mode and self.sim_turbo
+        if turbo:
+            # тот же client_seed (поле Client Seed вкладки) — тот же прогон
+            self._sim_rng.seed(f"{self.client_seed}")
+            self._turbo_start_t = self._turbo_snap_t = time.monotonic()
+            self._turbo_snap_spin = 0
+            self._turbo_prev_mode = None
+            self._log(f"[{self.bot_id}] ▶ Turbo SIM: seed={self.client_seed}, no pacing, snapshot every {self.sim_snapshot_every_spins} spins / {self.sim_snapshot_every_ms} ms, sampled log={self.sim_log_sampled}")
+
         while self.is_running:
             while self.paused and self.is_running:
                 time.sleep(0.1)
@@ -563,84 +533,64 @@ class CryptoGamesBot:
             current_balance = self.get_current_balance()
 
             # Авто-старт Recovery от локального last_successful_bank
-            try:
-                if (not self.recovery_active) and bool(self.recovery_enabled) and (self.recovery_auto_threshold_usdt > 0):
-                    baseline = (self.last_successful_bank if self.last_successful_bank is not None else (self.initial_bank or Decimal("0")))
-                    if baseline > 0 and current_balance <= (baseline - self.recovery_auto_threshold_usdt):
-                        self.start_recovery(self.recovery_pct_activation,
-                                            self.recovery_pct_total_losses,
-                                            self.recovery_trigger_threshold,
-                                            self.recovery_trigger_pct_bank)
-            except Exception:
-                pass
-
-            mode = "BASE"
-            payout = None
-            bet = None
-
-            # 1) Основной бет: либо RECOVERY, либо BASE
+            baseline = self._recovery_baseline(current_balance)
+            if auto_recovery_due(self.recovery_active, bool(self.recovery_enabled),
+                                 self.recovery_auto_threshold_usdt, baseline, current_balance):
+                self.start_recovery(self.recovery_pct_activation,
+                                    self.recovery_pct_total_losses,
+                                    self.recovery_trigger_threshold,
+                                    self.recovery_trigger_pct_bank)
+
+            # 1) Основной бет: либо RECOVERY / RECOVERY-TRIGGER, либо BASE — решение ядра (crypto_games_kernel)
+            base_payout = None
+            sched_payout = None
             if self.recovery_active:
                 if self.initial_bank is not None:
-                    dyn_act_loss = (self.initial_bank - current_balance)
-                    if dyn_act_loss < 0:
-                        dyn_act_loss = Decimal("0")
-                    self.recovery_activation_loss = dyn_act_loss
-
-                trigger_now = False
-                if self.recovery_last_roll is not None:
-                    try:
-                        if Decimal(self.recovery_last_roll) >= self.recovery_trigger_threshold:
-                            trigger_now = True
-                    except Exception:
-                        trigger_now = False
-
-                min_bet_eff = self._recovery_min_bet_eff()
-                if trigger_now and self.recovery_trigger_pct_bank > 0:
-                    payout = Decimal(5)
-                    target_T = self.recovery_trigger_pct_bank * (current_balance if current_balance > 0 else (self.initial_bank or Decimal("0")))
-                    bet = self._compute_recovery_bet(current_balance, payout, target_T, min_bet_eff,
-                                                     baseline_for_drawdown=self.last_successful_bank)
-                    mode = "RECOVERY-TRIGGER"
-                    self.recovery_last_roll = Decimal("0")
-                else:
-                    try:
-                        M = self.recovery_Ms[self.recovery_i]
-                    except Exception:
-                        self.recovery_Ms = self._gen_recovery_Ms(
-                            desc=self.recovery_direction_desc,
-                            min_payout=self.recovery_payout_min,
-                            max_payout=self.recovery_payout_max,
-                            step=self.recovery_payout_step
-                        )
-                        self.recovery_i = 0
-                        M = self.recovery_Ms[self.recovery_i]
-                    payout = Decimal(M)
-                    target_T = (self.recovery_pct_activation * self.recovery_activation_loss) + \
-                               (self.recovery_pct_total_losses * self.recovery_losses_so_far)
-                    bet = self._compute_recovery_bet(current_balance, payout, target_T, min_bet_eff,
-                                                     baseline_for_drawdown=self.last_successful_bank)
-                    mode = "RECOVERY"
-
-                if bet > current_balance:
-                    if current_balance >= min_bet_eff:
-                        bet = quantize_bet(current_balance)
-                    else:
-                        self._log(f"[{self.bot_id}] ❌ Недостаточно средств для recovery: balance={current_balance:.8f} min_bet={min_bet_eff:.8f}")
-                        self.stop()
-                        break
-
+                    self.recovery_activation_loss = activation_loss(self.initial_bank, current_balance)
+                try:
+                    sched_payout = self.recovery_Ms[self.recovery_i]
+                except Exception:
+                    self.recovery_Ms = self._gen_recovery_Ms(
+                        desc=self.recovery_direction_desc,
+                        min_payout=self.recovery_payout_min,
+                        max_payout=self.recovery_payout_max,
+                        step=self.recovery_payout_step
+                    )
+                    self.recovery_i = 0
+                    sched_payout = self.recovery_Ms[self.recovery_i]
             else:
                 if self.strategy is None:
                     self._log(f"[{self.bot_id}] Нет стратегии.")
                     break
                 try:
-                    payout, _, _, _ = self.strategy.next_payout_and_bet({"min_bet": self.min_bet})
+                    base_payout, _, _, _ = self.strategy.next_payout_and_bet({"min_bet": self.min_bet})
                 except Exception as e:
                     self._log(f"[{self.bot_id}] Strategy error: {e}")
                     time.sleep(1)
                     continue
-                bet = Decimal(max(self.config.base_bet, self.config.min_bet_enforced))
-                mode = "BASE"
+
+            min_bet_eff = self._recovery_min_bet_eff()
+            code, payout, bet, status, target_T, relative_dd, adj_T, need, cap_abs = decide(
+                self.recovery_active, current_balance, baseline,
+                self.recovery_last_roll if self.recovery_last_roll is not None else NO_ROLL,
+                self.recovery_trigger_threshold, self.recovery_trigger_pct_bank, RECOVERY_TRIGGER_PAYOUT,
+                sched_payout, self.recovery_pct_activation, self.recovery_pct_total_losses,
+                self.recovery_activation_loss, self.recovery_losses_so_far, self.initial_bank or Decimal("0"),
+                base_payout, self.config.base_bet, self.config.min_bet_enforced, min_bet_eff,
+                self.recovery_drawdown_intensity, self.recovery_bet_cap_pct_of_bank, self.config.max_bet_limit)
+            mode = MODE_NAMES[code]
+            if code != MODE_BASE:
+                if code == MODE_RECOVERY_TRIGGER:
+                    self.recovery_last_roll = Decimal("0")
+                self._log_recovery_calc(current_balance, payout, baseline, target_T, relative_dd,
+                                        adj_T, need, cap_abs, bet)
+                if status == NO_FUNDS_RECOVERY:
+                    self._log(f"[{self.bot_id}] ❌ Недостаточно средств для recovery: balance={current_balance:.8f} min_bet={min_bet_eff:.8f}")
+                    self.stop()
+                    break
+
+            if turbo:
+                self._turbo_mode_change(mode)
 
             if mode not in ("RECOVERY", "RECOVERY-TRIGGER"):
                 if self.strategy and hasattr(self.strategy, "max_payout"):
@@ -652,18 +602,7 @@ class CryptoGamesBot:
                         pass
             self._prev_payout = payout
 
-            try:
-                chance_decimal = (Decimal("100") / payout)
-            except Exception:
-                chance_decimal = Decimal("99.99")
-            if chance_decimal < MIN_API_CHANCE:
-                chance_decimal = MIN_API_CHANCE
-            if chance_decimal > MAX_API_CHANCE:
-                chance_decimal = MAX_API_CHANCE
-
-            bet = quantize_bet(bet)
-
-            if bet > current_balance:
+            if status == NO_FUNDS:
                 self._log(f"[{self.bot_id}] ❌ Недостаточно средств: balance={current_balance:.8f} bet={bet:.8f}")
                 break
 
@@ -689,8 +628,13 @@ class CryptoGamesBot:
             except Exception:
                 self.recovery_last_roll = None
 
-            roll_str = f"{roll_val:.10f}" if isinstance(roll_val, float) else ("n/a" if roll_val is None else str(roll_val))
             win = profit > 0
+            if self.journal is not None and not self.sim_mode:
+                self.journal.append(payout, roll_val, bet, profit, new_balance, mode=mode)
+            self.monitor.check(self, res, payout, bet, profit, new_balance, win)
+            roll_str = ""
+            if not turbo or (win and self.sim_log_sampled):
+                roll_str = f"{roll_val:.10f}" if isinstance(roll_val, float) else ("n/a" if roll_val is None else str(roll_val))
 
             if mode == "RECOVERY" or mode == "RECOVERY-TRIGGER":
                 prefix = "[WIN-RECOVERY]" if win else "[LOSS-RECOVERY]"
@@ -724,7 +668,8 @@ class CryptoGamesBot:
 
                 if self.stop_on_win and (mode not in ("RECOVERY", "RECOVERY-TRIGGER")):
                     self.paused = True
-                self._log(f"{prefix} spin {self.spin_count + 1} payout={int(payout)} roll={roll_str} bet={bet:.8f} profit={profit:.8f}")
+                if not turbo or self.sim_log_sampled:
+                    self._log(f"{prefix} spin {self.spin_count + 1} payout={int(payout)} roll={roll_str} bet={bet:.8f} profit={profit:.8f}")
             else:
                 self.stats["losses"] += 1
                 self.stats["current_streak"] = min(0, self.stats["current_streak"] - 1)
@@ -734,60 +679,49 @@ class CryptoGamesBot:
                     self.stats["max_loss_sum"] = self.loss_sum
                 if bet > self.stats["max_bet"]:
                     self.stats["max_bet"] = bet
-                self._log(f"{prefix} spin {self.spin_count + 1} payout={int(payout)} roll={roll_str} bet={bet:.8f}")
+                if not turbo:
+                    self._log(f"{prefix} spin {self.spin_count + 1} payout={int(payout)} roll={roll_str} bet={bet:.8f}")
 
             self.stats["total_bets"] += 1
             self.stats["total_wagered"] += bet
+            if self.path_stats is not None:
+                self.path_stats.update(float(new_balance), win)
             self.profit_global = new_balance - (self.initial_bank if self.initial_bank is not None else Decimal("0"))
-            self._stats()
-            self._bank(new_balance)
+            if not turbo:
+                self._stats()
+                self._bank(new_balance)
 
             # Обработка recovery
             if self.recovery_active:
                 if win:
                     if self.initial_bank is not None:
-                        dyn_act_loss_after_win = (self.initial_bank - new_balance)
-                        if dyn_act_loss_after_win < 0:
-                            dyn_act_loss_after_win = Decimal("0")
-                        self.recovery_activation_loss = dyn_act_loss_after_win
+                        self.recovery_activation_loss = activation_loss(self.initial_bank, new_balance)
                     if self.last_successful_bank is not None and new_balance >= self.last_successful_bank:
                         self._stop_recovery_for_all(triggering_balance=new_balance)
                 else:
-                    self.recovery_losses_so_far += bet
-                    if mode == "RECOVERY":
-                        # Учитываем шаг спина (stride)
+                    # Учитываем шаг спина (stride)
+                    try:
+                        stride = int(self.recovery_spin_stride)
+                    except Exception:
                         stride = 1
-                        try:
-                            stride = int(self.recovery_spin_stride)
-                        except Exception:
-                            stride = 1
-                        if stride <= 0:
-                            stride = 1
-                        self.recovery_i += stride
-                        if self.recovery_i >= len(self.recovery_Ms):
-                            self.recovery_direction_desc = not self.recovery_direction_desc
-                            self.recovery_Ms = self._gen_recovery_Ms(
-                                desc=self.recovery_direction_desc,
-                                min_payout=self.recovery_payout_min,
-                                max_payout=self.recovery_payout_max,
-                                step=self.recovery_payout_step
-                            )
-                            self.recovery_i = 0
+                    self.recovery_losses_so_far, self.recovery_i, reverse = recovery_after(
+                        win, code, bet, self.recovery_losses_so_far, self.recovery_i, len(self.recovery_Ms), stride)
+                    if reverse:
+                        self.recovery_direction_desc = not self.recovery_direction_desc
+                        self.recovery_Ms = self._gen_recovery_Ms(
+                            desc=self.recovery_direction_desc,
+                            min_payout=self.recovery_payout_min,
+                            max_payout=self.recovery_payout_max,
+                            step=self.recovery_payout_step
+                        )
+                        if not turbo:
                             self._log(f"[{self.bot_id}] [RECOVERY] reverse direction (desc={self.recovery_direction_desc})")
 
             # PRESS-бет (как было)
             if self.press_active and self.press_left > 0 and self.press_payout is not None:
                 press_payout = Decimal(self.press_payout)
-                press_bet = Decimal(self.press_bet)
-                press_bet = quantize_bet(press_bet)
-                if press_bet > self.config.max_bet_limit:
-                    press_bet = Decimal(self.config.max_bet_limit)
-                try:
-                    _ = Decimal("100") / press_payout
-                except Exception:
-                    pass
-
-                if press_bet <= new_balance:
+                press_bet, press_ok = press_plan(Decimal(self.press_bet), self.config.max_bet_limit, new_balance)
+                if press_ok:
                     if self.sim_mode:
                         res2 = self._simulate_placebet(press_bet, press_payout)
                     else:
@@ -801,9 +735,13 @@ class CryptoGamesBot:
                         roll2 = res2.get("Roll", None)
                         roll2_str = f"{roll2:.10f}" if isinstance(roll2, float) else ("n/a" if roll2 is None else str(roll2))
                         win2 = profit2 > 0
+                        if self.journal is not None and not self.sim_mode:
+                            self.journal.append(press_payout, roll2, press_bet, profit2, new_balance2, mode="PRESS")
+                        self.monitor.check(self, res2, press_payout, press_bet, profit2, new_balance2, win2, counters=False)
 
                         pref2 = "[WIN-PRESS]" if win2 else "[LOSS-PRESS]"
-                        self._log(f"{pref2} spin {self.spin_count + 1} payout={int(press_payout)} roll={roll2_str} bet={press_bet:.8f} profit={profit2:.8f}" if win2 else f"{pref2} spin {self.spin_count + 1} payout={int(press_payout)} roll={roll2_str} bet={press_bet:.8f}")
+                        if not turbo or (win2 and self.sim_log_sampled):
+                            self._log(f"{pref2} spin {self.spin_count + 1} payout={int(press_payout)} roll={roll2_str} bet={press_bet:.8f} profit={profit2:.8f}" if win2 else f"{pref2} spin {self.spin_count + 1} payout={int(press_payout)} roll={roll2_str} bet={press_bet:.8f}")
 
                         if win2:
                             self.stats["wins"] += 1
@@ -834,48 +772,40 @@ class CryptoGamesBot:
 
                         self.stats["total_bets"] += 1
                         self.stats["total_wagered"] += press_bet
+                        if self.path_stats is not None:
+                            self.path_stats.update(float(new_balance2), win2)
                         self.profit_global = new_balance2 - (self.initial_bank if self.initial_bank is not None else Decimal("0"))
-                        self._stats()
-                        self._bank(new_balance2)
+                        if not turbo:
+                            self._stats()
+                            self._bank(new_balance2)
                         new_balance = new_balance2
 
-                        if win2:
-                            self.press_active = False
-                            self.press_left = 0
+                        self.press_active, self.press_left = press_after(win2, self.press_left)
+                        if not self.press_active:
                             self.press_payout = None
-                        else:
-                            self.press_left -= 1
-                            if self.press_left <= 0:
-                                self.press_active = False
-                                self.press_payout = None
                 else:
                     self._log(f"[{self.bot_id}] ⚠️ Недостаточно средств для press: balance={new_balance:.8f} press_bet={press_bet:.8f}")
 
-            # Триггеры включения press (как было)
-            if not self.paused:
-                if self.enable_highroll_99 and (roll_val is not None):
-                    try:
-                        if Decimal(str(roll_val)) >= Decimal("99.000"):
-                            self._activate_press(Decimal("100"), reason="highroll99")
-                        else:
-                            if Decimal("5") <= Decimal(payout) <= Decimal("8") and Decimal(str(roll_val)) >= Decimal("90.000"):
-                                self._activate_press(Decimal("10"), reason="win-5-8-roll>=90" if win else "cond-5-8-roll>=90")
-                    except Exception:
-                        pass
-                else:
-                    try:
-                        if Decimal("5") <= Decimal(payout) <= Decimal("8") and (roll_val is not None) and Decimal(str(roll_val)) >= Decimal("90.000"):
-                            self._activate_press(Decimal("10"), reason="win-5-8-roll>=90" if win else "cond-5-8-roll>=90")
-                    except Exception:
-                        pass
+            # Триггеры включения press: roll ≥ 99 (highroll) или payout 5..8 и roll ≥ 90
+            if not self.paused and self.recovery_last_roll is not None:
+                press_payout, reason = press_trigger(self.enable_highroll_99, payout, self.recovery_last_roll)
+                if reason == PRESS_HIGHROLL_99:
+                    self._activate_press(Decimal(press_payout), reason="highroll99")
+                elif reason == PRESS_5_8_ROLL_90:
+                    self._activate_press(Decimal(press_payout), reason="win-5-8-roll>=90" if win else "cond-5-8-roll>=90")
 
             if self.recovery_active and (self.last_successful_bank is not None) and (new_balance >= self.last_successful_bank):
                 self._stop_recovery_for_all(triggering_balance=new_balance)
 
             self.spin_count += 1
             self.local_nonce += 1
-            time.sleep(max(0.01, self.config.speed_ms / 1000.0))
+            if turbo:
+                self._turbo_snapshot(new_balance)
+            else:
+                time.sleep(max(0.01, self.config.speed_ms / 1000.0))
 
+        if turbo:
+            self._turbo_snapshot(self.sim_balance, force=True)
         self._log(f"[{self.bot_id}] 🛑 Остановлен")
 
     def stop(self):
@@ -992,11 +922,30 @@ class BotTab:
         self.rec_stride_entry = ttk.Entry(recf, width=8); self.rec_stride_entry.grid(row=12, column=1, sticky="e")
         self.rec_stride_entry.insert(0, "1")
 
-        btnf = ttk.Frame(left); btnf.grid(row=15,column=0,columnspan=2,pady=(8,0))
+        # SIM (без API ключа): turbo-режим
+        simf = ttk.LabelFrame(left, text="SIM", padding=6)
+        simf.grid(row=15, column=0, columnspan=2, sticky="we", pady=(8,0))
+        self.sim_turbo_var = tk.BooleanVar(value=False)
+        ttk.Checkbutton(simf, text="Turbo SIM (no pacing, batched UI)", variable=self.sim_turbo_var).grid(row=0, column=0, columnspan=2, sticky="w")
+
+        ttk.Label(simf, text="Snapshot every N spins:").grid(row=1, column=0, sticky="w")
+        self.sim_snap_spins_entry = ttk.Entry(simf, width=8); self.sim_snap_spins_entry.grid(row=1, column=1, sticky="e")
+        self.sim_snap_spins_entry.insert(0, "5000")
+
+        ttk.Label(simf, text="Snapshot every ms:").grid(row=2, column=0, sticky="w")
+        self.sim_snap_ms_entry = ttk.Entry(simf, width=8); self.sim_snap_ms_entry.grid(row=2, column=1, sticky="e")
+        self.sim_snap_ms_entry.insert(0, "500")
+
+        self.sim_log_sampled_var = tk.BooleanVar(value=True)
+        ttk.Checkbutton(simf, text="Log WIN / mode changes", variable=self.sim_log_sampled_var).grid(row=3, column=0, columnspan=2, sticky="w")
+
+        btnf = ttk.Frame(left); btnf.grid(row=16,column=0,columnspan=2,pady=(8,0))
         self.start_btn.pack(in_=btnf, side="left", padx=4)
         self.pause_btn.pack(in_=btnf, side="left", padx=4)
         self.stop_btn.pack(in_=btnf, side="left", padx=4)
         self.seed_btn.pack(in_=btnf, side="left", padx=4)
+        self.history_btn = ttk.Button(left, text="History", command=self.open_history)
+        self.history_btn.pack(in_=btnf, side="left", padx=4)
 
         bank_frame = ttk.LabelFrame(right, text="Bank", padding=6)
         bank_frame.pack(fill="x", pady=(0,6))
@@ -1010,7 +959,7 @@ class BotTab:
         self.log_text.tag_config("win", foreground="green")
         self.log_text.tag_config("loss", foreground="red")
 
-        self._bet_lines = deque(maxlen=20)
+        self.bet_log = BetLogBuffer(self.log_text, maxlen=20)
 
         os.makedirs("logs", exist_ok=True)
         safe_name = self.bot_name.replace("/", "_").replace("\\", "_")
@@ -1040,20 +989,12 @@ class BotTab:
         self.bot_thread = None
 
     def _file_log(self, msg: str):
+        # запись — только постановка в очередь; файл пишет фоновый поток (crypto_games_filelog)
         try:
             ts = time.strftime("%Y-%m-%d %H:%M:%S")
-            with open(self.log_file_path, "a", encoding="utf-8") as f:
-                f.write(f"{ts} {msg}\n")
+            file_logger().write(self.log_file_path, f"{ts} {msg}\n")
         except Exception as e:
-            print(f"[{self.bot_name}] File log error: {e}")
-
-    def _render_bet_log(self):
-        self.log_text.configure(state="normal")
-        self.log_text.delete("1.0", "end")
-        for line, tag in self._bet_lines:
-            self.log_text.insert("end", line + "\n", (tag if tag else ()))
-        self.log_text.see("end")
-        self.log_text.configure(state="normal")
+            console().emit(f"[{self.bot_name}] File log error: {e}")
 
     def log_bet(self, raw_line: str):
         ll = raw_line.lower()
@@ -1062,12 +1003,11 @@ class BotTab:
             tag = "win"
         elif ll.startswith("[loss"):
             tag = "loss"
-        self._bet_lines.append((raw_line, tag))
-        self._render_bet_log()
+        self.bet_log.append(raw_line, tag)
 
     def log(self, msg):
         ts = time.strftime("%H:%M:%S")
-        print(f"{ts} [{self.bot_name}] {msg}")
+        console().emit(f"{ts} [{self.bot_name}] {msg}")
         self._file_log(f"[{self.bot_name}] {msg}")
         if msg.startswith("[WIN") or msg.startswith("[LOSS"):
             self.log_bet(msg)
@@ -1159,8 +1099,13 @@ class BotTab:
             seed = self.seed_entry.get().strip()
             if seed:
                 self.bot.client_seed = seed
+                self.bot.monitor.note_seed(seed)
 
             self.bot.manager_ref = self.manager
+            try:
+                self.bot.journal = open_journal(self.log_file_path)
+            except Exception as e:
+                self.log(f"[{self.bot_name}] journal disabled: {e}")
 
             # Recovery parameters и авто-порог
             if bool(self.recovery_enabled_var.get()):
@@ -1179,7 +1124,11 @@ class BotTab:
             if not cfg.api_key:
                 self.bot.sim_mode = True
                 self.bot.sim_balance = SIM_DEFAULT_INITIAL_BANK
-                self.manager.enqueue(('log', bot_id, f"SIM mode ON (no API key). Start balance={self.bot.sim_balance:.8f}"))
+                self.bot.sim_turbo = bool(self.sim_turbo_var.get())
+                self.bot.sim_snapshot_every_spins = max(1, self._parse_int(self.sim_snap_spins_entry.get(), 5000))
+                self.bot.sim_snapshot_every_ms = max(10, self._parse_int(self.sim_snap_ms_entry.get(), 500))
+                self.bot.sim_log_sampled = bool(self.sim_log_sampled_var.get())
+                self.manager.enqueue(('log', bot_id, f"SIM mode ON (no API key). Start balance={self.bot.sim_balance:.8f} turbo={self.bot.sim_turbo}"))
 
             self.start_btn.config(state="disabled")
             self.pause_btn.config(state="normal")
@@ -1218,6 +1167,15 @@ class BotTab:
         self.seed_entry.insert(0, seed)
         self.manager.enqueue(('log', self.bot_name, f"Client seed: {seed}"))
 
+    def open_history(self):
+        if open_log_history is None:
+            messagebox.showinfo("History", f"Лог бота: {os.path.abspath(self.log_file_path)}")
+            return
+        try:
+            open_log_history(self.frame, self.log_file_path, title=f"History — {self.bot_name}")
+        except Exception as e:
+            messagebox.showerror("History", f"Не удалось открыть лог: {e}")
+
     def _on_pause_on_fail_toggled(self):
         val = bool(self.pause_on_fail_var.get())
         if self.bot:
@@ -1346,12 +1304,18 @@ class BotManagerApp:
         self.root.geometry("1200x840")
         self.bot_tabs = {}
         self.active_bots = {}
-        self.all_banks = {}
+        self.all_banks = FleetBanks()
+        self.balance_history = FleetBalanceHistory() if FleetBalanceHistory is not None else None
+        self.chart_win = None
         self.lock = threading.Lock()
-        self.ui_queue = queue.Queue()
+        self.ui_queue = UIEventQueue()
         max_workers = min(32, (os.cpu_count() or 4) * 5)
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
         self.ui_poll_ms = ui_poll_ms
+        # Последние снимки PathStats ботов → перцентили флота (слияние скетчей)
+        self.bot_path_stats = {}
+        self._fleet_stats_t = 0.0
+        self.fleet_stats_every_s = 1.0
 
         # Global TP/SL
         self.global_tp_enabled = tk.BooleanVar(value=False)
@@ -1368,10 +1332,17 @@ class BotManagerApp:
         top = ttk.Frame(self.root); top.pack(fill="x", padx=6, pady=6)
         self.agg_label = ttk.Label(top, text="Aggregate: Current=0.00000000 Profit=+0.00000000")
         self.agg_label.pack(side="left", padx=(4,14))
+        self.fleet_stats_label = ttk.Label(self.root, text="Fleet: n/a")
 
         ttk.Button(top, text="New Bot", command=self.new_bot_tab).pack(side="left")
+        self.add_count_var = tk.StringVar(value="10")
+        ttk.Spinbox(top, from_=1, to=500, increment=1, width=4, textvariable=self.add_count_var).pack(side="left", padx=(6, 2))
+        ttk.Button(top, text="Add bots", command=self.add_bot_rows).pack(side="left")
+        self.queue_label = ttk.Label(top, text="")
+        self.queue_label.pack(side="right", padx=6)
         ttk.Button(top, text="Start All", command=self.start_all_bots).pack(side="left", padx=6)
         ttk.Button(top, text="Stop All", command=self.stop_all_bots).pack(side="left", padx=6)
+        ttk.Button(top, text="Chart", command=self.open_chart).pack(side="left", padx=6)
 
         sep = ttk.Label(top, text=" | "); sep.pack(side="left", padx=6)
         ttk.Label(top, text="Global TP %:").pack(side="left", padx=(6,4))
@@ -1382,13 +1353,48 @@ class BotManagerApp:
         self.sl_entry = ttk.Entry(top, textvariable=self.global_sl_percent_var, width=6); self.sl_entry.pack(side="left", padx=2)
         ttk.Checkbutton(top, text="Enable SL", variable=self.global_sl_enabled).pack(side="left", padx=6)
 
+        self.fleet_stats_label.pack(fill="x", padx=10, pady=(0,4))
         self.bot_notebook = ttk.Notebook(self.root); self.bot_notebook.pack(fill="both", expand=True, padx=6, pady=(0,6))
+        self.overview = FleetOverview(self.bot_notebook, on_open=self.open_bot_tab, status_fn=self._bot_status)
+        self.bot_notebook.add(self.overview, text="Fleet")
 
     def new_bot_tab(self):
+        tab = self.add_bot_row()
+        self.open_bot_tab(tab.bot_name)
+
+    def add_bot_row(self):
+        """Строка в обзоре флота; сама вкладка BotTab строится при первом открытии."""
         idx = len(self.bot_tabs) + 1
-        tab = BotTab(self.bot_notebook, self, idx)
+        tab = LazyBotTab(self.bot_notebook, lambda nb, idx=idx: BotTab(nb, self, idx), f"Bot-{idx}")
         self.bot_tabs[tab.bot_name] = tab
-        self.bot_notebook.select(tab.frame)
+        self.overview.add_bot(tab.bot_name)
+        return tab
+
+    def add_bot_rows(self):
+        try:
+            n = int(str(self.add_count_var.get()).strip())
+        except Exception:
+            n = 1
+        for _ in range(max(1, min(n, 500))):
+            self.add_bot_row()
+
+    def open_bot_tab(self, bot_id):
+        tab = self.bot_tabs.get(bot_id)
+        if tab is None:
+            return
+        try:
+            self.bot_notebook.select(tab.frame)
+        except Exception as e:
+            console().emit(f"[Manager] open tab error: {e}")
+
+    def _bot_status(self, bot_id) -> str:
+        tab = self.bot_tabs.get(bot_id)
+        bot = getattr(tab, "bot", None) if tab is not None else None
+        if bot is None:
+            return "idle" if getattr(tab, "built", True) else "new"
+        if not getattr(bot, "is_running", False):
+            return "stopped"
+        return "paused" if getattr(bot, "paused", False) else "running"
 
     def register_bot(self, bot: CryptoGamesBot, bottab: BotTab):
         with self.lock:
@@ -1403,6 +1409,7 @@ class BotManagerApp:
         with self.lock:
             self.active_bots.pop(bot_id, None)
             self.all_banks.pop(bot_id, None)
+            self.bot_path_stats.pop(bot_id, None)
         self._update_aggregate_label()
 
     def enqueue(self, item_tuple):
@@ -1412,15 +1419,10 @@ class BotManagerApp:
             pass
 
     def _process_ui_queue(self):
-        processed = 0
         max_per_cycle = 600
-        while processed < max_per_cycle:
-            try:
-                typ, bot_id, payload = self.ui_queue.get_nowait()
-            except queue.Empty:
-                break
-
+        for typ, bot_id, payload in self.ui_queue.drain(max_per_cycle):
             if typ == 'log':
+                self.overview.note_line(bot_id, payload)
                 tab = self.bot_tabs.get(bot_id)
                 if tab:
                     try:
@@ -1429,7 +1431,13 @@ class BotManagerApp:
                         pass
 
             elif typ == 'trace':
-                print(payload)
+                console().emit(str(payload), force=True)
+
+            elif typ == 'stats':
+                ps = payload.get("path_stats") if isinstance(payload, dict) else None
+                if ps is not None:
+                    with self.lock:
+                        self.bot_path_stats[bot_id] = ps
 
             elif typ == 'bank':
                 stats = payload
@@ -1440,6 +1448,9 @@ class BotManagerApp:
                         init = curr
                     with self.lock:
                         self.all_banks[bot_id] = {"current_bank": curr, "initial_bank": init}
+                        if self.balance_history is not None:
+                            self.balance_history.add(bot_id, curr, self.all_banks.total_current)
+                        self.overview.note_bank(bot_id, curr, init)
                     tab = self.bot_tabs.get(bot_id)
                     if tab:
                         tab.update_bank_ui(stats)
@@ -1447,23 +1458,19 @@ class BotManagerApp:
                 except Exception:
                     pass
 
-            processed += 1
 
         self._check_global_limits()
+        now = time.monotonic()
+        if now - self._fleet_stats_t >= self.fleet_stats_every_s:
+            self._fleet_stats_t = now
+            self._update_fleet_stats_label()
+        if self.ui_queue.ticks % 10 == 0:
+            self.queue_label.config(text=self.ui_queue.describe())
         self.root.after(self.ui_poll_ms, self._process_ui_queue)
 
     def _aggregate_initial_and_current(self):
         with self.lock:
-            total_current = Decimal("0")
-            total_initial = Decimal("0")
-            for v in self.all_banks.values():
-                curr = safe_decimal(v.get("current_bank"))
-                init = safe_decimal(v.get("initial_bank"))
-                if init <= 0:
-                    init = curr
-                total_current += curr
-                total_initial += init
-        return total_initial, total_current
+            return self.all_banks.initial_and_current()
 
     def _parse_percent(self, s: str) -> Optional[Decimal]:
         try:
@@ -1504,7 +1511,7 @@ class BotManagerApp:
     def _trigger_global_stop(self, kind: str, growth: Decimal, limit: Decimal):
         self.global_stop_fired = True
         msg = f"[Manager] Global {kind} triggered: growth={growth:.2f}% limit={limit:.2f}% → STOP ALL"
-        print(msg)
+        console().emit(msg)
         try:
             messagebox.showinfo("Global limit", msg)
         except Exception:
@@ -1521,6 +1528,40 @@ class BotManagerApp:
         except:
             pass
 
+    def fleet_path_stats(self):
+        """Слить последние снимки скетчей ботов в перцентили флота."""
+        if PathStats is None:
+            return None
+        with self.lock:
+            items = list(self.bot_path_stats.values())
+        if not items:
+            return None
+        return PathStats.merged(items)
+
+    def _update_fleet_stats_label(self):
+        try:
+            ps = self.fleet_path_stats()
+            if ps is None:
+                return
+            self.fleet_stats_label.config(text=f"Fleet ({len(self.bot_path_stats)} bots, {ps.balance.n} spins): {ps.format()}")
+        except Exception:
+            pass
+
+    def open_chart(self):
+        if open_balance_chart is None or self.balance_history is None:
+            messagebox.showinfo("Chart", "Графики недоступны (нет crypto_games_charts)")
+            return
+        try:
+            if self.chart_win is not None and self.chart_win.winfo_exists():
+                self.chart_win.lift()
+                return
+        except Exception:
+            pass
+        try:
+            self.chart_win = open_balance_chart(self.root, self.balance_history, title="Balance — fleet")
+        except Exception as e:
+            messagebox.showerror("Chart", f"Не удалось открыть график: {e}")
+
     def stop_all_bots(self):
         with self.lock:
             bots = list(self.active_bots.values())
@@ -1529,7 +1570,7 @@ class BotManagerApp:
                 b.stop()
             except Exception:
                 pass
-        print("All bots stop requested")
+        console().emit("All bots stop requested")
 
     def start_all_bots(self):
         for tab in list(self.bot_tabs.values()):
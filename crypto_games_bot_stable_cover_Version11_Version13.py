@@ -11,15 +11,36 @@ from tkinter import ttk, messagebox, scrolledtext
 import threading
 import time
 import random
-import string
-import requests
 import os
 import traceback
 import queue
-from collections import deque
 from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from decimal import Decimal, getcontext, ROUND_DOWN, InvalidOperation
+from decimal import Decimal, getcontext, InvalidOperation
+
+from crypto_games_engine import APIClient, LinearPayoutStrategy, quantize_bet, safe_decimal
+from crypto_games_betlog import BetLogBuffer
+from crypto_games_uiqueue import UIEventQueue
+from crypto_games_fleet import FleetBanks
+from crypto_games_overview import FleetOverview, LazyBotTab
+from crypto_games_filelog import file_logger
+from crypto_games_console import console
+from crypto_games_journal import bot_mode, open_journal
+from crypto_games_spindb import record_event
+from crypto_games_anomaly import SpinMonitor
+
+try:
+    # Полная история лога: индекс на диске + виртуальный список (опционально)
+    from crypto_games_logview import open_log_history
+except Exception:
+    open_log_history = None
+
+try:
+    # Графики баланса ботов и флота (опционально)
+    from crypto_games_charts import FleetBalanceHistory, open_balance_chart
+except Exception:
+    FleetBalanceHistory = None
+    open_balance_chart = None
 
 getcontext().prec = 40
 
@@ -37,74 +58,8 @@ class BetConfig:
     min_bet_refresh_secs: int = 30
     target_min_bets_on_win: int = 10
 
-MIN_API_CHANCE = Decimal("0.01")
-MAX_API_CHANCE = Decimal("9920")
-
-class APIClient:
-    def __init__(self, api_base: str = API_BASE, timeout: int = 15):
-        self.base = api_base.rstrip("/")
-        self.timeout = timeout
-        self.session = requests.Session()
-        self.session.headers.update({
-            "User-Agent": "CryptoGamesBot/1.0",
-            "Content-Type": "application/json",
-            "Accept": "application/json",
-        })
-
-    def _get(self, path: str):
-        url = f"{self.base}{path}"
-        try:
-            r = self.session.get(url, timeout=self.timeout)
-            r.raise_for_status()
-            return r.json()
-        except requests.RequestException as e:
-            try:
-                return {"error": r.json()}
-            except Exception:
-                return {"error": str(e)}
-
-    def _post(self, path: str, payload: dict):
-        url = f"{self.base}{path}"
-        try:
-            r = self.session.post(url, json=payload, timeout=self.timeout)
-            r.raise_for_status()
-            return r.json()
-        except requests.RequestException as e:
-            try:
-                return {"error": r.json()}
-            except Exception:
-                return {"error": str(e)}
-
-    def settings(self, coin: str):
-        return self._get(f"/settings/{coin}")
-
-    def balance(self, coin: str, key: str):
-        return self._get(f"/balance/{coin}/{key}")
-
-    def user(self, coin: str, key: str):
-        return self._get(f"/user/{coin}/{key}")
-
-    def placebet(self, coin: str, key: str, bet_amount, payout, underover_bool, client_seed):
-        payload = {"Bet": float(bet_amount), "Payout": float(payout), "UnderOver": bool(underover_bool), "ClientSeed": client_seed}
-        return self._post(f"/placebet/{coin}/{key}", payload)
-
-    def generate_client_seed(self) -> str:
-        return ''.join(random.choice(string.ascii_letters + string.digits) for _ in range(16))
-
-def quantize_bet(bet: Decimal, max_scale=8):
-    q = Decimal(1).scaleb(-max_scale)
-    try:
-        return bet.quantize(q, rounding=ROUND_DOWN)
-    except Exception:
-        return bet
 
-def safe_decimal(val, default="0"):
-    if val is None:
-        return Decimal(default)
-    try:
-        return Decimal(str(val))
-    except Exception:
-        return Decimal(default)
+# APIClient, quantize_bet, safe_decimal, LinearPayoutStrategy — общее ядро в crypto_games_engine
 
 def compute_bet_for_target_profit(
     payout: Decimal,
@@ -149,22 +104,6 @@ def compute_bet_for_target_profit(
         bet = Decimal("0.00000001")
     return quantize_bet(bet)
 
-class LinearPayoutStrategy:
-    def __init__(self, start_payout=Decimal("1000"), max_payout=MAX_PAYOUT_DEFAULT):
-        self.start_payout = Decimal(start_payout)
-        self.max_payout = Decimal(max_payout)
-        self.current_payout = Decimal(start_payout)
-
-    def reset(self):
-        self.current_payout = Decimal(self.start_payout)
-
-    def next_payout(self):
-        payout = self.current_payout
-        nxt = payout + Decimal(1)
-        if nxt > self.max_payout:
-            nxt = Decimal(self.start_payout)
-        self.current_payout = nxt
-        return payout
 
 class CryptoGamesBot:
     def __init__(self, bot_id: str, api: APIClient, config: BetConfig,
@@ -197,6 +136,8 @@ class CryptoGamesBot:
         self.payout_wraps = 0
         self._prev_payout = None
         self.manager_ref = None
+        self.journal = None                 # SpinJournal (logs/<bot>.cgj), подключает BotTab
+        self.monitor = SpinMonitor(bot_id)  # онлайн-инварианты спина (crypto_games_anomaly)
 
         self.house_edge_frac = Decimal("0")
 
@@ -281,6 +222,7 @@ class CryptoGamesBot:
 
     def restart_after_tp(self, new_initial: Decimal):
         self.initial_bank = safe_decimal(new_initial)
+        record_event(self.bot_id, "tp_restart", f"new_initial={self.initial_bank:.8f}", self.initial_bank)
         self.last_successful_bank = self.initial_bank
         self.profit_global = Decimal("0")
         self.reset_stats()
@@ -292,15 +234,11 @@ class CryptoGamesBot:
         self._log(f"▶ TP restart initial={self._fmt_money(self.initial_bank)}")
 
     def _log(self, msg):
-        ts = time.strftime("%H:%M:%S")
-        try:
-            print(f"{ts} [{self.bot_id}] {msg}")
-        except Exception:
-            pass
+        # в консоль строку выводит BotTab.log (через неблокирующий console()); здесь — только если UI недоступен
         try:
             self.log_cb(msg)
         except Exception:
-            pass
+            console().emit(f"{time.strftime('%H:%M:%S')} [{self.bot_id}] {msg}")
 
     def _push_bank_payload(self, bal: Decimal):
         if self.initial_bank is None:
@@ -438,6 +376,7 @@ class CryptoGamesBot:
         if self.periodic_recovery_active and self.loss_total >= self.recovery_stop_loss_usdt:
             self._stop_periodic_recovery("STOP-LOSS reached")
             self.base_post_sl_lock = True
+            record_event(self.bot_id, "recovery_sl", f"loss_total={self.loss_total}")
             self._log(f"[EVENT] STOP-LOSS достигнут: loss_total={self._fmt_money(self.loss_total)} → Base без сброса убытка; post-SL lock ON")
 
     def _check_global_stop_loss(self):
@@ -447,6 +386,7 @@ class CryptoGamesBot:
             self.cycle_loss = Decimal("0")
             self._global_sl_active = True
             self.paused = True
+            record_event(self.bot_id, "global_sl", "loss_total reset, pause 10m")
             self._log(f"[EVENT] GLOBAL STOP-LOSS: loss_total сброшен → пауза 10 минут, затем авто-продолжение")
             try:
                 if self.manager_ref and hasattr(self.manager_ref, "schedule_bot_pause"):
@@ -515,15 +455,6 @@ class CryptoGamesBot:
                     pass
             self._prev_payout = payout
 
-            try:
-                chance_decimal = (Decimal("100") / payout)
-            except Exception:
-                chance_decimal = Decimal("99.99")
-            if chance_decimal < MIN_API_CHANCE:
-                chance_decimal = MIN_API_CHANCE
-            if chance_decimal > MAX_API_CHANCE:
-                chance_decimal = MAX_API_CHANCE
-
             in_recover66 = False
             in_periodic = False
 
@@ -591,6 +522,9 @@ class CryptoGamesBot:
             roll_val = res.get("Roll", None)
             roll_str = self._fmt_roll(roll_val) if roll_val is not None else "n/a"
             win = profit > 0
+            if self.journal is not None:
+                self.journal.append(payout, roll_val, bet, profit, new_balance, mode=bot_mode(self))
+            self.monitor.check(self, res, payout, bet, profit, new_balance, win)
 
             if win:
                 prev_cycle_loss = self.cycle_loss
@@ -722,6 +656,7 @@ class CryptoGamesBot:
             if self.spin_count % 5 == 0:
                 try:
                     self.client_seed = self.api.generate_client_seed()
+                    self.monitor.note_seed(self.client_seed)
                     self._log(f"[SEED] New client seed set after {self.spin_count} spins: {self.client_seed}")
                 except Exception as e:
                     self._log(f"[SEED] Error generating new seed: {e}")
@@ -809,6 +744,8 @@ class BotTab:
         self.pause_btn.pack(in_=btnf, side="left", padx=4)
         self.stop_btn.pack(in_=btnf, side="left", padx=4)
         self.seed_btn.pack(in_=btnf, side="left", padx=4)
+        self.history_btn = ttk.Button(left, text="History", command=self.open_history)
+        self.history_btn.pack(in_=btnf, side="left", padx=4)
 
         self.coin_box.set("USDT")
         self.bet_entry.insert(0, "0.001")
@@ -844,7 +781,7 @@ class BotTab:
         self.log_text.tag_config("win", foreground="green")
         self.log_text.tag_config("loss", foreground="red")
         self.log_text.tag_config("info", foreground="blue")
-        self._bet_lines = deque(maxlen=200)
+        self.bet_log = BetLogBuffer(self.log_text, maxlen=200)
 
         os.makedirs("logs", exist_ok=True)
         safe_name = self.bot_name.replace("/", "_").replace("\\", "_")
@@ -854,26 +791,12 @@ class BotTab:
         self.bot_thread = None
 
     def _file_log(self, msg: str):
+        # запись — только постановка в очередь; файл пишет фоновый поток (crypto_games_filelog)
         try:
             ts = time.strftime("%Y-%m-%d %H:%M:%S")
-            with open(self.log_file_path, "a", encoding="utf-8") as f:
-                f.write(f"{ts} {msg}\n")
+            file_logger().write(self.log_file_path, f"{ts} {msg}\n")
         except Exception as e:
-            print(f"[{self.bot_name}] File log error: {e}")
-
-    def _render_bet_log(self):
-        try:
-            self.log_text.configure(state="normal")
-            self.log_text.delete("1.0", "end")
-            for line, tag in self._bet_lines:
-                if tag:
-                    self.log_text.insert("end", line + "\n", tag)
-                else:
-                    self.log_text.insert("end", line + "\n")
-            self.log_text.see("end")
-            self.log_text.configure(state="normal")
-        except Exception as e:
-            print(f"[{self.bot_name}] UI log render error: {e}")
+            console().emit(f"[{self.bot_name}] File log error: {e}")
 
     def log_bet(self, raw_line: str):
         ll = raw_line.lower()
@@ -882,13 +805,12 @@ class BotTab:
             tag = "win"
         elif ll.startswith("[loss"):
             tag = "loss"
-        self._bet_lines.append((raw_line, tag))
-        self._render_bet_log()
+        self.bet_log.append(raw_line, tag)
 
     def log(self, msg):
         ts = time.strftime("%H:%M:%S")
         line = f"{ts} [{self.bot_name}] {msg}"
-        print(line)
+        console().emit(line)
         self._file_log(f"[{self.bot_name}] {msg}")
         self.log_bet(msg)
 
@@ -1031,8 +953,13 @@ class BotTab:
             seed = self.seed_entry.get().strip()
             if seed:
                 self.bot.client_seed = seed
+                self.bot.monitor.note_seed(seed)
 
             self.bot.manager_ref = self.manager
+            try:
+                self.bot.journal = open_journal(self.log_file_path)
+            except Exception as e:
+                self.log(f"[{self.bot_name}] journal disabled: {e}")
 
             self.start_btn.config(state="disabled")
             self.pause_btn.config(state="normal")
@@ -1071,6 +998,15 @@ class BotTab:
         self.seed_entry.insert(0, seed)
         self.manager.enqueue(('log', self.bot_name, f"Client seed: {seed}"))
 
+    def open_history(self):
+        if open_log_history is None:
+            messagebox.showinfo("History", f"Лог бота: {os.path.abspath(self.log_file_path)}")
+            return
+        try:
+            open_log_history(self.frame, self.log_file_path, title=f"History — {self.bot_name}")
+        except Exception as e:
+            messagebox.showerror("History", f"Не удалось открыть лог: {e}")
+
     def _on_pause_on_fail_toggled(self):
         val = bool(self.pause_on_fail_var.get())
         if self.bot:
@@ -1131,9 +1067,11 @@ class BotManagerApp:
         self.root.geometry("1260x880")
         self.bot_tabs = {}
         self.active_bots = {}
-        self.all_banks = {}
+        self.all_banks = FleetBanks()
+        self.balance_history = FleetBalanceHistory() if FleetBalanceHistory is not None else None
+        self.chart_win = None
         self.lock = threading.Lock()
-        self.ui_queue = queue.Queue()
+        self.ui_queue = UIEventQueue()
         max_workers = min(32, (os.cpu_count() or 4) * 5)
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
         self.global_take_profit_enabled = tk.BooleanVar(value=False)
@@ -1150,22 +1088,62 @@ class BotManagerApp:
         self.agg_label = ttk.Label(top, text="Aggregate: Current=0.00000000 Profit=+0.00000000")
         self.agg_label.pack(side="left", padx=(4, 20))
         ttk.Button(top, text="New Bot", command=self.new_bot_tab).pack(side="left")
+        self.add_count_var = tk.StringVar(value="10")
+        ttk.Spinbox(top, from_=1, to=500, increment=1, width=4, textvariable=self.add_count_var).pack(side="left", padx=(6, 2))
+        ttk.Button(top, text="Add bots", command=self.add_bot_rows).pack(side="left")
+        self.queue_label = ttk.Label(top, text="")
+        self.queue_label.pack(side="right", padx=6)
         ttk.Button(top, text="Start All", command=self.start_all_bots).pack(side="left", padx=6)
         ttk.Button(top, text="Stop All", command=self.stop_all_bots).pack(side="left", padx=6)
+        ttk.Button(top, text="Chart", command=self.open_chart).pack(side="left", padx=6)
         ttk.Label(top, text="Global TP %:").pack(side="left", padx=(16, 4))
         ttk.Entry(top, textvariable=self.global_take_profit_percent_var, width=6).pack(side="left", padx=2)
         ttk.Checkbutton(top, text="Enable Global TP %", variable=self.global_take_profit_enabled,
                         command=self._on_global_tp_toggle).pack(side="left", padx=6)
         self.bot_notebook = ttk.Notebook(self.root); self.bot_notebook.pack(fill="both", expand=True, padx=6, pady=(0, 6))
+        self.overview = FleetOverview(self.bot_notebook, on_open=self.open_bot_tab, status_fn=self._bot_status)
+        self.bot_notebook.add(self.overview, text="Fleet")
 
     def _on_global_tp_toggle(self):
         self.check_global_take_profit(force=True)
 
     def new_bot_tab(self):
+        tab = self.add_bot_row()
+        self.open_bot_tab(tab.bot_name)
+
+    def add_bot_row(self):
+        """Строка в обзоре флота; сама вкладка BotTab строится при первом открытии."""
         idx = len(self.bot_tabs) + 1
-        tab = BotTab(self.bot_notebook, self, idx)
+        tab = LazyBotTab(self.bot_notebook, lambda nb, idx=idx: BotTab(nb, self, idx), f"Bot-{idx}")
         self.bot_tabs[tab.bot_name] = tab
-        self.bot_notebook.select(tab.frame)
+        self.overview.add_bot(tab.bot_name)
+        return tab
+
+    def add_bot_rows(self):
+        try:
+            n = int(str(self.add_count_var.get()).strip())
+        except Exception:
+            n = 1
+        for _ in range(max(1, min(n, 500))):
+            self.add_bot_row()
+
+    def open_bot_tab(self, bot_id):
+        tab = self.bot_tabs.get(bot_id)
+        if tab is None:
+            return
+        try:
+            self.bot_notebook.select(tab.frame)
+        except Exception as e:
+            console().emit(f"[Manager] open tab error: {e}")
+
+    def _bot_status(self, bot_id) -> str:
+        tab = self.bot_tabs.get(bot_id)
+        bot = getattr(tab, "bot", None) if tab is not None else None
+        if bot is None:
+            return "idle" if getattr(tab, "built", True) else "new"
+        if not getattr(bot, "is_running", False):
+            return "stopped"
+        return "paused" if getattr(bot, "paused", False) else "running"
 
     def register_bot(self, bot: CryptoGamesBot, bottab: BotTab):
         with self.lock:
@@ -1190,14 +1168,10 @@ class BotManagerApp:
             pass
 
     def _process_ui_queue(self):
-        processed = 0
         max_per_cycle = 600
-        while processed < max_per_cycle:
-            try:
-                typ, bot_id, payload = self.ui_queue.get_nowait()
-            except queue.Empty:
-                break
+        for typ, bot_id, payload in self.ui_queue.drain(max_per_cycle):
             if typ == 'log':
+                self.overview.note_line(bot_id, payload)
                 tab = self.bot_tabs.get(bot_id)
                 if tab:
                     try:
@@ -1205,7 +1179,7 @@ class BotManagerApp:
                     except Exception:
                         pass
             elif typ == 'trace':
-                print(payload)
+                console().emit(str(payload), force=True)
             elif typ == 'bank':
                 stats = payload
                 try:
@@ -1216,20 +1190,24 @@ class BotManagerApp:
                         init = curr
                     with self.lock:
                         self.all_banks[bot_id] = {"current_bank": curr, "profit_global": prof, "initial_bank": init}
+                        if self.balance_history is not None:
+                            self.balance_history.add(bot_id, curr, self.all_banks.total_current)
+                        self.overview.note_bank(bot_id, curr, init)
                     tab = self.bot_tabs.get(bot_id)
                     if tab:
                         tab.update_bank_ui(stats)
                     self._update_aggregate_label()
                 except Exception:
                     pass
-            processed += 1
         self.check_global_take_profit()
+        if self.ui_queue.ticks % 10 == 0:
+            self.queue_label.config(text=self.ui_queue.describe())
         self.root.after(self.ui_poll_ms, self._process_ui_queue)
 
     def _update_aggregate_label(self):
         with self.lock:
-            total_current = sum(safe_decimal(v.get("current_bank")) for v in self.all_banks.values()) if self.all_banks else Decimal("0")
-            total_profit = sum(safe_decimal(v.get("profit_global")) for v in self.all_banks.values()) if self.all_banks else Decimal("0")
+            total_current = self.all_banks.total_current
+            total_profit = self.all_banks.total_profit
         sign = "+" if total_profit >= 0 else ""
         col = "darkgreen" if total_profit >= 0 else "red"
         try:
@@ -1239,16 +1217,7 @@ class BotManagerApp:
 
     def _aggregate_initial_and_current(self):
         with self.lock:
-            total_current = Decimal("0")
-            total_initial = Decimal("0")
-            for v in self.all_banks.values():
-                curr = safe_decimal(v.get("current_bank"))
-                init = safe_decimal(v.get("initial_bank"))
-                if init <= 0:
-                    init = curr
-                total_current += curr
-                total_initial += init
-        return total_initial, total_current
+            return self.all_banks.initial_and_current()
 
     def _parse_tp_percent(self):
         try:
@@ -1276,7 +1245,8 @@ class BotManagerApp:
     def _trigger_global_tp(self, total_current: Decimal, total_initial: Decimal, tp_percent: Decimal):
         self.global_tp_active = True
         growth = (total_current - total_initial) * Decimal("100") / total_initial
-        print(f"[Manager] Global TP triggered: growth={growth:.2f}% target={tp_percent:.2f}% pause 5s")
+        record_event("*", "global_tp", f"growth={growth:.2f}% target={tp_percent:.2f}%", total_current)
+        console().emit(f"[Manager] Global TP triggered: growth={growth:.2f}% target={tp_percent:.2f}% pause 5s")
         with self.lock:
             self.tp_new_initials = {}
             for bot_id, rec in self.all_banks.items():
@@ -1300,7 +1270,7 @@ class BotManagerApp:
                 bot.paused = False
             self.global_tp_active = False
             self.tp_new_initials = {}
-        print("[Manager] Global TP resume done")
+        console().emit("[Manager] Global TP resume done")
 
     def schedule_bot_pause(self, bot: CryptoGamesBot, seconds: int | None, reason: str = ""):
         """
@@ -1318,7 +1288,22 @@ class BotManagerApp:
                 self.root.after(int(seconds * 1000), _resume)
             # seconds=None — остаётся на паузе до ручного Resume
         except Exception as e:
-            print(f"[Manager] schedule_bot_pause error: {e}")
+            console().emit(f"[Manager] schedule_bot_pause error: {e}")
+
+    def open_chart(self):
+        if open_balance_chart is None or self.balance_history is None:
+            messagebox.showinfo("Chart", "Графики недоступны (нет crypto_games_charts)")
+            return
+        try:
+            if self.chart_win is not None and self.chart_win.winfo_exists():
+                self.chart_win.lift()
+                return
+        except Exception:
+            pass
+        try:
+            self.chart_win = open_balance_chart(self.root, self.balance_history, title="Balance — fleet")
+        except Exception as e:
+            messagebox.showerror("Chart", f"Не удалось открыть график: {e}")
 
     def stop_all_bots(self):
         with self.lock:
@@ -1328,7 +1313,7 @@ class BotManagerApp:
                 b.stop()
             except Exception:
                 pass
-        print("All bots stop requested")
+        console().emit("All bots stop requested")
 
     def start_all_bots(self):
         for tab in list(self.bot_tabs.values()):
@@ -0,0 +1,389 @@
+#!/usr/bin/env python3
+# Crypto.Games — графики баланса ботов и флота: многоуровневые бакеты + LTTB-прореживание
+#
+# Зачем:
+# - Сессии в сотни тысяч спинов: рисовать каждую точку — смерть для Tk, хранить каждую — память без предела.
+# - BalanceSeries: несколько уровней разрешения (1 с, 10 с, 1 мин, 10 мин, 1 ч); в каждом уровне
+#   не больше LEVEL_CAP бакетов (min / max / last с моментами), т.е. память на бота ограничена,
+#   а давняя история остаётся в грубых уровнях.
+# - points(): берётся самый мелкий уровень, который ещё покрывает окно и даёт не больше ~ширины
+#   экрана бакетов; min и max бакета сохраняются — провалы не теряются при прореживании.
+# - lttb(): Largest-Triangle-Three-Buckets до ширины Canvas в пикселях.
+# - FleetBalanceHistory: серия на бота + серия суммарного баланса флота; кормится снимками 'bank'
+#   из _process_ui_queue, сама ничего не рисует.
+# - BalanceChart (Toplevel): перерисовка только по таймеру и только если пришли новые данные
+#   или изменился размер окна.
+#
+# Запуск: python crypto_games_charts.py --demo 300000
+
+import argparse
+import math
+import random
+import time
+from collections import OrderedDict, deque
+from typing import Optional
+
+try:
+    import tkinter as tk
+    from tkinter import ttk
+except Exception:
+    tk = None
+    ttk = None
+
+LEVELS = (1.0, 10.0, 60.0, 600.0, 3600.0)   # ширина бакета, с
+LEVEL_CAP = 512                             # бакетов на уровень: ~8.5 мин по 1 с … ~21 дня по 1 ч
+MAX_SERIES = 64                             # ботов в истории; дольше всех молчащий вытесняется
+AGGREGATE = "Σ fleet"
+
+# бакет: (t0, min, t_min, max, t_max, last, t_last)
+_T0, _MN, _TMN, _MX, _TMX, _LAST, _TLAST = range(7)
+
+
+class BalanceSeries:
+    """Ряд (t, value) в нескольких разрешениях; память — len(levels) × cap бакетов."""
+    def __init__(self, levels=LEVELS, cap: int = LEVEL_CAP):
+        self.levels = tuple(float(w) for w in levels)
+        self.cap = max(2, int(cap))
+        self._closed = [deque(maxlen=self.cap) for _ in self.levels]
+        self._open = [None] * len(self.levels)
+        self.count = 0
+        self.t_first = None
+        self.t_last = None
+        self.last = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def add(self, t: float, value):
+        v = float(value)
+        if self.t_last is not None and t < self.t_last:
+            t = self.t_last                     # часы не идут назад
+        for i, w in enumerate(self.levels):
+            b = self._open[i]
+            t0 = math.floor(t / w) * w
+            if b is None or t0 != b[_T0]:
+                if b is not None:
+                    self._closed[i].append(tuple(b))
+                self._open[i] = [t0, v, t, v, t, v, t]
+            else:
+                if v < b[_MN]:
+                    b[_MN] = v
+                    b[_TMN] = t
+                if v > b[_MX]:
+                    b[_MX] = v
+                    b[_TMX] = t
+                b[_LAST] = v
+                b[_TLAST] = t
+        if self.t_first is None:
+            self.t_first = t
+        self.t_last = t
+        self.last = v
+        self.count += 1
+
+    def _oldest(self, i: int) -> float:
+        if self._closed[i]:
+            return self._closed[i][0][_T0]
+        b = self._open[i]
+        return b[_T0] if b is not None else math.inf
+
+    def pick_level(self, t_from: float, t_to: float, max_buckets: int) -> int:
+        """Самый мелкий уровень, покрывающий [t_from, t_to] не более чем max_buckets бакетами."""
+        start = max(t_from, self.t_first if self.t_first is not None else t_from)
+        for i, w in enumerate(self.levels):
+            if self._oldest(i) <= start and (t_to - start) / w <= max_buckets:
+                return i
+        return len(self.levels) - 1
+
+    def buckets(self, level: int, t_from: float = -math.inf, t_to: float = math.inf):
+        w = self.levels[level]
+        for b in self._closed[level]:
+            if b[_T0] + w >= t_from and b[_T0] <= t_to:
+                yield b
+        b = self._open[level]
+        if b is not None and b[_T0] + w >= t_from and b[_T0] <= t_to:
+            yield tuple(b)
+
+    def points(self, t_from: float, t_to: float, max_buckets: int = 1000) -> list:
+        """[(t, v)] в окне: для каждого бакета min, max и last в порядке времени."""
+        if self.count == 0:
+            return []
+        level = self.pick_level(t_from, t_to, max_buckets)
+        pts = []
+        for b in self.buckets(level, t_from, t_to):
+            trio = sorted({(b[_TMN], b[_MN]), (b[_TMX], b[_MX]), (b[_TLAST], b[_LAST])})
+            pts.extend(trio)
+        return pts
+
+    def memory_buckets(self) -> int:
+        return sum(len(d) for d in self._closed) + sum(1 for b in self._open if b is not None)
+
+
+def lttb(points: list, threshold: int) -> list:
+    """Largest-Triangle-Three-Buckets: threshold точек, сохраняющих форму ряда."""
+    n = len(points)
+    if threshold >= n or threshold < 3:
+        return list(points)
+    out = [points[0]]
+    every = (n - 2) / (threshold - 2)
+    a = 0
+    for i in range(threshold - 2):
+        r0 = int(i * every) + 1
+        r1 = int((i + 1) * every) + 1
+        n0 = r1
+        n1 = min(int((i + 2) * every) + 1, n)
+        if n0 >= n1:
+            avg_t, avg_v = points[-1]
+        else:
+            cnt = n1 - n0
+            avg_t = sum(p[0] for p in points[n0:n1]) / cnt
+            avg_v = sum(p[1] for p in points[n0:n1]) / cnt
+        at, av = points[a]
+        best = -1.0
+        best_j = r0
+        for j in range(r0, min(r1, n - 1)):
+            pt, pv = points[j]
+            area = abs((at - avg_t) * (pv - av) - (at - pt) * (avg_v - av))
+            if area > best:
+                best = area
+                best_j = j
+        out.append(points[best_j])
+        a = best_j
+    out.append(points[-1])
+    return out
+
+
+class FleetBalanceHistory:
+    """Ряды баланса по ботам + суммарный; add() — из UI-потока на каждый снимок 'bank'."""
+    def __init__(self, levels=LEVELS, cap: int = LEVEL_CAP, max_series: int = MAX_SERIES, clock=time.monotonic):
+        self.levels = levels
+        self.cap = cap
+        self.max_series = max(1, int(max_series))
+        self.clock = clock
+        self.t0 = clock()
+        self.series = OrderedDict()             # bot_id → BalanceSeries, порядок — давность обновления
+        self.aggregate = BalanceSeries(levels, cap)
+        self.version = 0                        # растёт на каждый add — для «есть ли что перерисовать»
+        self.evicted = 0
+
+    def now(self) -> float:
+        return self.clock() - self.t0
+
+    def add(self, bot_id, value, total=None, t: Optional[float] = None):
+        t = self.now() if t is None else t
+        s = self.series.get(bot_id)
+        if s is None:
+            s = self.series[bot_id] = BalanceSeries(self.levels, self.cap)
+            while len(self.series) > self.max_series:
+                self.series.popitem(last=False)
+                self.evicted += 1
+        else:
+            self.series.move_to_end(bot_id)
+        s.add(t, value)
+        if total is not None:
+            self.aggregate.add(t, total)
+        self.version += 1
+
+    def bot_ids(self) -> list:
+        return sorted(self.series.keys(), key=str)
+
+    def get(self, bot_id) -> Optional[BalanceSeries]:
+        if bot_id == AGGREGATE:
+            return self.aggregate
+        return self.series.get(bot_id)
+
+
+def _fmt_elapsed(sec: float) -> str:
+    sec = int(max(0, sec))
+    h, rem = divmod(sec, 3600)
+    m, s = divmod(rem, 60)
+    return f"{h}:{m:02d}:{s:02d}" if h else f"{m}:{s:02d}"
+
+
+# ------------------ Tk chart ------------------
+if tk is not None:
+    class BalanceChart(tk.Toplevel):
+        """Окно графиков: сверху — суммарный баланс флота, снизу — боты (у каждой панели своя шкала)."""
+        REDRAW_MS = 1000
+        WINDOWS = (("10m", 600.0), ("1h", 3600.0), ("6h", 21600.0), ("24h", 86400.0), ("All", None))
+        COLORS = ("#1f77b4", "#ff7f0e", "#2ca02c", "#d62728", "#9467bd", "#8c564b",
+                  "#e377c2", "#7f7f7f", "#bcbd22", "#17becf")
+        PAD = 48
+
+        def __init__(self, master, history: FleetBalanceHistory, title: str = ""):
+            super().__init__(master)
+            self.title(title or "Balance chart")
+            self.geometry("900x560")
+            self.history = history
+            self._drawn = None
+            self._after = None
+
+            bar = ttk.Frame(self)
+            bar.pack(fill="x", padx=4, pady=2)
+            ttk.Label(bar, text="Window").pack(side="left")
+            self.window_box = ttk.Combobox(bar, width=6, state="readonly", values=[w for w, _ in self.WINDOWS])
+            self.window_box.set("1h")
+            self.window_box.pack(side="left", padx=4)
+            self.window_box.bind("<<ComboboxSelected>>", lambda e: self.invalidate())
+            self.fleet_var = tk.BooleanVar(value=True)
+            self.bots_var = tk.BooleanVar(value=True)
+            ttk.Checkbutton(bar, text="Fleet", variable=self.fleet_var, command=self.invalidate).pack(side="left", padx=4)
+            ttk.Checkbutton(bar, text="Bots", variable=self.bots_var, command=self.invalidate).pack(side="left", padx=4)
+            self.status = ttk.Label(bar, text="")
+            self.status.pack(side="right")
+
+            self.canvas = tk.Canvas(self, background="white", highlightthickness=0)
+            self.canvas.pack(fill="both", expand=True)
+            self.canvas.bind("<Configure>", lambda e: self.invalidate())
+            self.protocol("WM_DELETE_WINDOW", self.close)
+            self._after = self.after(self.REDRAW_MS, self._tick)
+
+        def invalidate(self):
+            self._drawn = None
+
+        def _window(self):
+            sel = self.window_box.get()
+            for name, sec in self.WINDOWS:
+                if name == sel:
+                    return sec
+            return None
+
+        def _tick(self):
+            try:
+                w, h = self.canvas.winfo_width(), self.canvas.winfo_height()
+                key = (self.history.version, w, h)
+                if key != self._drawn and self.winfo_viewable():
+                    self.redraw(w, h)
+                    self._drawn = key
+            except Exception as e:
+                self.status.config(text=f"draw error: {e}")
+            self._after = self.after(self.REDRAW_MS, self._tick)
+
+        def _pane(self, series_list, x0, y0, x1, y1, t_from, t_to, label):
+            c = self.canvas
+            c.create_rectangle(x0, y0, x1, y1, outline="#cccccc")
+            c.create_text(x0 + 4, y0 + 2, text=label, anchor="nw", fill="#555555")
+            px = max(3, int(x1 - x0))
+            lines = []
+            lo, hi = math.inf, -math.inf
+            for name, s, color in series_list:
+                pts = lttb(s.points(t_from, t_to, max_buckets=px), px)
+                if not pts:
+                    continue
+                lines.append((name, pts, color))
+                for _, v in pts:
+                    lo = min(lo, v)
+                    hi = max(hi, v)
+            if not lines:
+                return 0
+            if hi - lo < 1e-12:
+                lo, hi = lo - 1e-8, hi + 1e-8
+            span_t = max(t_to - t_from, 1e-9)
+            sx = (x1 - x0) / span_t
+            sy = (y1 - y0 - 16) / (hi - lo)
+            c.create_text(x0 - 2, y0 + 14, text=f"{hi:.8f}".rstrip("0").rstrip("."), anchor="ne", fill="#555555")
+            c.create_text(x0 - 2, y1, text=f"{lo:.8f}".rstrip("0").rstrip("."), anchor="se", fill="#555555")
+            drawn = 0
+            for name, pts, color in lines:
+                coords = []
+                for t, v in pts:
+                    coords.append(x0 + (t - t_from) * sx)
+                    coords.append(y1 - (v - lo) * sy)
+                if len(coords) == 2:
+                    coords += [coords[0] + 1, coords[1]]
+                c.create_line(*coords, fill=color, width=1)
+                drawn += len(pts)
+            return drawn
+
+        def redraw(self, w: int, h: int):
+            c = self.canvas
+            c.delete("all")
+            hist = self.history
+            t_to = hist.now()
+            win = self._window()
+            t_from = max(0.0, t_to - win) if win else 0.0
+            x0, x1 = self.PAD + 40, max(self.PAD + 80, w - 10)
+            top, bottom = 10, max(60, h - 24)
+            show_fleet = self.fleet_var.get()
+            show_bots = self.bots_var.get() and len(hist.series) > 0
+            panes = []
+            if show_fleet:
+                panes.append("fleet")
+            if show_bots:
+                panes.append("bots")
+            drawn = 0
+            if panes:
+                split = top + (bottom - top) * (0.4 if len(panes) == 2 else 1.0)
+                y = top
+                for pane in panes:
+                    y_end = split if (pane == "fleet" and len(panes) == 2) else bottom
+                    if pane == "fleet":
+                        drawn += self._pane([(AGGREGATE, hist.aggregate, "black")],
+                                            x0, y, x1, y_end - 6, t_from, t_to, AGGREGATE)
+                    else:
+                        ids = hist.bot_ids()
+                        series = [(b, hist.series[b], self.COLORS[i % len(self.COLORS)]) for i, b in enumerate(ids)]
+                        drawn += self._pane(series, x0, y, x1, y_end, t_from, t_to, "Bots")
+                        lx = x0 + 50
+                        for b, _, color in series[:12]:
+                            c.create_text(lx, y + 2, text=str(b), anchor="nw", fill=color)
+                            lx += 8 * len(str(b)) + 14
+                    y = y_end + 6
+            c.create_text(x0, h - 4, text=_fmt_elapsed(t_from), anchor="sw", fill="#555555")
+            c.create_text(x1, h - 4, text=_fmt_elapsed(t_to), anchor="se", fill="#555555")
+            mem = hist.aggregate.memory_buckets() + sum(s.memory_buckets() for s in hist.series.values())
+            self.status.config(text=f"bots={len(hist.series)} points={drawn} buckets={mem}")
+
+        def close(self):
+            if self._after is not None:
+                try:
+                    self.after_cancel(self._after)
+                except Exception:
+                    pass
+            self.destroy()
+else:
+    BalanceChart = None
+
+
+def open_balance_chart(master, history: FleetBalanceHistory, title: str = ""):
+    """Открыть окно графиков (из BotManagerApp); None — нет Tk."""
+    if BalanceChart is None:
+        return None
+    return BalanceChart(master, history, title=title)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Balance chart demo / self-check")
+    ap.add_argument("--demo", type=int, default=100000, help="синтетических спинов на бота")
+    ap.add_argument("--bots", type=int, default=4)
+    ap.add_argument("--rate", type=float, default=50.0, help="снимков в секунду (синтетическое время)")
+    ap.add_argument("--gui", action="store_true")
+    args = ap.parse_args(argv)
+
+    rnd = random.Random(1)
+    t_sim = [0.0]
+    hist = FleetBalanceHistory(clock=lambda: t_sim[0])
+    banks = [100.0] * args.bots
+    started = time.perf_counter()
+    for k in range(args.demo):
+        t_sim[0] = k / args.rate
+        for b in range(args.bots):
+            banks[b] += rnd.gauss(0, 0.05)
+            hist.add(f"Bot-{b + 1}", banks[b], sum(banks))
+    dt = time.perf_counter() - started
+    n = args.demo * args.bots
+    s = hist.get(AGGREGATE)
+    pts = s.points(0, hist.now(), max_buckets=1000)
+    print(f"adds={n} in {dt:.2f}s ({n / max(dt, 1e-9):,.0f}/s) span={_fmt_elapsed(hist.now())}")
+    print(f"aggregate buckets={s.memory_buckets()} window points={len(pts)} lttb→{len(lttb(pts, 800))}")
+    if args.gui and tk is not None:
+        root = tk.Tk()
+        root.withdraw()
+        chart = open_balance_chart(root, hist, title="Balance chart (demo)")
+        chart.window_box.set("All")
+        chart.protocol("WM_DELETE_WINDOW", root.destroy)
+        root.mainloop()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
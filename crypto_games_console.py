@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+# Crypto.Games — неблокирующий вывод в консоль: off / all / выборка / ограничение скорости
+#
+# Зачем:
+# - CryptoGamesBot._log и BotTab.log печатали каждое сообщение через print, в части версий —
+#   оба, т.е. каждая строка дважды. Под IDLE (так запускаются боты) stdout — медленный RPC,
+#   и print в потоке бота тормозил сами спины.
+# - ConsoleSink.emit(line) — только добавление в ограниченную очередь; отдельный поток пишет
+#   в sys.stdout пачками (одна write + flush на пачку).
+# - Режим из переменной окружения CG_CONSOLE (или set_mode):
+#     off        — ничего не печатать;
+#     all        — всё (но всё равно без блокировки потоков);
+#     sample:N   — каждую N-ю строку;
+#     rate:N     — не больше N строк/с (token bucket), лишнее считается и раз в секунду
+#                  печатается «[console] suppressed K lines».
+#   По умолчанию — rate:100. emit(..., force=True) (трейсбеки) проходит в любом режиме, кроме off.
+# - При переполнении очереди (max_pending) старые строки выбрасываются со счётчиком.
+
+import atexit
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+DEFAULT_MODE = "rate:100"
+MAX_PENDING = 10000
+
+
+def parse_mode(spec: str):
+    """'rate:50' → ('rate', 50.0); неизвестное → режим по умолчанию."""
+    spec = (spec or "").strip().lower()
+    if spec in ("off", "none", "0"):
+        return "off", 0.0
+    if spec in ("all", "on", "1"):
+        return "all", 0.0
+    kind, _, arg = spec.partition(":")
+    if kind in ("sample", "rate"):
+        try:
+            val = float(arg)
+            if val > 0:
+                return kind, val
+        except ValueError:
+            pass
+    return "rate", 100.0                        # = DEFAULT_MODE
+
+
+class ConsoleSink:
+    def __init__(self, mode: str = None, max_pending: int = MAX_PENDING, stream=None):
+        self.stream = stream
+        self.max_pending = max(100, int(max_pending))
+        self._cond = threading.Condition(threading.Lock())
+        self._pending = deque()
+        self._seen = 0
+        self._tokens = 0.0
+        self._t_tokens = time.monotonic()
+        self._suppressed = 0                    # с прошлого отчёта
+        self._t_report = time.monotonic()
+        self.emitted = 0
+        self.suppressed = 0
+        self.dropped = 0
+        self.set_mode(mode if mode is not None else os.environ.get("CG_CONSOLE", DEFAULT_MODE))
+        self._thread = threading.Thread(target=self._run, name="console-sink", daemon=True)
+        self._thread.start()
+
+    def set_mode(self, spec: str):
+        kind, val = parse_mode(spec)
+        with self._cond:
+            self.kind, self.value = kind, val
+            self._tokens = val
+            self._t_tokens = time.monotonic()
+
+    @property
+    def mode(self) -> str:
+        return self.kind if self.kind in ("off", "all") else f"{self.kind}:{self.value:g}"
+
+    def _admit_locked(self) -> bool:
+        kind = self.kind
+        if kind == "all":
+            return True
+        if kind == "sample":
+            self._seen += 1
+            return self._seen % int(self.value) == 1 or self.value <= 1
+        # rate
+        now = time.monotonic()
+        self._tokens = min(self.value, self._tokens + (now - self._t_tokens) * self.value)
+        self._t_tokens = now
+        if self._tokens >= 1.0:
+            self._tokens -= 1.0
+            return True
+        return False
+
+    def emit(self, line: str, force: bool = False):
+        """Поставить строку в очередь вывода; никогда не ждёт терминал."""
+        if self.kind == "off":
+            return
+        with self._cond:
+            if not force and not self._admit_locked():
+                self._suppressed += 1
+                self.suppressed += 1
+                return
+            if len(self._pending) >= self.max_pending:
+                self._pending.popleft()
+                self.dropped += 1
+            self._pending.append(line)
+            self._cond.notify()
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {"mode": self.mode, "pending": len(self._pending), "emitted": self.emitted,
+                    "suppressed": self.suppressed, "dropped": self.dropped}
+
+    def _run(self):
+        while True:
+            with self._cond:
+                if not self._pending:
+                    self._cond.wait(1.0)
+                batch = list(self._pending)
+                self._pending.clear()
+                now = time.monotonic()
+                if self._suppressed and now - self._t_report >= 1.0:
+                    batch.append(f"[console] suppressed {self._suppressed} lines ({self.mode})")
+                    self._suppressed = 0
+                    self._t_report = now
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch):
+        stream = self.stream or sys.stdout
+        if stream is None:                      # pythonw: консоли нет
+            return
+        try:
+            stream.write("\n".join(batch) + "\n")
+            stream.flush()
+            self.emitted += len(batch)
+        except Exception:
+            pass
+
+    def drain(self, timeout: float = 2.0):
+        """Допечатать очередь (при выходе)."""
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            with self._cond:
+                if not self._pending:
+                    return
+                batch = list(self._pending)
+                self._pending.clear()
+            self._write(batch)
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def console() -> ConsoleSink:
+    """Общий вывод процесса; режим — CG_CONSOLE."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = ConsoleSink()
+                atexit.register(_default.drain)
+    return _default
@@ -0,0 +1,943 @@
+#!/usr/bin/env python3
+# Crypto.Games — общее ядро ботов: API-клиент, утилиты и стратегии-модули
+#
+# Зачем:
+# - В каждом crypto_games_bot_stable_*.py была своя копия APIClient, quantize_bet, safe_decimal,
+#   LinearPayoutStrategy, а стратегии (Cover50, Double-Press, Recovery с общим S_ref, периодический
+#   recovery, trigger) были вшиты в 300-строчные циклы start(). Любую правку приходилось переносить
+#   руками в каждый файл.
+# - Здесь ядро одно; стратегии — подключаемые модули с единым интерфейсом:
+#     plan(ctx, engine)          → SpinPlan (payout, bet, mode) или None, если модуль неактивен;
+#     observe(plan, ctx, result) → обновить своё состояние по итогу спина (вызывается у всех модулей).
+#   SpinEngine опрашивает модули по порядку (приоритет), базовый план — у LinearBase.
+# - PRESETS — наборы модулей, повторяющие стратегии GUI-вариантов ботов (набор → близкие файлы).
+#   Это модель для SIM/CLI, а не замена файлов: через SpinEngine крутится только
+#   crypto_games_bot_stable_100-9999_cover%$.py (ENGINE_BACKED); остальные GUI-файлы пока
+#   работают на своих циклах CryptoGamesBot.start().
+# - EngineBot — минимальный безголовый цикл над SpinEngine (CLI, SIM-клиент для прогона пресетов).
+#
+# Запуск: python crypto_games_engine.py --preset press_shared_recovery --sim --spins 2000
+
+import argparse
+import random
+import string
+import time
+from dataclasses import dataclass
+from decimal import Decimal, getcontext
+from typing import Optional
+
+from crypto_games_payouts import ArithmeticRange, RandomLadder, RECOVERY_LADDER
+from crypto_games_sizing import BetSizer, quantize_bet
+
+try:
+    import requests
+except Exception:  # SIM / анализ без сети
+    requests = None
+
+getcontext().prec = 40
+
+API_BASE = "https://api.crypto.games/v1"
+_ZERO = Decimal("0")
+_ONE = Decimal("1")
+_DEFAULT_MIN_BET = Decimal("0.001")
+
+
+# ------------------ API ------------------
+class APIClient:
+    def __init__(self, api_base: str = API_BASE, timeout: int = 15):
+        self.base = api_base.rstrip("/")
+        self.timeout = timeout
+        self.session = requests.Session()
+        self.session.headers.update({
+            "User-Agent": "CryptoGamesBot/1.0",
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        })
+
+    def _get(self, path: str):
+        url = f"{self.base}{path}"
+        try:
+            r = self.session.get(url, timeout=self.timeout)
+            r.raise_for_status()
+            return r.json()
+        except requests.RequestException as e:
+            try:
+                return {"error": r.json()}
+            except Exception:
+                return {"error": str(e)}
+
+    def _post(self, path: str, payload: dict):
+        url = f"{self.base}{path}"
+        try:
+            r = self.session.post(url, json=payload, timeout=self.timeout)
+            r.raise_for_status()
+            return r.json()
+        except requests.RequestException as e:
+            try:
+                return {"error": r.json()}
+            except Exception:
+                return {"error": str(e)}
+
+    def settings(self, coin: str):
+        return self._get(f"/settings/{coin}")
+
+    def balance(self, coin: str, key: str):
+        return self._get(f"/balance/{coin}/{key}")
+
+    def user(self, coin: str, key: str):
+        return self._get(f"/user/{coin}/{key}")
+
+    def placebet(self, coin: str, key: str, bet_amount, payout, underover_bool, client_seed):
+        payload = {"Bet": float(bet_amount), "Payout": float(payout), "UnderOver": bool(underover_bool), "ClientSeed": client_seed}
+        return self._post(f"/placebet/{coin}/{key}", payload)
+
+    def generate_client_seed(self) -> str:
+        return ''.join(random.choice(string.ascii_letters + string.digits) for _ in range(16))
+
+
+class SimAPIClient:
+    """
+    Офлайн-замена APIClient для EngineBot: Roll 0..99.99, WIN — roll в окне шанса
+    [100 − (100−edge)/payout, 100), как в crypto_games_sim; баланс ведётся локально. Ответы — в формате API (Balance / Profit / Roll / MinBet / Edge).
+    """
+    def __init__(self, balance="100", min_bet="0.00000001", edge_pct="1", seed: Optional[int] = None):
+        self.balance_value = Decimal(str(balance))
+        self.min_bet = Decimal(str(min_bet))
+        self.edge_pct = Decimal(str(edge_pct))
+        self._win_factor = 100.0 - float(self.edge_pct)
+        self.rng = random.Random(seed)
+
+    def settings(self, coin: str):
+        return {"MinBet": str(self.min_bet), "Edge": str(self.edge_pct)}
+
+    def balance(self, coin: str, key: str):
+        return {"Balance": str(self.balance_value)}
+
+    def user(self, coin: str, key: str):
+        return self.balance(coin, key)
+
+    def placebet(self, coin: str, key: str, bet_amount, payout, underover_bool, client_seed):
+        bet = quantize_bet(Decimal(str(bet_amount)))
+        payout = Decimal(str(payout))
+        if bet > self.balance_value:
+            return {"error": "insufficient balance"}
+        roll = self.rng.random() * 100.0
+        win = roll >= 100.0 - self._win_factor / float(payout)
+        roll = round(roll, 2)
+        profit = quantize_bet(bet * (payout - _ONE)) if win else -bet
+        self.balance_value += profit
+        return {"Balance": str(self.balance_value), "Profit": str(profit), "Roll": roll}
+
+    def generate_client_seed(self) -> str:
+        return ''.join(self.rng.choice(string.ascii_letters + string.digits) for _ in range(16))
+
+
+# ------------------ Utils ------------------
+def safe_decimal(val, default="0"):
+    if val is None:
+        return Decimal(default)
+    if isinstance(val, Decimal):
+        return val
+    try:
+        return Decimal(str(val))
+    except Exception:
+        return Decimal(default)
+
+
+# ------------------ Strategy (сканирование payout) ------------------
+class LinearPayoutStrategy:
+    """
+    Линейный скан start..max (+1 за спин, после max — снова start).
+    next_payout() — новый API, next_payout_and_bet(state) — прежний (payout, bet, 1, False).
+    """
+    def __init__(self, start_payout=Decimal("100"), max_payout=Decimal("9999")):
+        self.start_payout = Decimal(start_payout)
+        self.max_payout = Decimal(max_payout)
+        # start..max с шагом 1: элементы считаются по индексу, без новых Decimal на шаг
+        self.schedule = ArithmeticRange(self.start_payout, max(self.start_payout, self.max_payout), 1)
+        self.pos = 0
+
+    @property
+    def current_payout(self):
+        return self.schedule[self.pos]
+
+    def reset(self):
+        self.pos = 0
+
+    def next_payout(self):
+        payout = self.schedule[self.pos]
+        self.pos += 1
+        if self.pos >= len(self.schedule):
+            self.pos = 0
+        return payout
+
+    def next_payout_and_bet(self, state):
+        payout = self.next_payout()
+        bet = Decimal(state.get("min_bet", _DEFAULT_MIN_BET)) or _DEFAULT_MIN_BET
+        return payout, bet, 1, False
+
+
+# ------------------ Spin plan / context ------------------
+@dataclass
+class SpinPlan:
+    payout: Decimal
+    bet: Decimal
+    mode: str = "BASE"              # BASE / PRESS / RECOVERY / COVER50 / PERIODIC / TRIGGER
+    source: object = None           # модуль, выбравший спин
+    tag: str = ""                   # уточнение для лога (manual / auto / reason)
+    wrapped: bool = False           # базовый скан прошёл max → start
+
+
+@dataclass
+class SpinContext:
+    balance: Decimal
+    min_bet: Decimal
+    config: object
+    house_edge_frac: Decimal = _ZERO
+    loss_total: Decimal = _ZERO
+    initial_bank: Optional[Decimal] = None
+    last_successful_bank: Optional[Decimal] = None
+
+    @property
+    def min_bet_or_default(self) -> Decimal:
+        return self.min_bet or _DEFAULT_MIN_BET
+
+
+@dataclass
+class SpinResult:
+    win: bool
+    profit: Decimal
+    balance: Decimal
+    roll: Optional[Decimal] = None
+
+
+def _roll_decimal(roll_val) -> Optional[Decimal]:
+    if roll_val is None:
+        return None
+    try:
+        return Decimal(str(roll_val))
+    except Exception:
+        return None
+
+
+def _cfg(config, name, default):
+    return getattr(config, name, default) if config is not None else default
+
+
+# ------------------ Strategy modules ------------------
+class ModuleAttr:
+    """
+    Прежний атрибут бота как прокси к полю модуля: recovery_active = ModuleAttr("recovery", "active").
+    Менеджер и UI продолжают читать/писать bot.recovery_active, состояние живёт в модуле.
+    """
+    __slots__ = ("module", "field")
+
+    def __init__(self, module: str, field: str):
+        self.module = module
+        self.field = field
+
+    def __get__(self, obj, owner=None):
+        if obj is None:
+            return self
+        return getattr(getattr(obj, self.module), self.field)
+
+    def __set__(self, obj, value):
+        setattr(getattr(obj, self.module), self.field, value)
+
+
+class StrategyModule:
+    """База модуля: неактивен по умолчанию, состояние — в самом модуле."""
+    name = "module"
+
+    def reset(self):
+        pass
+
+    def on_start(self, ctx: SpinContext):
+        """Старт цикла бота (баланс известен)."""
+        pass
+
+    def plan(self, ctx: SpinContext, engine: "SpinEngine") -> Optional[SpinPlan]:
+        return None
+
+    def observe(self, plan: SpinPlan, ctx: SpinContext, result: SpinResult, engine: "SpinEngine"):
+        pass
+
+
+class LinearBase(StrategyModule):
+    """
+    Базовый линейный скан. Ставка:
+      fixed_bet                   — фиксированная (Cover50-варианты: 0.001);
+      cover_fraction              — покрыть долю loss_total при выигрыше (cover_Version11*);
+      иначе                       — max(config.base_bet, config.min_bet_enforced).
+    """
+    name = "linear"
+
+    def __init__(self, strategy: LinearPayoutStrategy, fixed_bet=None, cover_fraction=None,
+                 cover_fraction_after_sl=Decimal("0.30")):
+        self.strategy = strategy
+        self.fixed_bet = Decimal(fixed_bet) if fixed_bet is not None else None
+        self.cover_fraction = Decimal(cover_fraction) if cover_fraction is not None else None
+        self.cover_fraction_after_sl = Decimal(cover_fraction_after_sl)
+        self._prev_idx = None
+
+    def reset(self):
+        self.strategy.reset()
+        self._prev_idx = None
+
+    def next_payout(self):
+        """Следующий payout скана и признак WRAP (max → start)."""
+        s = self.strategy
+        idx = s.pos
+        wrapped = idx == 0 and self._prev_idx is not None and self._prev_idx == len(s.schedule) - 1
+        self._prev_idx = idx
+        return s.next_payout(), wrapped
+
+    def bet_for(self, payout: Decimal, ctx: SpinContext, engine: "SpinEngine", target=None) -> Decimal:
+        if target is None:
+            if self.fixed_bet is not None:
+                return self.fixed_bet
+            if self.cover_fraction is None:
+                cfg = ctx.config
+                return Decimal(max(_cfg(cfg, "base_bet", _DEFAULT_MIN_BET), _cfg(cfg, "min_bet_enforced", _ZERO)))
+            frac = self.cover_fraction_after_sl if engine.post_sl_lock else self.cover_fraction
+            target = ctx.loss_total * frac
+        return engine.sizer.bet_for_target_profit(payout, target, ctx.min_bet_or_default, ctx.balance)
+
+    def plan(self, ctx, engine):
+        payout, wrapped = self.next_payout()
+        return SpinPlan(payout, self.bet_for(payout, ctx, engine), "BASE", self, wrapped=wrapped)
+
+
+class DoublePress(StrategyModule):
+    """
+    Double-Press (cover%$): WIN на payout 5..8 с roll ≥ 90 → payout 10 на 2 спина фиксированной ставкой;
+    highroll99: WIN с roll ≥ 99 → payout 100. WIN в press — выход, LOSS — минус спин.
+    """
+    name = "press"
+
+    def __init__(self, press_bet=Decimal("0.1"), spins: int = 2, enable_highroll_99: bool = False):
+        self.press_bet = Decimal(press_bet)
+        self.spins = int(spins)
+        self.enable_highroll_99 = bool(enable_highroll_99)
+        self.reset()
+
+    def reset(self):
+        self.active = False
+        self.left = 0
+        self.payout = None
+
+    def activate(self, payout: Decimal, reason: str, engine: "SpinEngine" = None):
+        self.active = True
+        self.left = self.spins
+        self.payout = Decimal(payout)
+        if engine is not None:
+            engine.log(f"▶ Press start: payout={int(self.payout)} bet={self.press_bet:.6f} ({self.spins} spins) reason={reason}")
+
+    def plan(self, ctx, engine):
+        if self.active and self.left > 0 and self.payout is not None:
+            return SpinPlan(self.payout, self.press_bet, "PRESS", self)
+        return None
+
+    def observe(self, plan, ctx, result, engine):
+        if plan.mode == "PRESS" and plan.source is self:
+            if result.win:
+                self.reset()
+            else:
+                self.left -= 1
+                if self.left <= 0:
+                    self.active = False
+                    self.payout = None
+            return
+        if plan.mode != "BASE" or not result.win or result.roll is None:
+            return
+        roll = result.roll
+        if self.enable_highroll_99 and roll >= Decimal("99.000"):
+            self.activate(Decimal("100"), "highroll99", engine)
+        elif Decimal("5") <= plan.payout <= Decimal("8") and roll >= Decimal("90.000"):
+            self.activate(Decimal("10"), "win-5-8-roll>=90", engine)
+
+
+class SharedRefRecovery(StrategyModule):
+    """
+    Recovery с общим S_ref (cover%$): каждый бот восстанавливает банк до shared_S_ref.
+    target = min(recovery_percent·S_ref/N или recovery_usdt/N, S_ref - bank); payout min..max, +1 на LOSS
+    (после max — снова min), сброс на min при WIN.
+    """
+    name = "shared_recovery"
+
+    def __init__(self, min_payout=Decimal("50"), max_payout=Decimal("60")):
+        self.min_payout = Decimal(min_payout)
+        self.max_payout = Decimal(max_payout)
+        self.reset()
+
+    def reset(self):
+        self.active = False
+        self.S_ref: Optional[Decimal] = None
+        self.divisor = 1
+        self.target_end: Optional[Decimal] = None
+        self.payout = Decimal(self.min_payout)
+
+    def enter(self, shared_S_ref: Decimal, divisor: int) -> bool:
+        sref = safe_decimal(shared_S_ref, "0")
+        if sref <= 0:
+            return False
+        self.S_ref = sref
+        self.divisor = max(1, int(divisor))
+        self.target_end = sref
+        self.payout = Decimal(self.min_payout)
+        self.active = True
+        return True
+
+    def reached(self, balance: Decimal) -> bool:
+        return self.active and self.target_end is not None and balance >= self.target_end
+
+    def plan(self, ctx, engine):
+        if not (self.active and self.S_ref and self.target_end):
+            return None
+        R = self.target_end - ctx.balance
+        if R <= 0:
+            return None
+        cfg = ctx.config
+        pct = Decimal(_cfg(cfg, "recovery_percent_per_win", Decimal("1")))
+        usdt = Decimal(_cfg(cfg, "recovery_usdt_per_win", _ZERO))
+        target_from_percent = (pct / Decimal("100")) * self.S_ref / Decimal(self.divisor)
+        target_from_usdt = usdt / Decimal(max(1, self.divisor)) if usdt > 0 else _ZERO
+        target_unit = target_from_usdt if target_from_usdt > 0 else target_from_percent
+        target_profit = target_unit if target_unit <= R else R
+
+        payout = Decimal(self.payout)
+        denom = payout - _ONE
+        if denom <= 0:
+            denom = _ONE
+        bet = target_profit / denom
+        bet = max(bet, Decimal(_cfg(cfg, "min_bet_enforced", _ZERO)), ctx.min_bet_or_default)
+        mb = _cfg(cfg, "max_bet_limit", None)
+        if mb and bet > mb:
+            bet = mb
+        if bet > ctx.balance:
+            bet = ctx.balance
+        return SpinPlan(payout, bet, "RECOVERY", self)
+
+    def observe(self, plan, ctx, result, engine):
+        if plan.source is not self:
+            return
+        if result.win:
+            self.payout = Decimal(self.min_payout)
+            return
+        try:
+            np = int(self.payout) + 1
+            if np > int(self.max_payout) or int(self.payout) >= int(self.max_payout):
+                np = int(self.min_payout)
+            self.payout = Decimal(np)
+        except Exception:
+            self.payout = Decimal(self.min_payout)
+
+
+class Cover50(StrategyModule):
+    """
+    Cover 50% (Version2_Version14): ставка покрывает 50% просадки от cover_base_bank (с edge и маржой),
+    не больше cap_ratio·bank. Ручной запрос — на ближайший спин; авто — WIN на payout в
+    [auto_min..auto_max] → тот же payout ещё auto_spins спинов.
+    """
+    name = "cover50"
+
+    def __init__(self, cap_ratio=Decimal("0.02"), auto_min=Decimal("0"), auto_max=Decimal("0"),
+                 auto_spins: int = 2, margin_ratio=Decimal("0"), fraction=Decimal("0.50")):
+        self.cap_ratio = Decimal(cap_ratio)
+        self.auto_min = Decimal(auto_min)
+        self.auto_max = Decimal(auto_max)
+        self.auto_spins = int(auto_spins)
+        self.margin_ratio = Decimal(margin_ratio)
+        self.fraction = Decimal(fraction)
+        self.base_bank: Optional[Decimal] = None
+        self.profit_total = self.profit_manual = self.profit_auto = _ZERO
+        self.wins_total = self.wins_manual = self.wins_auto = self.losses_total = 0
+        self.reset()
+
+    def reset(self):
+        self.pending = False
+        self.auto_remaining = 0
+        self.auto_payout = None
+
+    def on_start(self, ctx):
+        if self.base_bank is None:
+            self.base_bank = ctx.balance
+
+    def request(self, cap_ratio=None):
+        if cap_ratio is not None and cap_ratio > 0:
+            self.cap_ratio = Decimal(cap_ratio)
+        self.pending = True
+
+    def drawdown(self, ctx: SpinContext) -> Decimal:
+        base = self.base_bank
+        if base is None:
+            return _ZERO
+        dd = base - ctx.balance
+        return dd if dd > 0 else _ZERO
+
+    def bet_for(self, payout: Decimal, ctx: SpinContext, engine: "SpinEngine") -> Optional[Decimal]:
+        dd = self.drawdown(ctx)
+        if dd <= 0:
+            return None
+        sizer = engine.cover_sizer(self.margin_ratio)
+        min_bet = ctx.min_bet_or_default
+        bet = sizer.covering_bet(payout, dd * self.fraction, min_bet, ctx.balance)
+        cap_by_bank = quantize_bet(self.cap_ratio * ctx.balance)
+        if bet > cap_by_bank:
+            bet = cap_by_bank
+        if bet < ctx.min_bet:
+            bet = ctx.min_bet
+        return bet
+
+    def plan(self, ctx, engine):
+        auto = self.auto_remaining > 0 and self.auto_payout is not None
+        if not self.pending and not auto:
+            return None
+        if auto:
+            base = SpinPlan(self.auto_payout, engine.base.bet_for(self.auto_payout, ctx, engine), "BASE", engine.base)
+        else:
+            base = engine.base_plan(ctx)
+        if self.pending:
+            self.pending = False
+            bet = self.bet_for(base.payout, ctx, engine)
+            if bet is not None:
+                return SpinPlan(base.payout, bet, "COVER50", self, tag="manual", wrapped=base.wrapped)
+            return base
+        bet = self.bet_for(base.payout, ctx, engine)
+        self.auto_remaining -= 1
+        if self.auto_remaining == 0:
+            self.auto_payout = None
+        if bet is not None:
+            return SpinPlan(base.payout, bet, "COVER50", self, tag="auto", wrapped=base.wrapped)
+        return base
+
+    def observe(self, plan, ctx, result, engine):
+        mine = plan.source is self
+        if result.win:
+            if mine:
+                self.profit_total += result.profit
+                self.wins_total += 1
+                if plan.tag == "manual":
+                    self.profit_manual += result.profit
+                    self.wins_manual += 1
+                else:
+                    self.profit_auto += result.profit
+                    self.wins_auto += 1
+            if self.auto_spins > 0 and self.auto_min <= plan.payout <= self.auto_max:
+                self.auto_remaining = self.auto_spins
+                self.auto_payout = plan.payout
+                engine.log(f"▶ Авто Cover50 старт payout={int(plan.payout)} ({self.auto_spins} спина)")
+        elif mine:
+            self.losses_total += 1
+
+
+class PeriodicRecovery(StrategyModule):
+    """
+    Периодическое восстановление (cover_Version11_Version20): после after_spins LOSS подряд в Base —
+    до max_spins спинов с payout из [payout_min..payout_max] (случайная ступень лестницы или payout_min)
+    и целью cover_frac·loss_total. WIN — выход и сброс скана; loss_total ≥ stop_loss — выход и post-SL lock.
+    """
+    name = "periodic"
+
+    def __init__(self, payout_min=Decimal("1.02"), payout_max=Decimal("2.0"), max_spins: int = 100,
+                 stop_loss_usdt=Decimal("0.75"), cover_frac=Decimal("1"), after_spins: int = 50,
+                 random_payout: bool = True, enabled: bool = True, rng=None):
+        self.payout_min = Decimal(payout_min)
+        self.payout_max = Decimal(payout_max)
+        self.max_spins = int(max_spins)
+        self.stop_loss_usdt = Decimal(stop_loss_usdt)
+        self.cover_frac = Decimal(cover_frac)
+        self.after_spins = int(after_spins)
+        self.random_payout = bool(random_payout)
+        self.enabled = bool(enabled)
+        self.ladder = RandomLadder(RECOVERY_LADDER, self.payout_min, self.payout_max, rng)
+        self.consecutive_base_losses = 0
+        self.reset()
+
+    def reset(self):
+        self.active = False
+        self.spins_done = 0
+        self.spent = _ZERO
+
+    def start(self, engine: "SpinEngine" = None):
+        if not self.enabled:
+            return
+        self.active = True
+        self.spins_done = 0
+        self.spent = _ZERO
+        if engine is not None:
+            engine.log(f"▶ Periodic recovery start (range={self.payout_min}..{self.payout_max}, "
+                       f"max_spins={self.max_spins}, SL={self.stop_loss_usdt}) loss_total={engine.loss_total:.8f}")
+
+    def stop(self, reason: str, engine: "SpinEngine" = None):
+        if self.active and engine is not None:
+            engine.log(f"▶ Periodic recovery stop: {reason} (spins={self.spins_done}, spent={self.spent:.8f})")
+        self.reset()
+
+    def next_payout(self) -> Decimal:
+        if not self.random_payout:
+            return self.payout_min
+        self.ladder.configure(self.payout_min, self.payout_max)
+        return self.ladder.choice()
+
+    def plan(self, ctx, engine):
+        if not self.enabled:
+            return None
+        if not self.active and self.after_spins > 0 and not engine.post_sl_lock \
+                and self.consecutive_base_losses >= self.after_spins:
+            self.start(engine)
+            self.consecutive_base_losses = 0
+        if not self.active:
+            return None
+        payout = self.next_payout()
+        bet = engine.sizer.bet_for_target_profit(payout, ctx.loss_total * self.cover_frac,
+                                                 ctx.min_bet_or_default, ctx.balance)
+        self.spent += bet
+        return SpinPlan(payout, bet, "PERIODIC", self)
+
+    def observe(self, plan, ctx, result, engine):
+        if plan.source is self:
+            if result.win:
+                self.stop("WIN achieved", engine)
+                engine.reset_base()
+                return
+            if self.enabled and engine.loss_total >= self.stop_loss_usdt:
+                self.stop("STOP-LOSS reached", engine)
+                engine.post_sl_lock = True
+                engine.log(f"[EVENT] STOP-LOSS достигнут: loss_total={engine.loss_total:.8f} → Base; post-SL lock ON")
+                return
+            self.spins_done += 1
+            if self.spins_done >= self.max_spins:
+                self.stop("max spins reached without WIN", engine)
+            return
+        if plan.mode in ("BASE", "TRIGGER"):
+            if result.win:
+                self.consecutive_base_losses = 0
+                if engine.post_sl_lock:
+                    engine.post_sl_lock = False
+                    engine.log("[EVENT] WIN в Base: post-SL lock снят")
+            else:
+                self.consecutive_base_losses += 1
+
+
+class RollTrigger(StrategyModule):
+    """
+    Trigger (cover_Version11_Version20): Roll в [roll_min..roll_max] → ближайший базовый спин
+    идёт на payout триггера с целью cover_frac·loss_total (скан при этом продвигается).
+    """
+    name = "trigger"
+
+    def __init__(self, roll_min=Decimal("0"), roll_max=Decimal("0"), payout=Decimal("2"),
+                 cover_frac=Decimal("1"), enabled: bool = False):
+        self.roll_min = Decimal(roll_min)
+        self.roll_max = Decimal(roll_max)
+        self.payout = Decimal(payout)
+        self.cover_frac = Decimal(cover_frac)
+        self.enabled = bool(enabled)
+        self.reset()
+
+    def reset(self):
+        self.armed = False
+
+    def matches(self, roll: Optional[Decimal]) -> bool:
+        return self.enabled and roll is not None and self.roll_min <= roll <= self.roll_max
+
+    def plan(self, ctx, engine):
+        if not (self.armed and self.enabled):
+            return None
+        self.armed = False
+        base = engine.base_plan(ctx)
+        bet = engine.sizer.bet_for_target_profit(self.payout, ctx.loss_total * self.cover_frac,
+                                                 ctx.min_bet_or_default, ctx.balance)
+        return SpinPlan(self.payout, bet, "TRIGGER", self, wrapped=base.wrapped)
+
+    def observe(self, plan, ctx, result, engine):
+        if self.matches(result.roll):
+            self.armed = True
+            engine.log(f"[TRIGGER] Roll={result.roll} попал в [{self.roll_min}..{self.roll_max}] → триггер на следующую ставку")
+
+
+# ------------------ Engine ------------------
+class SpinEngine:
+    """
+    Выбор спина: модули по порядку (первый вернувший план), иначе — base.
+    После спина observe() получают все модули; loss_total ведёт движок (WIN → 0, LOSS → += bet).
+    """
+    def __init__(self, base: LinearBase, modules=(), log=None, max_bet_limit=None):
+        self.base = base
+        self.modules = list(modules)
+        self.log = log or (lambda msg: None)
+        self.sizer = BetSizer(max_bet_limit=max_bet_limit)
+        self._cover_sizers = {}
+        self.loss_total = _ZERO
+        self.post_sl_lock = False
+        self.wraps = 0
+
+    def module(self, name: str):
+        for m in self.modules:
+            if m.name == name:
+                return m
+        return self.base if self.base.name == name else None
+
+    def configure(self, house_edge_frac=None, max_bet_limit=None):
+        if self.sizer.configure(house_edge_frac, None, max_bet_limit):
+            self._cover_sizers.clear()
+
+    def cover_sizer(self, margin_ratio) -> BetSizer:
+        s = self._cover_sizers.get(margin_ratio)
+        if s is None:
+            s = BetSizer(self.sizer.house_edge_frac, margin_ratio, self.sizer.max_bet_limit)
+            self._cover_sizers[margin_ratio] = s
+        return s
+
+    def reset_base(self):
+        try:
+            self.base.reset()
+        except Exception:
+            pass
+
+    def reset(self):
+        self.base.reset()
+        for m in self.modules:
+            m.reset()
+        self.loss_total = _ZERO
+        self.post_sl_lock = False
+
+    def start(self, ctx: SpinContext):
+        for m in self.modules:
+            m.on_start(ctx)
+
+    def base_plan(self, ctx: SpinContext) -> SpinPlan:
+        return self.base.plan(ctx, self)
+
+    def plan(self, ctx: SpinContext) -> SpinPlan:
+        for m in self.modules:
+            p = m.plan(ctx, self)
+            if p is not None:
+                break
+        else:
+            p = self.base_plan(ctx)
+        if p.wrapped:
+            self.wraps += 1
+        p.bet = quantize_bet(p.bet)
+        return p
+
+    def settle(self, plan: SpinPlan, ctx: SpinContext, result: SpinResult):
+        if result.win:
+            self.loss_total = _ZERO
+        else:
+            self.loss_total += plan.bet
+        ctx.loss_total = self.loss_total
+        for m in self.modules:
+            m.observe(plan, ctx, result, self)
+
+
+# ------------------ Presets ------------------
+@dataclass
+class BotPreset:
+    name: str
+    legacy: tuple          # GUI-файлы с близкой стратегией (свои циклы start(), кроме ENGINE_BACKED)
+    build: object          # (start_payout, max_payout, config, log) -> SpinEngine
+    description: str = ""
+
+
+def _build_linear(start, stop, config, log):
+    return SpinEngine(LinearBase(LinearPayoutStrategy(start, stop)), log=log,
+                      max_bet_limit=_cfg(config, "max_bet_limit", None))
+
+
+def _build_press_shared_recovery(start, stop, config, log):
+    return SpinEngine(LinearBase(LinearPayoutStrategy(start, stop)),
+                      [SharedRefRecovery(_cfg(config, "recovery_min_payout", Decimal("50")),
+                                         _cfg(config, "recovery_max_payout", Decimal("60"))),
+                       DoublePress()],
+                      log=log, max_bet_limit=_cfg(config, "max_bet_limit", None))
+
+
+def _build_cover50(start, stop, config, log):
+    return SpinEngine(LinearBase(LinearPayoutStrategy(start, stop), fixed_bet=_DEFAULT_MIN_BET),
+                      [Cover50(auto_min=Decimal("5"), auto_max=Decimal("8"))],
+                      log=log, max_bet_limit=_cfg(config, "max_bet_limit", None))
+
+
+def _build_cover_periodic(start, stop, config, log):
+    return SpinEngine(LinearBase(LinearPayoutStrategy(start, stop), cover_fraction=Decimal("1")),
+                      [PeriodicRecovery(enabled=_cfg(config, "recovery_enabled", True)),
+                       RollTrigger(_cfg(config, "trigger_roll_min", Decimal("0")),
+                                   _cfg(config, "trigger_roll_max", Decimal("0")),
+                                   _cfg(config, "trigger_payout", Decimal("2")),
+                                   Decimal(_cfg(config, "trigger_recovery_percent", Decimal("100"))) / Decimal("100"),
+                                   enabled=_cfg(config, "trigger_enabled", False))],
+                      log=log, max_bet_limit=_cfg(config, "max_bet_limit", None))
+
+
+def _build_press(start, stop, config, log):
+    return SpinEngine(LinearBase(LinearPayoutStrategy(start, stop)), [DoublePress()], log=log,
+                      max_bet_limit=_cfg(config, "max_bet_limit", None))
+
+
+# GUI-файлы, чей цикл спинов уже идёт через SpinEngine
+ENGINE_BACKED = frozenset({"crypto_games_bot_stable_100-9999_cover%$.py"})
+
+PRESETS = {p.name: p for p in (
+    BotPreset("linear", (), _build_linear, "линейный скан, ставка base_bet"),
+    BotPreset("press", ("crypto_games_bot_stable_100-9999_norm_versiya.py",
+                        "crypto_games_bot_stable_100-9999_Version2_Version14_Version1.py"),
+              _build_press, "скан + Double-Press"),
+    BotPreset("press_shared_recovery", ("crypto_games_bot_stable_100-9999_cover%$.py",
+                                        "crypto_games_bot_stable_100-9999_norm_versiya_Version36_Version13.py"),
+              _build_press_shared_recovery, "скан + Double-Press + Recovery с общим S_ref"),
+    BotPreset("cover50", ("crypto_games_bot_stable_100-9999_Version2_Version14.py",
+                          "crypto_games_bot_stable_100-9999_Version2_Version9.py",
+                          "crypto_games_bot_stable_cover.py",
+                          "crypto_games_bot_stable_cover_Version2.py",
+                          "crypto_games_bot_stable_cover_Version2_Version9.py"),
+              _build_cover50, "скан 0.001 + Cover 50% (ручной / авто после WIN на 5..8)"),
+    BotPreset("cover_periodic", ("crypto_games_bot_stable_cover_Version11.py",
+                                 "crypto_games_bot_stable_cover_Version11_Version13.py",
+                                 "crypto_games_bot_stable_cover_Version11_Version20.py"),
+              _build_cover_periodic, "покрытие loss_total + периодический recovery + roll-trigger"),
+)}
+
+
+def build_preset(name: str, start_payout, max_payout, config=None, log=None) -> SpinEngine:
+    try:
+        preset = PRESETS[name]
+    except KeyError:
+        raise ValueError(f"unknown preset {name!r}; known: {', '.join(sorted(PRESETS))}")
+    return preset.build(Decimal(start_payout), Decimal(max_payout), config, log)
+
+
+# ------------------ Headless bot ------------------
+class EngineBot:
+    """
+    Безголовый цикл над SpinEngine: баланс берётся из ответа placebet (без запроса на каждый спин),
+    настройки (MinBet / Edge) — раз в min_bet_refresh_secs.
+    """
+    def __init__(self, bot_id: str, api, config, engine: SpinEngine, log_cb=None, speed_ms: Optional[int] = None):
+        self.bot_id = bot_id
+        self.api = api
+        self.config = config
+        self.engine = engine
+        self.log_cb = log_cb or print
+        self.speed_ms = _cfg(config, "speed_ms", 0) if speed_ms is None else speed_ms
+        self.is_running = False
+        self.paused = False
+        self.min_bet = _ZERO
+        self.house_edge_frac = _ZERO
+        self._last_settings = 0.0
+        self.spin_count = 0
+        self.wins = 0
+        self.initial_bank = None
+        self.last_successful_bank = None
+        self.client_seed = api.generate_client_seed()
+        engine.log = self._log
+
+    def _log(self, msg):
+        try:
+            self.log_cb(f"[{self.bot_id}] {msg}")
+        except Exception:
+            pass
+
+    def _refresh_settings(self):
+        now = time.time()
+        if now - self._last_settings < _cfg(self.config, "min_bet_refresh_secs", 30):
+            return
+        self._last_settings = now
+        res = self.api.settings(_cfg(self.config, "coin", "USDT"))
+        if isinstance(res, dict) and res.get("MinBet") is not None:
+            self.min_bet = safe_decimal(res.get("MinBet"))
+            edge = safe_decimal(res.get("Edge"), "0")
+            self.house_edge_frac = edge / Decimal("100") if edge > 0 else _ZERO
+            self.engine.configure(self.house_edge_frac, _cfg(self.config, "max_bet_limit", None))
+
+    def _fetch_balance(self) -> Decimal:
+        coin, key = _cfg(self.config, "coin", "USDT"), _cfg(self.config, "api_key", "")
+        res = self.api.balance(coin, key)
+        if isinstance(res, dict) and res.get("Balance") is not None:
+            return safe_decimal(res.get("Balance"))
+        return _ZERO
+
+    def run(self, max_spins: Optional[int] = None):
+        self.is_running = True
+        balance = self._fetch_balance()
+        self.initial_bank = self.last_successful_bank = balance
+        self._log(f"▶ Старт баланс={balance:.8f}")
+        self.engine.start(SpinContext(balance, self.min_bet, self.config))
+        coin, key = _cfg(self.config, "coin", "USDT"), _cfg(self.config, "api_key", "")
+        while self.is_running and (max_spins is None or self.spin_count < max_spins):
+            while self.paused and self.is_running:
+                time.sleep(0.1)
+            self._refresh_settings()
+            ctx = SpinContext(balance, self.min_bet, self.config, self.house_edge_frac,
+                              self.engine.loss_total, self.initial_bank, self.last_successful_bank)
+            plan = self.engine.plan(ctx)
+            if plan.bet > balance:
+                self._log(f"❌ Недостаточно средств: balance={balance:.8f} bet={plan.bet:.8f}")
+                break
+            res = self.api.placebet(coin, key, float(plan.bet), float(plan.payout), True, self.client_seed)
+            if isinstance(res, dict) and res.get("error"):
+                self._log(f"API error: {res.get('error')}")
+                time.sleep(1)
+                continue
+            profit = safe_decimal(res.get("Profit", "0"))
+            balance = safe_decimal(res.get("Balance", balance))
+            result = SpinResult(profit > 0, profit, balance, _roll_decimal(res.get("Roll")))
+            self.engine.settle(plan, ctx, result)
+            self.spin_count += 1
+            if result.win:
+                self.wins += 1
+                if balance > self.last_successful_bank:
+                    self.last_successful_bank = balance
+            prefix = f"[{'WIN' if result.win else 'LOSS'}{'' if plan.mode == 'BASE' else '-' + plan.mode}]"
+            self._log(f"{prefix} spin {self.spin_count} payout={plan.payout} roll={result.roll} "
+                      f"bet={plan.bet:.8f} profit={profit:.8f} balance={balance:.8f}")
+            if self.speed_ms:
+                time.sleep(self.speed_ms / 1000.0)
+        self.is_running = False
+        self._log(f"🛑 Остановлен: spins={self.spin_count} wins={self.wins} balance={balance:.8f}")
+        return balance
+
+    def stop(self):
+        self.is_running = False
+        self.paused = False
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Crypto.Games engine: прогон пресета стратегии")
+    ap.add_argument("--preset", default="linear", choices=sorted(PRESETS))
+    ap.add_argument("--min-payout", default="100")
+    ap.add_argument("--max-payout", default="9999")
+    ap.add_argument("--spins", type=int, default=1000)
+    ap.add_argument("--sim", action="store_true", help="офлайн SIM-клиент вместо API")
+    ap.add_argument("--bank", default="100", help="стартовый банк SIM")
+    ap.add_argument("--seed", type=int, default=None)
+    ap.add_argument("--api-key", default="")
+    ap.add_argument("--coin", default="USDT")
+    ap.add_argument("--quiet", action="store_true", help="только итог")
+    ap.add_argument("--list", action="store_true", help="список пресетов и близких GUI-файлов")
+    args = ap.parse_args(argv)
+
+    if args.list:
+        for p in PRESETS.values():
+            print(f"{p.name:24s} {p.description}")
+            for f in p.legacy:
+                print(f"{'':24s}   ≈ {f}{'  (SpinEngine)' if f in ENGINE_BACKED else ''}")
+        return 0
+
+    from types import SimpleNamespace
+    config = SimpleNamespace(coin=args.coin, api_key=args.api_key or "SIM", base_bet=Decimal("0.001"),
+                             min_bet_enforced=_ZERO, max_bet_limit=None, speed_ms=0, min_bet_refresh_secs=30)
+    api = SimAPIClient(args.bank, seed=args.seed) if args.sim else APIClient()
+    if not args.sim and not args.api_key:
+        ap.error("--api-key обязателен без --sim")
+    engine = build_preset(args.preset, args.min_payout, args.max_payout, config)
+    bot = EngineBot("engine", api, config, engine, log_cb=(lambda m: None) if args.quiet else print)
+    final = bot.run(max_spins=args.spins)
+    print(f"preset={args.preset} spins={bot.spin_count} wins={bot.wins} wraps={engine.wraps} "
+          f"balance {bot.initial_bank:.8f} → {final:.8f}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
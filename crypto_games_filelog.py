@@ -0,0 +1,333 @@
+#!/usr/bin/env python3
+# Crypto.Games — асинхронная запись логов ботов: поток-писатель, буфер, ротация, сжатие
+#
+# Зачем:
+# - BotTab._file_log на каждое сообщение открывал logs/<bot>.txt, дописывал строку и закрывал файл:
+#   на Windows это шквал системных вызовов прямо в UI-потоке.
+# - AsyncFileLogger: write(path, line) — только добавление в очередь; один фоновый поток держит
+#   файлы открытыми с большим буфером и пишет пачками:
+#   * flush — раз в flush_interval секунд, fsync — раз в fsync_interval (0 — не делать);
+#   * ротация по размеру (max_bytes) и/или по смене дня: <bot>.txt → <bot>.YYYYmmdd-HHMMSS.txt;
+#   * ротированный файл сжимается в .gz отдельным потоком (вместо ручной упаковки logs_parsed.rar);
+#   * очередь ограничена (max_pending): при переполнении старые строки выбрасываются со счётчиком,
+#     в файл пишется строка «[filelog] dropped N lines».
+# - При выходе (atexit) всё недописанное сбрасывается на диск.
+#
+# Запуск: python crypto_games_filelog.py --bench 200000
+
+import argparse
+import atexit
+import gzip
+import os
+import shutil
+import threading
+import time
+from collections import deque
+
+FLUSH_INTERVAL = 1.0
+FSYNC_INTERVAL = 10.0
+MAX_BYTES = 64 << 20            # 64 МБ на файл до ротации; 0 — без ротации по размеру
+ROTATE_DAILY = True
+BUFFER_SIZE = 1 << 20
+MAX_PENDING = 500_000
+OPEN_FILES = 64                 # открытых файлов одновременно; дольше всех молчащий закрывается
+
+
+class _Sink:
+    __slots__ = ("path", "fh", "size", "day", "last_write", "dirty", "synced_at")
+
+    def __init__(self, path):
+        self.path = path
+        self.fh = None
+        self.size = 0
+        self.day = None
+        self.last_write = 0.0
+        self.dirty = False
+        self.synced_at = time.monotonic()
+
+
+class AsyncFileLogger:
+    """Общий писатель для всех файлов логов; write() потокобезопасен и не делает I/O."""
+    def __init__(self, flush_interval: float = FLUSH_INTERVAL, fsync_interval: float = FSYNC_INTERVAL,
+                 max_bytes: int = MAX_BYTES, rotate_daily: bool = ROTATE_DAILY, compress: bool = True,
+                 buffer_size: int = BUFFER_SIZE, max_pending: int = MAX_PENDING, open_files: int = OPEN_FILES):
+        self.flush_interval = max(0.05, float(flush_interval))
+        self.fsync_interval = max(0.0, float(fsync_interval))
+        self.max_bytes = max(0, int(max_bytes))
+        self.rotate_daily = rotate_daily
+        self.compress = compress
+        self.buffer_size = int(buffer_size)
+        self.max_pending = max(1000, int(max_pending))
+        self.open_files = max(1, int(open_files))
+        self._cond = threading.Condition(threading.Lock())
+        self._pending = deque()
+        self._dropped = {}                      # path → выброшено с прошлой записи
+        self._sinks = {}
+        self._compress_q = deque()
+        self._compress_cv = threading.Condition(threading.Lock())
+        self._flush_req = 0
+        self._flush_done = 0
+        self._stop = False
+        self._errors = {}
+        self.written = 0
+        self.dropped = 0
+        self.rotations = 0
+        self.compressed = 0
+        self._thread = threading.Thread(target=self._run, name="filelog-writer", daemon=True)
+        self._thread.start()
+        self._zthread = threading.Thread(target=self._run_compress, name="filelog-gzip", daemon=True)
+        self._zthread.start()
+
+    # -- производители --
+    def write(self, path: str, line: str):
+        with self._cond:
+            if len(self._pending) >= self.max_pending:
+                old_path, _ = self._pending.popleft()
+                self._dropped[old_path] = self._dropped.get(old_path, 0) + 1
+                self.dropped += 1
+            self._pending.append((path, line))
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """Дождаться, пока всё поставленное в очередь окажется в файлах (flush, без fsync)."""
+        with self._cond:
+            self._flush_req += 1
+            ticket = self._flush_req
+            self._cond.notify()
+            deadline = time.monotonic() + timeout
+            while self._flush_done < ticket and not self._stop:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return False
+                self._cond.wait(left)
+        return True
+
+    def close(self, timeout: float = 5.0):
+        self.flush(timeout)
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        self._thread.join(timeout)
+        with self._compress_cv:
+            self._compress_cv.notify()
+        self._zthread.join(timeout)
+
+    def stats(self) -> dict:
+        with self._cond:
+            pending = len(self._pending)
+        return {"pending": pending, "written": self.written, "dropped": self.dropped,
+                "rotations": self.rotations, "compressed": self.compressed, "open": len(self._sinks)}
+
+    # -- поток-писатель --
+    def _run(self):
+        next_flush = time.monotonic() + self.flush_interval
+        while True:
+            with self._cond:
+                while not self._pending and not self._stop and self._flush_req == self._flush_done:
+                    left = next_flush - time.monotonic()
+                    if left <= 0:
+                        break
+                    self._cond.wait(left)
+                batch = self._pending
+                self._pending = deque()
+                dropped = self._dropped
+                self._dropped = {}
+                ticket = self._flush_req
+                stop = self._stop
+            self._write_batch(batch, dropped)
+            now = time.monotonic()
+            if now >= next_flush or ticket != self._flush_done or stop:
+                self._flush_all(now, force_sync=stop)
+                next_flush = now + self.flush_interval
+            if ticket != self._flush_done:
+                with self._cond:
+                    self._flush_done = ticket
+                    self._cond.notify_all()
+            if stop:
+                for sink in list(self._sinks.values()):
+                    self._close_sink(sink)
+                return
+
+    def _write_batch(self, batch, dropped):
+        for path, n in dropped.items():
+            batch.appendleft((path, f"{time.strftime('%Y-%m-%d %H:%M:%S')} [filelog] dropped {n} lines (writer backlog)\n"))
+        if not batch:
+            return
+        today = time.strftime("%Y%m%d")
+        # подряд идущие строки одного файла — одним write
+        run_path = None
+        run = []
+        for path, line in batch:
+            if path != run_path:
+                if run:
+                    self._emit(run_path, run, today)
+                run_path = path
+                run = []
+            run.append(line)
+        if run:
+            self._emit(run_path, run, today)
+
+    def _sink(self, path: str, today: str) -> _Sink:
+        sink = self._sinks.get(path)
+        if sink is not None and sink.fh is not None:
+            return sink
+        if len(self._sinks) >= self.open_files:
+            oldest = min(self._sinks.values(), key=lambda s: s.last_write)
+            self._close_sink(oldest)
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        sink = _Sink(path)
+        sink.fh = open(path, "a", encoding="utf-8", buffering=self.buffer_size)
+        sink.size = sink.fh.tell()
+        try:
+            sink.day = time.strftime("%Y%m%d", time.localtime(os.path.getmtime(path))) if sink.size else today
+        except OSError:
+            sink.day = today
+        self._sinks[path] = sink
+        return sink
+
+    def _emit(self, path: str, lines: list, today: str):
+        try:
+            sink = self._sink(path, today)
+            if self.rotate_daily and sink.day != today and sink.size > 0:
+                sink = self._rotate(sink, today)
+            data = "".join(lines)
+            sink.fh.write(data)
+            sink.size += len(data)              # символы ≈ байты; для порога ротации достаточно
+            sink.dirty = True
+            sink.last_write = time.monotonic()
+            sink.day = today
+            self.written += len(lines)
+            if self.max_bytes and sink.size >= self.max_bytes:
+                self._rotate(sink, today)
+        except Exception as e:
+            key = (path, type(e).__name__)
+            if key not in self._errors:
+                self._errors[key] = 1
+                print(f"[filelog] {path}: {e}")
+
+    def _flush_all(self, now: float, force_sync: bool = False):
+        for sink in list(self._sinks.values()):
+            if sink.fh is None or not sink.dirty:
+                continue
+            try:
+                sink.fh.flush()
+                sink.dirty = False
+                if self.fsync_interval and (force_sync or now - sink.synced_at >= self.fsync_interval):
+                    os.fsync(sink.fh.fileno())
+                    sink.synced_at = now
+            except Exception as e:
+                print(f"[filelog] flush {sink.path}: {e}")
+
+    def _close_sink(self, sink: _Sink):
+        self._sinks.pop(sink.path, None)
+        if sink.fh is None:
+            return
+        try:
+            sink.fh.flush()
+            if self.fsync_interval:
+                os.fsync(sink.fh.fileno())
+            sink.fh.close()
+        except Exception as e:
+            print(f"[filelog] close {sink.path}: {e}")
+        sink.fh = None
+
+    def _rotate(self, sink: _Sink, today: str) -> _Sink:
+        path = sink.path
+        self._close_sink(sink)
+        base, ext = os.path.splitext(path)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        target = f"{base}.{stamp}{ext}"
+        n = 1
+        while os.path.exists(target) or os.path.exists(target + ".gz"):
+            target = f"{base}.{stamp}-{n}{ext}"
+            n += 1
+        try:
+            os.replace(path, target)
+            _move_sidecar(path, target)
+            self.rotations += 1
+            if self.compress:
+                with self._compress_cv:
+                    self._compress_q.append(target)
+                    self._compress_cv.notify()
+        except Exception as e:
+            print(f"[filelog] rotate {path}: {e}")
+        return self._sink(path, today)
+
+    # -- поток сжатия --
+    def _run_compress(self):
+        while True:
+            with self._compress_cv:
+                while not self._compress_q and not self._stop:
+                    self._compress_cv.wait(1.0)
+                if not self._compress_q and self._stop:
+                    return
+                path = self._compress_q.popleft()
+            try:
+                tmp = path + ".gz.part"
+                with open(path, "rb") as src, gzip.open(tmp, "wb", compresslevel=6) as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+                os.replace(tmp, path + ".gz")
+                os.remove(path)
+                _move_sidecar(path, path + ".gz")
+                self.compressed += 1
+            except Exception as e:
+                print(f"[filelog] gzip {path}: {e}")
+
+
+def _move_sidecar(src: str, dst: str):
+    """Индекс времени ленты флота (<log>.tsx, crypto_games_timeline) переезжает вместе с частью лога."""
+    try:
+        if os.path.exists(src + ".tsx"):
+            os.replace(src + ".tsx", dst + ".tsx")
+    except OSError:
+        pass
+
+
+_default = None
+_default_lock = threading.Lock()
+
+
+def file_logger() -> AsyncFileLogger:
+    """Общий писатель процесса (создаётся при первом обращении, закрывается при выходе)."""
+    global _default
+    if _default is None:
+        with _default_lock:
+            if _default is None:
+                _default = AsyncFileLogger()
+                atexit.register(_default.close)
+    return _default
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Async file logger benchmark")
+    ap.add_argument("--bench", type=int, default=200000, help="строк на файл")
+    ap.add_argument("--files", type=int, default=4)
+    ap.add_argument("--dir", default="logs_bench")
+    ap.add_argument("--max-bytes", type=int, default=8 << 20)
+    args = ap.parse_args(argv)
+
+    line = "[WIN] payout=123.45 bet=0.00000100 roll=42.17 balance=1.23456789 " + "x" * 20
+    log = AsyncFileLogger(max_bytes=args.max_bytes)
+    paths = [os.path.join(args.dir, f"Bot-{i + 1}.txt") for i in range(args.files)]
+    t0 = time.perf_counter()
+    for k in range(args.bench):
+        ts = time.strftime("%Y-%m-%d %H:%M:%S")
+        for p in paths:
+            log.write(p, f"{ts} {line} {k}\n")
+    t_enq = time.perf_counter() - t0
+    log.close(timeout=60)
+    t_all = time.perf_counter() - t0
+    n = args.bench * args.files
+    t1 = time.perf_counter()
+    for k in range(min(args.bench, 20000)):
+        with open(os.path.join(args.dir, "sync.txt"), "a", encoding="utf-8") as f:
+            f.write(f"{line} {k}\n")
+    t_sync = (time.perf_counter() - t1) / min(args.bench, 20000)
+    print(f"lines={n} enqueue={t_enq / n * 1e6:.2f} µs/line total={t_all:.2f}s "
+          f"open/append/close={t_sync * 1e6:.1f} µs/line stats={log.stats()}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
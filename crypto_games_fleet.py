@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+# Crypto.Games — суммы по флоту ботов, поддерживаемые инкрементально
+#
+# Зачем:
+# - На каждое событие 'bank' _update_aggregate_label пересчитывал sum(safe_decimal(...)) по всем ботам
+#   под self.lock, а check_global_take_profit / _aggregate_initial_and_current / _check_global_recovery
+#   суммировали всё заново каждый тик: O(N·S) Decimal-операций в UI-потоке (N ботов, S спинов/с).
+# - FleetBanks — замена словаря BotManagerApp.all_banks (bot_id → запись банка):
+#   * при записи/удалении бота суммы полей меняются на дельту (старый вклад бота хранится отдельно,
+#     поэтому запись можно менять на месте и потом присвоить обратно — как в _resume_after_tp);
+#   * totals / initial_and_current() — чтение за O(1);
+#   * max_of("last_successful_bank") — максимум с ленивым пересчётом, только если уменьшился
+#     вклад текущего лидера или он удалён.
+# - Блокировки своей нет: как и прежний dict, защищается self.lock менеджера.
+
+from decimal import Decimal
+
+from crypto_games_engine import safe_decimal
+
+SUM_FIELDS = ("current_bank", "profit_global", "initial_bank")
+MAX_FIELDS = ("last_successful_bank",)
+
+_ZERO = Decimal("0")
+
+
+class FleetBanks(dict):
+    """
+    dict bot_id → {"current_bank", "profit_global", "initial_bank", ...} с бегущими суммами.
+    initial_eff — initial_bank, а если он <= 0, то current_bank (как в _aggregate_initial_and_current).
+    """
+    def __init__(self, *args, sum_fields=SUM_FIELDS, max_fields=MAX_FIELDS, **kwargs):
+        super().__init__()
+        self.sum_fields = tuple(sum_fields)
+        self.max_fields = tuple(max_fields)
+        self._keys = self.sum_fields + ("initial_eff",)
+        self._contrib = {}                      # bot_id → вклад в суммы (кортеж по self._keys)
+        self._max_contrib = {}                  # bot_id → кортеж по self.max_fields
+        self._sums = dict.fromkeys(self._keys, _ZERO)
+        self._max = {}                          # поле → (значение, bot_id) или None (нужен пересчёт)
+        self.updates = 0
+        self.rescans = 0                        # ленивые пересчёты максимумов
+        if args or kwargs:
+            self.update(*args, **kwargs)
+
+    # -- вклад одной записи --
+    def _contribution(self, rec) -> tuple:
+        rec = rec or {}
+        vals = {k: safe_decimal(rec.get(k)) for k in self.sum_fields}
+        curr = vals.get("current_bank", _ZERO)
+        init = vals.get("initial_bank", _ZERO)
+        vals["initial_eff"] = init if init > 0 else curr
+        return tuple(vals[k] for k in self._keys)
+
+    def _apply(self, bot_id, rec):
+        old = self._contrib.pop(bot_id, None)
+        self._max_contrib.pop(bot_id, None)
+        new = self._contribution(rec) if rec is not None else None
+        for i, k in enumerate(self._keys):
+            delta = (new[i] if new else _ZERO) - (old[i] if old else _ZERO)
+            if delta:
+                self._sums[k] += delta
+        if new is not None:
+            self._contrib[bot_id] = new
+            new_max = tuple(safe_decimal((rec or {}).get(f), "0") for f in self.max_fields)
+            self._max_contrib[bot_id] = new_max
+        else:
+            new_max = None
+        for i, f in enumerate(self.max_fields):
+            cur = self._max.get(f)
+            if cur is None:
+                continue
+            val, holder = cur
+            if new_max is not None and new_max[i] >= val:
+                self._max[f] = (new_max[i], bot_id)
+            elif holder == bot_id:
+                self._max[f] = None             # лидер уменьшился или ушёл — пересчёт при чтении
+        self.updates += 1
+
+    # -- dict API --
+    def __setitem__(self, bot_id, rec):
+        self._apply(bot_id, rec)
+        super().__setitem__(bot_id, rec)
+
+    def __delitem__(self, bot_id):
+        super().__delitem__(bot_id)
+        self._apply(bot_id, None)
+
+    def pop(self, bot_id, *default):
+        if bot_id in self:
+            self._apply(bot_id, None)
+        return super().pop(bot_id, *default)
+
+    def popitem(self):
+        bot_id, rec = super().popitem()
+        self._apply(bot_id, None)
+        return bot_id, rec
+
+    def setdefault(self, bot_id, default=None):
+        if bot_id not in self:
+            self[bot_id] = default
+        return super().__getitem__(bot_id)
+
+    def update(self, *args, **kwargs):
+        for bot_id, rec in dict(*args, **kwargs).items():
+            self[bot_id] = rec
+
+    def clear(self):
+        super().clear()
+        self._contrib.clear()
+        self._max_contrib.clear()
+        self._sums = dict.fromkeys(self._keys, _ZERO)
+        self._max = {}
+
+    # -- чтение O(1) --
+    def total(self, field: str) -> Decimal:
+        return self._sums.get(field, _ZERO)
+
+    @property
+    def total_current(self) -> Decimal:
+        return self._sums.get("current_bank", _ZERO)
+
+    @property
+    def total_profit(self) -> Decimal:
+        return self._sums.get("profit_global", _ZERO)
+
+    @property
+    def total_initial(self) -> Decimal:
+        return self._sums.get("initial_bank", _ZERO)
+
+    def initial_and_current(self):
+        """(сумма initial_eff, сумма current_bank) — то же, что возвращал _aggregate_initial_and_current."""
+        return self._sums["initial_eff"], self._sums.get("current_bank", _ZERO)
+
+    def max_of(self, field: str) -> Decimal:
+        """Максимум поля из MAX_FIELDS по ботам (0, если ботов нет)."""
+        i = self.max_fields.index(field)
+        cur = self._max.get(field)
+        if cur is None:
+            self.rescans += 1
+            cur = (_ZERO, None)
+            for bot_id, vals in self._max_contrib.items():
+                if cur[1] is None or vals[i] > cur[0]:
+                    cur = (vals[i], bot_id)
+            self._max[field] = cur
+        return cur[0]
+
+    def resync(self):
+        """Пересчитать всё с нуля (сверка, если кто-то поменял запись на месте без присваивания)."""
+        items = list(self.items())
+        self.clear()
+        for bot_id, rec in items:
+            self[bot_id] = rec
@@ -0,0 +1,464 @@
+#!/usr/bin/env python3
+# Crypto.Games — бинарный журнал спинов: запись фиксированной длины на спин, чтение через mmap / NumPy
+#
+# Зачем:
+# - Анализ (logs_parsed.csv, *.report.txt, бэктест --rolls, история) каждый раз заново разбирал
+#   текстовые логи регулярками: миллион спинов — десятки секунд и сотни МБ строк в памяти.
+# - SpinJournal: рядом с logs/<bot>.txt файл logs/<bot>.cgj — заголовок + по RECORD (64 байта)
+#   на спин: ts, gspin, bet, profit, balance, roll, payout, L, режим, флаги (WIN / recovery).
+#   roll — double: бэктест сравнивает его с порогами так же, как живой цикл.
+#   L — «ожидаемых выигрышей с последнего WIN»: сумма 1/payout по проигрышам, на WIN сбрасывается
+#   (то же, что spins_in_level / payout в S6-логах, но и при смене payout).
+#   Запись — в буферизованный файл из потока бота, flush раз в flush_interval; недописанный
+#   хвост (падение посреди записи) читатели игнорируют, а при следующем открытии он отрезается.
+# - Чтение: load() — NumPy structured array поверх np.memmap (миллион спинов — миллисекунды,
+#   без копирования); без NumPy — JournalView поверх mmap (struct.unpack_from по индексу).
+#   column(path, name) — одна колонка (roll для бэктеста, balance для графиков).
+# - from_text_log() — конвертация уже накопленных текстовых логов (Bot-N.txt и S6-формат).
+# - Если включено SQLite-хранилище (CG_SPINDB, crypto_games_spindb), open_journal подключает его:
+#   каждый спин дополнительно ставится в очередь его писателя. Так же подключаются агрегаты
+#   1 мин / 1 ч / 1 день (crypto_games_rollup, CG_ROLLUPS).
+#
+# Запуск: python crypto_games_journal.py convert Bot-3.txt
+#         python crypto_games_journal.py stats logs/Bot-3.cgj
+#         python crypto_games_journal.py bench 1000000
+
+import argparse
+import atexit
+import mmap
+import os
+import re
+import struct
+import sys
+import threading
+import time
+from array import array
+from datetime import datetime
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+from crypto_games_logview import MODES
+
+MAGIC = b"CGSJ"
+VERSION = 1
+HEADER = struct.Struct("<4sHHd")              # magic, version, размер записи, время создания
+RECORD = struct.Struct("<dQddddffBB6x")       # ts, gspin, bet, profit, balance, roll, payout, L, mode, flags
+FIELDS = ("ts", "gspin", "bet", "profit", "balance", "roll", "payout", "L", "mode", "flags")
+F_WIN = 1
+F_RECOVERY = 2
+EXT = ".cgj"
+FLUSH_INTERVAL = 1.0
+BUFFER_SIZE = 64 << 10
+
+if np is not None:
+    DTYPE = np.dtype([("ts", "<f8"), ("gspin", "<u8"), ("bet", "<f8"), ("profit", "<f8"), ("balance", "<f8"),
+                      ("roll", "<f8"), ("payout", "<f4"), ("L", "<f4"), ("mode", "u1"), ("flags", "u1"),
+                      ("_pad", "V6")])
+    assert DTYPE.itemsize == RECORD.size
+else:
+    DTYPE = None
+
+# Коды режимов — те же, что в индексе истории: имена — суффиксы тегов [WIN-XXX]
+_MODE_CODE = {name: i for i, name in enumerate(MODES) if name}
+_MODE_ALIASES = {"RECOVERY-TRIGGER": "TRIGGER", "R66": "66%"}
+RECOVERY_MODES = {"RECOVERY", "PR", "PERIODIC", "TRIGGER", "66%"}
+
+# Состояние бота → режим (как выбирается префикс строки ставки); первое истинное побеждает
+_STATE_MODES = (
+    ("periodic_recovery_active", "PR"),
+    ("recover66_active", "66%"),
+    ("recovery_active", "RECOVERY"),
+    ("press_active", "PRESS"),
+)
+
+
+def journal_path(log_path: str) -> str:
+    """logs/Bot-1.txt → logs/Bot-1.cgj."""
+    return os.path.splitext(log_path)[0] + EXT
+
+
+def mode_code(mode) -> int:
+    if isinstance(mode, int):
+        return mode if 0 <= mode < len(MODES) else _MODE_CODE["OTHER"]
+    if not mode:
+        return _MODE_CODE["BASE"]
+    name = str(mode).upper()
+    name = _MODE_ALIASES.get(name, name)
+    return _MODE_CODE.get(name, _MODE_CODE["OTHER"])
+
+
+def bot_mode(bot) -> str:
+    """Режим спина по флагам состояния бота (для версий без явной переменной mode)."""
+    for attr, name in _STATE_MODES:
+        if getattr(bot, attr, False):
+            return name
+    return "BASE"
+
+
+# ------------------ Запись ------------------
+class SpinJournal:
+    """Журнал одного бота; append() вызывается из потока бота и не делает syscall на каждый спин."""
+    def __init__(self, path: str, flush_interval: float = FLUSH_INTERVAL, buffer_size: int = BUFFER_SIZE):
+        self.path = path
+        self.flush_interval = max(0.0, float(flush_interval))
+        self._lock = threading.Lock()
+        self._L = 0.0
+        self.errors = 0
+        self.bot = os.path.splitext(os.path.basename(path))[0]
+        self.store = None                       # SpinStore (crypto_games_spindb): копия каждого спина в SQLite
+        self.rollup = None                      # RollupBook (crypto_games_rollup): корзины по времени
+        d = os.path.dirname(path)
+        if d:
+            os.makedirs(d, exist_ok=True)
+        size = os.path.getsize(path) if os.path.exists(path) else 0
+        if size >= HEADER.size:
+            _check_header(path)
+            tail = (size - HEADER.size) % RECORD.size
+            if tail:
+                with open(path, "r+b") as f:
+                    f.truncate(size - tail)         # недописанная запись после падения
+                size -= tail
+        else:
+            size = 0
+        self.count = (size - HEADER.size) // RECORD.size if size else 0
+        if self.count:
+            with open(path, "rb") as f:                 # L продолжается с последней записи
+                f.seek(size - RECORD.size)
+                last = RECORD.unpack(f.read(RECORD.size))
+            self._L = 0.0 if last[9] & F_WIN else float(last[7])
+        self._fh = open(path, "r+b" if size else "wb", buffering=buffer_size)
+        if size:
+            self._fh.seek(size)
+        else:
+            self._fh.write(HEADER.pack(MAGIC, VERSION, RECORD.size, time.time()))
+        self._next_flush = time.monotonic() + self.flush_interval
+
+    def append(self, payout, roll, bet, profit, balance, mode="BASE", recovery=None, ts=None, win=None, L=None):
+        """Записать спин; Decimal/str допустимы, roll/balance None → NaN. L — готовое значение (S6-лог) вместо счёта."""
+        try:
+            payout_f = float(payout or 0)
+            profit_f = float(profit or 0)
+            win = profit_f > 0 if win is None else bool(win)
+            code = mode_code(mode)
+            if recovery is None:
+                recovery = MODES[code] in RECOVERY_MODES
+            flags = (F_WIN if win else 0) | (F_RECOVERY if recovery else 0)
+            try:
+                roll_f = float(roll) if roll is not None else float("nan")
+            except (TypeError, ValueError):
+                roll_f = float("nan")
+            ts_f = time.time() if ts is None else float(ts)
+            bet_f = float(bet or 0)
+            bal_f = float("nan") if balance is None else float(balance)
+            with self._lock:
+                if self._fh is None:
+                    return
+                if L is not None:
+                    self._L = float(L)
+                elif payout_f > 0:
+                    self._L += 1.0 / payout_f
+                rec = RECORD.pack(ts_f, self.count, bet_f, profit_f, bal_f, roll_f, payout_f, self._L, code, flags)
+                if win:
+                    self._L = 0.0
+                self._fh.write(rec)
+                self.count += 1
+                if self.flush_interval == 0 or time.monotonic() >= self._next_flush:
+                    self._fh.flush()
+                    self._next_flush = time.monotonic() + self.flush_interval
+            if self.store is not None:
+                self.store.add_spin(ts_f, self.bot, MODES[code], payout_f, roll_f, bet_f, profit_f, bal_f,
+                                    win, recovery)
+            if self.rollup is not None:
+                self.rollup.add(ts_f, self.bot, bet_f, profit_f, bal_f, win)
+        except Exception as e:
+            self.errors += 1
+            if self.errors == 1:
+                print(f"[journal] {self.path}: {e}")
+
+    def flush(self):
+        with self._lock:
+            if self._fh is not None:
+                self._fh.flush()
+
+    def close(self):
+        with self._lock:
+            if self._fh is not None:
+                try:
+                    self._fh.flush()
+                    self._fh.close()
+                finally:
+                    self._fh = None
+
+
+_journals = {}
+_journals_lock = threading.Lock()
+
+
+def open_journal(log_path: str) -> SpinJournal:
+    """Журнал рядом с текстовым логом бота; один объект на файл в процессе (перезапуск бота — дописывает)."""
+    path = journal_path(log_path)
+    with _journals_lock:
+        j = _journals.get(path)
+        if j is None or j._fh is None:
+            if not _journals:
+                atexit.register(close_all)
+            j = _journals[path] = SpinJournal(path)
+            try:
+                from crypto_games_spindb import spin_store
+                j.store = spin_store()
+            except Exception as e:
+                print(f"[journal] spindb: {e}")
+            try:
+                from crypto_games_rollup import rollup_book
+                j.rollup = rollup_book()
+            except Exception as e:
+                print(f"[journal] rollup: {e}")
+        return j
+
+
+def close_all():
+    with _journals_lock:
+        items = list(_journals.values())
+        _journals.clear()
+    for j in items:
+        try:
+            j.close()
+        except Exception:
+            pass
+
+
+# ------------------ Чтение ------------------
+def _check_header(path: str) -> float:
+    with open(path, "rb") as f:
+        raw = f.read(HEADER.size)
+    if len(raw) < HEADER.size:
+        raise ValueError(f"{path}: нет заголовка журнала")
+    magic, version, rec_size, created = HEADER.unpack(raw)
+    if magic != MAGIC or version != VERSION or rec_size != RECORD.size:
+        raise ValueError(f"{path}: не журнал спинов (magic={magic!r} v{version} rec={rec_size})")
+    return created
+
+
+def record_count(path: str) -> int:
+    size = os.path.getsize(path)
+    return max(0, (size - HEADER.size) // RECORD.size)
+
+
+class JournalView:
+    """Последовательность записей поверх mmap (без NumPy): len, [i], срезы, column()."""
+    def __init__(self, path: str):
+        _check_header(path)
+        self.path = path
+        self.count = record_count(path)
+        self._f = open(path, "rb")
+        self._mm = mmap.mmap(self._f.fileno(), 0, access=mmap.ACCESS_READ) if self.count else None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[k] for k in range(*i.indices(self.count))]
+        if i < 0:
+            i += self.count
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        return RECORD.unpack_from(self._mm, HEADER.size + i * RECORD.size)
+
+    def __iter__(self):
+        if self._mm is None:
+            return iter(())
+        end = HEADER.size + self.count * RECORD.size
+        return RECORD.iter_unpack(memoryview(self._mm)[HEADER.size:end])
+
+    def column(self, name: str) -> array:
+        k = FIELDS.index(name)
+        typ = "Q" if name == "gspin" else ("B" if name in ("mode", "flags") else "d")
+        return array(typ, (rec[k] for rec in self))
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        self._f.close()
+
+
+def load(path: str):
+    """Все записи: NumPy structured array (np.memmap, только чтение) или JournalView без NumPy."""
+    if np is None:
+        return JournalView(path)
+    _check_header(path)
+    n = record_count(path)
+    if n == 0:
+        return np.zeros(0, dtype=DTYPE)
+    return np.memmap(path, dtype=DTYPE, mode="r", offset=HEADER.size, shape=(n,))
+
+
+def column(path: str, name: str):
+    """Одна колонка журнала: ndarray или array.array."""
+    if name not in FIELDS:
+        raise KeyError(name)
+    data = load(path)
+    if np is not None:
+        return np.asarray(data[name])
+    try:
+        return data.column(name)
+    finally:
+        data.close()
+
+
+def iter_records(path: str):
+    """Записи как dict (для отчётов и небольших выборок)."""
+    view = JournalView(path)
+    try:
+        for rec in view:
+            yield dict(zip(FIELDS, rec))
+    finally:
+        view.close()
+
+
+def summarize(path: str) -> dict:
+    """Сводка журнала: спины, WIN, профит, диапазон баланса, максимальный L, доля recovery."""
+    data = load(path)
+    if np is not None:
+        n = len(data)
+        if n == 0:
+            return {"spins": 0}
+        flags = data["flags"]
+        bal = data["balance"]
+        bal = bal[~np.isnan(bal)]
+        return {"spins": n, "wins": int(np.count_nonzero(flags & F_WIN)),
+                "recovery": int(np.count_nonzero(flags & F_RECOVERY)),
+                "profit": float(data["profit"].sum()),
+                "balance_min": float(bal.min()) if len(bal) else None,
+                "balance_max": float(bal.max()) if len(bal) else None,
+                "balance_last": float(bal[-1]) if len(bal) else None, "max_L": float(data["L"].max()),
+                "t0": float(data["ts"][0]), "t1": float(data["ts"][-1])}
+    try:
+        n = len(data)
+        if n == 0:
+            return {"spins": 0}
+        wins = rec_n = 0
+        profit = 0.0
+        bmin = bmax = blast = None
+        max_l = 0.0
+        for rec in data:
+            f = rec[9]
+            wins += f & F_WIN
+            rec_n += 1 if f & F_RECOVERY else 0
+            profit += rec[3]
+            b = rec[4]
+            if b == b:                              # NaN — баланс неизвестен (конвертированный лог)
+                bmin = b if bmin is None or b < bmin else bmin
+                bmax = b if bmax is None or b > bmax else bmax
+                blast = b
+            max_l = rec[7] if rec[7] > max_l else max_l
+        return {"spins": n, "wins": wins, "recovery": rec_n, "profit": profit, "balance_min": bmin,
+                "balance_max": bmax, "balance_last": blast, "max_L": max_l,
+                "t0": data[0][0], "t1": data[-1][0]}
+    finally:
+        data.close()
+
+
+def format_summary(s: dict) -> str:
+    if not s.get("spins"):
+        return "journal: 0 spins"
+    wr = s["wins"] / s["spins"] * 100
+    bal = "" if s["balance_min"] is None else f"balance {s['balance_min']:.8f}..{s['balance_max']:.8f}, "
+    return (f"journal: {s['spins']:,} spins, WIN {s['wins']:,} ({wr:.2f}%), profit {s['profit']:+.8f}, "
+            f"{bal}max L {s['max_L']:.2f}")
+
+
+# ------------------ Конвертация текстовых логов ------------------
+_TS_RE = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})")
+_TAG_RE = re.compile(r"\[(WIN|LOSS)(?:-([A-Z0-9_%]+))?\]")
+_NUM_RES = {k: re.compile(rf"\b{k}=(-?[0-9]+(?:\.[0-9]+)?)") for k in
+            ("payout", "roll", "bet", "profit", "bal", "balance", "L")}
+
+
+def from_text_log(log_path: str, out_path: str = None) -> int:
+    """Перевести текстовый лог (Bot-N.txt / S6) в журнал; возвращает число спинов. Старый журнал заменяется."""
+    out_path = out_path or journal_path(log_path)
+    tmp = out_path + ".part"
+    if os.path.exists(tmp):
+        os.remove(tmp)
+    j = SpinJournal(tmp, flush_interval=3600)
+    try:
+        with open(log_path, "r", encoding="utf-8", errors="replace") as f:
+            for line in f:
+                m = _TAG_RE.search(line)
+                if m is None:
+                    continue
+                vals = {}
+                for k, rx in _NUM_RES.items():
+                    v = rx.search(line, m.end())
+                    if v is not None:
+                        vals[k] = float(v.group(1))
+                if "payout" not in vals:
+                    continue
+                win = m.group(1) == "WIN"
+                bet = vals.get("bet", 0.0)
+                profit = vals.get("profit")
+                if profit is None:
+                    profit = bet * (vals["payout"] - 1) if win else -bet
+                balance = vals.get("bal", vals.get("balance"))
+                t = _TS_RE.match(line)
+                ts = datetime.strptime(t.group(1), "%Y-%m-%d %H:%M:%S").timestamp() if t else 0.0
+                j.append(vals["payout"], vals.get("roll"), bet, profit, balance,
+                         mode=m.group(2) or "BASE", ts=ts, win=win, L=vals.get("L"))
+    finally:
+        j.close()
+    os.replace(tmp, out_path)
+    return j.count
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Crypto.Games binary spin journal")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    c = sub.add_parser("convert", help="текстовый лог → .cgj")
+    c.add_argument("logs", nargs="+")
+    s = sub.add_parser("stats", help="сводка журнала")
+    s.add_argument("journals", nargs="+")
+    b = sub.add_parser("bench", help="запись/чтение N спинов")
+    b.add_argument("n", type=int, nargs="?", default=1000000)
+    b.add_argument("--path", default="bench.cgj")
+    args = ap.parse_args(argv)
+
+    if args.cmd == "convert":
+        for path in args.logs:
+            t0 = time.perf_counter()
+            n = from_text_log(path)
+            print(f"{path} → {journal_path(path)}: {n} spins ({time.perf_counter() - t0:.2f}s)")
+    elif args.cmd == "stats":
+        for path in args.journals:
+            print(f"{path}: {format_summary(summarize(path))}")
+    else:
+        if os.path.exists(args.path):
+            os.remove(args.path)
+        j = SpinJournal(args.path)
+        t0 = time.perf_counter()
+        for k in range(args.n):
+            j.append(100 + k % 9900, (k * 7919 % 10000) / 100.0, 0.00000100, -0.000001, 1.0 - k * 1e-6)
+        j.close()
+        t_w = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        data = load(args.path)
+        rolls = column(args.path, "roll")
+        t_r = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        summarize(args.path)
+        t_s = time.perf_counter() - t0
+        print(f"spins={args.n} write={t_w / args.n * 1e6:.2f} µs/spin load+roll column={t_r * 1e3:.1f} ms "
+              f"summary={t_s * 1e3:.1f} ms ({'numpy' if np is not None else 'mmap'}) "
+              f"size={os.path.getsize(args.path) / 1e6:.1f} MB len={len(data)} rolls={len(rolls)}")
+        if np is None:
+            data.close()
+        os.remove(args.path)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
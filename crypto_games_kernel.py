@@ -0,0 +1,498 @@
+#!/usr/bin/env python3
+# Crypto.Games — решение на один спин как чистая функция (Recovery / Recovery-Trigger / Base / Press)
+#
+# Зачем:
+# - Выбор режима, payout и ставки в Version36_Version13 жил внутри 300-строчного start()
+#   вперемешку с логами, менеджером и try/except вокруг каждого сравнения.
+# - Здесь то же решение — функции без побочных эффектов над простыми числами
+#   (состояние → (mode, payout, bet, ...)); вызывающий сам меняет своё состояние и пишет лог.
+# - Одни и те же функции работают в Decimal (живой цикл: _q8 = quantize_bet) и во float
+#   (бэктест по записанным roll, Monte Carlo: _q8 = floor8). В теле ядра поэтому только
+#   целые литералы и арифметика, общая для Decimal и float.
+# - Если установлен numba — float-вариант (float_kernel) компилируется njit, включая прогон
+#   пути целиком (run_path); без numba те же функции работают как обычный Python.
+#
+# Режимы: MODE_BASE, MODE_RECOVERY, MODE_RECOVERY_TRIGGER, MODE_PRESS (MODE_NAMES — строки для лога).
+#
+# Запуск: python crypto_games_kernel.py --spins 200000 --paths 8
+#         python crypto_games_kernel.py --rolls Bot-3.txt            (бэктест по roll из лога)
+#         python crypto_games_kernel.py --rolls logs/Bot-3.cgj       (то же из журнала спинов)
+
+import argparse
+import math
+import re
+import sys
+import time
+import types
+from typing import NamedTuple
+
+from crypto_games_sizing import quantize_bet
+
+try:
+    import numpy as np
+except Exception:
+    np = None
+
+try:
+    from numba import njit
+except Exception:
+    njit = None
+
+MODE_BASE = 0
+MODE_RECOVERY = 1
+MODE_RECOVERY_TRIGGER = 2
+MODE_PRESS = 3
+MODE_NAMES = ("BASE", "RECOVERY", "RECOVERY-TRIGGER", "PRESS")
+
+# Статус решения
+OK = 0
+NO_FUNDS_RECOVERY = 1     # recovery-ставка больше баланса, а баланс меньше min_bet
+NO_FUNDS = 2              # итоговая ставка больше баланса
+
+# Причина включения Press
+PRESS_NONE = 0
+PRESS_HIGHROLL_99 = 1
+PRESS_5_8_ROLL_90 = 2
+
+NO_ROLL = -1              # roll ещё не было (вместо None: numba не знает Optional в арифметике)
+
+
+# ------------------ Kernel (Decimal по умолчанию) ------------------
+def _q8(x):
+    return quantize_bet(x)
+
+
+def _zero(x):
+    """Ноль того же типа, что x (Decimal или float)."""
+    return x - x
+
+
+def roll_in_range(roll, lo, hi):
+    """Roll в [lo, hi]; NO_ROLL — не попадает."""
+    return roll >= 0 and lo <= roll <= hi
+
+
+def auto_recovery_due(active, enabled, threshold, baseline, balance):
+    """Авто-старт Recovery: просадка от baseline (last_successful_bank) не меньше threshold USDT."""
+    return (not active) and enabled and threshold > 0 and baseline > 0 and balance <= baseline - threshold
+
+
+def activation_loss(initial, balance):
+    d = initial - balance
+    return d if d > 0 else _zero(d)
+
+
+def recovery_bet(balance, payout, target, min_bet_eff, baseline, intensity, cap_pct, max_bet):
+    """
+    adj_T = T·(1 + intensity·relative_dd), need = adj_T/(payout-1),
+    ставка = min(need, cap_pct·bank) не ниже min_bet, не выше max_bet (без лимита — inf) и баланса.
+    Возвращает (bet, relative_dd, adj_T, need, cap_abs).
+    """
+    zero = _zero(balance)
+    if payout <= 1:
+        payout = _zero(payout) + 2
+    denom = baseline if baseline > 0 else balance
+    if denom == 0:
+        rdd = zero
+    else:
+        rdd = (baseline - balance) / denom
+        if rdd < 0:
+            rdd = zero
+        if rdd > 1:
+            rdd = zero + 1
+    adj_T = target * (1 + intensity * rdd)
+    need = adj_T / (payout - 1) if adj_T > 0 else min_bet_eff
+    if cap_pct <= 0:
+        cap_pct = (zero + 1) / 100
+    cap_abs = balance * cap_pct
+    bet = need if need < cap_abs else cap_abs
+    if bet < min_bet_eff:
+        bet = min_bet_eff
+    bet = _q8(bet)
+    if bet > max_bet:
+        bet = max_bet
+    if bet > balance:
+        bet = _q8(balance)
+    return bet, rdd, adj_T, need, cap_abs
+
+
+def decide(recovery_active, balance, baseline, last_roll, trig_threshold, trig_pct_bank, trig_payout,
+           sched_payout, pct_act, pct_total, act_loss, losses_so_far, initial,
+           base_payout, base_bet, min_bet_enforced, min_bet_eff, intensity, cap_pct, max_bet):
+    """
+    Один спин: (mode, payout, bet, status, target, relative_dd, adj_T, need, cap_abs).
+    act_loss — уже пересчитанная activation_loss(initial, balance); initial — для цели триггера
+    при нулевом балансе. MODE_RECOVERY_TRIGGER «съедает» last_roll — вызывающий сбрасывает его.
+    """
+    zero = _zero(balance)
+    status = OK
+    rdd = zero
+    adj_T = zero
+    need = zero
+    cap_abs = zero
+    target = zero
+    if recovery_active:
+        if last_roll >= 0 and last_roll >= trig_threshold and trig_pct_bank > 0:
+            mode = MODE_RECOVERY_TRIGGER
+            payout = trig_payout
+            target = trig_pct_bank * (balance if balance > 0 else initial)
+        else:
+            mode = MODE_RECOVERY
+            payout = sched_payout
+            target = pct_act * act_loss + pct_total * losses_so_far
+        if balance <= 0:
+            bet = min_bet_eff
+        else:
+            bet, rdd, adj_T, need, cap_abs = recovery_bet(balance, payout, target, min_bet_eff, baseline,
+                                                          intensity, cap_pct, max_bet)
+        if bet > balance:
+            if balance >= min_bet_eff:
+                bet = _q8(balance)
+            else:
+                status = NO_FUNDS_RECOVERY
+    else:
+        mode = MODE_BASE
+        payout = base_payout
+        bet = base_bet if base_bet > min_bet_enforced else min_bet_enforced
+    bet = _q8(bet)
+    if status == OK and bet > balance:
+        status = NO_FUNDS
+    return mode, payout, bet, status, target, rdd, adj_T, need, cap_abs
+
+
+def schedule_len(mn, mx, step):
+    """Длина целочисленного расписания Recovery mn..mx с шагом step (как ArithmeticRange.between)."""
+    return (mx - mn) // step + 1
+
+
+def schedule_at(mn, mx, step, desc, i):
+    return mx - i * step if desc else mn + i * step
+
+
+def recovery_after(win, mode, bet, losses_so_far, idx, n, stride):
+    """
+    После спина в Recovery: LOSS копит losses_so_far, в MODE_RECOVERY сдвигает индекс расписания на stride.
+    Возвращает (losses_so_far, idx, reversed) — reversed: расписание пройдено, направление меняется.
+    """
+    if win:
+        return losses_so_far, idx, False
+    losses_so_far = losses_so_far + bet
+    if mode != MODE_RECOVERY:
+        return losses_so_far, idx, False
+    if stride <= 0:
+        stride = 1
+    idx += stride
+    if idx >= n:
+        return losses_so_far, 0, True
+    return losses_so_far, idx, False
+
+
+def press_plan(press_bet, max_bet, balance):
+    """Ставка Press (не выше max_bet) и хватает ли на неё баланса: (bet, ok)."""
+    bet = _q8(press_bet)
+    if bet > max_bet:
+        bet = max_bet
+    return bet, bet <= balance
+
+
+def press_after(win, left):
+    """(active, left) после спина Press: WIN — конец, LOSS — минус спин."""
+    if win:
+        return False, 0
+    left -= 1
+    return left > 0, left
+
+
+def press_trigger(enable_highroll_99, payout, roll):
+    """
+    Включение Press по итогу основного спина: (payout Press, причина), 0 — не включать.
+    roll ≥ 99 (если enable_highroll_99) → 100; payout 5..8 и roll ≥ 90 → 10.
+    """
+    if roll < 0:
+        return 0, PRESS_NONE
+    if enable_highroll_99 and roll >= 99:
+        return 100, PRESS_HIGHROLL_99
+    if 5 <= payout <= 8 and roll >= 90:
+        return 10, PRESS_5_8_ROLL_90
+    return 0, PRESS_NONE
+
+
+# ------------------ Float path: backtest / Monte Carlo ------------------
+class KernelParams(NamedTuple):
+    """Настройки пути для float-прогона (NamedTuple — numba принимает его как аргумент njit)."""
+    initial_bank: float = 100.0
+    min_payout: int = 100
+    max_payout: int = 9999
+    base_bet: float = 0.001
+    min_bet: float = 0.001
+    max_bet: float = 1.0
+    edge_pct: float = 1.0
+    recovery_enabled: bool = True
+    auto_threshold_usdt: float = 1.0
+    pct_activation: float = 0.1
+    pct_total_losses: float = 0.5
+    trigger_threshold: float = 95.0
+    trigger_pct_bank: float = 0.0
+    trigger_payout: float = 5.0
+    rec_payout_min: int = 50
+    rec_payout_max: int = 1000
+    rec_payout_step: int = 2
+    rec_desc: bool = True
+    rec_stride: int = 1
+    cap_pct: float = 0.01
+    intensity: float = 0.5
+    press_enabled: bool = True
+    press_bet: float = 0.1
+    enable_highroll_99: bool = False
+
+
+def _floor8(x):
+    """Аналог quantize_bet (ROUND_DOWN до 8 знаков) для float."""
+    return math.floor(x * 1e8 + 1e-6) / 1e8
+
+
+def _xorshift32(x):
+    x ^= (x << 13) & 0xFFFFFFFF
+    x ^= x >> 17
+    x ^= (x << 5) & 0xFFFFFFFF
+    return x
+
+
+def run_path(p, spins, seed, rolls, n_rolls):
+    """
+    Один путь бота Version36_Version13 во float на функциях ядра.
+    n_rolls > 0 — roll берутся из rolls (бэктест), иначе из xorshift32(seed) (одинаково с numba и без).
+    Возвращает (balance, spins, wins, max_dd, min_balance, recoveries, presses, wraps, status).
+    """
+    bal = p.initial_bank
+    initial = bal
+    lsb = bal
+    peak = bal
+    max_dd = 0.0
+    min_bal = bal
+    win_factor = 100.0 - p.edge_pct
+    x = (seed * 2654435761 + 1) & 0xFFFFFFFF
+    if x == 0:
+        x = 1
+    base_cur = p.min_payout
+    wraps = 0
+    rec = False
+    rec_desc = p.rec_desc
+    rec_n = schedule_len(p.rec_payout_min, p.rec_payout_max, p.rec_payout_step)
+    rec_idx = 0
+    act_loss = 0.0
+    losses = 0.0
+    last_roll = -1.0
+    recoveries = 0
+    press_active = False
+    press_left = 0
+    press_payout = 0.0
+    presses = 0
+    wins = 0
+    status = OK
+    done = 0
+    min_bet_eff = p.min_bet if p.min_bet > 0.001 else 0.001
+    if n_rolls > 0 and spins > n_rolls:
+        spins = n_rolls
+    r_i = 0
+    while done < spins:
+        if auto_recovery_due(rec, p.recovery_enabled, p.auto_threshold_usdt, lsb, bal):
+            rec = True
+            recoveries += 1
+            act_loss = activation_loss(initial, bal)
+            losses = 0.0
+            rec_idx = 0
+            last_roll = -1.0
+        if rec:
+            act_loss = activation_loss(initial, bal)
+        payout_base = float(base_cur)
+        if not rec:
+            base_cur += 1
+            if base_cur > p.max_payout:
+                base_cur = p.min_payout
+                wraps += 1
+        sched = float(schedule_at(p.rec_payout_min, p.rec_payout_max, p.rec_payout_step, rec_desc, rec_idx))
+        mode, payout, bet, status, _t, _r, _a, _n, _c = decide(
+            rec, bal, lsb, last_roll, p.trigger_threshold, p.trigger_pct_bank, p.trigger_payout,
+            sched, p.pct_activation, p.pct_total_losses, act_loss, losses, initial,
+            payout_base, p.base_bet, p.min_bet, min_bet_eff, p.intensity, p.cap_pct, p.max_bet)
+        if status != OK:
+            break
+        if n_rolls > 0:
+            roll = rolls[r_i]
+            r_i += 1
+        else:
+            x = _xorshift32(x)
+            roll = (x % 1000000) / 10000.0
+        win = roll >= 100.0 - win_factor / payout
+        bal = bal + (bet * (payout - 1.0) if win else -bet)
+        last_roll = roll
+        done += 1
+        if win:
+            wins += 1
+            if bal > lsb:
+                lsb = bal
+            if rec and bal >= lsb:
+                rec = False
+        if rec:
+            if not win:
+                losses, rec_idx, rev = recovery_after(win, mode, bet, losses, rec_idx, rec_n, p.rec_stride)
+                if rev:
+                    rec_desc = not rec_desc
+        if press_active and press_left > 0 and done < spins:
+            pbet, ok = press_plan(p.press_bet, p.max_bet, bal)
+            if ok:
+                if n_rolls > 0:
+                    roll2 = rolls[r_i]
+                    r_i += 1
+                else:
+                    x = _xorshift32(x)
+                    roll2 = (x % 1000000) / 10000.0
+                win2 = roll2 >= 100.0 - win_factor / press_payout
+                bal = bal + (pbet * (press_payout - 1.0) if win2 else -pbet)
+                done += 1
+                if win2:
+                    wins += 1
+                    if bal > lsb:
+                        lsb = bal
+                    if rec and bal >= lsb:
+                        rec = False
+                press_active, press_left = press_after(win2, press_left)
+        if p.press_enabled:
+            pp, _reason = press_trigger(p.enable_highroll_99, payout, roll)
+            if pp > 0:
+                press_active = True
+                press_left = 2
+                press_payout = float(pp)
+                presses += 1
+        if rec and bal >= lsb:
+            rec = False
+        if bal > peak:
+            peak = bal
+        if peak - bal > max_dd:
+            max_dd = peak - bal
+        if bal < min_bal:
+            min_bal = bal
+    return bal, done, wins, max_dd, min_bal, recoveries, presses, wraps, status
+
+
+_KERNEL_FUNCS = ("_zero", "roll_in_range", "auto_recovery_due", "activation_loss", "recovery_bet", "decide",
+                 "schedule_len", "schedule_at", "recovery_after", "press_plan", "press_after", "press_trigger",
+                 "_xorshift32", "run_path")
+
+_float_ns = None
+
+
+def _rebind(fn, g):
+    return types.FunctionType(fn.__code__, g, fn.__name__, fn.__defaults__, fn.__closure__)
+
+
+def float_kernel(use_numba: bool = True):
+    """
+    Float-вариант ядра: те же функции с _q8 = floor8, общее пространство имён;
+    при наличии numba — njit (компиляция при первом вызове). Результат кэшируется.
+    """
+    global _float_ns
+    jit = use_numba and njit is not None
+    if _float_ns is not None and _float_ns.numba == jit:
+        return _float_ns
+    g = dict(globals())
+    g["_q8"] = _rebind(_floor8, g)
+    for name in _KERNEL_FUNCS:
+        g[name] = _rebind(globals()[name], g)
+    if jit:
+        for name in ("_q8",) + _KERNEL_FUNCS:
+            g[name] = njit(g[name])
+    ns = types.SimpleNamespace(numba=jit, **{name.lstrip("_"): g[name] for name in ("_q8",) + _KERNEL_FUNCS})
+    _float_ns = ns
+    return ns
+
+
+def _rolls_array(rolls):
+    if np is not None:
+        return np.asarray(rolls, dtype=np.float64)
+    return [float(r) for r in rolls]
+
+
+def monte_carlo(params: KernelParams = None, spins: int = 100000, paths: int = 8, seed: int = 1,
+                use_numba: bool = True):
+    """Пути с seed, seed+1, ...; строки результата run_path (numpy-массив, если numpy есть)."""
+    params = params or KernelParams()
+    k = float_kernel(use_numba)
+    empty = _rolls_array([])
+    out = [k.run_path(params, int(spins), int(seed) + i, empty, 0) for i in range(int(paths))]
+    if np is not None:
+        return np.asarray(out, dtype=np.float64)
+    return out
+
+
+def backtest(params: KernelParams, rolls, use_numba: bool = True):
+    """Прогон по записанной последовательности roll (основные и Press-спины подряд)."""
+    arr = _rolls_array(rolls)
+    k = float_kernel(use_numba)
+    return k.run_path(params, len(arr), 0, arr, len(arr))
+
+
+_ROLL_RE = re.compile(r"\broll=([0-9]+(?:\.[0-9]+)?)")
+
+
+def rolls_from_log(path: str):
+    """roll из строк [WIN]/[LOSS]* лога бота, в порядке записи; .cgj — из бинарного журнала спинов."""
+    if path.endswith(".cgj"):
+        from crypto_games_journal import column
+        rolls = column(path, "roll")
+        if np is not None:
+            return rolls[~np.isnan(rolls)].astype(np.float64)
+        return [r for r in rolls if r == r]
+    rolls = []
+    with open(path, "r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            if "[WIN" not in line and "[LOSS" not in line:
+                continue
+            m = _ROLL_RE.search(line)
+            if m:
+                rolls.append(float(m.group(1)))
+    return rolls
+
+
+def _format_row(row) -> str:
+    bal, done, wins, max_dd, min_bal, recs, presses, wraps, status = row
+    return (f"balance={bal:.8f} spins={int(done)} wins={int(wins)} max_dd={max_dd:.8f} min={min_bal:.8f} "
+            f"recoveries={int(recs)} presses={int(presses)} wraps={int(wraps)} status={int(status)}")
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Crypto.Games spin kernel: Monte Carlo / backtest (Version36 modes)")
+    ap.add_argument("--spins", type=int, default=200000)
+    ap.add_argument("--paths", type=int, default=4)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--bank", type=float, default=100.0)
+    ap.add_argument("--min-payout", type=int, default=100)
+    ap.add_argument("--max-payout", type=int, default=9999)
+    ap.add_argument("--auto-threshold", type=float, default=1.0)
+    ap.add_argument("--rolls", help="лог бота (.txt) или журнал (.cgj): бэктест по его roll вместо RNG")
+    ap.add_argument("--no-numba", action="store_true")
+    args = ap.parse_args(argv)
+
+    params = KernelParams(initial_bank=args.bank, min_payout=args.min_payout, max_payout=args.max_payout,
+                          auto_threshold_usdt=args.auto_threshold)
+    use_numba = not args.no_numba
+    t0 = time.perf_counter()
+    if args.rolls:
+        rolls = rolls_from_log(args.rolls)
+        rows = [backtest(params, rolls, use_numba)]
+        print(f"backtest {args.rolls}: {len(rolls)} rolls")
+    else:
+        rows = monte_carlo(params, args.spins, args.paths, args.seed, use_numba)
+    dt = time.perf_counter() - t0
+    total = 0
+    for i, row in enumerate(rows):
+        total += int(row[1])
+        print(f"path {i}: {_format_row(row)}")
+    rate = total / dt if dt > 0 else 0.0
+    print(f"numba={float_kernel(use_numba).numba} spins={total} time={dt:.2f}s rate={rate:.0f}/s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
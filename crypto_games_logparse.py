@@ -0,0 +1,562 @@
+#!/usr/bin/env python3
+# Crypto.Games — потоковый разбор логов ботов: logs_parsed.csv + summary.csv + <file>.report.txt за один проход
+#
+# Зачем:
+# - logs_parsed.csv, summary.csv и *.report.txt делал внешний скрипт, которого нет в репозитории;
+#   он читал файлы целиком и понимал не все форматы.
+# - Здесь один проход по каждому файлу, память — O(1) на файл (хвост незакрытых gspin ограничен
+#   PENDING_WINDOW, список примеров аномалий — MAX_EXAMPLES):
+#   * [Bot-N] [WIN|LOSS-…] spin 12 / spin=12 payout=… roll=… bet=… profit=…   (боты этого репозитория);
+#   * [S6] [WIN|LOSS] payout=1000 HI bet=… profit=… bal=… i=1 F=1 spins_in_level=… L=…;
+#   * записи pre / post / result с sid=… gspin=… (тег [PRE] / [POST] / [RESULT] или слово pre/post/result).
+# - Файлы разбираются параллельно (ProcessPoolExecutor); каждый процесс пишет свою часть CSV
+#   во временный файл, родитель склеивает их в порядке аргументов.
+# - FileStats — агрегаты и счётчики аномалий одного файла (как в bot.txt.report.txt):
+#   missing pre/post/result, смена SID, немонотонный gspin, скачки spins2 / i2,
+#   уменьшение L на LOSS, расхождение bet между pre и result.
+#
+# - IncrementalParser (--incremental / --follow): смещение, хеш начала и состояние FileStats каждого
+#   файла сохраняются в logparse_state.json; следующий запуск читает только дописанные байты
+#   (недописанная последняя строка ждёт следующего раза), summary.csv и отчёты обновляются сразу.
+#
+# Запуск: python crypto_games_logparse.py bot.txt Bot-*.txt --out . --workers 4
+#         python crypto_games_logparse.py bot.txt --incremental          (только новое с прошлого раза)
+#         python crypto_games_logparse.py logs/*.txt --follow 5          (живое обновление summary.csv)
+
+import argparse
+import csv
+import glob
+import hashlib
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from decimal import Decimal, InvalidOperation
+
+PARSED_COLUMNS = ("ts", "bot", "type", "spin", "payout", "roll", "bet", "profit", "raw")
+SUMMARY_COLUMNS = ("file", "results", "wins", "losses", "winrate_pct", "profit_sum", "bet_sum", "avg_bet",
+                   "min_bal", "max_bal", "missing_pre", "missing_post", "missing_result", "sid_changes",
+                   "spins_jumps", "i_jumps", "L_decrease_on_loss", "bet_mismatch_pre_vs_result")
+PENDING_WINDOW = 256            # gspin, на которые ещё могут прийти pre/post/result
+MAX_EXAMPLES = 50
+Q8 = Decimal("0.00000001")
+
+_TS_RE = re.compile(r"^(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2}|\d{2}:\d{2}:\d{2})")
+_TAG_RE = re.compile(r"\[([^\]\s]+)\]")
+_KV_RE = re.compile(r"\b([A-Za-z_][A-Za-z0-9_]*)=([^\s,;]+)")
+_SPIN_RE = re.compile(r"\bspin[ =](\d+)")
+_KIND_WORD_RE = re.compile(r"\b(pre|post|result)\b", re.I)
+_OUTCOME_RE = re.compile(r"\b(WIN|LOSS)\b")
+
+
+def _dec(s):
+    if s is None:
+        return None
+    try:
+        return Decimal(s.rstrip("%"))
+    except (InvalidOperation, ValueError):
+        return None
+
+
+def parse_line(line: str):
+    """
+    dict записи или None: kind ('result' / 'pre' / 'post'), ts, bot, type (WIN / LOSS-PRESS / ...),
+    win, spin и поля key=value как строки (payout, roll, bet, profit, bal, sid, gspin, spins2, i2, L, ...).
+    """
+    if "=" not in line:
+        return None
+    tags = _TAG_RE.findall(line)
+    kind = None
+    typ = ""
+    bot = ""
+    for t in tags:
+        u = t.upper()
+        if u.startswith(("WIN", "LOSS")):
+            typ = typ or u
+        elif u in ("PRE", "POST", "RESULT"):
+            kind = u.lower()
+        elif not bot:
+            bot = t
+    if kind is None:
+        if typ:
+            kind = "result"
+        else:
+            m = _KIND_WORD_RE.search(line)
+            if m is None:
+                return None
+            kind = m.group(1).lower()
+    kv = dict(_KV_RE.findall(line))
+    if kind == "result" and not typ:
+        m = _OUTCOME_RE.search(line)
+        if m is not None:
+            typ = m.group(1)
+        else:
+            p = _dec(kv.get("profit"))
+            typ = "WIN" if (p is not None and p > 0) else "LOSS"
+    m = _TS_RE.match(line)
+    rec = kv
+    rec["kind"] = kind
+    rec["ts"] = m.group(1) if m else ""
+    rec["bot"] = bot
+    rec["type"] = typ
+    rec["win"] = typ.startswith("WIN")
+    if "spin" not in rec:
+        s = _SPIN_RE.search(line)
+        rec["spin"] = s.group(1) if s else rec.get("gspin", "")
+    # S6: spins_in_level / i — те же счётчики, что spins2 / i2 в pre/post/result
+    if "spins2" not in rec and "spins_in_level" in rec:
+        rec["spins2"] = rec["spins_in_level"]
+    if "i2" not in rec and "i" in rec:
+        rec["i2"] = rec["i"]
+    if "bal" not in rec and "balance" in rec:
+        rec["bal"] = rec["balance"]
+    return rec
+
+
+class FileStats:
+    """Агрегаты и аномалии одного лога; feed(rec) по порядку строк, finish() в конце."""
+    def __init__(self, name: str):
+        self.name = name
+        self.results = 0
+        self.wins = 0
+        self.profit_sum = Decimal("0")
+        self.bet_sum = Decimal("0")
+        self.min_bal = None
+        self.max_bal = None
+        self.missing_pre = 0
+        self.missing_post = 0
+        self.missing_result = 0
+        self.sid_changes = 0
+        self.gspin_nonmono = 0
+        self.spins_jumps = 0
+        self.i_jumps = 0
+        self.L_decrease_on_loss = 0
+        self.bet_mismatch = 0
+        self.examples = []
+        self.has_prepost = False
+        self.lines = 0
+        # состояние между строками
+        self._sid = None
+        self._gspin = None
+        self._spins2 = None
+        self._i2 = None
+        self._L = None
+        self._last_win = False
+        self._pending = {}                      # (sid, gspin) → [pre, post, result, pre_bet]
+
+    def _example(self, text: str):
+        if len(self.examples) < MAX_EXAMPLES:
+            self.examples.append(text)
+
+    def feed(self, rec: dict):
+        kind = rec["kind"]
+        sid = rec.get("sid")
+        gspin = rec.get("gspin")
+        if sid is not None:
+            if self._sid is not None and sid != self._sid:
+                self.sid_changes += 1
+                self._example(f"SID change gspin={gspin}: {self._sid} -> {sid}")
+                self._gspin = None
+            self._sid = sid
+        if gspin is not None:
+            try:
+                g = int(gspin)
+            except ValueError:
+                g = None
+            if g is not None:
+                self._track(kind, g, rec)
+        if kind == "pre":
+            self.has_prepost = True
+        elif kind == "post":
+            self.has_prepost = True
+        else:
+            self._result(rec)
+
+    def _track(self, kind: str, g: int, rec: dict):
+        key = (self._sid, g)
+        if kind == "pre" and self._gspin is not None and g < self._gspin:
+            self.gspin_nonmono += 1
+            self._example(f"non-monotonic gspin sid={self._sid}: {self._gspin} -> {g}")
+        if self._gspin is None or g > self._gspin:
+            self._gspin = g
+        slot = self._pending.get(key)
+        if slot is None:
+            slot = self._pending[key] = [False, False, False, None]
+        if kind == "pre":
+            slot[0] = True
+            slot[3] = rec.get("bet")
+        elif kind == "post":
+            slot[1] = True
+        else:
+            slot[2] = True
+            pre_bet, bet = slot[3], rec.get("bet")
+            if pre_bet is not None and bet is not None and _dec(pre_bet) != _dec(bet):
+                self.bet_mismatch += 1
+                self._example(f"bet mismatch gspin={g}: pre={_dec(pre_bet):.8f} result={_dec(bet):.8f}")
+        if len(self._pending) > PENDING_WINDOW:
+            self._close_pending(self._gspin - PENDING_WINDOW // 2)
+
+    def _close_pending(self, below=None):
+        for key in [k for k in self._pending if below is None or k[1] < below]:
+            pre, post, res, _ = self._pending.pop(key)
+            if not self.has_prepost:
+                continue
+            self.missing_pre += not pre
+            self.missing_post += not post
+            self.missing_result += not res
+
+    def _result(self, rec: dict):
+        self.results += 1
+        win = rec["win"]
+        self.wins += win
+        bet = _dec(rec.get("bet")) or Decimal("0")
+        profit = _dec(rec.get("profit"))
+        if profit is None:
+            payout = _dec(rec.get("payout")) or Decimal("0")
+            profit = bet * (payout - 1) if win else -bet
+        self.bet_sum += bet
+        self.profit_sum += profit
+        bal = _dec(rec.get("bal"))
+        if bal is not None:
+            self.min_bal = bal if self.min_bal is None or bal < self.min_bal else self.min_bal
+            self.max_bal = bal if self.max_bal is None or bal > self.max_bal else self.max_bal
+        where = f"sid={self._sid} gspin={rec.get('gspin')}" if self._sid is not None else f"spin={rec.get('spin')}"
+        i2 = _int_or_none(rec.get("i2"))
+        if i2 is not None and self._i2 is not None and abs(i2 - self._i2) > 1 and i2 != 1:
+            self.i_jumps += 1
+            self._example(f"i2 jump {where}: {self._i2} -> {i2}")
+        spins2 = _int_or_none(rec.get("spins2"))
+        if (spins2 is not None and self._spins2 is not None and spins2 != self._spins2 + 1 and spins2 > 1
+                and not self._last_win and i2 == self._i2):
+            self.spins_jumps += 1
+            self._example(f"spins2 jump {where}: {self._spins2} -> {spins2}")
+        L = _dec(rec.get("L"))
+        if L is not None and self._L is not None and not win and not self._last_win and L < self._L:
+            self.L_decrease_on_loss += 1
+            self._example(f"L decreased on LOSS {where}: {self._L:.8f} -> {L:.8f}")
+        self._i2 = i2 if i2 is not None else self._i2
+        self._spins2 = spins2 if spins2 is not None else self._spins2
+        self._L = L if L is not None else self._L
+        self._last_win = win
+
+    def finish(self):
+        self._close_pending()
+
+    # -- состояние для инкрементального режима --
+    _DEC_FIELDS = ("profit_sum", "bet_sum", "min_bal", "max_bal", "_L")
+
+    def to_state(self) -> dict:
+        """JSON-совместимый снимок всех агрегатов и межстрочного состояния."""
+        st = dict(self.__dict__)
+        for k in self._DEC_FIELDS:
+            st[k] = None if st[k] is None else str(st[k])
+        st["examples"] = list(self.examples)
+        st["_pending"] = [[sid, g] + list(slot) for (sid, g), slot in self._pending.items()]
+        return st
+
+    @classmethod
+    def from_state(cls, st: dict) -> "FileStats":
+        self = cls(st["name"])
+        for k, v in st.items():
+            if k in self.__dict__:
+                setattr(self, k, v)
+        for k in self._DEC_FIELDS:
+            v = st.get(k)
+            setattr(self, k, None if v is None else Decimal(v))
+        self.examples = list(st.get("examples", ()))
+        self._pending = {(row[0], row[1]): row[2:] for row in st.get("_pending", ())}
+        return self
+
+    def snapshot(self) -> "FileStats":
+        """Копия с закрытыми незавершёнными gspin — для summary/отчёта посреди файла."""
+        snap = FileStats.from_state(self.to_state())
+        snap.finish()
+        return snap
+
+    # -- вывод --
+    @property
+    def losses(self) -> int:
+        return self.results - self.wins
+
+    def summary_row(self) -> list:
+        wr = self.wins / self.results * 100 if self.results else 0.0
+        avg = self.bet_sum / self.results if self.results else Decimal("0")
+        q = lambda d: "" if d is None else str(d.quantize(Q8))
+        return [self.name, self.results, self.wins, self.losses, f"{wr:.10f}", q(self.profit_sum), q(self.bet_sum),
+                str(avg), q(self.min_bal), q(self.max_bal), self.missing_pre, self.missing_post, self.missing_result,
+                self.sid_changes, self.spins_jumps, self.i_jumps, self.L_decrease_on_loss, self.bet_mismatch]
+
+    def report(self) -> str:
+        row = dict(zip(SUMMARY_COLUMNS, self.summary_row()))
+        wr = self.wins / self.results * 100 if self.results else 0.0
+        lines = [
+            "=== S6 LOG ANALYSIS REPORT ===",
+            f"File: {self.name}",
+            f"Results: {self.results} (WIN {self.wins}, LOSS {self.losses}, WR {wr:.6f}%)",
+            f"Profit sum: {row['profit_sum']} | Bet sum: {row['bet_sum']} | Avg bet: {row['avg_bet']}",
+            f"Balance min/max: {row['min_bal'] or 'n/a'} / {row['max_bal'] or 'n/a'}",
+            "",
+            "Completeness:",
+            f"- missing pre: {self.missing_pre}",
+            f"- missing post: {self.missing_post}",
+            f"- missing result: {self.missing_result}",
+            "",
+            "Anomalies:",
+            f"- SID changes: {self.sid_changes}",
+            f"- non-monotonic gspin: {self.gspin_nonmono}",
+            f"- spins2 jumps: {self.spins_jumps}",
+            f"- i2 jumps: {self.i_jumps}",
+            f"- L decreased on LOSS: {self.L_decrease_on_loss}",
+            f"- bet pre/result mismatch: {self.bet_mismatch}",
+            "",
+            f"First anomalies (up to {MAX_EXAMPLES}):",
+        ]
+        lines.extend(f"  * {e}" for e in self.examples)
+        return "\n".join(lines) + "\n"
+
+
+def _int_or_none(s):
+    if s is None:
+        return None
+    try:
+        return int(s)
+    except ValueError:
+        return None
+
+
+def scan(path: str, stats: FileStats, start: int = 0, writer=None, final: bool = True) -> int:
+    """
+    Скормить stats строки path с байта start; строки результатов — в csv writer.
+    final=False — недописанную последнюю строку (без '\\n') не трогать: её дочитает следующий вызов.
+    Возвращает смещение, до которого файл обработан.
+    """
+    pos = start
+    with open(path, "rb") as f:
+        f.seek(start)
+        for raw in f:
+            if not raw.endswith(b"\n") and not final:
+                break
+            pos += len(raw)
+            line = raw.decode("utf-8", errors="replace")
+            stats.lines += 1
+            rec = parse_line(line)
+            if rec is None:
+                continue
+            stats.feed(rec)
+            if writer is not None and rec["kind"] == "result":
+                writer.writerow((rec["ts"], rec["bot"], rec["type"], rec["spin"], rec.get("payout", ""),
+                                 rec.get("roll", ""), rec.get("bet", ""), rec.get("profit", ""),
+                                 line.rstrip("\r\n")))
+    return pos
+
+
+def _write_report(report_dir: str, stats: FileStats):
+    with open(os.path.join(report_dir, stats.name + ".report.txt"), "w", encoding="utf-8") as f:
+        f.write(stats.report())
+
+
+def parse_file(path: str, parsed_csv: str = None, report_dir: str = None):
+    """Разобрать один лог; строки результатов — в parsed_csv (без заголовка), отчёт — в report_dir."""
+    stats = FileStats(os.path.basename(path))
+    out = open(parsed_csv, "w", encoding="utf-8", newline="") if parsed_csv else None
+    try:
+        scan(path, stats, 0, csv.writer(out) if out else None)
+    finally:
+        if out is not None:
+            out.close()
+    stats.finish()
+    if report_dir is not None:
+        _write_report(report_dir, stats)
+    return stats
+
+
+def _job(args):
+    path, part, report_dir = args
+    t0 = time.perf_counter()
+    stats = parse_file(path, part, report_dir)
+    return stats, time.perf_counter() - t0
+
+
+def _map(fn, jobs, workers: int):
+    workers = workers or min(len(jobs), os.cpu_count() or 1)
+    if workers > 1 and len(jobs) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(fn, jobs))
+    return [fn(j) for j in jobs]
+
+
+def _append_parts(dst: str, parts, header: bool):
+    with open(dst, "a" if not header else "w", encoding="utf-8", newline="") as out:
+        if header:
+            csv.writer(out).writerow(PARSED_COLUMNS)
+        for part in parts:
+            with open(part, "r", encoding="utf-8", newline="") as src:
+                shutil.copyfileobj(src, out, 1 << 20)
+
+
+def run(paths, out_dir: str = ".", workers: int = 0, reports: bool = True) -> list:
+    """Разобрать логи (параллельно), записать logs_parsed.csv, summary.csv и отчёты; [(FileStats, секунды)]."""
+    os.makedirs(out_dir, exist_ok=True)
+    tmp = tempfile.mkdtemp(prefix="cg_parse_", dir=out_dir)
+    try:
+        jobs = [(p, os.path.join(tmp, f"{i}.csv"), out_dir if reports else None) for i, p in enumerate(paths)]
+        results = _map(_job, jobs, workers)
+        _append_parts(os.path.join(out_dir, "logs_parsed.csv"), [part for _, part, _ in jobs], header=True)
+        write_summary(os.path.join(out_dir, "summary.csv"), [s for s, _ in results])
+        return results
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+
+# ------------------ Инкрементальный режим ------------------
+STATE_FILE = "logparse_state.json"
+HEAD_BYTES = 4096               # по хешу начала файла замечаем ротацию/перезапись при том же размере
+
+
+def _head_hash(path: str, n: int) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha1(f.read(n)).hexdigest()
+
+
+def _inc_job(args):
+    path, state, offset, part = args
+    stats = FileStats.from_state(state) if state else FileStats(os.path.basename(path))
+    t0 = time.perf_counter()
+    with open(part, "w", encoding="utf-8", newline="") as out:
+        end = scan(path, stats, offset, csv.writer(out), final=False)
+    return path, stats.to_state(), end, time.perf_counter() - t0
+
+
+class IncrementalParser:
+    """
+    Разбор только дописанных байтов: на файл хранится смещение, хеш начала и состояние FileStats
+    (out_dir/logparse_state.json). Обрезанный/подменённый файл разбирается заново; тогда и
+    logs_parsed.csv пересобирается целиком, иначе новые строки дописываются в конец.
+    """
+    def __init__(self, out_dir: str = ".", state_path: str = None, workers: int = 0, reports: bool = True):
+        self.out_dir = out_dir
+        self.state_path = state_path or os.path.join(out_dir, STATE_FILE)
+        self.workers = workers
+        self.reports = reports
+        self.files = {}                         # abspath → {"offset", "head_len", "head", "stats"}
+        if os.path.exists(self.state_path):
+            try:
+                with open(self.state_path, "r", encoding="utf-8") as f:
+                    self.files = json.load(f).get("files", {})
+            except Exception as e:
+                print(f"[logparse] state {self.state_path} ignored: {e}")
+                self.files = {}
+
+    def _save(self):
+        tmp = self.state_path + ".part"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"version": 1, "files": self.files}, f)
+        os.replace(tmp, self.state_path)
+
+    def _unchanged_prefix(self, path: str, entry: dict, size: int) -> bool:
+        if size < entry["offset"]:
+            return False
+        n = entry.get("head_len", 0)
+        return n == 0 or _head_hash(path, n) == entry.get("head")
+
+    def update(self, paths) -> list:
+        """Дочитать новые байты; [(имя, байт, секунды)] по изменившимся файлам."""
+        os.makedirs(self.out_dir, exist_ok=True)
+        csv_path = os.path.join(self.out_dir, "logs_parsed.csv")
+        keys = [os.path.abspath(p) for p in paths]
+        rebuild = not os.path.exists(csv_path)
+        for key in keys:
+            entry = self.files.get(key)
+            if entry is not None and os.path.exists(key) and not self._unchanged_prefix(key, entry, os.path.getsize(key)):
+                rebuild = True
+        if rebuild:
+            self.files = {}
+        jobs = []
+        tmp = tempfile.mkdtemp(prefix="cg_parse_", dir=self.out_dir)
+        try:
+            for i, key in enumerate(keys):
+                if not os.path.exists(key):
+                    continue
+                entry = self.files.get(key)
+                offset = entry["offset"] if entry else 0
+                if os.path.getsize(key) > offset:
+                    jobs.append((key, entry["stats"] if entry else None, offset, os.path.join(tmp, f"{i}.csv")))
+            results = _map(_inc_job, jobs, self.workers) if jobs else []
+            if jobs or rebuild:
+                _append_parts(csv_path, [j[3] for j in jobs], header=rebuild)
+        finally:
+            shutil.rmtree(tmp, ignore_errors=True)
+        changed = []
+        for (key, state, end, dt), job in zip(results, jobs):
+            head_len = min(HEAD_BYTES, end)
+            self.files[key] = {"offset": end, "head_len": head_len, "head": _head_hash(key, head_len), "stats": state}
+            if end > job[2]:
+                changed.append((state["name"], end - job[2], dt))
+        if changed or rebuild:
+            snaps = {key: FileStats.from_state(self.files[key]["stats"]).snapshot() for key in keys if key in self.files}
+            write_summary(os.path.join(self.out_dir, "summary.csv"), [snaps[k] for k in keys if k in snaps])
+            if self.reports:
+                for key, state, _, _ in results:
+                    _write_report(self.out_dir, snaps[key])
+            self._save()
+        return changed
+
+    def follow(self, paths, interval: float = 2.0, on_update=None):
+        """Следить за файлами: update() раз в interval секунд до Ctrl+C."""
+        try:
+            while True:
+                changed = self.update(paths)
+                if changed and on_update is not None:
+                    on_update(changed)
+                time.sleep(interval)
+        except KeyboardInterrupt:
+            pass
+
+
+def write_summary(path: str, stats_list):
+    tmp = path + ".part"
+    with open(tmp, "w", encoding="utf-8", newline="") as f:
+        w = csv.writer(f)
+        w.writerow(SUMMARY_COLUMNS)
+        for s in stats_list:
+            w.writerow(s.summary_row())
+    os.replace(tmp, path)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Crypto.Games streaming log parser")
+    ap.add_argument("logs", nargs="+", help="файлы логов (шаблоны glob допустимы)")
+    ap.add_argument("--out", default=".", help="каталог для logs_parsed.csv / summary.csv / отчётов")
+    ap.add_argument("--workers", type=int, default=0, help="процессов (0 — по числу файлов/ядер, 1 — без пула)")
+    ap.add_argument("--no-reports", action="store_true")
+    ap.add_argument("--incremental", action="store_true",
+                    help="разбирать только дописанное с прошлого запуска (состояние в --out/" + STATE_FILE + ")")
+    ap.add_argument("--follow", type=float, default=0.0, metavar="SEC",
+                    help="следить за файлами, обновляя summary.csv раз в SEC секунд (включает --incremental)")
+    args = ap.parse_args(argv)
+
+    paths = []
+    for pattern in args.logs:
+        paths.extend(sorted(glob.glob(pattern)) or [pattern])
+    t0 = time.perf_counter()
+    if args.incremental or args.follow:
+        inc = IncrementalParser(args.out, workers=args.workers, reports=not args.no_reports)
+        show = lambda changed: [print(f"{name}: +{n} bytes ({dt:.2f}s)") for name, n, dt in changed]
+        show(inc.update(paths))
+        print(f"incremental {time.perf_counter() - t0:.2f}s → {os.path.join(args.out, 'summary.csv')}")
+        if args.follow:
+            inc.follow(paths, args.follow, show)
+        return 0
+    results = run(paths, args.out, args.workers, not args.no_reports)
+    for stats, dt in results:
+        print(f"{stats.name}: lines={stats.lines} results={stats.results} wins={stats.wins} ({dt:.2f}s)")
+    print(f"total {time.perf_counter() - t0:.2f}s → {os.path.join(args.out, 'summary.csv')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,646 @@
+#!/usr/bin/env python3
+# Crypto.Games — просмотр полной истории лога бота: индекс смещений на диске + виртуальный список
+#
+# Зачем:
+# - Вкладки держат только последние 20–200 строк (BetLogBuffer), всё, что ушло выше, — только
+#   grep по logs/<bot>.txt.
+# - LogIndex: рядом с логом файл <log>.idx — на каждую строку запись фиксированной длины
+#   (смещение, payout×100, флаги WIN/ставка, режим). Индекс дописывается инкрементально
+#   (refresh читает только новый хвост лога) и читается через mmap: память UI не растёт с логом.
+# - FilteredView: фильтры WIN / ставки / payout-диапазон / режим / подстрока считаются одним
+#   проходом по индексу; хранится только каждая STRIDE-я позиция совпадения (checkpoints),
+#   строка фильтра находится сканом не более STRIDE записей.
+# - LogViewer (Toplevel): рисует только видимые строки, собственный скроллбар по числу строк,
+#   поиск вперёд/назад, «Follow» — хвост лога обновляется по таймеру; если рядом есть журнал
+#   спинов <log>.cgj (crypto_games_journal), в строке статуса — его сводка.
+#
+# Запуск: python crypto_games_logview.py logs/Bot-1.txt --win --payout 100:500 --head 20
+#         python crypto_games_logview.py logs/Bot-1.txt --gui
+
+import argparse
+import mmap
+import os
+import re
+import struct
+import sys
+import time
+from array import array
+from dataclasses import dataclass
+from typing import Optional
+
+try:
+    import tkinter as tk
+    from tkinter import ttk
+except Exception:
+    tk = None
+    ttk = None
+
+IDX_MAGIC = b"CGLI"
+IDX_VERSION = 1
+HEADER = struct.Struct("<4sIQQ")          # magic, version, indexed_bytes, count
+RECORD = struct.Struct("<QIBB2x")         # offset, payout×100, flags, mode
+F_BET = 1
+F_WIN = 2
+
+# Режим строки ставки — суффикс тега [WIN-XXX] / [LOSS-XXX]; без суффикса — BASE
+MODES = ("", "BASE", "RECOVERY", "PRESS", "PR", "TR", "COVER50", "PERIODIC", "TRIGGER", "OTHER", "66%")
+_MODE_CODE = {name: i for i, name in enumerate(MODES) if name}
+_PAYOUT_RE = re.compile(rb"payout=([0-9]+(?:\.[0-9]+)?)")
+_TAG_RE = re.compile(rb"\[(WIN|LOSS)(?:-([A-Z0-9_%]+))?\]")
+
+
+def parse_line(line: bytes):
+    """(payout×100, flags, mode) строки лога; не ставка — (0, 0, 0)."""
+    if b"[WIN" not in line and b"[LOSS" not in line:
+        return 0, 0, 0
+    m = _TAG_RE.search(line)
+    if m is None:
+        return 0, 0, 0
+    flags = F_BET | (F_WIN if m.group(1) == b"WIN" else 0)
+    suffix = m.group(2)
+    mode = _MODE_CODE["BASE"] if suffix is None else _MODE_CODE.get(suffix.decode("ascii"), _MODE_CODE["OTHER"])
+    payout = 0
+    p = _PAYOUT_RE.search(line, m.end())
+    if p is not None:
+        try:
+            payout = min(int(round(float(p.group(1)) * 100)), 0xFFFFFFFF)
+        except ValueError:
+            payout = 0
+    return payout, flags, mode
+
+
+# ------------------ Index ------------------
+class LogIndex:
+    """
+    Индекс строк лога в <path>.idx. Неполная последняя строка (без \\n) не индексируется,
+    пока не допишется. Лог стал короче проиндексированного (ротация/очистка) — индекс строится заново,
+    generation увеличивается (FilteredView по нему пересчитывает совпадения).
+    """
+    CHUNK = 1 << 20
+
+    def __init__(self, path: str, index_path: Optional[str] = None):
+        self.path = path
+        self.index_path = index_path or (path + ".idx")
+        self.count = 0
+        self.indexed_bytes = 0
+        self.generation = 0
+        self._mm = None
+        self._log = None
+        self._open_index()
+
+    # -- файл индекса --
+    def _open_index(self):
+        ok = False
+        try:
+            with open(self.index_path, "rb") as f:
+                head = f.read(HEADER.size)
+                size = os.fstat(f.fileno()).st_size
+            if len(head) == HEADER.size:
+                magic, ver, indexed, count = HEADER.unpack(head)
+                ok = magic == IDX_MAGIC and ver == IDX_VERSION and size >= HEADER.size + count * RECORD.size
+                if ok:
+                    self.indexed_bytes, self.count = indexed, count
+        except OSError:
+            ok = False
+        if not ok:
+            self._reset()
+        self._remap()
+
+    def _reset(self):
+        self.close()
+        self.generation += 1
+        self.count = 0
+        self.indexed_bytes = 0
+        with open(self.index_path, "wb") as f:
+            f.write(HEADER.pack(IDX_MAGIC, IDX_VERSION, 0, 0))
+
+    def _remap(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self.count <= 0:
+            return
+        with open(self.index_path, "rb") as f:
+            self._mm = mmap.mmap(f.fileno(), HEADER.size + self.count * RECORD.size, access=mmap.ACCESS_READ)
+
+    def close(self):
+        if self._mm is not None:
+            self._mm.close()
+            self._mm = None
+        if self._log is not None:
+            self._log.close()
+            self._log = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    # -- инкрементальное построение --
+    def refresh(self, max_bytes: Optional[int] = None) -> int:
+        """Проиндексировать новый хвост лога (не больше max_bytes за вызов). Возвращает число новых строк."""
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        if size < self.indexed_bytes:
+            self._reset()
+        if size <= self.indexed_bytes:
+            return 0
+        budget = size - self.indexed_bytes if max_bytes is None else min(size - self.indexed_bytes, int(max_bytes))
+        added = 0
+        pos = self.indexed_bytes
+        out = bytearray()
+        with open(self.path, "rb") as lf:
+            lf.seek(pos)
+            carry = b""
+            left = budget
+            while left > 0:
+                data = lf.read(min(self.CHUNK, left))
+                if not data:
+                    break
+                left -= len(data)
+                data = carry + data
+                start = 0
+                while True:
+                    nl = data.find(b"\n", start)
+                    if nl < 0:
+                        break
+                    payout, flags, mode = parse_line(data[start:nl])
+                    out += RECORD.pack(pos, payout, flags, mode)
+                    pos += nl + 1 - start
+                    start = nl + 1
+                    added += 1
+                carry = data[start:]
+        if not added:
+            return 0
+        with open(self.index_path, "r+b") as f:
+            f.seek(HEADER.size + self.count * RECORD.size)
+            f.write(out)
+            self.count += added
+            self.indexed_bytes = pos
+            f.seek(0)
+            f.write(HEADER.pack(IDX_MAGIC, IDX_VERSION, self.indexed_bytes, self.count))
+        self._remap()
+        return added
+
+    # -- чтение --
+    def record(self, i: int):
+        return RECORD.unpack_from(self._mm, HEADER.size + i * RECORD.size)
+
+    def iter_records(self, start: int = 0, stop: Optional[int] = None):
+        """(offset, payout×100, flags, mode) для строк start..stop-1 — без копирования в список."""
+        stop = self.count if stop is None else min(stop, self.count)
+        if self._mm is None or start >= stop:
+            return iter(())
+        mv = memoryview(self._mm)[HEADER.size + start * RECORD.size: HEADER.size + stop * RECORD.size]
+        return RECORD.iter_unpack(mv)
+
+    def _offset(self, i: int) -> int:
+        if i >= self.count:
+            return self.indexed_bytes
+        return RECORD.unpack_from(self._mm, HEADER.size + i * RECORD.size)[0]
+
+    def _read(self, start: int, end: int) -> bytes:
+        if self._log is None:
+            self._log = open(self.path, "rb")
+        self._log.seek(start)
+        return self._log.read(end - start)
+
+    def lines(self, start: int, n: int) -> list:
+        """Строки start..start+n-1 одним чтением."""
+        start = max(0, start)
+        stop = min(self.count, start + max(0, n))
+        if start >= stop:
+            return []
+        raw = self._read(self._offset(start), self._offset(stop))
+        return [s.rstrip(b"\r").decode("utf-8", errors="replace") for s in raw.split(b"\n")[:stop - start]]
+
+    def line(self, i: int) -> str:
+        got = self.lines(i, 1)
+        return got[0] if got else ""
+
+
+# ------------------ Filter / view ------------------
+@dataclass
+class LogFilter:
+    win_only: bool = False
+    bets_only: bool = False
+    payout_min: Optional[float] = None
+    payout_max: Optional[float] = None
+    mode: str = ""              # "" — любой; иначе имя из MODES
+    text: str = ""              # подстрока (регистр не важен)
+
+    def is_identity(self) -> bool:
+        return not (self.win_only or self.bets_only or self.mode or self.text
+                    or self.payout_min is not None or self.payout_max is not None)
+
+    def compile(self):
+        """Проверка записи индекса: функция (payout×100, flags, mode) → bool."""
+        need = F_WIN if self.win_only else (F_BET if (self.bets_only or self.mode or self.payout_min is not None
+                                                      or self.payout_max is not None) else 0)
+        lo = int(round(self.payout_min * 100)) if self.payout_min is not None else None
+        hi = int(round(self.payout_max * 100)) if self.payout_max is not None else None
+        mode = _MODE_CODE.get(self.mode.upper(), -1) if self.mode else 0
+
+        def match(payout, flags, m):
+            if need and not (flags & need):
+                return False
+            if mode and m != mode:
+                return False
+            if lo is not None and payout < lo:
+                return False
+            if hi is not None and payout > hi:
+                return False
+            return True
+        return match
+
+
+class FilteredView:
+    """
+    Строки лога, прошедшие фильтр. Память — O(совпадений / STRIDE): хранится номер строки
+    каждого STRIDE-го совпадения; extend() досчитывает только новые строки индекса.
+    """
+    STRIDE = 1024
+
+    def __init__(self, index: LogIndex, flt: Optional[LogFilter] = None):
+        self.index = index
+        self.filter = flt or LogFilter()
+        self.rebuild()
+
+    def rebuild(self):
+        self.identity = self.filter.is_identity()
+        self._match = self.filter.compile()
+        self._needle = self.filter.text.lower().encode("utf-8") if self.filter.text else b""
+        self._checkpoints = array("Q")
+        self._count = 0
+        self._scanned = 0
+        self._generation = self.index.generation
+        self.extend()
+
+    def __len__(self) -> int:
+        return self.index.count if self.identity else self._count
+
+    def _text_source(self, start: int, stop: int):
+        """Нижний регистр строк start..stop-1 (только для фильтра по подстроке), потоково."""
+        if start >= stop:
+            return
+        pos = self.index._offset(start)
+        end = self.index._offset(stop)
+        with open(self.index.path, "rb") as f:
+            f.seek(pos)
+            carry = b""
+            while pos < end:
+                data = f.read(min(LogIndex.CHUNK, end - pos))
+                if not data:
+                    break
+                pos += len(data)
+                parts = (carry + data).split(b"\n")
+                carry = parts.pop()
+                for p in parts:
+                    yield p.lower()
+
+    def extend(self) -> int:
+        """Досчитать совпадения для строк, добавленных в индекс после прошлого вызова."""
+        if self._generation != self.index.generation:   # индекс перестроен: старые совпадения недействительны
+            before = self._count
+            self.rebuild()
+            return self._count - before
+        if self.identity:
+            self._scanned = self.index.count
+            return 0
+        start, stop = self._scanned, self.index.count
+        before = self._count
+        match, needle, stride = self._match, self._needle, self.STRIDE
+        texts = self._text_source(start, stop) if needle else None
+        line_no = start
+        for _, payout, flags, mode in self.index.iter_records(start, stop):
+            ok = match(payout, flags, mode)
+            if texts is not None:
+                text = next(texts, b"")
+                ok = ok and needle in text
+            if ok:
+                if self._count % stride == 0:
+                    self._checkpoints.append(line_no)
+                self._count += 1
+            line_no += 1
+        self._scanned = stop
+        return self._count - before
+
+    def line_numbers(self, first: int, n: int) -> list:
+        """Номера строк лога для строк фильтра first..first+n-1."""
+        total = len(self)
+        first = max(0, min(first, total))
+        n = max(0, min(n, total - first))
+        if n == 0:
+            return []
+        if self.identity:
+            return list(range(first, first + n))
+        cp = first // self.STRIDE
+        skip = first - cp * self.STRIDE
+        line_no = self._checkpoints[cp]
+        out = []
+        match, needle = self._match, self._needle
+        texts = self._text_source(line_no, self._scanned) if needle else None
+        for _, payout, flags, mode in self.index.iter_records(line_no, self._scanned):
+            ok = match(payout, flags, mode)
+            if texts is not None:
+                text = next(texts, b"")     # текст читается для каждой строки — поток не должен отставать
+                ok = ok and needle in text
+            if ok:
+                if skip:
+                    skip -= 1
+                else:
+                    out.append(line_no)
+                    if len(out) >= n:
+                        break
+            line_no += 1
+        return out
+
+    def rows(self, first: int, n: int) -> list:
+        """[(номер строки лога, текст)] для видимого окна; соседние строки читаются одним куском."""
+        nums = self.line_numbers(first, n)
+        out = []
+        i = 0
+        while i < len(nums):
+            j = i
+            while j + 1 < len(nums) and nums[j + 1] == nums[j] + 1:
+                j += 1
+            for k, text in enumerate(self.index.lines(nums[i], j - i + 1)):
+                out.append((nums[i] + k, text))
+            i = j + 1
+        return out
+
+    def find(self, needle: str, from_row: int, forward: bool = True, chunk: int = 512) -> int:
+        """Строка фильтра с подстрокой needle (после/до from_row), -1 — не найдено."""
+        needle = needle.lower()
+        if not needle:
+            return -1
+        total = len(self)
+        if forward:
+            row = max(0, from_row + 1)
+            while row < total:
+                for k, (_, text) in enumerate(self.rows(row, chunk)):
+                    if needle in text.lower():
+                        return row + k
+                row += chunk
+        else:
+            row = min(total, from_row)
+            while row > 0:
+                lo = max(0, row - chunk)
+                got = self.rows(lo, row - lo)
+                for k in range(len(got) - 1, -1, -1):
+                    if needle in got[k][1].lower():
+                        return lo + k
+                row = lo
+        return -1
+
+
+# ------------------ Tk viewer ------------------
+if tk is not None:
+    class LogViewer(tk.Toplevel):
+        """Окно истории: видимы только rows строк, остальное — индекс на диске."""
+        POLL_MS = 1000
+        REFRESH_BYTES = 8 << 20    # за тик таймера — не больше 8 МБ нового лога (первичная индексация)
+        JOURNAL_REFRESH_S = 10.0   # сводка журнала спинов — не чаще раза в 10 с
+
+        def __init__(self, master, path: str, title: str = "", rows: int = 35):
+            super().__init__(master)
+            self.title(title or f"History — {os.path.basename(path)}")
+            self.visible = max(5, int(rows))
+            self.first = 0
+            self.hit_row = -1
+            self.index = LogIndex(path)
+            self.index.refresh(self.REFRESH_BYTES)
+            self.view = FilteredView(self.index)
+            self._after = None
+
+            bar = ttk.Frame(self)
+            bar.pack(fill="x", padx=4, pady=2)
+            self.win_var = tk.BooleanVar(value=False)
+            self.bets_var = tk.BooleanVar(value=False)
+            self.follow_var = tk.BooleanVar(value=True)
+            ttk.Checkbutton(bar, text="WIN only", variable=self.win_var, command=self.apply_filter).pack(side="left")
+            ttk.Checkbutton(bar, text="Bets only", variable=self.bets_var, command=self.apply_filter).pack(side="left", padx=4)
+            ttk.Label(bar, text="Payout").pack(side="left", padx=(8, 2))
+            self.pmin_entry = ttk.Entry(bar, width=8)
+            self.pmin_entry.pack(side="left")
+            ttk.Label(bar, text="..").pack(side="left")
+            self.pmax_entry = ttk.Entry(bar, width=8)
+            self.pmax_entry.pack(side="left")
+            ttk.Label(bar, text="Mode").pack(side="left", padx=(8, 2))
+            self.mode_box = ttk.Combobox(bar, width=10, state="readonly", values=("",) + MODES[1:])
+            self.mode_box.pack(side="left")
+            self.mode_box.bind("<<ComboboxSelected>>", lambda e: self.apply_filter())
+            ttk.Label(bar, text="Contains").pack(side="left", padx=(8, 2))
+            self.text_entry = ttk.Entry(bar, width=16)
+            self.text_entry.pack(side="left")
+            ttk.Button(bar, text="Apply", command=self.apply_filter).pack(side="left", padx=4)
+            ttk.Checkbutton(bar, text="Follow", variable=self.follow_var).pack(side="left", padx=4)
+
+            sbar = ttk.Frame(self)
+            sbar.pack(fill="x", padx=4, pady=2)
+            ttk.Label(sbar, text="Find").pack(side="left")
+            self.find_entry = ttk.Entry(sbar, width=24)
+            self.find_entry.pack(side="left", padx=2)
+            self.find_entry.bind("<Return>", lambda e: self.find(True))
+            ttk.Button(sbar, text="▼", width=3, command=lambda: self.find(True)).pack(side="left")
+            ttk.Button(sbar, text="▲", width=3, command=lambda: self.find(False)).pack(side="left")
+            self.status = ttk.Label(sbar, text="")
+            self.status.pack(side="right")
+            self.journal_label = ttk.Label(sbar, text="", foreground="gray")
+            self.journal_label.pack(side="right", padx=8)
+            self._journal_size = -1
+            self._journal_t = 0.0
+
+            body = ttk.Frame(self)
+            body.pack(fill="both", expand=True)
+            self.text = tk.Text(body, height=self.visible, wrap="none", state="disabled")
+            self.text.pack(side="left", fill="both", expand=True)
+            self.text.tag_config("win", foreground="green")
+            self.text.tag_config("loss", foreground="red")
+            self.text.tag_config("hit", background="yellow")
+            self.scroll = ttk.Scrollbar(body, orient="vertical", command=self._on_scroll)
+            self.scroll.pack(side="right", fill="y")
+            self.text.bind("<MouseWheel>", self._on_wheel)
+            self.text.bind("<Button-4>", lambda e: self.scroll_to(self.first - 3))
+            self.text.bind("<Button-5>", lambda e: self.scroll_to(self.first + 3))
+            for key, fn in (("<Prior>", lambda e: self.scroll_to(self.first - self.visible)),
+                            ("<Next>", lambda e: self.scroll_to(self.first + self.visible)),
+                            ("<Home>", lambda e: self.scroll_to(0)),
+                            ("<End>", lambda e: self.scroll_to(len(self.view)))):
+                self.bind(key, fn)
+            self.protocol("WM_DELETE_WINDOW", self.close)
+
+            self.scroll_to(len(self.view))
+            self._refresh_journal()
+            self._after = self.after(self.POLL_MS, self._poll)
+
+        def _refresh_journal(self):
+            """Сводка из бинарного журнала спинов (<log>.cgj), если он есть; пересчёт — только при росте файла."""
+            try:
+                from crypto_games_journal import format_summary, journal_path, summarize
+                path = journal_path(self.index.path)
+                size = os.path.getsize(path) if os.path.exists(path) else -1
+                now = time.monotonic()
+                if size != self._journal_size and now - self._journal_t >= self.JOURNAL_REFRESH_S:
+                    self._journal_size = size
+                    self._journal_t = now
+                    self.journal_label.config(text=format_summary(summarize(path)) if size > 0 else "")
+            except Exception as e:
+                self.journal_label.config(text=f"journal: {e}")
+
+        # -- фильтр / поиск --
+        def _float_or_none(self, entry):
+            s = entry.get().strip()
+            if not s:
+                return None
+            try:
+                return float(s)
+            except ValueError:
+                return None
+
+        def apply_filter(self):
+            self.view.filter = LogFilter(win_only=self.win_var.get(), bets_only=self.bets_var.get(),
+                                         payout_min=self._float_or_none(self.pmin_entry),
+                                         payout_max=self._float_or_none(self.pmax_entry),
+                                         mode=self.mode_box.get(), text=self.text_entry.get().strip())
+            self.view.rebuild()
+            self.hit_row = -1
+            self.scroll_to(len(self.view) if self.follow_var.get() else 0)
+
+        def find(self, forward: bool):
+            needle = self.find_entry.get()
+            start = self.hit_row if self.hit_row >= 0 else (self.first - 1 if forward else self.first + self.visible)
+            row = self.view.find(needle, start, forward)
+            if row < 0:
+                self.status.config(text=f"'{needle}' not found")
+                return
+            self.hit_row = row
+            self.follow_var.set(False)
+            self.scroll_to(row - self.visible // 2)
+
+        # -- прокрутка / отрисовка --
+        def _on_scroll(self, *args):
+            total = len(self.view)
+            if not args:
+                return
+            if args[0] == "moveto":
+                self.scroll_to(int(float(args[1]) * total))
+            elif args[0] == "scroll":
+                step = int(args[1]) * (self.visible if args[2] == "pages" else 1)
+                self.scroll_to(self.first + step)
+
+        def _on_wheel(self, event):
+            self.scroll_to(self.first - (3 if event.delta > 0 else -3))
+            return "break"
+
+        def scroll_to(self, first: int):
+            total = len(self.view)
+            self.first = max(0, min(int(first), max(0, total - self.visible)))
+            self.render()
+
+        def render(self):
+            total = len(self.view)
+            rows = self.view.rows(self.first, self.visible)
+            args = []
+            for k, (_, line) in enumerate(rows):
+                tags = []
+                if "[WIN" in line:
+                    tags.append("win")
+                elif "[LOSS" in line:
+                    tags.append("loss")
+                if self.first + k == self.hit_row:
+                    tags.append("hit")
+                args.append(line + "\n")
+                args.append(tuple(tags))
+            self.text.configure(state="normal")
+            self.text.delete("1.0", "end")
+            if args:
+                self.text.insert("end", *args)
+            self.text.configure(state="disabled")
+            if total > 0:
+                self.scroll.set(self.first / total, min(1.0, (self.first + len(rows)) / total))
+            else:
+                self.scroll.set(0.0, 1.0)
+            self.status.config(text=f"rows {self.first + 1 if rows else 0}–{self.first + len(rows)} of {total:,} "
+                                    f"(lines {self.index.count:,})")
+
+        def _poll(self):
+            self._after = None
+            try:
+                gen = self.index.generation
+                if self.index.refresh(self.REFRESH_BYTES) or self.index.generation != gen:
+                    self.view.extend()
+                    if self.follow_var.get():
+                        self.scroll_to(len(self.view))
+                    else:
+                        self.scroll_to(self.first)
+            except Exception as e:
+                self.status.config(text=f"refresh error: {e}")
+            self._refresh_journal()
+            self._after = self.after(self.POLL_MS, self._poll)
+
+        def close(self):
+            if self._after is not None:
+                try:
+                    self.after_cancel(self._after)
+                except Exception:
+                    pass
+            self.index.close()
+            self.destroy()
+else:
+    LogViewer = None
+
+
+def open_log_history(master, path: str, title: str = ""):
+    """Открыть окно истории для лога (из BotTab); None — нет Tk."""
+    if LogViewer is None:
+        return None
+    return LogViewer(master, path, title=title)
+
+
+def _parse_range(s: Optional[str]):
+    if not s:
+        return None, None
+    lo, _, hi = s.partition(":")
+    return (float(lo) if lo.strip() else None), (float(hi) if hi.strip() else None)
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Crypto.Games log history viewer (indexed)")
+    ap.add_argument("log")
+    ap.add_argument("--win", action="store_true", help="только WIN")
+    ap.add_argument("--bets", action="store_true", help="только строки ставок")
+    ap.add_argument("--payout", help="диапазон payout lo:hi")
+    ap.add_argument("--mode", default="", help="режим: " + ", ".join(MODES[1:]).replace("%", "%%"))
+    ap.add_argument("--grep", default="", help="подстрока")
+    ap.add_argument("--head", type=int, default=0)
+    ap.add_argument("--tail", type=int, default=10)
+    ap.add_argument("--gui", action="store_true")
+    args = ap.parse_args(argv)
+
+    if args.gui:
+        if tk is None:
+            print("tkinter недоступен")
+            return 1
+        root = tk.Tk()
+        root.withdraw()
+        viewer = LogViewer(root, args.log)
+        viewer.protocol("WM_DELETE_WINDOW", lambda: (viewer.close(), root.destroy()))
+        root.mainloop()
+        return 0
+
+    index = LogIndex(args.log)
+    added = index.refresh()
+    lo, hi = _parse_range(args.payout)
+    view = FilteredView(index, LogFilter(win_only=args.win, bets_only=args.bets, payout_min=lo, payout_max=hi,
+                                         mode=args.mode, text=args.grep))
+    print(f"{args.log}: lines={index.count} (+{added} indexed) matched={len(view)}")
+    rows = view.rows(0, args.head) if args.head else view.rows(max(0, len(view) - args.tail), args.tail)
+    for line_no, text in rows:
+        print(f"{line_no + 1:>9}: {text}")
+    index.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+# Crypto.Games — обзор флота: одна таблица ttk.Treeview на все боты + ленивые вкладки BotTab
+#
+# Зачем:
+# - Каждый бот — полноценная вкладка BotTab (десятки Entry/Spinbox/Label + Text лога), и все они
+#   строились сразу в new_bot_tab: после ~30 ботов старт и отклик UI деградировали.
+# - FleetOverview — вкладка «Fleet»: строка на бота (статус, режим, баланс, профит, спины/с, серия).
+#   Модель строк обновляется из _process_ui_queue (note_bank / note_line — только словари),
+#   а Treeview — по таймеру и только для изменившихся строк, видимых на экране; строки вне
+#   экрана остаются «грязными» до прокрутки к ним.
+# - LazyBotTab — заместитель вкладки: пока бот не открыт (двойной клик в таблице, New Bot,
+#   старт), настоящий BotTab не строится; log / update_bank_ui копятся (лог — ограниченно,
+#   банк — последний снимок) и проигрываются при построении. Любое другое обращение
+#   (start_bot, frame, ...) строит вкладку.
+
+import time
+from collections import deque
+
+try:
+    import tkinter as tk
+    from tkinter import ttk
+except Exception:
+    tk = None
+    ttk = None
+
+COLUMNS = (
+    ("status", "Status", 70),
+    ("mode", "Mode", 80),
+    ("balance", "Balance", 130),
+    ("profit", "Profit", 120),
+    ("sps", "Spins/s", 70),
+    ("streak", "Streak", 60),
+    ("spins", "Spins", 80),
+)
+_NUMERIC = {"balance", "profit", "sps", "streak", "spins"}
+
+
+def parse_bet_line(line) -> tuple:
+    """(is_bet, win, mode) строки лога: '[WIN]…', '[LOSS-RECOVERY]…', '[WIN-66%]…'."""
+    if not isinstance(line, str) or not line.startswith(("[WIN", "[LOSS")):
+        return False, False, ""
+    win = line.startswith("[WIN")
+    end = line.find("]")
+    tag = line[1:end] if end > 0 else ""
+    mode = tag.split("-", 1)[1] if "-" in tag else "BASE"
+    return True, win, mode
+
+
+class BotRow:
+    """Строка обзора: сырые значения + время/счётчики для спинов в секунду."""
+    __slots__ = ("bot_id", "balance", "initial", "mode", "spins", "streak", "sps",
+                 "_rate_spins", "_rate_t", "shown")
+
+    def __init__(self, bot_id):
+        self.bot_id = bot_id
+        self.balance = None
+        self.initial = None
+        self.mode = ""
+        self.spins = 0
+        self.streak = 0                         # >0 — подряд WIN, <0 — подряд LOSS
+        self.sps = 0.0
+        self._rate_spins = 0
+        self._rate_t = None
+        self.shown = None                       # последний показанный кортеж значений
+
+    def values(self, status: str) -> tuple:
+        bal = "" if self.balance is None else f"{self.balance:.8f}"
+        if self.balance is None or self.initial is None:
+            prof = ""
+        else:
+            p = self.balance - self.initial
+            prof = f"{'+' if p >= 0 else ''}{p:.8f}"
+        streak = f"W{self.streak}" if self.streak > 0 else (f"L{-self.streak}" if self.streak < 0 else "")
+        return (status, self.mode, bal, prof, f"{self.sps:.1f}" if self.spins else "", streak, str(self.spins))
+
+    def sort_key(self, col: str):
+        if col == "balance":
+            return self.balance if self.balance is not None else -1
+        if col == "profit":
+            return (self.balance - self.initial) if (self.balance is not None and self.initial is not None) else 0
+        if col in ("sps", "streak", "spins"):
+            return getattr(self, col)
+        if col == "mode":
+            return self.mode
+        return str(self.bot_id)
+
+
+if tk is not None:
+    class FleetOverview(ttk.Frame):
+        """Таблица ботов; on_open(bot_id) — двойной клик/Enter, status_fn(bot_id) → 'running' / ..."""
+        FLUSH_MS = 500
+        RATE_ALPHA = 0.5                        # сглаживание спинов/с между тиками
+
+        def __init__(self, master, on_open=None, status_fn=None):
+            super().__init__(master)
+            self.on_open = on_open
+            self.status_fn = status_fn
+            self.rows = {}                      # bot_id → BotRow
+            self.order = []                     # bot_id в порядке показа
+            self.dirty = set()
+            self.sort_col = None
+            self.sort_desc = False
+            self.updates = 0                    # реальных tree.item(...) — для статистики
+            self._flush_pending = None
+
+            bar = ttk.Frame(self)
+            bar.pack(fill="x", padx=4, pady=2)
+            self.summary = ttk.Label(bar, text="")
+            self.summary.pack(side="left")
+            ttk.Label(bar, text="Double-click a row to open the bot tab").pack(side="right")
+
+            body = ttk.Frame(self)
+            body.pack(fill="both", expand=True)
+            self.tree = ttk.Treeview(body, columns=[c for c, _, _ in COLUMNS], selectmode="browse")
+            self.tree.heading("#0", text="Bot", command=lambda: self.sort_by("bot"))
+            self.tree.column("#0", width=110, stretch=False)
+            for col, title, width in COLUMNS:
+                self.tree.heading(col, text=title, command=lambda c=col: self.sort_by(c))
+                self.tree.column(col, width=width, anchor="e" if col in _NUMERIC else "w", stretch=False)
+            self.tree.tag_configure("up", foreground="darkgreen")
+            self.tree.tag_configure("down", foreground="red")
+            self.scroll = ttk.Scrollbar(body, orient="vertical", command=self.tree.yview)
+            self.tree.configure(yscrollcommand=self._on_yscroll)
+            self.tree.pack(side="left", fill="both", expand=True)
+            self.scroll.pack(side="right", fill="y")
+            self.tree.bind("<Double-1>", self._on_open)
+            self.tree.bind("<Return>", self._on_open)
+            self.after(self.FLUSH_MS, self._tick)
+
+        # -- модель (из _process_ui_queue) --
+        def add_bot(self, bot_id):
+            if bot_id in self.rows:
+                return
+            row = self.rows[bot_id] = BotRow(bot_id)
+            self.order.append(bot_id)
+            row.shown = row.values(self._status(bot_id))
+            self.tree.insert("", "end", iid=str(bot_id), text=str(bot_id), values=row.shown)
+
+        def remove_bot(self, bot_id):
+            if self.rows.pop(bot_id, None) is None:
+                return
+            self.order.remove(bot_id)
+            self.dirty.discard(bot_id)
+            try:
+                self.tree.delete(str(bot_id))
+            except Exception:
+                pass
+
+        def note_bank(self, bot_id, current, initial):
+            row = self.rows.get(bot_id)
+            if row is None:
+                return
+            if row.balance != current or row.initial != initial:
+                row.balance = current
+                row.initial = initial
+                self.dirty.add(bot_id)
+
+        def note_line(self, bot_id, line):
+            row = self.rows.get(bot_id)
+            if row is None:
+                return
+            is_bet, win, mode = parse_bet_line(line)
+            if not is_bet:
+                return
+            row.spins += 1
+            if win:
+                row.streak = row.streak + 1 if row.streak > 0 else 1
+            else:
+                row.streak = row.streak - 1 if row.streak < 0 else -1
+            row.mode = mode
+            self.dirty.add(bot_id)
+
+        # -- отрисовка --
+        def _status(self, bot_id) -> str:
+            if self.status_fn is None:
+                return ""
+            try:
+                return self.status_fn(bot_id)
+            except Exception:
+                return "?"
+
+        def _visible_ids(self) -> list:
+            n = len(self.order)
+            if n == 0:
+                return []
+            first, last = self.tree.yview()
+            lo = max(0, int(first * n) - 1)
+            hi = min(n, int(last * n + 0.999) + 1)
+            return self.order[lo:hi]
+
+        def _update_rates(self):
+            now = time.monotonic()
+            for bot_id, row in self.rows.items():
+                if row._rate_t is None:
+                    row._rate_t = now
+                    row._rate_spins = row.spins
+                    continue
+                dt = now - row._rate_t
+                if dt <= 0:
+                    continue
+                inst = (row.spins - row._rate_spins) / dt
+                sps = self.RATE_ALPHA * inst + (1 - self.RATE_ALPHA) * row.sps
+                if sps < 0.05 and inst == 0:
+                    sps = 0.0
+                if abs(sps - row.sps) >= 0.05:
+                    self.dirty.add(bot_id)
+                row.sps = sps
+                row._rate_t = now
+                row._rate_spins = row.spins
+
+        def flush(self):
+            """Перенести в Treeview изменившиеся видимые строки."""
+            self._flush_pending = None
+            for bot_id in self._visible_ids():
+                row = self.rows[bot_id]
+                vals = row.values(self._status(bot_id))
+                self.dirty.discard(bot_id)
+                if vals == row.shown:
+                    continue
+                prof = vals[3]
+                tags = ("up",) if prof.startswith("+") else (("down",) if prof.startswith("-") else ())
+                self.tree.item(str(bot_id), values=vals, tags=tags)
+                row.shown = vals
+                self.updates += 1
+
+        def _tick(self):
+            try:
+                self._update_rates()
+                self.flush()
+                running = sum(1 for bot_id in self.rows if self._status(bot_id) == "running")
+                self.summary.config(text=f"Bots: {len(self.rows)}  running: {running}  pending: {len(self.dirty)}")
+            except Exception as e:
+                print(f"[FleetOverview] refresh error: {e}")
+            self.after(self.FLUSH_MS, self._tick)
+
+        def _on_yscroll(self, first, last):
+            self.scroll.set(first, last)
+            if self.dirty and self._flush_pending is None:
+                self._flush_pending = self.after_idle(self.flush)
+
+        def sort_by(self, col: str):
+            if self.sort_col == col:
+                self.sort_desc = not self.sort_desc
+            else:
+                self.sort_col, self.sort_desc = col, col in _NUMERIC
+            self.order.sort(key=lambda b: self.rows[b].sort_key(col), reverse=self.sort_desc)
+            for i, bot_id in enumerate(self.order):
+                self.tree.move(str(bot_id), "", i)
+            self.flush()
+
+        def _on_open(self, event=None):
+            sel = self.tree.focus() or (self.tree.selection() or ("",))[0]
+            if not sel or self.on_open is None:
+                return
+            for bot_id in self.rows:
+                if str(bot_id) == sel:
+                    self.on_open(bot_id)
+                    break
+else:
+    FleetOverview = None
+
+
+class LazyBotTab:
+    """
+    Заместитель BotTab: factory(notebook) строит настоящую вкладку при первом обращении,
+    кроме log / log_bet / _file_log / update_bank_ui, которые до этого копятся.
+    """
+    PENDING_LOGS = 200
+
+    def __init__(self, notebook, factory, bot_name: str):
+        object.__setattr__(self, "_notebook", notebook)
+        object.__setattr__(self, "_factory", factory)
+        object.__setattr__(self, "_tab", None)
+        object.__setattr__(self, "_pending", deque(maxlen=self.PENDING_LOGS))
+        object.__setattr__(self, "_bank", None)
+        object.__setattr__(self, "bot_name", bot_name)
+
+    @property
+    def built(self) -> bool:
+        return self._tab is not None
+
+    @property
+    def bot(self):
+        return self._tab.bot if self._tab is not None else None
+
+    def materialize(self):
+        if self._tab is None:
+            tab = self._factory(self._notebook)
+            object.__setattr__(self, "_tab", tab)
+            pending = list(self._pending)
+            self._pending.clear()
+            for name, arg in pending:
+                try:
+                    getattr(tab, name)(arg)
+                except Exception as e:
+                    print(f"[LazyBotTab] replay {name} error: {e}")
+            if self._bank is not None:
+                try:
+                    tab.update_bank_ui(self._bank)
+                except Exception as e:
+                    print(f"[LazyBotTab] replay bank error: {e}")
+                object.__setattr__(self, "_bank", None)
+        return self._tab
+
+    def _buffered(self, name, arg):
+        if self._tab is not None:
+            return getattr(self._tab, name)(arg)
+        self._pending.append((name, arg))
+
+    def log(self, msg):
+        return self._buffered("log", msg)
+
+    def log_bet(self, msg):
+        return self._buffered("log_bet", msg)
+
+    def _file_log(self, msg):
+        return self._buffered("_file_log", msg)
+
+    def update_bank_ui(self, stats):
+        if self._tab is not None:
+            return self._tab.update_bank_ui(stats)
+        object.__setattr__(self, "_bank", stats)
+
+    def __getattr__(self, name):
+        # сюда попадают только атрибуты, которых нет у заместителя
+        if name.startswith("__"):
+            raise AttributeError(name)
+        return getattr(self.materialize(), name)
+
+    def __setattr__(self, name, value):
+        setattr(self.materialize(), name, value)
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+# Crypto.Games — расписания payout с памятью O(1), общие для стратегий
+#
+# Зачем:
+# - _gen_recovery_Ms строил полный список Decimal и перестраивал его на каждом развороте,
+#   _random_recovery_payout пересобирал и фильтровал лестницу 1.02..2.0 на каждом спине,
+#   LinearPayoutStrategy создавал новые Decimal на каждом шаге.
+# - Здесь расписание — объект-последовательность (len / [i]): элементы считаются по индексу,
+#   фильтрация лестницы делается один раз на изменение настроек.
+#
+# Расписания:
+#   ArithmeticRange — start, start+step, ... до stop включительно (step < 0 — убывание);
+#   PingPong       — туда-обратно по вложенному расписанию без повтора крайних точек;
+#   Strided        — каждый stride-й элемент вложенного расписания;
+#   Ladder         — фиксированная лестница значений (+ отфильтрованные по диапазону копии, с кэшем);
+#   RandomLadder   — случайный элемент лестницы в диапазоне [lo, hi] (иначе — целое из диапазона).
+
+import random
+from decimal import Decimal
+
+
+class PayoutSchedule:
+    """База: последовательность payout фиксированной длины, элементы — по индексу."""
+    __slots__ = ()
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def _item(self, i: int) -> Decimal:
+        raise NotImplementedError
+
+    def __getitem__(self, i: int) -> Decimal:
+        n = len(self)
+        if i < 0:
+            i += n
+        if i < 0 or i >= n:
+            raise IndexError("payout schedule index out of range")
+        return self._item(i)
+
+    def __iter__(self):
+        for i in range(len(self)):
+            yield self._item(i)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def first(self) -> Decimal:
+        return self[0]
+
+    def last(self) -> Decimal:
+        return self[-1]
+
+
+class ArithmeticRange(PayoutSchedule):
+    """
+    start, start+step, ... (включительно до stop). as_int=True — каждый элемент усекается до целого
+    (как Decimal(int(cur)) в старом _gen_recovery_Ms).
+    """
+    __slots__ = ("start", "stop", "step", "as_int", "_n", "_si", "_ti")
+
+    def __init__(self, start, stop, step=1, as_int: bool = False):
+        start, stop, step = Decimal(start), Decimal(stop), Decimal(step)
+        if step == 0:
+            raise ValueError("step must be non-zero")
+        self.start, self.stop, self.step, self.as_int = start, stop, step, bool(as_int)
+        span = (stop - start) / step
+        self._n = int(span) + 1 if span >= 0 else 0
+        # целочисленный быстрый путь: один Decimal(int) на элемент
+        if start == start.to_integral_value() and step == step.to_integral_value():
+            self._si, self._ti = int(start), int(step)
+        else:
+            self._si = self._ti = None
+
+    @classmethod
+    def between(cls, lo, hi, step=1, desc: bool = False, as_int: bool = False) -> "ArithmeticRange":
+        """lo..hi с шагом |step|; desc — от hi к lo."""
+        lo, hi = Decimal(lo), Decimal(hi)
+        if hi < lo:
+            lo, hi = hi, lo
+        st = abs(Decimal(step)) or Decimal(1)
+        return cls(hi, lo, -st, as_int) if desc else cls(lo, hi, st, as_int)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _item(self, i: int) -> Decimal:
+        if self._si is not None:
+            return Decimal(self._si + i * self._ti)
+        v = self.start + self.step * i
+        return Decimal(int(v)) if self.as_int else v
+
+    def __repr__(self):
+        return f"ArithmeticRange({self.start}, {self.stop}, {self.step}, n={self._n})"
+
+
+class PingPong(PayoutSchedule):
+    """a0..a(n-1), a(n-2)..a1 — период 2n-2, крайние точки не повторяются."""
+    __slots__ = ("inner", "_n")
+
+    def __init__(self, inner: PayoutSchedule):
+        self.inner = inner
+        n = len(inner)
+        self._n = 2 * n - 2 if n > 1 else n
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _item(self, i: int) -> Decimal:
+        n = len(self.inner)
+        return self.inner[i] if i < n else self.inner[2 * n - 2 - i]
+
+
+class Strided(PayoutSchedule):
+    """inner[offset], inner[offset+stride], ..."""
+    __slots__ = ("inner", "stride", "offset", "_n")
+
+    def __init__(self, inner: PayoutSchedule, stride: int = 1, offset: int = 0):
+        self.inner = inner
+        self.stride = max(1, int(stride))
+        self.offset = max(0, int(offset))
+        rest = len(inner) - self.offset
+        self._n = (rest + self.stride - 1) // self.stride if rest > 0 else 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def _item(self, i: int) -> Decimal:
+        return self.inner[self.offset + i * self.stride]
+
+
+class Ladder(PayoutSchedule):
+    """Фиксированная лестница значений; within(lo, hi) кэширует отфильтрованные копии."""
+    __slots__ = ("values", "_within")
+
+    def __init__(self, values):
+        self.values = tuple(Decimal(str(v)) if not isinstance(v, Decimal) else v for v in values)
+        self._within = {}
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def _item(self, i: int) -> Decimal:
+        return self.values[i]
+
+    def within(self, lo, hi) -> "Ladder":
+        lo, hi = Decimal(lo), Decimal(hi)
+        if hi < lo:
+            lo, hi = hi, lo
+        key = (lo, hi)
+        sub = self._within.get(key)
+        if sub is None:
+            if len(self._within) > 64:
+                self._within.clear()
+            sub = Ladder(v for v in self.values if lo <= v <= hi)
+            self._within[key] = sub
+        return sub
+
+
+# Дробная лестница восстановления: 1.02, 1.1 .. 2.0
+RECOVERY_LADDER = Ladder([Decimal("1.02")] + [Decimal(str(i / 10)) for i in range(11, 21)])
+
+
+class RandomLadder:
+    """
+    Случайный payout из лестницы в диапазоне [lo, hi]; если пересечения нет — случайное целое из диапазона.
+    Фильтрация — только при смене диапазона (configure).
+    """
+    __slots__ = ("ladder", "lo", "hi", "options", "rng")
+
+    def __init__(self, ladder: Ladder = RECOVERY_LADDER, lo="1.02", hi="2.0", rng=None):
+        self.ladder = ladder
+        self.rng = rng or random
+        self.lo = self.hi = None
+        self.options = ()
+        self.configure(lo, hi)
+
+    def configure(self, lo, hi):
+        lo, hi = Decimal(lo), Decimal(hi)
+        if hi < lo:
+            lo, hi = hi, lo
+        if lo == self.lo and hi == self.hi:
+            return
+        self.lo, self.hi = lo, hi
+        self.options = self.ladder.within(lo, hi).values
+
+    def choice(self) -> Decimal:
+        if self.options:
+            return self.rng.choice(self.options)
+        return Decimal(self.rng.randint(int(self.lo), int(self.hi)))
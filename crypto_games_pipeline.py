@@ -0,0 +1,148 @@
+#!/usr/bin/env python3
+# Crypto.Games — горячая замена стратегии и настроек без остановки потока бота
+#
+# Зачем:
+# - Смена диапазона payout, recovery или trigger требовала stop → start_bot: новый APIClient,
+#   повторный запрос баланса, потеря состояния (loss_total, recovery, позиция скана).
+# - Здесь UI кладёт новый снимок настроек (ConfigSnapshot, с номером версии) в StrategyPipeline,
+#   а поток бота применяет его между спинами (apply_pending в начале итерации цикла):
+#   замена BetConfig, атрибутов-настроек бота и — если изменился ключ стратегии —
+#   пересборка стратегии через set_strategy_factories. Ни простоя, ни лишних запросов к API.
+# - История снимков хранится (ограниченно) — можно откатиться к версии (rollback).
+
+import dataclasses
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Optional
+
+
+@dataclass(frozen=True)
+class ConfigSnapshot:
+    version: int
+    config: object                  # копия BetConfig
+    params: tuple                   # ((имя атрибута бота, значение), ...)
+    strategy_key: tuple = ()        # смена ключа → новая стратегия из strategy_factories[0]
+    strategy_factories: tuple = ()
+    created: float = 0.0
+    note: str = ""
+
+    def params_dict(self) -> dict:
+        return dict(self.params)
+
+    def diff(self, prev: Optional["ConfigSnapshot"]) -> list:
+        """Имена изменившихся полей BetConfig / параметров / стратегии относительно prev."""
+        if prev is None:
+            return ["*"]
+        changed = []
+        if self.config is not None and prev.config is not None and dataclasses.is_dataclass(self.config):
+            for f in dataclasses.fields(self.config):
+                if getattr(self.config, f.name, None) != getattr(prev.config, f.name, None):
+                    changed.append(f.name)
+        old = prev.params_dict()
+        for k, v in self.params:
+            if k not in old or old[k] != v:
+                changed.append(k)
+        if self.strategy_key != prev.strategy_key:
+            changed.append("strategy")
+        return changed
+
+
+def _copy_config(cfg):
+    if cfg is not None and dataclasses.is_dataclass(cfg):
+        return dataclasses.replace(cfg)
+    return cfg
+
+
+class StrategyPipeline:
+    """
+    Очередь из одного ожидающего снимка: submit() из UI-потока, apply_pending() из потока бота.
+    Быстрый путь в цикле — проверка pipeline.pending is not None.
+    """
+    def __init__(self, history: int = 32):
+        self._lock = threading.Lock()
+        self._version = 0
+        self.current: Optional[ConfigSnapshot] = None
+        self.pending: Optional[ConfigSnapshot] = None
+        self.history = deque(maxlen=max(1, int(history)))
+        self.swaps = 0
+
+    @property
+    def version(self) -> int:
+        return self.current.version if self.current is not None else 0
+
+    def _make(self, base: Optional[ConfigSnapshot], config, params, strategy_key, strategy_factories,
+              note: str) -> ConfigSnapshot:
+        self._version += 1
+        merged = dict(base.params) if base is not None else {}
+        if params:
+            merged.update(params)
+        return ConfigSnapshot(
+            version=self._version,
+            config=_copy_config(config if config is not None else (base.config if base else None)),
+            params=tuple(merged.items()),
+            strategy_key=tuple(strategy_key) if strategy_key is not None else (base.strategy_key if base else ()),
+            strategy_factories=tuple(strategy_factories) if strategy_factories is not None
+            else (base.strategy_factories if base else ()),
+            created=time.time(),
+            note=note,
+        )
+
+    def adopt(self, bot, param_names, strategy_key=()) -> ConfigSnapshot:
+        """Снять текущее состояние бота как исходную версию (без применения)."""
+        params = {name: getattr(bot, name) for name in param_names if hasattr(bot, name)}
+        with self._lock:
+            snap = self._make(None, getattr(bot, "config", None), params, strategy_key,
+                              getattr(bot, "strategy_factories", ()), "adopted")
+            self.current = snap
+            self.history.append(snap)
+        return snap
+
+    def submit(self, config=None, params: Optional[dict] = None, strategy_key=None,
+               strategy_factories=None, note: str = "") -> ConfigSnapshot:
+        """Новая версия поверх последней (ожидающей или текущей); применится перед следующим спином."""
+        with self._lock:
+            base = self.pending or self.current
+            snap = self._make(base, config, params, strategy_key, strategy_factories, note)
+            self.pending = snap
+        return snap
+
+    def rollback(self, version: int) -> Optional[ConfigSnapshot]:
+        with self._lock:
+            old = next((s for s in self.history if s.version == version), None)
+        if old is None:
+            return None
+        return self.submit(old.config, old.params_dict(), old.strategy_key, old.strategy_factories,
+                           note=f"rollback to v{version}")
+
+    def apply_pending(self, bot):
+        """
+        Вызывается потоком бота между спинами. Возвращает (snapshot, changed) или None.
+        """
+        if self.pending is None:
+            return None
+        with self._lock:
+            snap = self.pending
+            self.pending = None
+        if snap is None:
+            return None
+        prev = self.current
+        changed = snap.diff(prev)
+        if snap.config is not None:
+            bot.config = _copy_config(snap.config)
+        for name, value in snap.params:
+            setattr(bot, name, value)
+        if (prev is None or snap.strategy_key != prev.strategy_key) and snap.strategy_factories:
+            bot.set_strategy_factories(snap.strategy_factories)
+            bot.set_strategy(snap.strategy_factories[0]())
+        self.current = snap
+        self.history.append(snap)
+        self.swaps += 1
+        hook = getattr(bot, "on_config_applied", None)
+        if hook is not None:
+            try:
+                hook(snap, changed)
+            except Exception:
+                pass
+        return snap, changed
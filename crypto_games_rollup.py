@@ -0,0 +1,360 @@
+#!/usr/bin/env python3
+# Crypto.Games — агрегаты спинов по времени (1 мин / 1 ч / 1 день), считаются на лету и хранятся в SQLite
+#
+# Зачем:
+# - Для графиков и разборов «что было за час/день» каждый раз пересчитывались сырые логи
+#   (logs_parsed.csv, summary.csv). Здесь на каждый спин обновляются три корзины бота:
+#   spins, wins, wagered, pnl и баланс open/high/low/close. Недели истории — тысячи строк,
+#   запрос — миллисекунды; сырые логи можно архивировать.
+# - RollupBook.add(...) — O(1): под замком обновляются три накопителя в словаре «изменено с
+#   прошлой записи». Поток-писатель раз в flush_interval делает UPSERT этих дельт одной транзакцией:
+#   счётчики складываются, high/low — max/min, open берётся у самого раннего спина, close — у
+#   самого позднего. Поэтому несколько процессов (скрипты ботов) пишут в одну базу, а перезапуск
+#   посреди минуты дописывает ту же корзину.
+# - open — баланс до первого спина корзины (balance − profit), т.е. совпадает с close предыдущей.
+#   high/low учитывают и open, так что open/close всегда внутри [low, high] (контракт свечи).
+#   Баланс NaN (конвертированные Bot-N логи) — open/high/low/close пустые. Корзины — по UTC.
+# - Спины приходят из журнала спинов (crypto_games_journal.open_journal). Включено по умолчанию:
+#   CG_ROLLUPS не задан — logs/rollups.db; "0" / "off" — выключено; иначе путь к базе.
+#
+# Запуск: python crypto_games_rollup.py show --res 1h --days 7
+#         python crypto_games_rollup.py show --res 1d --fleet
+#         python crypto_games_rollup.py import logs/*.cgj --replace
+#         python crypto_games_rollup.py bench 500000
+
+import argparse
+import atexit
+import os
+import sys
+import threading
+import time
+
+try:
+    import sqlite3
+except Exception:
+    sqlite3 = None
+
+DEFAULT_PATH = os.path.join("logs", "rollups.db")
+FLUSH_INTERVAL = 5.0
+RESOLUTIONS = {"1m": 60, "1h": 3600, "1d": 86400}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS rollups (
+    res      INTEGER NOT NULL,
+    bot      TEXT NOT NULL,
+    bucket   INTEGER NOT NULL,
+    spins    INTEGER NOT NULL,
+    wins     INTEGER NOT NULL,
+    wagered  REAL NOT NULL,
+    pnl      REAL NOT NULL,
+    open     REAL,
+    high     REAL,
+    low      REAL,
+    close    REAL,
+    first_ts REAL NOT NULL,
+    last_ts  REAL NOT NULL,
+    PRIMARY KEY (res, bot, bucket)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS rollups_res_bucket ON rollups(res, bucket);
+"""
+
+_UPSERT = """
+INSERT INTO rollups (res, bot, bucket, spins, wins, wagered, pnl, open, high, low, close, first_ts, last_ts)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT (res, bot, bucket) DO UPDATE SET
+    spins    = spins + excluded.spins,
+    wins     = wins + excluded.wins,
+    wagered  = wagered + excluded.wagered,
+    pnl      = pnl + excluded.pnl,
+    open     = CASE WHEN excluded.first_ts < first_ts THEN excluded.open ELSE open END,
+    high     = max(coalesce(high, excluded.high), coalesce(excluded.high, high),
+                   coalesce(excluded.open, high, excluded.high)),
+    low      = min(coalesce(low, excluded.low), coalesce(excluded.low, low),
+                   coalesce(excluded.open, low, excluded.low)),
+    close    = CASE WHEN excluded.last_ts >= last_ts THEN excluded.close ELSE close END,
+    first_ts = min(first_ts, excluded.first_ts),
+    last_ts  = max(last_ts, excluded.last_ts)
+"""
+
+# накопитель корзины: [spins, wins, wagered, pnl, open, high, low, close, first_ts, last_ts]
+_SPINS, _WINS, _WAGERED, _PNL, _OPEN, _HIGH, _LOW, _CLOSE, _FIRST, _LAST = range(10)
+
+
+def _open(path: str, readonly: bool = False):
+    if readonly:
+        return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def res_seconds(res) -> int:
+    """'1h' / 3600 → 3600."""
+    if isinstance(res, str):
+        if res not in RESOLUTIONS:
+            raise ValueError(f"разрешение: {', '.join(RESOLUTIONS)}")
+        return RESOLUTIONS[res]
+    return int(res)
+
+
+class RollupBook:
+    """Дельты корзин в памяти + поток-писатель в SQLite; add() потокобезопасен и не делает I/O."""
+    def __init__(self, path: str = DEFAULT_PATH, flush_interval: float = FLUSH_INTERVAL):
+        if sqlite3 is None:
+            raise RuntimeError("sqlite3 недоступен")
+        self.path = path
+        self.flush_interval = max(0.05, float(flush_interval))
+        self._lock = threading.Lock()
+        self._io_lock = threading.Lock()
+        self._dirty = {}                        # (res, bot, bucket) → накопитель с прошлой записи
+        self._stop = threading.Event()
+        self.spins = 0
+        self.written = 0
+        self.errors = 0
+        _open(path).close()                     # схема и WAL — сразу, ошибки пути видны вызывающему
+        self._thread = threading.Thread(target=self._run, name="rollup-writer", daemon=True)
+        self._thread.start()
+
+    def add(self, ts: float, bot: str, bet: float, profit: float, balance: float, win: bool):
+        """Учесть спин во всех разрешениях; balance NaN/None — без OHLC."""
+        bal = None if balance is None or balance != balance else balance
+        opening = None if bal is None else bal - profit
+        with self._lock:
+            self.spins += 1
+            dirty = self._dirty
+            for sec in RESOLUTIONS.values():
+                key = (sec, bot, int(ts // sec) * sec)
+                acc = dirty.get(key)
+                if acc is None:
+                    if bal is None:
+                        dirty[key] = [1, 1 if win else 0, bet, profit, None, None, None, None, ts, ts]
+                    else:
+                        dirty[key] = [1, 1 if win else 0, bet, profit, opening, max(bal, opening),
+                                      min(bal, opening), bal, ts, ts]
+                    continue
+                acc[_SPINS] += 1
+                if win:
+                    acc[_WINS] += 1
+                acc[_WAGERED] += bet
+                acc[_PNL] += profit
+                if ts >= acc[_LAST]:
+                    acc[_LAST] = ts
+                    acc[_CLOSE] = bal
+                if ts < acc[_FIRST]:
+                    acc[_FIRST] = ts
+                    acc[_OPEN] = opening
+                if bal is not None:
+                    hi, lo = max(bal, opening), min(bal, opening)
+                    if acc[_HIGH] is None or hi > acc[_HIGH]:
+                        acc[_HIGH] = hi
+                    if acc[_LOW] is None or lo < acc[_LOW]:
+                        acc[_LOW] = lo
+
+    def flush(self):
+        """Записать накопленные дельты (вызывается писателем, при close и из CLI)."""
+        with self._io_lock:
+            with self._lock:
+                dirty, self._dirty = self._dirty, {}
+            if not dirty:
+                return
+            rows = [(sec, bot, bucket, *acc) for (sec, bot, bucket), acc in dirty.items()]
+            try:
+                conn = _open(self.path)
+                try:
+                    with conn:
+                        conn.executemany(_UPSERT, rows)
+                finally:
+                    conn.close()
+                self.written += len(rows)
+            except Exception as e:
+                self.errors += 1
+                if self.errors == 1 or self.errors % 100 == 0:
+                    print(f"[rollup] {self.path}: {e} ({len(rows)} buckets lost)")
+
+    def close(self, timeout: float = 10.0):
+        self._stop.set()
+        self._thread.join(timeout)
+        self.flush()
+
+    def stats(self) -> dict:
+        with self._lock:
+            pending = len(self._dirty)
+        return {"spins": self.spins, "pending": pending, "written": self.written, "errors": self.errors}
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+
+_default = None
+_default_lock = threading.Lock()
+_default_tried = False
+
+
+def rollup_path_from_env():
+    spec = os.environ.get("CG_ROLLUPS", "").strip()
+    if spec.lower() in ("0", "off", "no", "none"):
+        return None
+    if not spec or spec.lower() in ("1", "on", "yes"):
+        return DEFAULT_PATH
+    return spec
+
+
+def rollup_book():
+    """Общие агрегаты процесса или None (CG_ROLLUPS=off / sqlite3 недоступен / ошибка открытия)."""
+    global _default, _default_tried
+    if _default is None and not _default_tried:
+        with _default_lock:
+            if _default is None and not _default_tried:
+                _default_tried = True
+                path = rollup_path_from_env()
+                if path and sqlite3 is not None:
+                    try:
+                        _default = RollupBook(path)
+                        atexit.register(_default.close)
+                    except Exception as e:
+                        print(f"[rollup] disabled: {e}")
+    return _default
+
+
+# ------------------ Запросы ------------------
+def _where(res, days=None, bots=None, since=None, until=None):
+    clauses, args = ["res = ?"], [res_seconds(res)]
+    if days is not None:
+        since = time.time() - float(days) * 86400
+    if since is not None:
+        clauses.append("bucket >= ?")
+        args.append(int(since // args[0]) * args[0])
+    if until is not None:
+        clauses.append("bucket < ?")
+        args.append(float(until))
+    if bots:
+        bots = list(bots)
+        clauses.append(f"bot IN ({','.join('?' * len(bots))})")
+        args.extend(bots)
+    return " WHERE " + " AND ".join(clauses), args
+
+
+def query(conn, res="1h", days=None, bots=None, since=None, until=None):
+    """[(bucket, bot, spins, wins, wagered, pnl, open, high, low, close)] по времени, затем по боту."""
+    where, args = _where(res, days, bots, since, until)
+    sql = (f"SELECT bucket, bot, spins, wins, wagered, pnl, open, high, low, close FROM rollups{where} "
+           f"ORDER BY bucket, bot")
+    return conn.execute(sql, args).fetchall()
+
+
+def fleet(conn, res="1h", days=None, bots=None, since=None, until=None):
+    """[(bucket, bots, spins, wins, wagered, pnl)] — суммы по всем ботам (баланс у ботов общий, OHLC не суммируется)."""
+    where, args = _where(res, days, bots, since, until)
+    sql = (f"SELECT bucket, COUNT(*), SUM(spins), SUM(wins), SUM(wagered), SUM(pnl) FROM rollups{where} "
+           f"GROUP BY bucket ORDER BY bucket")
+    return conn.execute(sql, args).fetchall()
+
+
+def import_journal(book: RollupBook, path: str, bot: str = None, replace: bool = False) -> int:
+    """Досчитать агрегаты из журнала спинов (.cgj); replace — сперва удалить строки этого бота."""
+    from crypto_games_journal import F_WIN, iter_records
+    bot = bot or os.path.splitext(os.path.basename(path))[0]
+    if replace:
+        book.flush()
+        with book._io_lock:
+            conn = _open(book.path)
+            try:
+                with conn:
+                    conn.execute("DELETE FROM rollups WHERE bot = ?", (bot,))
+            finally:
+                conn.close()
+    n = 0
+    for r in iter_records(path):
+        book.add(r["ts"], bot, r["bet"], r["profit"], r["balance"], r["flags"] & F_WIN)
+        n += 1
+        if n % 200000 == 0:
+            book.flush()
+    book.flush()
+    return n
+
+
+def _fmt_bucket(bucket, sec) -> str:
+    return time.strftime("%Y-%m-%d" if sec >= 86400 else "%Y-%m-%d %H:%M", time.gmtime(bucket))
+
+
+def _fmt_bal(x) -> str:
+    return "-" if x is None else f"{x:.8f}"
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Crypto.Games time-bucketed spin rollups")
+    ap.add_argument("--db", default=rollup_path_from_env() or DEFAULT_PATH)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    s = sub.add_parser("show", help="корзины по времени")
+    s.add_argument("--res", default="1h", choices=list(RESOLUTIONS))
+    s.add_argument("--days", type=float, default=None, help="только последние N дней")
+    s.add_argument("--bot", action="append", default=None)
+    s.add_argument("--fleet", action="store_true", help="суммы по всем ботам")
+    im = sub.add_parser("import", help="журналы спинов .cgj → агрегаты")
+    im.add_argument("journals", nargs="+")
+    im.add_argument("--replace", action="store_true", help="удалить прежние агрегаты этих ботов")
+    b = sub.add_parser("bench", help="N спинов через add() и запрос недели часовых корзин")
+    b.add_argument("n", type=int, nargs="?", default=500000)
+    args = ap.parse_args(argv)
+
+    if sqlite3 is None:
+        print("sqlite3 недоступен")
+        return 1
+    if args.cmd == "import":
+        book = RollupBook(args.db, flush_interval=3600)
+        for path in args.journals:
+            t0 = time.perf_counter()
+            n = import_journal(book, path, replace=args.replace)
+            print(f"{path}: {n} spins ({time.perf_counter() - t0:.2f}s)")
+        book.close()
+        return 0
+    if args.cmd == "bench":
+        path = args.db if args.db != DEFAULT_PATH else "bench_rollups.db"
+        book = RollupBook(path)
+        now = time.time()
+        span = 21 * 86400                       # три недели истории на 8 ботов
+        t0 = time.perf_counter()
+        for k in range(args.n):
+            win = k % 97 == 0
+            book.add(now - span + span * k / args.n, f"Bot-{k % 8 + 1}", 0.001, 0.096 if win else -0.001,
+                     10.0 + (k % 1000) * 1e-3, win)
+        t_add = time.perf_counter() - t0
+        book.close()
+        conn = _open(path, readonly=True)
+        t1 = time.perf_counter()
+        rows = query(conn, "1h", days=7)
+        t_q = time.perf_counter() - t1
+        t1 = time.perf_counter()
+        days = fleet(conn, "1d")
+        t_f = time.perf_counter() - t1
+        total = conn.execute("SELECT COUNT(*) FROM rollups").fetchone()[0]
+        conn.close()
+        print(f"spins={args.n} add={t_add / args.n * 1e6:.2f} µs/spin rows={total} "
+              f"1h×7d query={t_q * 1e3:.1f} ms ({len(rows)} rows) 1d fleet={t_f * 1e3:.1f} ms ({len(days)} rows) "
+              f"stats={book.stats()}")
+        return 0
+
+    sec = res_seconds(args.res)
+    conn = _open(args.db, readonly=True)
+    if args.fleet:
+        print(f"{'bucket (UTC)':<16} {'bots':>4} {'spins':>9} {'wins':>6} {'wagered':>16} {'pnl':>16}")
+        for bucket, nb, n, wins, wag, pnl in fleet(conn, sec, args.days, args.bot):
+            print(f"{_fmt_bucket(bucket, sec):<16} {nb:>4} {n:>9} {wins:>6} {wag:>16.8f} {pnl:>+16.8f}")
+    else:
+        print(f"{'bucket (UTC)':<16} {'bot':<10} {'spins':>8} {'wins':>5} {'wagered':>14} {'pnl':>15} "
+              f"{'open':>12} {'high':>12} {'low':>12} {'close':>12}")
+        for bucket, bot, n, wins, wag, pnl, o, h, lo, c in query(conn, sec, args.days, args.bot):
+            print(f"{_fmt_bucket(bucket, sec):<16} {bot:<10} {n:>8} {wins:>5} {wag:>14.8f} {pnl:>+15.8f} "
+                  f"{_fmt_bal(o):>12} {_fmt_bal(h):>12} {_fmt_bal(lo):>12} {_fmt_bal(c):>12}")
+    conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1036 @@
+#!/usr/bin/env python3
+# Crypto.Games — дискретно-событийный симулятор флота ботов (без потоков и sleep)
+#
+# Зачем:
+# - Глобальные правила менеджера проявляются только при многих ботах, а в GUI они
+#   живут на Tk after() с задержками от 5 секунд до 10 минут.
+# - Здесь вместо time.sleep / root.after — виртуальные часы (heapq), поэтому сутки
+#   работы флота прогоняются за секунды.
+#
+# Что моделируется:
+# - Бот: линейный payout-скан (min..max, +1 за спин, WRAP), Double-Press
+#   (WIN payout 5..8 + roll ≥ 90 → payout 10 на 2 спина; опционально roll ≥ 99 → payout 100),
+#   Recovery с общим S_ref (как в crypto_games_bot_stable_100-9999_cover%$.py),
+#   loss_total + GLOBAL STOP-LOSS бота (пауза 10 минут, как в cover_Version11_Version20).
+# - Менеджер:
+#   * check_global_take_profit / _trigger_global_tp / _resume_after_tp (пауза 5с → restart_after_tp);
+#   * _check_global_limits (глобальный TP/SL % → STOP ALL);
+#   * _check_global_recovery / force_end_recovery (общий S_ref, ступенчатое резюме по 5с);
+#   * _stop_recovery_for_all (синхронизация last_successful_bank по максимуму флота);
+#   * schedule_bot_pause (авто-пауза бота после GLOBAL STOP-LOSS).
+# - Перцентили баланса/просадки/серий LOSS: скетчи PathStats каждого бота сливаются в отчёте по флоту.
+# - Результаты кэшируются на диске (crypto_games_simcache): повтор — мгновенно, более длинный
+#   прогон продолжает сохранённый более короткий (--no-cache — отключить).
+# - Ставки и банки считаются во float (для скорости); RNG детерминированный (seed).
+#
+# Запуск: python crypto_games_sim.py --bots 10 --hours 24 --tp 10
+#         python crypto_games_sim.py scan-risk --bank 30 --spins 100000   (importance sampling)
+
+import argparse
+import bisect
+import heapq
+import math
+import os
+import random
+import statistics
+import sys
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Optional
+
+from crypto_games_simcache import SimResultCache, code_fingerprint, config_key
+from crypto_games_sizing import FloatBetSizer
+from crypto_games_sketch import PathStats
+
+MS_SECOND = 1000.0
+MS_MINUTE = 60 * MS_SECOND
+MS_HOUR = 60 * MS_MINUTE
+
+
+def floor8(x: float) -> float:
+    """Аналог quantize_bet (ROUND_DOWN до 8 знаков) для float."""
+    return math.floor(x * 1e8 + 1e-6) / 1e8
+
+
+# ------------------ Virtual clock ------------------
+class VirtualClock:
+    """
+    Очередь событий с виртуальным временем (мс). after() совместим по смыслу с Tk root.after().
+    """
+    def __init__(self):
+        self.now = 0.0
+        self._heap = []
+        self._seq = 0
+        self._cancelled = set()
+        self.events_run = 0
+
+    def after(self, ms, fn, *args):
+        self._seq += 1
+        heapq.heappush(self._heap, (self.now + max(0.0, float(ms)), self._seq, fn, args))
+        return self._seq
+
+    def after_cancel(self, event_id):
+        self._cancelled.add(event_id)
+
+    def run_until(self, t_end: float):
+        heap = self._heap
+        cancelled = self._cancelled
+        while heap and heap[0][0] <= t_end:
+            t, seq, fn, args = heapq.heappop(heap)
+            if seq in cancelled:
+                cancelled.discard(seq)
+                continue
+            self.now = t
+            self.events_run += 1
+            fn(*args)
+        self.now = max(self.now, t_end)
+
+    def pending(self) -> int:
+        return len(self._heap)
+
+
+# ------------------ Config ------------------
+@dataclass
+class FleetSimConfig:
+    bots: int = 10
+    seed: int = 1
+    initial_bank: float = 100.0
+    # Тайминги (виртуальные): интервал спина = speed_ms + api_latency_ms
+    speed_ms: int = 50
+    api_latency_ms: int = 300
+    ui_poll_ms: int = 100
+    start_stagger_ms: int = 0              # 5000 — как start_all_bots в cover%$
+    # Base
+    base_bet: float = 0.001
+    min_bet: float = 0.001
+    max_bet_limit: float = 1.0
+    min_payout: int = 100
+    max_payout: int = 9999
+    house_edge_pct: float = 1.0
+    # Double-Press
+    press_enabled: bool = True
+    press_bet: float = 0.1
+    enable_highroll_99: bool = False
+    # Recovery с общим S_ref (менеджер)
+    shared_recovery: bool = True
+    recovery_min_payout: int = 50
+    recovery_max_payout: int = 1000
+    recovery_percent_per_win: float = 21.0
+    recovery_usdt_per_win: float = 0.0
+    recovery_dd_percent: float = 20.0
+    recovery_dd_usdt: float = 0.0
+    recovery_resume_stagger_ms: int = 5000
+    # Синхронизация last_successful_bank по флоту (_stop_recovery_for_all)
+    sync_last_successful: bool = False
+    # Глобальный TP: "pause" — пауза 5с и рестарт с новым initial; "stop" — STOP ALL
+    global_tp_percent: float = 0.0
+    global_tp_mode: str = "pause"
+    global_tp_pause_ms: int = 5000
+    global_sl_percent: float = 0.0
+    # GLOBAL STOP-LOSS бота по loss_total (0 — выключено)
+    bot_stop_loss_usdt: float = 0.0
+    bot_stop_loss_pause_ms: int = 600 * 1000
+    event_log_size: int = 2000
+
+
+# ------------------ Bot model ------------------
+class SimBot:
+    def __init__(self, sim: "FleetSimulation", idx: int):
+        cfg = sim.config
+        self.sim = sim
+        self.cfg = cfg
+        self.bot_id = f"Bot-{idx + 1}"
+        self.idx = idx
+        self.rng = random.Random(cfg.seed * 1000003 + idx)
+        self.interval_ms = max(10.0, float(cfg.speed_ms)) + max(0.0, float(cfg.api_latency_ms))
+        self.win_factor = (100.0 - cfg.house_edge_pct)
+
+        self.balance = float(cfg.initial_bank)
+        self.initial_bank = self.balance
+        self.last_successful_bank = self.balance
+        self.profit_global = 0.0
+
+        self.is_running = False
+        self.paused = False
+        self._spin_scheduled = False
+        self._global_sl_active = False
+
+        self.current_payout = cfg.min_payout
+        self.payout_wraps = 0
+
+        self.press_active = False
+        self.press_left = 0
+        self.press_payout = 0
+
+        self.recovery_active = False
+        self.recovery_payout = cfg.recovery_min_payout
+        self.recovery_shared_S_ref = None
+        self.recovery_divisor = 1
+        self.recovery_target_end = None
+
+        self.loss_total = 0.0
+        self.spins_total = 0           # не сбрасывается на restart_after_tp
+        self.path_stats = PathStats()  # перцентили баланса/просадки/серий LOSS в ограниченной памяти
+        # target/(payout-1) по таблице множителей для recovery-диапазона payout
+        self.recovery_sizer = FloatBetSizer(cfg.recovery_min_payout, cfg.recovery_max_payout)
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.stats = {"total_bets": 0, "wins": 0, "losses": 0, "profit": 0.0,
+                      "current_streak": 0, "total_wagered": 0.0, "max_bet": 0.0}
+        self.spin_count = 0
+
+    def reset_strategy(self):
+        self.current_payout = self.cfg.min_payout
+
+    def restart_after_tp(self, new_initial: float):
+        self.initial_bank = new_initial
+        self.last_successful_bank = new_initial
+        self.profit_global = 0.0
+        self.reset_stats()
+        self.reset_strategy()
+        self.path_stats.new_session(new_initial)
+
+    # -- управление, как у CryptoGamesBot --
+    def start(self):
+        self.is_running = True
+        self.paused = False
+        self._schedule_spin(0)
+
+    def stop(self):
+        self.is_running = False
+        self.paused = False
+
+    def pause(self):
+        self.paused = True
+
+    def resume(self):
+        self.paused = False
+        if self.is_running:
+            self._schedule_spin(0)
+
+    def _schedule_spin(self, delay_ms):
+        if self._spin_scheduled:
+            return
+        self._spin_scheduled = True
+        self.sim.clock.after(delay_ms, self._spin)
+
+    def enter_recovery(self, shared_S_ref: float, divisor: int):
+        if shared_S_ref <= 0:
+            return
+        self.recovery_shared_S_ref = shared_S_ref
+        self.recovery_divisor = max(1, int(divisor))
+        self.recovery_target_end = shared_S_ref
+        self.recovery_payout = self.cfg.recovery_min_payout
+        self.press_active = False
+        self.press_left = 0
+        self.press_payout = 0
+        self.recovery_active = True
+
+    def _activate_press(self, payout: int):
+        self.press_active = True
+        self.press_left = 2
+        self.press_payout = payout
+
+    # -- один спин --
+    def _spin(self):
+        self._spin_scheduled = False
+        if not self.is_running or self.paused:
+            # пауза: бот «спит» до resume()
+            return
+        cfg = self.cfg
+        sim = self.sim
+        bal = self.balance
+        mode = "BASE"
+
+        if self.recovery_active and self.recovery_shared_S_ref and self.recovery_target_end:
+            mode = "RECOVERY"
+            payout = self.recovery_payout
+            R = self.recovery_target_end - bal
+            if R <= 0:
+                self._maybe_exit_recovery(bal)
+                self._schedule_spin(0)
+                return
+            target_from_percent = (cfg.recovery_percent_per_win / 100.0) * self.recovery_shared_S_ref / self.recovery_divisor
+            target_from_usdt = cfg.recovery_usdt_per_win / max(1, self.recovery_divisor) if cfg.recovery_usdt_per_win > 0 else 0.0
+            target_unit = target_from_usdt if target_from_usdt > 0 else target_from_percent
+            target_profit = target_unit if target_unit <= R else R
+            bet = self.recovery_sizer.bet(payout, target_profit, cfg.min_bet, cfg.max_bet_limit, bal)
+        elif self.press_active and self.press_left > 0:
+            mode = "PRESS"
+            payout = self.press_payout
+            bet = cfg.press_bet
+        else:
+            payout = self.current_payout
+            nxt = payout + 1
+            if nxt > cfg.max_payout:
+                nxt = cfg.min_payout
+                self.payout_wraps += 1
+            self.current_payout = nxt
+            bet = max(cfg.base_bet, cfg.min_bet)
+
+        bet = floor8(bet)
+        if bet <= 0 or bet > bal:
+            self.is_running = False
+            sim.log_event(self.bot_id, "STOP", f"insufficient funds balance={bal:.8f} bet={bet:.8f}")
+            sim.on_bank(self)
+            return
+
+        roll = self.rng.random() * 100.0
+        win = roll >= 100.0 - self.win_factor / payout
+        profit = bet * (payout - 1) if win else -bet
+        bal = bal + profit
+        self.balance = bal
+
+        st = self.stats
+        st["total_bets"] += 1
+        st["total_wagered"] += bet
+        self.spin_count += 1
+        self.spins_total += 1
+        if win:
+            st["wins"] += 1
+            st["profit"] += profit
+            st["current_streak"] = max(0, st["current_streak"] + 1)
+            if bal > self.last_successful_bank:
+                self.last_successful_bank = bal
+            if mode != "RECOVERY":
+                self.loss_total = 0.0
+        else:
+            st["losses"] += 1
+            st["current_streak"] = min(0, st["current_streak"] - 1)
+            if bet > st["max_bet"]:
+                st["max_bet"] = bet
+            self.loss_total += bet
+        self.path_stats.update(bal, win)
+        self.profit_global = bal - self.initial_bank
+
+        if mode == "RECOVERY":
+            if win:
+                self.recovery_payout = cfg.recovery_min_payout
+            else:
+                np_ = self.recovery_payout + 1
+                if np_ > cfg.recovery_max_payout:
+                    np_ = cfg.recovery_min_payout
+                self.recovery_payout = np_
+            self._maybe_exit_recovery(bal)
+        elif mode == "PRESS":
+            if win:
+                self.press_active = False
+                self.press_left = 0
+            else:
+                self.press_left -= 1
+                if self.press_left <= 0:
+                    self.press_active = False
+        elif win and cfg.press_enabled:
+            if cfg.enable_highroll_99 and roll >= 99.0:
+                self._activate_press(100)
+            elif 5 <= payout <= 8 and roll >= 90.0:
+                self._activate_press(10)
+
+        if win and cfg.sync_last_successful:
+            sim.manager.sync_last_successful(self, was_recovery=(mode == "RECOVERY"))
+
+        if cfg.bot_stop_loss_usdt > 0 and self.loss_total >= cfg.bot_stop_loss_usdt and not self._global_sl_active:
+            self.loss_total = 0.0
+            self._global_sl_active = True
+            sim.manager.schedule_bot_pause(self, cfg.bot_stop_loss_pause_ms, reason="GLOBAL STOP-LOSS")
+
+        sim.on_bank(self)
+        if self.is_running and not self.paused:
+            self._schedule_spin(self.interval_ms)
+
+    def _maybe_exit_recovery(self, current_balance: float):
+        if self.recovery_active and self.recovery_target_end is not None and current_balance >= self.recovery_target_end:
+            self.sim.manager.force_end_recovery(initiator_id=self.bot_id)
+            self.recovery_active = False
+            self.reset_strategy()
+
+
+# ------------------ Manager rules ------------------
+class SimFleetManager:
+    """
+    Правила BotManagerApp поверх VirtualClock. Проверки выполняются на «тике UI»
+    (каждые ui_poll_ms), но тик планируется только если с прошлого тика менялись банки.
+    """
+    def __init__(self, sim: "FleetSimulation"):
+        self.sim = sim
+        self.cfg = sim.config
+        self.clock = sim.clock
+        self.active_bots = {}
+        self.global_tp_active = False
+        self.global_stop_fired = False
+        self.recovery_global_active = False
+        self.tp_new_initials = {}
+        self._tick_scheduled = False
+
+    def register_bot(self, bot: SimBot):
+        self.active_bots[bot.bot_id] = bot
+
+    def mark_dirty(self):
+        if self._tick_scheduled:
+            return
+        self._tick_scheduled = True
+        poll = float(self.cfg.ui_poll_ms)
+        now = self.clock.now
+        nxt = (math.floor(now / poll) + 1) * poll
+        self.clock.after(nxt - now, self._tick)
+
+    def _tick(self):
+        self._tick_scheduled = False
+        self.check_global_take_profit()
+        self._check_global_limits()
+        if self.cfg.shared_recovery:
+            self._check_global_recovery()
+
+    def _aggregate_initial_and_current(self):
+        total_initial = 0.0
+        total_current = 0.0
+        for b in self.active_bots.values():
+            total_current += b.balance
+            total_initial += b.initial_bank if b.initial_bank > 0 else b.balance
+        return total_initial, total_current
+
+    # -- Global TP (pause 5s → restart_after_tp) --
+    def check_global_take_profit(self):
+        cfg = self.cfg
+        if cfg.global_tp_percent <= 0 or cfg.global_tp_mode != "pause":
+            return
+        total_initial, total_current = self._aggregate_initial_and_current()
+        if total_initial <= 0:
+            return
+        if total_current >= total_initial * (1.0 + cfg.global_tp_percent / 100.0) and not self.global_tp_active:
+            self._trigger_global_tp(total_current, total_initial)
+
+    def _trigger_global_tp(self, total_current: float, total_initial: float):
+        self.global_tp_active = True
+        growth = (total_current - total_initial) * 100.0 / total_initial
+        self.sim.counters["global_tp"] += 1
+        self.sim.log_event("Manager", "GLOBAL-TP", f"growth={growth:.2f}% pause {self.cfg.global_tp_pause_ms / 1000:.0f}s")
+        self.tp_new_initials = {bid: b.balance for bid, b in self.active_bots.items()}
+        for b in self.active_bots.values():
+            b.pause()
+        self.clock.after(self.cfg.global_tp_pause_ms, self._resume_after_tp)
+
+    def _resume_after_tp(self):
+        for bid, b in self.active_bots.items():
+            new_initial = self.tp_new_initials.get(bid)
+            if new_initial is None or new_initial <= 0:
+                new_initial = b.balance
+            b.restart_after_tp(new_initial)
+            b.resume()
+        self.global_tp_active = False
+        self.tp_new_initials = {}
+
+    # -- Global TP/SL % → STOP ALL --
+    def _check_global_limits(self):
+        cfg = self.cfg
+        if self.global_stop_fired:
+            return
+        tp_stop = cfg.global_tp_percent > 0 and cfg.global_tp_mode == "stop"
+        if not tp_stop and cfg.global_sl_percent <= 0:
+            return
+        total_initial, total_current = self._aggregate_initial_and_current()
+        if total_initial <= 0:
+            return
+        growth = (total_current - total_initial) * 100.0 / total_initial
+        if tp_stop and growth >= cfg.global_tp_percent:
+            self._trigger_global_stop("TP", growth)
+        elif cfg.global_sl_percent > 0 and growth <= -cfg.global_sl_percent:
+            self._trigger_global_stop("SL", growth)
+
+    def _trigger_global_stop(self, kind: str, growth: float):
+        self.global_stop_fired = True
+        self.sim.counters["global_stop"] += 1
+        self.sim.log_event("Manager", f"GLOBAL-{kind}", f"growth={growth:.2f}% → STOP ALL")
+        for b in self.active_bots.values():
+            b.stop()
+
+    # -- Shared S_ref recovery --
+    def _check_global_recovery(self):
+        cfg = self.cfg
+        active = list(self.active_bots.values())
+        N = len(active)
+        if N == 0:
+            return
+        shared_S_ref = 0.0
+        sum_current = 0.0
+        for b in active:
+            sum_current += b.balance
+            if b.last_successful_bank > shared_S_ref:
+                shared_S_ref = b.last_successful_bank
+        if shared_S_ref <= 0:
+            return
+        denom = shared_S_ref * N
+        deficit_abs = max(0.0, denom - sum_current)
+        dd_pct = deficit_abs * 100.0 / denom
+        trigger_by_pct = cfg.recovery_dd_percent > 0 and dd_pct >= cfg.recovery_dd_percent
+        trigger_by_usdt = cfg.recovery_dd_usdt > 0 and deficit_abs >= cfg.recovery_dd_usdt
+
+        if not self.recovery_global_active and (trigger_by_pct or trigger_by_usdt):
+            self.recovery_global_active = True
+            for b in active:
+                b.enter_recovery(shared_S_ref, N)
+            self.sim.counters["recovery_start"] += 1
+            self.sim.log_event("Manager", "RECOVERY-START",
+                               f"dd%={dd_pct:.2f} deficit={deficit_abs:.8f} S_ref={shared_S_ref:.8f} bots={N}")
+            return
+
+        if self.recovery_global_active and not any(b.recovery_active for b in self.active_bots.values()):
+            self.recovery_global_active = False
+
+    def force_end_recovery(self, initiator_id: Optional[str] = None):
+        bots_seq = list(self.active_bots.values())
+        for b in bots_seq:
+            b.recovery_active = False
+            b.recovery_shared_S_ref = None
+            b.recovery_target_end = None
+            b.recovery_payout = self.cfg.recovery_min_payout
+            b.reset_strategy()
+            if b.balance > 0:
+                b.initial_bank = b.balance
+                b.last_successful_bank = b.balance
+                b.profit_global = 0.0
+            b.pause()
+        self.recovery_global_active = False
+        self.sim.counters["recovery_end"] += 1
+        self.sim.log_event("Manager", "RECOVERY-END", f"force-completed by {initiator_id or 'unknown'}")
+        for idx, b in enumerate(bots_seq):
+            self.clock.after(self.cfg.recovery_resume_stagger_ms * (idx + 1), b.resume)
+
+    # -- _stop_recovery_for_all / синхронизация last_successful_bank --
+    def sync_last_successful(self, bot: SimBot, was_recovery: bool):
+        global_max = bot.balance
+        for b in self.active_bots.values():
+            if b.last_successful_bank > global_max:
+                global_max = b.last_successful_bank
+        for b in self.active_bots.values():
+            b.last_successful_bank = global_max
+        if was_recovery and bot.balance >= global_max:
+            self._stop_recovery_for_all(global_max)
+
+    def _stop_recovery_for_all(self, global_max: float):
+        for b in self.active_bots.values():
+            b.last_successful_bank = global_max
+            b.recovery_active = False
+            b.profit_global = 0.0
+        self.sim.counters["recovery_sync_stop"] += 1
+        self.sim.log_event("Manager", "RECOVERY-OFF", f"global sync last_successful={global_max:.8f}")
+
+    # -- GLOBAL STOP-LOSS бота: авто-пауза --
+    def schedule_bot_pause(self, bot: SimBot, ms: float, reason: str = ""):
+        bot.pause()
+        self.sim.counters["bot_pauses"] += 1
+        self.sim.log_event(bot.bot_id, "PAUSE", f"{reason} for {ms / 1000:.0f}s")
+        self.clock.after(ms, self._resume_after_pause, bot)
+
+    def _resume_after_pause(self, bot: SimBot):
+        # метод, а не замыкание: очередь событий должна сериализоваться (кэш результатов)
+        bot._global_sl_active = False
+        bot.resume()
+
+
+# ------------------ Simulation ------------------
+@dataclass
+class FleetSimReport:
+    virtual_ms: float
+    wall_seconds: float
+    total_spins: int
+    events_run: int
+    counters: dict
+    bots: list = field(default_factory=list)
+    events: list = field(default_factory=list)
+    fleet_path_stats: Optional[PathStats] = None
+    cache_status: str = ""
+
+    def format(self) -> str:
+        hours = self.virtual_ms / MS_HOUR
+        rate = self.total_spins / self.wall_seconds if self.wall_seconds > 0 else 0.0
+        lines = [f"=== FLEET SIM: {hours:.2f}h virtual in {self.wall_seconds:.2f}s wall "
+                 f"({self.total_spins} spins, {rate:,.0f} spins/s, {self.events_run} events) ==="]
+        if self.cache_status:
+            lines.append(f"Cache: {self.cache_status}")
+        lines.append("Counters: " + ", ".join(f"{k}={v}" for k, v in sorted(self.counters.items())))
+        for b in self.bots:
+            lines.append(f"  {b['bot_id']}: spins={b['spins']} wins={b['wins']} bank={b['balance']:.8f} "
+                         f"initial={b['initial_bank']:.8f} last_successful={b['last_successful_bank']:.8f} "
+                         f"running={b['running']}")
+            if b.get("max_dd_pct") is not None:
+                lines.append(f"    maxDD={b['max_dd_pct']:.2f}% loss-streak p99={b['loss_streak_p99']}")
+        if self.fleet_path_stats is not None:
+            lines.append("Fleet path: " + self.fleet_path_stats.format())
+        return "\n".join(lines)
+
+
+class FleetSimulation:
+    def __init__(self, config: FleetSimConfig = None):
+        self.config = config or FleetSimConfig()
+        self.clock = VirtualClock()
+        self.counters = {"global_tp": 0, "global_stop": 0, "recovery_start": 0, "recovery_end": 0,
+                         "recovery_sync_stop": 0, "bot_pauses": 0}
+        self.events = deque(maxlen=max(1, self.config.event_log_size))
+        self.manager = SimFleetManager(self)
+        self.bots = [SimBot(self, i) for i in range(max(1, int(self.config.bots)))]
+        self._started = False
+
+    def log_event(self, who: str, kind: str, detail: str = ""):
+        self.events.append((self.clock.now, who, kind, detail))
+
+    def on_bank(self, bot: SimBot):
+        self.manager.mark_dirty()
+
+    def start(self):
+        if self._started:
+            return
+        self._started = True
+        for i, b in enumerate(self.bots):
+            self.manager.register_bot(b)
+            self.clock.after(self.config.start_stagger_ms * i, b.start)
+
+    def run(self, duration_ms: float) -> FleetSimReport:
+        """Прогнать ещё duration_ms виртуального времени (можно вызывать повторно)."""
+        self.start()
+        t0 = time.perf_counter()
+        self.clock.run_until(self.clock.now + float(duration_ms))
+        wall = time.perf_counter() - t0
+        return self.report(wall)
+
+    def report(self, wall_seconds: float = 0.0) -> FleetSimReport:
+        bots = [{"bot_id": b.bot_id, "spins": b.spins_total, "wins": b.stats["wins"],
+                 "balance": b.balance, "initial_bank": b.initial_bank,
+                 "last_successful_bank": b.last_successful_bank, "running": b.is_running,
+                 "max_dd_pct": b.path_stats.dd.max_dd_pct,
+                 "loss_streak_p99": b.path_stats.loss_streak.quantile(0.99)}
+                for b in self.bots]
+        total = sum(b.spins_total for b in self.bots)
+        return FleetSimReport(virtual_ms=self.clock.now, wall_seconds=wall_seconds, total_spins=total,
+                              events_run=self.clock.events_run, counters=dict(self.counters),
+                              bots=bots, events=list(self.events),
+                              fleet_path_stats=PathStats.merged(b.path_stats for b in self.bots))
+
+
+# ------------------ Result cache ------------------
+_SIM_SOURCES = tuple(os.path.join(os.path.dirname(os.path.abspath(__file__)), name)
+                     for name in ("crypto_games_sim.py", "crypto_games_sketch.py"))
+_FLEET_CACHE_REPORTS = 16     # сколько отчётов разной длительности хранить на один конфиг
+
+
+def _cache_key(kind: str, config) -> str:
+    return config_key(kind, config, code_fingerprint(*_SIM_SOURCES))
+
+
+def run_fleet_sim(config: FleetSimConfig = None, hours: float = 24.0,
+                  cache: Optional[SimResultCache] = None) -> FleetSimReport:
+    """
+    С cache: тот же конфиг и длительность → отчёт из кэша; более длинный прогон продолжает
+    сохранённое состояние симуляции (виртуальные часы детерминированы, результат тот же,
+    что у прогона с нуля).
+    """
+    config = config or FleetSimConfig()
+    duration = float(hours) * MS_HOUR
+    if cache is None:
+        return FleetSimulation(config).run(duration)
+
+    key = _cache_key("fleet", config)
+    entry = cache.get(key) or {"reports": {}, "sim": None}
+    rep = entry["reports"].get(duration)
+    if rep is not None:
+        rep.cache_status = f"hit ({duration / MS_HOUR:.2f}h)"
+        return rep
+
+    sim = entry.get("sim")
+    if sim is not None and sim.clock.now <= duration:
+        done = sim.clock.now
+        rep = sim.run(duration - done)
+        status = f"extended {done / MS_HOUR:.2f}h → {duration / MS_HOUR:.2f}h"
+    else:
+        sim = FleetSimulation(config)
+        rep = sim.run(duration)
+        status = "miss"
+        if entry.get("sim") is not None and entry["sim"].clock.now > duration:
+            sim = entry["sim"]      # держим самый длинный чекпоинт
+    reports = entry["reports"]
+    reports[duration] = rep
+    while len(reports) > _FLEET_CACHE_REPORTS:
+        reports.pop(next(iter(reports)))
+    cache.put(key, {"reports": reports, "sim": sim})
+    rep.cache_status = status
+    return rep
+
+
+
+# ------------------ Rare wins: importance sampling ------------------
+# Линейный скан 1000..9999 фиксированной ставкой: выигрыш — редкое событие (~1/5000 спинов),
+# поэтому обычный Monte Carlo тратит миллионы спинов на то, чтобы увидеть хвосты
+# (разорение большого банка, крупный профит). Здесь:
+# - вероятность выигрыша наклоняется q = tilt * p, исход перевзвешивается отношением
+#   правдоподобий p/q (WIN) и (1-p)/(1-q) (LOSS);
+# - серии LOSS не разыгрываются по спину: позиция следующего WIN выбирается сразу
+#   (экспоненциальная величина против накопленного -log(1-q)), разорение — по числу
+#   проигрышей, которые банк ещё может оплатить;
+# - tilt=0 — подбор наклона методом cross-entropy под выбранное событие ("ruin" / "profit");
+#   наклонённые пути оценивают только это событие, второе — отдельным прогоном обычного MC
+#   (наклон под одно событие почти не даёт путей другого — оценка «0 с CI [0, 0]» была бы ложной);
+# - событие без попаданий или с малым ESS попавших путей (< min_hit_ess) — откат на обычный MC
+#   и предупреждение в отчёте; 0 попаданий — верхняя граница по «правилу трёх»;
+# - средний профит: контрольная переменная с известным матожиданием -edge*bet за спин,
+#   дисперсию дают только разорившиеся пути.
+@dataclass
+class ScanRiskConfig:
+    bank: float = 30.0
+    bet: float = 0.001
+    min_payout: int = 1000
+    max_payout: int = 9999
+    house_edge_pct: float = 1.0
+    spins: int = 100000                    # горизонт сессии
+    stop_balance: float = 0.0              # разорение: баланс < bet или ≤ stop_balance
+    target: str = "ruin"                   # "ruin" — P(разорение); "profit" — P(profit ≥ profit_target)
+    profit_target: float = 0.0
+    paths: int = 20000
+    seed: int = 1
+    tilt: float = 0.0                      # 0 — auto (cross-entropy), 1 — обычный MC
+    ce_pilot_paths: int = 2000
+    ce_rho: float = 0.1
+    ce_max_iters: int = 12
+    confidence: float = 0.95
+    min_hit_ess: float = 10.0              # ESS попавших в событие путей ниже — IS не доверяем
+
+
+class _ScanModel:
+    """Накопленные суммы по одному циклу payout-скана для заданного наклона."""
+    def __init__(self, cfg: ScanRiskConfig, tilt: float):
+        lo, hi = int(cfg.min_payout), int(cfg.max_payout)
+        if hi < lo:
+            lo, hi = hi, lo
+        self.tilt = float(tilt)
+        self.payouts = list(range(lo, hi + 1))
+        self.n = len(self.payouts)
+        wf = (100.0 - cfg.house_edge_pct) / 100.0
+        A = [0.0]      # Σ -log(1-q)
+        B = [0.0]      # Σ -log(1-p)
+        S = [0.0]      # Σ p
+        self.win_lr = []
+        for M in self.payouts:
+            p = wf / M
+            q = min(max(p * self.tilt, 1e-12), 0.5)
+            A.append(A[-1] - math.log1p(-q))
+            B.append(B[-1] - math.log1p(-p))
+            S.append(S[-1] + p)
+            self.win_lr.append(math.log(p / q))
+        self.A, self.B, self.S = A, B, S
+
+    def _cum(self, arr, g: int) -> float:
+        c, r = divmod(g, self.n)
+        return c * arr[self.n] + arr[r]
+
+    def next_win(self, g: int, e: float) -> int:
+        """Глобальный индекс первого WIN начиная со спина g (e ~ Exp(1))."""
+        target = self._cum(self.A, g) + e
+        cyc = self.A[self.n]
+        c = int(target // cyc)
+        mi = min(bisect.bisect_left(self.A, target - c * cyc), self.n)
+        return max(g, c * self.n + mi - 1)
+
+    def loss_lr(self, g0: int, g1: int) -> float:
+        """log Π (1-p)/(1-q) по спинам g0..g1-1."""
+        return (self._cum(self.A, g1) - self._cum(self.A, g0)) - (self._cum(self.B, g1) - self._cum(self.B, g0))
+
+    def psum(self, g0: int, g1: int) -> float:
+        return self._cum(self.S, g1) - self._cum(self.S, g0)
+
+
+def _scan_path(m: _ScanModel, rng: random.Random, bank_u: int, bet_u: int, stop_u: int, horizon: int):
+    """
+    Один путь сессии в сатоши. Возвращает (log_w, ruined, spins, profit_u, wins, psum, min_bal_u).
+    """
+    bal = bank_u
+    min_bal = bal
+    g = 0
+    logw = 0.0
+    wins = 0
+    sp = 0.0
+    ruined = False
+    while g < horizon:
+        if bal < bet_u or bal <= stop_u:
+            ruined = True
+            break
+        # сколько проигрышей подряд банк ещё оплатит
+        k_max = min((bal - bet_u) // bet_u, (bal - stop_u - 1) // bet_u) + 1
+        j = m.next_win(g, rng.expovariate(1.0))
+        if j < horizon and j < g + k_max:
+            logw += m.loss_lr(g, j) + m.win_lr[j % m.n]
+            sp += m.psum(g, j + 1)
+            bal -= (j - g) * bet_u
+            min_bal = min(min_bal, bal)
+            bal += bet_u * (m.payouts[j % m.n] - 1)
+            wins += 1
+            g = j + 1
+            continue
+        end = min(horizon, g + k_max)
+        logw += m.loss_lr(g, end)
+        sp += m.psum(g, end)
+        bal -= (end - g) * bet_u
+        min_bal = min(min_bal, bal)
+        ruined = end < horizon
+        g = end
+        break
+    return logw, ruined, g, bal - bank_u, wins, sp, min_bal
+
+
+@dataclass
+class ScanRiskReport:
+    config: ScanRiskConfig
+    tilt: float
+    ce_iters: int
+    paths: int
+    wall_seconds: float
+    spins_covered: int
+    ruin_p: float
+    ruin_ci: tuple
+    profit_p: float
+    profit_ci: tuple
+    profit_mean: float
+    profit_mean_ci: tuple
+    ess: float
+    variance_reduction: float
+    ruin_method: str = "IS"
+    profit_method: str = "IS"
+    hit_ess: float = 0.0
+    warnings: tuple = ()
+
+    def format(self) -> str:
+        c = self.config
+        conf = int(round(c.confidence * 100))
+        lines = [f"=== SCAN RISK (IS): payout {c.min_payout}..{c.max_payout} bet={c.bet:.8f} bank={c.bank:.8f} "
+                 f"horizon={c.spins} spins ===",
+                 f"Tilt: {self.tilt:.4f} ({'auto, CE iters=' + str(self.ce_iters) if c.tilt <= 0 else 'fixed'}), "
+                 f"paths={self.paths}, spins covered={self.spins_covered}, wall={self.wall_seconds:.2f}s",
+                 f"P(ruin):          {self.ruin_p:.6e}  {conf}% CI [{self.ruin_ci[0]:.6e}, {self.ruin_ci[1]:.6e}]"
+                 f"  ({self.ruin_method})",
+                 f"P(profit >= {c.profit_target:g}): {self.profit_p:.6e}  "
+                 f"{conf}% CI [{self.profit_ci[0]:.6e}, {self.profit_ci[1]:.6e}]  ({self.profit_method})",
+                 f"E[profit]:        {self.profit_mean:.8f}  "
+                 f"{conf}% CI [{self.profit_mean_ci[0]:.8f}, {self.profit_mean_ci[1]:.8f}]",
+                 f"ESS={self.ess:.1f} (hits: {self.hit_ess:.1f}), "
+                 f"variance reduction vs plain MC ({c.target}): x{self.variance_reduction:.1f}"]
+        lines += [f"! {w}" for w in self.warnings]
+        return "\n".join(lines)
+
+
+def _mean_ci(xs, z: float):
+    n = len(xs)
+    if n == 0:
+        return 0.0, (0.0, 0.0), 0.0
+    mean = math.fsum(xs) / n
+    var = math.fsum((x - mean) ** 2 for x in xs) / (n - 1) if n > 1 else 0.0
+    se = math.sqrt(var / n)
+    return mean, (mean - z * se, mean + z * se), se
+
+
+def _ce_select_tilt(cfg: ScanRiskConfig, rng: random.Random, units):
+    """
+    Cross-entropy: многоуровневый подбор наклона. Уровень — (1-rho)-квантиль «близости» к событию
+    (для разорения — минимум баланса, для профита — итоговый профит); новый наклон —
+    MLE по элитным путям: Σw·wins / Σw·Σp.
+    """
+    bank_u, bet_u, stop_u, target_u = units
+    tilt = 1.0
+    iters = 0
+    reached = 0
+    for iters in range(1, max(1, int(cfg.ce_max_iters)) + 1):
+        m = _ScanModel(cfg, tilt)
+        rows = [_scan_path(m, rng, bank_u, bet_u, stop_u, int(cfg.spins))
+                for _ in range(max(10, int(cfg.ce_pilot_paths)))]
+        if cfg.target == "profit":
+            scores = [r[3] for r in rows]
+            goal = target_u
+        else:
+            scores = [math.inf if r[1] else -r[6] for r in rows]
+            goal = math.inf
+        ordered = sorted(scores)
+        gamma = min(ordered[min(len(ordered) - 1, int((1.0 - cfg.ce_rho) * len(ordered)))], goal)
+        elite = [r for r, s in zip(rows, scores) if s >= gamma]
+        top = max(r[0] for r in elite)
+        num = den = 0.0
+        for r in elite:
+            w = math.exp(r[0] - top)
+            num += w * r[4]
+            den += w * r[5]
+        if den > 0:
+            new_tilt = max(num / den, 1e-3)
+            tilt = math.exp(0.7 * math.log(new_tilt) + 0.3 * math.log(tilt))
+        if gamma >= goal:
+            reached += 1
+            if reached >= 2:
+                break
+    return tilt, iters
+
+
+def _ess(ws) -> float:
+    sw = math.fsum(ws)
+    sw2 = math.fsum(w * w for w in ws)
+    return sw * sw / sw2 if sw2 > 0 else 0.0
+
+
+def _scan_paths(m: _ScanModel, rng: random.Random, n: int, units, horizon: int, edge_per_spin: float):
+    """n путей с наклоном m: веса, взвешенные индикаторы ruin/profit, контрольная переменная, покрытые спины."""
+    bank_u, bet_u, stop_u, target_u = units
+    ws, ruin_x, profit_x, cv_x = [], [], [], []
+    covered = 0
+    for _ in range(n):
+        logw, ruined, spins, profit_u, _wins, _sp, _mb = _scan_path(m, rng, bank_u, bet_u, stop_u, horizon)
+        w = math.exp(logw)
+        covered += spins
+        ws.append(w)
+        ruin_x.append(w if ruined else 0.0)
+        profit_x.append(w if profit_u >= target_u else 0.0)
+        # profit − (L_prefix + E[L_rest]): ненулевое только после разорения
+        cv_x.append(w * edge_per_spin * (horizon - spins) if ruined else 0.0)
+    return ws, ruin_x, profit_x, cv_x, covered
+
+
+def estimate_scan_risk(config: ScanRiskConfig = None) -> ScanRiskReport:
+    """
+    Оценка P(разорения), P(profit ≥ target) и E[profit] для линейного high-payout скана
+    с доверительными интервалами: целевое событие (cfg.target) — importance sampling с наклоном
+    под него, второе событие — обычный MC; вырожденный IS откатывается на обычный MC.
+    """
+    cfg = config or ScanRiskConfig()
+    t0 = time.perf_counter()
+    rng = random.Random(cfg.seed)
+    units = (int(round(cfg.bank * 1e8)), max(1, int(round(cfg.bet * 1e8))), int(round(cfg.stop_balance * 1e8)),
+             int(round(cfg.profit_target * 1e8)))
+    horizon = max(1, int(cfg.spins))
+
+    ce_iters = 0
+    if cfg.tilt > 0:
+        tilt = float(cfg.tilt)
+    else:
+        tilt, ce_iters = _ce_select_tilt(cfg, rng, units)
+
+    n = max(2, int(cfg.paths))
+    edge_per_spin = cfg.bet * cfg.house_edge_pct / 100.0
+    z = statistics.NormalDist().inv_cdf(0.5 + min(max(cfg.confidence, 0.5), 0.999999) / 2.0)
+    clip = lambda ci: (max(0.0, ci[0]), min(1.0, ci[1]))
+    other = "profit" if cfg.target == "ruin" else "ruin"
+    warnings = []
+
+    plain = _scan_paths(_ScanModel(cfg, 1.0), rng, n, units, horizon, edge_per_spin)
+    covered = plain[4]
+    if tilt != 1.0:
+        tilted = _scan_paths(_ScanModel(cfg, tilt), rng, n, units, horizon, edge_per_spin)
+        covered += tilted[4]
+        xs = tilted[1] if cfg.target == "ruin" else tilted[2]
+        hits = [x for x in xs if x > 0]
+        hit_ess = _ess(hits)
+        if not hits or hit_ess < cfg.min_hit_ess:
+            warnings.append(f"IS degenerate for {cfg.target} (tilt={tilt:.4f}, hits={len(hits)}, "
+                            f"hit ESS={hit_ess:.1f}): fallback to plain MC")
+            tilted = None
+    else:
+        tilted, hit_ess = None, _ess([x for x in (plain[1] if cfg.target == "ruin" else plain[2]) if x > 0])
+
+    src = {cfg.target: tilted or plain, other: plain}
+    method = {cfg.target: "IS" if tilted else "plain MC", other: "plain MC"}
+    est = {}
+    for event, idx in (("ruin", 1), ("profit", 2)):
+        xs = src[event][idx]
+        p, ci, se = _mean_ci(xs, z)
+        if not any(xs):
+            upper = -math.log(1.0 - min(max(cfg.confidence, 0.5), 0.999999)) / len(xs)
+            ci = (0.0, upper)
+            warnings.append(f"no {event} paths in {len(xs)} ({method[event]}): P < {upper:.2e} by rule of three")
+        est[event] = (p, clip(ci), se)
+
+    main = tilted or plain
+    cv_mean, cv_ci, _ = _mean_ci(main[3], z)
+    base = -edge_per_spin * horizon
+    p_hat, _, se = est[cfg.target]
+    vr = (p_hat * (1.0 - p_hat) / n) / (se * se) if tilted and se > 0 else 1.0
+    return ScanRiskReport(config=cfg, tilt=tilt, ce_iters=ce_iters, paths=n,
+                          wall_seconds=time.perf_counter() - t0, spins_covered=covered,
+                          ruin_p=est["ruin"][0], ruin_ci=est["ruin"][1],
+                          profit_p=est["profit"][0], profit_ci=est["profit"][1],
+                          profit_mean=base + cv_mean, profit_mean_ci=(base + cv_ci[0], base + cv_ci[1]),
+                          ess=_ess(main[0]), variance_reduction=vr, ruin_method=method["ruin"],
+                          profit_method=method["profit"], hit_ess=hit_ess, warnings=tuple(warnings))
+
+
+def main_scan_risk(argv=None):
+    ap = argparse.ArgumentParser(prog="crypto_games_sim.py scan-risk",
+                                 description="Rare high-payout wins: importance-sampling risk estimate")
+    ap.add_argument("--bank", type=float, default=30.0)
+    ap.add_argument("--bet", type=float, default=0.001)
+    ap.add_argument("--min-payout", type=int, default=1000)
+    ap.add_argument("--max-payout", type=int, default=9999)
+    ap.add_argument("--edge", type=float, default=1.0, help="house edge %%")
+    ap.add_argument("--spins", type=int, default=100000, help="session horizon")
+    ap.add_argument("--stop-balance", type=float, default=0.0)
+    ap.add_argument("--target", choices=("ruin", "profit"), default="ruin")
+    ap.add_argument("--profit-target", type=float, default=0.0)
+    ap.add_argument("--paths", type=int, default=20000)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--tilt", type=float, default=0.0, help="0 = auto (cross-entropy), 1 = plain MC")
+    ap.add_argument("--confidence", type=float, default=0.95)
+    ap.add_argument("--cache-dir", default=None, help="result cache directory (default ~/.crypto_games/sim_cache)")
+    ap.add_argument("--no-cache", action="store_true")
+    args = ap.parse_args(argv)
+    cfg = ScanRiskConfig(bank=args.bank, bet=args.bet, min_payout=args.min_payout, max_payout=args.max_payout,
+                         house_edge_pct=args.edge, spins=args.spins, stop_balance=args.stop_balance,
+                         target=args.target, profit_target=args.profit_target, paths=args.paths,
+                         seed=args.seed, tilt=args.tilt, confidence=args.confidence)
+    cache = None if args.no_cache else SimResultCache(args.cache_dir)
+    key = _cache_key("scan-risk", cfg) if cache is not None else None
+    rep = cache.get(key) if cache is not None else None
+    if rep is None:
+        rep = estimate_scan_risk(cfg)
+        if cache is not None:
+            cache.put(key, rep)
+    else:
+        print("Cache: hit")
+    print(rep.format())
+
+
+def main(argv=None):
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if argv and argv[0] == "scan-risk":
+        return main_scan_risk(argv[1:])
+    ap = argparse.ArgumentParser(description="Crypto.Games fleet discrete-event simulator "
+                                             "(scan-risk — оценка редких выигрышей, см. scan-risk -h)")
+    ap.add_argument("--bots", type=int, default=10)
+    ap.add_argument("--hours", type=float, default=24.0)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--bank", type=float, default=100.0)
+    ap.add_argument("--latency-ms", type=int, default=300)
+    ap.add_argument("--speed-ms", type=int, default=50)
+    ap.add_argument("--min-payout", type=int, default=100)
+    ap.add_argument("--max-payout", type=int, default=9999)
+    ap.add_argument("--tp", type=float, default=0.0, help="global TP %%")
+    ap.add_argument("--tp-mode", choices=("pause", "stop"), default="pause")
+    ap.add_argument("--sl", type=float, default=0.0, help="global SL %% (STOP ALL)")
+    ap.add_argument("--rec-dd", type=float, default=20.0, help="shared recovery DD %%")
+    ap.add_argument("--rec-dd-usdt", type=float, default=0.0)
+    ap.add_argument("--no-recovery", action="store_true")
+    ap.add_argument("--sync-last-successful", action="store_true")
+    ap.add_argument("--bot-sl", type=float, default=0.0, help="per-bot GLOBAL STOP-LOSS USDT (10 min pause)")
+    ap.add_argument("--events", type=int, default=20, help="print last N manager events")
+    ap.add_argument("--cache-dir", default=None, help="result cache directory (default ~/.crypto_games/sim_cache)")
+    ap.add_argument("--no-cache", action="store_true")
+    args = ap.parse_args(argv)
+
+    cfg = FleetSimConfig(bots=args.bots, seed=args.seed, initial_bank=args.bank,
+                         api_latency_ms=args.latency_ms, speed_ms=args.speed_ms,
+                         min_payout=args.min_payout, max_payout=args.max_payout,
+                         global_tp_percent=args.tp, global_tp_mode=args.tp_mode,
+                         global_sl_percent=args.sl, recovery_dd_percent=args.rec_dd,
+                         recovery_dd_usdt=args.rec_dd_usdt, shared_recovery=not args.no_recovery,
+                         sync_last_successful=args.sync_last_successful,
+                         bot_stop_loss_usdt=args.bot_sl)
+    rep = run_fleet_sim(cfg, hours=args.hours, cache=None if args.no_cache else SimResultCache(args.cache_dir))
+    print(rep.format())
+    for t, who, kind, detail in rep.events[-args.events:] if args.events > 0 else []:
+        print(f"  t={t / MS_SECOND:10.1f}s [{who}] {kind} {detail}")
+
+
+if __name__ == "__main__":
+    main()
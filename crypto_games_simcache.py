@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+# Crypto.Games — дисковый кэш результатов симуляции с адресацией по содержимому
+#
+# Зачем:
+# - Одни и те же конфигурации стратегий гоняются заново после мелких правок в UI.
+# - Ключ — SHA-256 канонического представления конфига (BetConfig / FleetSimConfig / параметры
+#   стратегии, seed, ...) плюс отпечаток исходников симулятора: правка кода = новый ключ.
+# - Поля отображения (размер текстового лога, частота снапшотов, api_key) в ключ не входят.
+# - LRU-вытеснение по числу записей и суммарному размеру (время доступа = mtime файла).
+# - Запись атомарная (tmp + os.replace), повреждённая запись считается промахом.
+
+import dataclasses
+import hashlib
+import json
+import os
+import pickle
+import tempfile
+import zlib
+from decimal import Decimal
+from typing import Optional
+
+CACHE_VERSION = 1
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".crypto_games", "sim_cache")
+
+# Поля, не влияющие на результат симуляции (только отображение/секреты).
+# event_log_size сюда не входит: он обрезает report.events.
+DISPLAY_FIELDS = frozenset({
+    "api_key", "log_file_path", "max_log_lines",
+    "sim_snapshot_every_spins", "sim_snapshot_every_ms", "sim_log_sampled",
+    "path_stats_publish_every",
+})
+
+
+def canonical(obj, exclude=DISPLAY_FIELDS):
+    """JSON-совместимое каноническое представление (dataclass, dict, Decimal, float, ...)."""
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        d = {f.name: getattr(obj, f.name) for f in dataclasses.fields(obj) if f.name not in exclude}
+        return {"__type__": type(obj).__name__, **{k: canonical(v, exclude) for k, v in sorted(d.items())}}
+    if isinstance(obj, dict):
+        return {str(k): canonical(v, exclude) for k, v in sorted(obj.items(), key=lambda kv: str(kv[0]))
+                if str(k) not in exclude}
+    if isinstance(obj, (list, tuple)):
+        return [canonical(v, exclude) for v in obj]
+    if isinstance(obj, (set, frozenset)):
+        return sorted(canonical(v, exclude) for v in obj)
+    if isinstance(obj, bool) or obj is None or isinstance(obj, str):
+        return obj
+    if isinstance(obj, Decimal):
+        # 0.0010 и 0.001 — одно и то же значение
+        return "D:" + format(obj.normalize(), "f")
+    if isinstance(obj, int):
+        return obj
+    if isinstance(obj, float):
+        return "F:" + repr(obj)
+    return "R:" + repr(obj)
+
+
+def code_fingerprint(*paths) -> str:
+    """SHA-256 исходников: результаты старой версии симулятора не переиспользуются."""
+    h = hashlib.sha256()
+    for p in paths:
+        try:
+            with open(p, "rb") as f:
+                h.update(f.read())
+        except OSError:
+            h.update(str(p).encode("utf-8"))
+    return h.hexdigest()
+
+
+def config_key(*parts, exclude=DISPLAY_FIELDS) -> str:
+    payload = json.dumps([CACHE_VERSION, [canonical(p, exclude) for p in parts]],
+                         sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class SimResultCache:
+    """
+    Кэш «ключ → объект» в каталоге root: один файл <sha256>.pkl.z на запись.
+    """
+    SUFFIX = ".pkl.z"
+
+    def __init__(self, root: Optional[str] = None, max_entries: int = 64, max_bytes: int = 256 * 1024 * 1024):
+        self.root = root or DEFAULT_CACHE_DIR
+        self.max_entries = max(1, int(max_entries))
+        self.max_bytes = max(1, int(max_bytes))
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        os.makedirs(self.root, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.root, key + self.SUFFIX)
+
+    def get(self, key: str):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                obj = pickle.loads(zlib.decompress(f.read()))
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception:
+            # битая/несовместимая запись — как промах
+            self.misses += 1
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+            return None
+        try:
+            os.utime(path, None)  # LRU: отметка доступа
+        except OSError:
+            pass
+        self.hits += 1
+        return obj
+
+    def put(self, key: str, obj):
+        data = zlib.compress(pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL), 1)
+        fd, tmp = tempfile.mkstemp(dir=self.root, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, self._path(key))
+        except Exception:
+            try:
+                os.remove(tmp)
+            except OSError:
+                pass
+            raise
+        self.evict()
+
+    def entries(self):
+        out = []
+        for name in os.listdir(self.root):
+            if not name.endswith(self.SUFFIX):
+                continue
+            p = os.path.join(self.root, name)
+            try:
+                st = os.stat(p)
+            except OSError:
+                continue
+            out.append((st.st_mtime, st.st_size, p))
+        return out
+
+    def evict(self):
+        items = sorted(self.entries())
+        total = sum(size for _, size, _ in items)
+        while items and (len(items) > self.max_entries or total > self.max_bytes):
+            _, size, p = items.pop(0)
+            try:
+                os.remove(p)
+                self.evictions += 1
+            except OSError:
+                pass
+            total -= size
+
+    def clear(self):
+        for _, _, p in self.entries():
+            try:
+                os.remove(p)
+            except OSError:
+                pass
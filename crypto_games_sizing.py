@@ -0,0 +1,214 @@
+#!/usr/bin/env python3
+# Crypto.Games — расчёт ставок с предвычисленными знаменателями (cover / recovery)
+#
+# Зачем:
+# - compute_bet_for_target_profit, compute_covering_bet_for_target и _compute_recovery_bet на каждом
+#   спине заново считали payout-1, поправку на edge, маржу, разбирали лимиты из str и т.д.
+# - BetSizer держит настройки (edge, маржа, лимит ставки) и кэш знаменателей по payout;
+#   кэш сбрасывается только при смене настроек (configure).
+# - Живой цикл считает в Decimal и ДЕЛИТ на кэшированный знаменатель: умножение на обратную
+#   величину меняет результат ROUND_DOWN в 8-м знаке (например 0.999 / 999).
+# - FloatBetSizer — для симуляторов: таблица обратных множителей по целым payout, float.
+
+from decimal import Decimal, ROUND_DOWN
+from functools import lru_cache
+from typing import Optional
+
+_Q8 = Decimal(1).scaleb(-8)
+_ONE = Decimal("1")
+_ZERO = Decimal("0")
+_SAT = Decimal("0.00000001")
+
+
+def quantize_bet(bet: Decimal, max_scale=8):
+    q = _Q8 if max_scale == 8 else Decimal(1).scaleb(-max_scale)
+    try:
+        return bet.quantize(q, rounding=ROUND_DOWN)
+    except Exception:
+        return bet
+
+
+def _dec(val, default=None):
+    if val is None:
+        return default
+    if isinstance(val, Decimal):
+        return val
+    try:
+        return Decimal(str(val))
+    except Exception:
+        return default
+
+
+class BetSizer:
+    """
+    Ставки под целевой профит в Decimal с кэшем знаменателей (payout-1)·(1-edge) по payout.
+    Результаты совпадают с прежними compute_bet_for_target_profit / compute_covering_bet_for_target.
+    """
+    MAX_CACHE = 65536
+
+    def __init__(self, house_edge_frac=None, margin_ratio=None, max_bet_limit=None):
+        self.house_edge_frac = None
+        self.margin_ratio = _ZERO
+        self.max_bet_limit = None
+        self._edge_mult = None
+        self._margin_mult = _ONE
+        self._denoms = {}
+        self.version = 0
+        self.configure(house_edge_frac, margin_ratio, max_bet_limit)
+
+    def configure(self, house_edge_frac=None, margin_ratio=None, max_bet_limit=None) -> bool:
+        """Применить настройки; кэш сбрасывается только если что-то изменилось."""
+        try:
+            ef = Decimal(house_edge_frac or 0)
+        except Exception:
+            ef = _ZERO
+        edge_mult = (_ONE - ef) if (ef > 0 and ef < 1) else None
+        mr = _dec(margin_ratio or 0, _ZERO)
+        mb = _dec(max_bet_limit)
+        if edge_mult == self._edge_mult and mr == self.margin_ratio and mb == self.max_bet_limit \
+                and self.version > 0:
+            return False
+        self.house_edge_frac = ef
+        self._edge_mult = edge_mult
+        self.margin_ratio = mr
+        self._margin_mult = _ONE + mr
+        self.max_bet_limit = mb
+        self._denoms.clear()
+        self.version += 1
+        return True
+
+    # -- знаменатели --
+    def denom(self, payout) -> Decimal:
+        """(payout-1)·(1-edge), не меньше 1 при вырождении."""
+        d = self._denoms.get(payout)
+        if d is None:
+            try:
+                d = Decimal(payout) - _ONE
+            except Exception:
+                d = _ONE    # как p = 2 в исходной функции
+            if self._edge_mult is not None:
+                d = d * self._edge_mult
+            if d <= 0:
+                d = _ONE
+            if len(self._denoms) >= self.MAX_CACHE:
+                self._denoms.clear()
+            self._denoms[payout] = d
+        return d
+
+    # -- ставки --
+    def _caps(self, bet: Decimal, min_bet: Decimal, current_bank, floor: Decimal) -> Decimal:
+        mb = self.max_bet_limit
+        if mb is not None and bet > mb:
+            bet = mb
+        if current_bank is not None:
+            cb = _dec(current_bank)
+            if cb is not None and bet > cb:
+                bet = cb
+        if bet < min_bet:
+            bet = min_bet
+        if bet <= _ZERO:
+            bet = floor
+        return quantize_bet(bet)
+
+    def bet_for_target_profit(self, payout, target_profit, min_bet, current_bank) -> Decimal:
+        desired = Decimal(target_profit) / self.denom(payout)
+        return self._caps(quantize_bet(desired), min_bet, current_bank, _SAT)
+
+    def covering_bet(self, payout, target_profit, min_bet, current_bank) -> Decimal:
+        desired = (Decimal(target_profit) / self.denom(payout)) * self._margin_mult
+        return self._caps(quantize_bet(desired), min_bet, current_bank, min_bet)
+
+    def recovery_bet(self, current_balance: Decimal, payout: Decimal, target_T: Decimal, min_bet_eff: Decimal,
+                     baseline: Decimal, intensity: Decimal, cap_pct: Decimal):
+        """
+        Recovery (Version36): adj_T = T·(1 + intensity·relative_dd), need = adj_T/(payout-1),
+        ставка = min(need, cap_pct·bank) не ниже min_bet, лимит ставки, не больше банка.
+        Возвращает (bet, relative_dd, adj_T, need, cap_pct, cap_abs) — для лога расчёта.
+        """
+        # та же функция, что в ядре спина (crypto_games_kernel) — живой цикл, бэктест и MC считают одинаково
+        from crypto_games_kernel import recovery_bet
+        if cap_pct <= 0:
+            cap_pct = Decimal("0.01")
+        mb = self.max_bet_limit
+        bet, relative_dd, adj_T, need, cap_abs = recovery_bet(
+            current_balance, payout, target_T, min_bet_eff, baseline, intensity, cap_pct,
+            mb if mb is not None else Decimal("Infinity"))
+        return bet, relative_dd, adj_T, need, cap_pct, cap_abs
+
+
+class FloatBetSizer:
+    """
+    Float-версия для симуляторов: factor[payout] = (1+margin) / ((payout-1)·(1-edge)),
+    таблица по целым payout lo..hi строится один раз на настройки.
+    """
+    __slots__ = ("lo", "hi", "house_edge_frac", "margin_ratio", "_table")
+
+    def __init__(self, lo: int, hi: int, house_edge_frac: float = 0.0, margin_ratio: float = 0.0):
+        self.lo, self.hi = int(min(lo, hi)), int(max(lo, hi))
+        self.house_edge_frac = float(house_edge_frac or 0.0)
+        self.margin_ratio = float(margin_ratio or 0.0)
+        self._table = [self._factor(p) for p in range(self.lo, self.hi + 1)]
+
+    def _factor(self, payout: float) -> float:
+        d = payout - 1.0
+        if 0.0 < self.house_edge_frac < 1.0:
+            d *= (1.0 - self.house_edge_frac)
+        if d <= 0:
+            d = 1.0
+        return (1.0 + self.margin_ratio) / d
+
+    def factor(self, payout) -> float:
+        i = int(payout) - self.lo
+        if 0 <= i < len(self._table) and i + self.lo == payout:
+            return self._table[i]
+        return self._factor(float(payout))
+
+    def bet(self, payout, target_profit: float, min_bet: float, max_bet: Optional[float], bank: float) -> float:
+        bet = target_profit * self.factor(payout)
+        if bet < min_bet:
+            bet = min_bet
+        if max_bet and bet > max_bet:
+            bet = max_bet
+        if bet > bank:
+            bet = bank
+        return bet
+
+
+# -- совместимые функции (прежние сигнатуры), общий сайзер на набор настроек --
+@lru_cache(maxsize=64)
+def _shared_sizer(edge_key, margin_key, max_bet_key) -> BetSizer:
+    return BetSizer(edge_key, margin_key, max_bet_key)
+
+
+def _key(val):
+    d = _dec(val)
+    return d if d is not None else None
+
+
+def compute_bet_for_target_profit(
+    payout: Decimal,
+    target_profit: Decimal,
+    min_bet: Decimal,
+    max_bet_limit: Decimal | None,
+    current_bank: Decimal,
+    house_edge_frac: Decimal | None = None
+) -> Decimal:
+    return _shared_sizer(_key(house_edge_frac), None, _key(max_bet_limit)).bet_for_target_profit(
+        payout, target_profit, min_bet, current_bank)
+
+
+def compute_covering_bet_for_target(
+    payout: Decimal,
+    target_profit: Decimal,
+    min_bet: Decimal,
+    max_bet_limit: Decimal | None,
+    current_bank: Decimal,
+    house_edge_frac: Decimal | None = None,
+    margin_ratio: Decimal = Decimal("0")
+) -> Decimal:
+    """
+    Ставка для покрытия целевой прибыли с учётом house edge и дополнительной маржи
+    (margin_ratio — например 0.03 для +3%).
+    """
+    return _shared_sizer(_key(house_edge_frac), _key(margin_ratio), _key(max_bet_limit)).covering_bet(
+        payout, target_profit, min_bet, current_bank)
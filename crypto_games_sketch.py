@@ -0,0 +1,291 @@
+#!/usr/bin/env python3
+# Crypto.Games — потоковые квантильные скетчи для траекторий банка (без зависимостей)
+#
+# Зачем:
+# - Сим и живой флот дают очень длинные траектории банка; хранить их целиком нельзя,
+#   а нужны перцентили баланса, просадки и длины серий LOSS по сессиям и по флоту.
+# - KLLSketch — сливаемый (merge) квантильный скетч: память O(k·log(n/k)) при любой длине прогона,
+#   скетчи ботов сливаются в перцентили флота у менеджера.
+# - DrawdownTracker — инкрементальная максимальная просадка (пик, текущая, максимум) за O(1) на спин.
+# - PathStats — набор: баланс, просадка %, длины серий LOSS, max DD по сессиям.
+# - Подключено: CryptoGamesBot/BotManagerApp в crypto_games_bot_stable_100-9999_norm_versiya_Version36_Version13.py
+#   (снимок в сообщении 'stats', перцентили флота в менеджере) и SimBot/отчёт флота в crypto_games_sim.
+#   Остальные GUI-варианты ботов скетчей и перцентилей флота пока не ведут.
+
+import math
+import random
+from typing import Optional
+
+
+class KLLSketch:
+    """
+    KLL-скетч (Karnin–Lang–Liberty): уровни-компакторы, уровень h несёт вес 2^h.
+    При переполнении уровень сортируется, и каждый второй элемент (со случайным сдвигом)
+    уходит на уровень выше. Ошибка ранга ~ O(1/k).
+    """
+    __slots__ = ("k", "c", "compactors", "size", "max_size", "n", "min", "max", "_rng")
+
+    def __init__(self, k: int = 200, c: float = 2.0 / 3.0, seed: Optional[int] = 0):
+        self.k = max(8, int(k))
+        self.c = float(c)
+        self.compactors = []
+        self.size = 0
+        self.max_size = 0
+        self.n = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._rng = random.Random(seed)
+        self._grow()
+
+    def _capacity(self, h: int) -> int:
+        depth = len(self.compactors) - h - 1
+        return int(math.ceil(self.k * (self.c ** depth))) + 1
+
+    def _grow(self):
+        self.compactors.append([])
+        self.max_size = sum(self._capacity(h) for h in range(len(self.compactors)))
+
+    def update(self, x: float):
+        x = float(x)
+        self.compactors[0].append(x)
+        self.size += 1
+        self.n += 1
+        if x < self.min:
+            self.min = x
+        if x > self.max:
+            self.max = x
+        if self.size >= self.max_size:
+            self._compress()
+
+    def _compress(self):
+        while self.size >= self.max_size:
+            for h in range(len(self.compactors)):
+                buf = self.compactors[h]
+                if len(buf) >= self._capacity(h):
+                    if h + 1 >= len(self.compactors):
+                        self._grow()
+                    buf.sort()
+                    keep = [buf.pop()] if len(buf) % 2 else []
+                    off = 1 if self._rng.random() < 0.5 else 0
+                    self.compactors[h + 1].extend(buf[off::2])
+                    self.compactors[h] = keep
+                    self.size = sum(len(cp) for cp in self.compactors)
+                    break
+            else:
+                break
+
+    def merge(self, other: "KLLSketch") -> "KLLSketch":
+        """Влить other в self (other не меняется)."""
+        if other is None or other.n == 0:
+            return self
+        while len(self.compactors) < len(other.compactors):
+            self._grow()
+        for h, buf in enumerate(other.compactors):
+            self.compactors[h].extend(buf)
+        self.n += other.n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.size = sum(len(cp) for cp in self.compactors)
+        self._compress()
+        return self
+
+    def copy(self) -> "KLLSketch":
+        sk = KLLSketch(self.k, self.c, seed=None)
+        sk.compactors = [list(cp) for cp in self.compactors]
+        sk.size, sk.max_size, sk.n = self.size, self.max_size, self.n
+        sk.min, sk.max = self.min, self.max
+        return sk
+
+    def _cdf_items(self):
+        items = []
+        for h, buf in enumerate(self.compactors):
+            w = 1 << h
+            items.extend((x, w) for x in buf)
+        items.sort()
+        return items
+
+    def quantiles(self, qs) -> list:
+        """Несколько квантилей за одну сортировку (q в [0, 1])."""
+        if self.n == 0:
+            return [None for _ in qs]
+        items = self._cdf_items()
+        total = sum(w for _, w in items)
+        out = []
+        for q in qs:
+            q = min(max(float(q), 0.0), 1.0)
+            if q <= 0.0:
+                out.append(self.min)
+                continue
+            if q >= 1.0:
+                out.append(self.max)
+                continue
+            need = q * total
+            acc = 0
+            val = items[-1][0]
+            for x, w in items:
+                acc += w
+                if acc >= need:
+                    val = x
+                    break
+            out.append(val)
+        return out
+
+    def quantile(self, q: float):
+        return self.quantiles([q])[0]
+
+    def rank(self, x: float) -> float:
+        """Доля значений ≤ x."""
+        if self.n == 0:
+            return 0.0
+        items = self._cdf_items()
+        total = sum(w for _, w in items)
+        return sum(w for v, w in items if v <= x) / total
+
+    def to_dict(self) -> dict:
+        return {"k": self.k, "c": self.c, "n": self.n, "min": self.min, "max": self.max,
+                "compactors": [list(cp) for cp in self.compactors]}
+
+    @classmethod
+    def from_dict(cls, d: dict) -> "KLLSketch":
+        sk = cls(d.get("k", 200), d.get("c", 2.0 / 3.0))
+        sk.compactors = []
+        sk.max_size = 0
+        for _ in d.get("compactors", []) or [[]]:
+            sk._grow()
+        for h, buf in enumerate(d.get("compactors", [])):
+            sk.compactors[h] = [float(x) for x in buf]
+        sk.size = sum(len(cp) for cp in sk.compactors)
+        sk.n = int(d.get("n", sk.size))
+        sk.min = float(d.get("min", math.inf))
+        sk.max = float(d.get("max", -math.inf))
+        return sk
+
+
+class DrawdownTracker:
+    """Инкрементальная просадка от пика: O(1) на обновление."""
+    __slots__ = ("peak", "current", "max_dd", "max_dd_pct", "spins_since_peak", "max_dd_spins")
+
+    def __init__(self, start: Optional[float] = None):
+        self.reset(start)
+
+    def reset(self, start: Optional[float] = None):
+        self.peak = None if start is None else float(start)
+        self.current = self.peak
+        self.max_dd = 0.0
+        self.max_dd_pct = 0.0
+        self.spins_since_peak = 0
+        self.max_dd_spins = 0
+
+    def update(self, balance: float) -> float:
+        """Возвращает текущую просадку в % от пика."""
+        b = float(balance)
+        self.current = b
+        if self.peak is None or b >= self.peak:
+            self.peak = b
+            self.spins_since_peak = 0
+            return 0.0
+        self.spins_since_peak += 1
+        if self.spins_since_peak > self.max_dd_spins:
+            self.max_dd_spins = self.spins_since_peak
+        dd = self.peak - b
+        if dd > self.max_dd:
+            self.max_dd = dd
+        pct = dd * 100.0 / self.peak if self.peak > 0 else 0.0
+        if pct > self.max_dd_pct:
+            self.max_dd_pct = pct
+        return pct
+
+    @property
+    def drawdown(self) -> float:
+        if self.peak is None or self.current is None:
+            return 0.0
+        return self.peak - self.current
+
+
+class PathStats:
+    """
+    Статистика траектории банка одного бота (или слитая по флоту):
+    balance / drawdown_pct — по каждому спину, loss_streak — длины завершённых серий LOSS,
+    session_max_dd_pct — максимальная просадка каждой завершённой сессии (new_session).
+    """
+    PERCENTILES = (0.5, 0.9, 0.99)
+
+    def __init__(self, k: int = 200):
+        self.k = k
+        self.balance = KLLSketch(k)
+        self.drawdown_pct = KLLSketch(k)
+        self.loss_streak = KLLSketch(k)
+        self.session_max_dd_pct = KLLSketch(k)
+        self.dd = DrawdownTracker()
+        self._streak = 0
+
+    def update(self, balance: float, win: bool):
+        self.balance.update(balance)
+        self.drawdown_pct.update(self.dd.update(balance))
+        if win:
+            if self._streak:
+                self.loss_streak.update(self._streak)
+            self._streak = 0
+        else:
+            self._streak += 1
+
+    def new_session(self, start_balance: Optional[float] = None):
+        """Закрыть сессию (TP-рестарт и т.п.): max DD сессии в скетч, трекер просадки с нуля."""
+        if self.dd.peak is not None:
+            self.session_max_dd_pct.update(self.dd.max_dd_pct)
+        self.dd.reset(start_balance)
+
+    def merge(self, other: "PathStats") -> "PathStats":
+        if other is None:
+            return self
+        self.balance.merge(other.balance)
+        self.drawdown_pct.merge(other.drawdown_pct)
+        self.loss_streak.merge(other.loss_streak)
+        self.session_max_dd_pct.merge(other.session_max_dd_pct)
+        # Для слитых: максимальная просадка — худшая из ботов
+        if other.dd.max_dd_pct > self.dd.max_dd_pct:
+            self.dd.max_dd_pct = other.dd.max_dd_pct
+        if other.dd.max_dd > self.dd.max_dd:
+            self.dd.max_dd = other.dd.max_dd
+        if other.dd.max_dd_spins > self.dd.max_dd_spins:
+            self.dd.max_dd_spins = other.dd.max_dd_spins
+        return self
+
+    def copy(self) -> "PathStats":
+        ps = PathStats(self.k)
+        ps.balance = self.balance.copy()
+        ps.drawdown_pct = self.drawdown_pct.copy()
+        ps.loss_streak = self.loss_streak.copy()
+        ps.session_max_dd_pct = self.session_max_dd_pct.copy()
+        for name in DrawdownTracker.__slots__:
+            setattr(ps.dd, name, getattr(self.dd, name))
+        ps._streak = self._streak
+        return ps
+
+    @staticmethod
+    def merged(items) -> "PathStats":
+        out = PathStats()
+        for ps in items:
+            out.merge(ps)
+        return out
+
+    def summary(self) -> dict:
+        qs = self.PERCENTILES
+        out = {"spins": self.balance.n, "max_dd": self.dd.max_dd, "max_dd_pct": self.dd.max_dd_pct,
+               "max_dd_spins": self.dd.max_dd_spins}
+        for name in ("balance", "drawdown_pct", "loss_streak", "session_max_dd_pct"):
+            sk = getattr(self, name)
+            for q, v in zip(qs, sk.quantiles(qs)):
+                out[f"{name}_p{int(round(q * 100))}"] = v
+        return out
+
+    def format(self) -> str:
+        s = self.summary()
+
+        def f(v, fmt):
+            return "n/a" if v is None else format(v, fmt)
+        return (f"bal p50/p90/p99={f(s['balance_p50'], '.4f')}/{f(s['balance_p90'], '.4f')}/{f(s['balance_p99'], '.4f')} "
+                f"DD% p50/p90/p99={f(s['drawdown_pct_p50'], '.2f')}/{f(s['drawdown_pct_p90'], '.2f')}/"
+                f"{f(s['drawdown_pct_p99'], '.2f')} maxDD={s['max_dd_pct']:.2f}% "
+                f"LOSS-streak p50/p90/p99={f(s['loss_streak_p50'], '.0f')}/{f(s['loss_streak_p90'], '.0f')}/"
+                f"{f(s['loss_streak_p99'], '.0f')}")
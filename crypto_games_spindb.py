@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+# Crypto.Games — SQLite-хранилище спинов и событий (WAL, пачечная запись из отдельного потока)
+#
+# Зачем:
+# - Вопросы вида «win rate по корзинам payout по всем ботам за неделю» решались повторным разбором
+#   всех текстовых логов. Здесь каждый спин (bot, mode, payout, roll, bet, profit, balance, WIN,
+#   recovery) и событие (TP / SL / начало и конец recovery) ложатся в одну базу с индексами
+#   (bot, ts), (ts), (payout), (mode) — такие запросы занимают миллисекунды.
+# - SpinStore.add_spin / add_event — только добавление кортежа в очередь под замком; поток-писатель
+#   вставляет пачками (executemany в одной транзакции) раз в flush_interval или по batch_size.
+#   Очередь ограничена (max_pending): при переполнении старые спины выбрасываются со счётчиком —
+#   цикл спина никогда не ждёт диск.
+# - journal_mode=WAL + synchronous=NORMAL: читатели (запросы, CLI) не блокируют писателя.
+# - События recovery_start / recovery_end пишутся писателем сами — по смене флага recovery у бота.
+# - Включается переменной окружения CG_SPINDB: "1" / "on" — logs/spins.db, иначе путь к базе;
+#   по умолчанию выключено (spin_store() → None, record_event — пустая операция).
+#   Спины приходят из журнала спинов (crypto_games_journal.open_journal).
+#
+# Запуск: python crypto_games_spindb.py winrate --days 7 --width 500
+#         python crypto_games_spindb.py import logs/*.cgj
+#         python crypto_games_spindb.py bench 200000
+
+import argparse
+import atexit
+import os
+import sys
+import threading
+import time
+from collections import deque
+
+try:
+    import sqlite3
+except Exception:
+    sqlite3 = None
+
+DEFAULT_PATH = os.path.join("logs", "spins.db")
+BATCH_SIZE = 2000
+FLUSH_INTERVAL = 1.0
+MAX_PENDING = 200_000
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS spins (
+    id       INTEGER PRIMARY KEY,
+    ts       REAL NOT NULL,
+    bot      TEXT NOT NULL,
+    mode     TEXT NOT NULL,
+    payout   REAL NOT NULL,
+    roll     REAL,
+    bet      REAL NOT NULL,
+    profit   REAL NOT NULL,
+    balance  REAL,
+    win      INTEGER NOT NULL,
+    recovery INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS spins_bot_ts ON spins(bot, ts);
+CREATE INDEX IF NOT EXISTS spins_ts ON spins(ts);
+CREATE INDEX IF NOT EXISTS spins_payout ON spins(payout);
+CREATE INDEX IF NOT EXISTS spins_mode ON spins(mode);
+CREATE TABLE IF NOT EXISTS events (
+    id      INTEGER PRIMARY KEY,
+    ts      REAL NOT NULL,
+    bot     TEXT NOT NULL,
+    kind    TEXT NOT NULL,
+    detail  TEXT,
+    balance REAL
+);
+CREATE INDEX IF NOT EXISTS events_bot_ts ON events(bot, ts);
+CREATE INDEX IF NOT EXISTS events_kind ON events(kind, ts);
+"""
+
+_INSERT_SPIN = ("INSERT INTO spins (ts, bot, mode, payout, roll, bet, profit, balance, win, recovery) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)")
+_INSERT_EVENT = "INSERT INTO events (ts, bot, kind, detail, balance) VALUES (?, ?, ?, ?, ?)"
+
+
+def _open(path: str, readonly: bool = False):
+    if readonly:
+        return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    d = os.path.dirname(path)
+    if d:
+        os.makedirs(d, exist_ok=True)
+    conn = sqlite3.connect(path, timeout=30)
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def _nan_to_none(x):
+    return None if x is None or x != x else x
+
+
+class SpinStore:
+    """Очередь спинов/событий + поток-писатель в SQLite; методы add_* потокобезопасны и не делают I/O."""
+    def __init__(self, path: str = DEFAULT_PATH, batch_size: int = BATCH_SIZE,
+                 flush_interval: float = FLUSH_INTERVAL, max_pending: int = MAX_PENDING):
+        if sqlite3 is None:
+            raise RuntimeError("sqlite3 недоступен")
+        self.path = path
+        self.batch_size = max(1, int(batch_size))
+        self.flush_interval = max(0.05, float(flush_interval))
+        self.max_pending = max(1000, int(max_pending))
+        self._cond = threading.Condition(threading.Lock())
+        self._spins = deque()
+        self._events = deque()
+        self._flush_req = 0
+        self._flush_done = 0
+        self._stop = False
+        self._recovery = {}                     # bot → последний флаг recovery (для событий)
+        self.inserted = 0
+        self.events = 0
+        self.dropped = 0
+        self.errors = 0
+        _open(path).close()                     # схема и WAL — сразу, ошибки пути видны вызывающему
+        self._thread = threading.Thread(target=self._run, name="spindb-writer", daemon=True)
+        self._thread.start()
+
+    # -- производители --
+    def add_spin(self, ts, bot, mode, payout, roll, bet, profit, balance, win, recovery):
+        with self._cond:
+            if len(self._spins) >= self.max_pending:
+                self._spins.popleft()
+                self.dropped += 1
+            self._spins.append((ts, bot, mode, payout, roll, bet, profit, balance, win, recovery))
+            if len(self._spins) >= self.batch_size:
+                self._cond.notify()
+
+    def add_event(self, bot, kind, detail="", balance=None, ts=None):
+        with self._cond:
+            self._events.append((time.time() if ts is None else ts, str(bot), kind, str(detail),
+                                 None if balance is None else float(balance)))
+            self._cond.notify()
+
+    def flush(self, timeout: float = 10.0) -> bool:
+        """Дождаться, пока всё поставленное в очередь окажется в базе."""
+        with self._cond:
+            self._flush_req += 1
+            ticket = self._flush_req
+            self._cond.notify()
+            deadline = time.monotonic() + timeout
+            while self._flush_done < ticket and not self._stop:
+                left = deadline - time.monotonic()
+                if left <= 0:
+                    return False
+                self._cond.wait(left)
+        return True
+
+    def close(self, timeout: float = 10.0):
+        self.flush(timeout)
+        with self._cond:
+            self._stop = True
+            self._cond.notify()
+        self._thread.join(timeout)
+
+    def stats(self) -> dict:
+        with self._cond:
+            pending = len(self._spins) + len(self._events)
+        return {"pending": pending, "inserted": self.inserted, "events": self.events,
+                "dropped": self.dropped, "errors": self.errors}
+
+    # -- поток-писатель --
+    def _run(self):
+        conn = _open(self.path)
+        try:
+            while True:
+                with self._cond:
+                    deadline = time.monotonic() + self.flush_interval
+                    while (len(self._spins) < self.batch_size and not self._events and not self._stop
+                           and self._flush_req == self._flush_done):
+                        left = deadline - time.monotonic()
+                        if left <= 0:
+                            break
+                        self._cond.wait(left)
+                    spins, self._spins = self._spins, deque()
+                    events, self._events = self._events, deque()
+                    ticket = self._flush_req
+                    stop = self._stop
+                if spins or events:
+                    self._write(conn, spins, events)
+                if ticket != self._flush_done:
+                    with self._cond:
+                        self._flush_done = ticket
+                        self._cond.notify_all()
+                if stop:
+                    return
+        finally:
+            conn.close()
+
+    def _write(self, conn, spins, events):
+        rows = []
+        events = list(events)
+        rec = self._recovery
+        for ts, bot, mode, payout, roll, bet, profit, balance, win, recovery in spins:
+            recovery = 1 if recovery else 0
+            prev = rec.get(bot)
+            if prev is not None and prev != recovery:
+                events.append((ts, bot, "recovery_start" if recovery else "recovery_end", mode,
+                               _nan_to_none(balance)))
+            rec[bot] = recovery
+            rows.append((ts, bot, mode, payout, _nan_to_none(roll), bet, profit, _nan_to_none(balance),
+                         1 if win else 0, recovery))
+        try:
+            with conn:
+                if rows:
+                    conn.executemany(_INSERT_SPIN, rows)
+                if events:
+                    conn.executemany(_INSERT_EVENT, events)
+            self.inserted += len(rows)
+            self.events += len(events)
+        except Exception as e:
+            self.errors += 1
+            if self.errors == 1 or self.errors % 100 == 0:
+                print(f"[spindb] {self.path}: {e} (batch {len(rows)} spins lost)")
+
+
+_default = None
+_default_lock = threading.Lock()
+_default_tried = False
+
+
+def store_path_from_env():
+    spec = os.environ.get("CG_SPINDB", "").strip()
+    if not spec or spec.lower() in ("0", "off", "no", "none"):
+        return None
+    if spec.lower() in ("1", "on", "yes"):
+        return DEFAULT_PATH
+    return spec
+
+
+def spin_store():
+    """Общее хранилище процесса или None (CG_SPINDB не задан / sqlite3 недоступен / ошибка открытия)."""
+    global _default, _default_tried
+    if _default is None and not _default_tried:
+        with _default_lock:
+            if _default is None and not _default_tried:
+                _default_tried = True
+                path = store_path_from_env()
+                if path and sqlite3 is not None:
+                    try:
+                        _default = SpinStore(path)
+                        atexit.register(_default.close)
+                    except Exception as e:
+                        print(f"[spindb] disabled: {e}")
+    return _default
+
+
+def record_event(bot, kind: str, detail="", balance=None):
+    """Событие (TP / SL / ...) в общее хранилище; без хранилища — ничего."""
+    store = spin_store()
+    if store is not None:
+        try:
+            store.add_event(bot, kind, detail, balance)
+        except Exception:
+            pass
+
+
+# ------------------ Запросы ------------------
+def _where(days=None, bots=None, since=None, until=None, table="spins"):
+    clauses, args = [], []
+    if days is not None:
+        since = time.time() - float(days) * 86400
+    if since is not None:
+        clauses.append(f"{table}.ts >= ?")
+        args.append(float(since))
+    if until is not None:
+        clauses.append(f"{table}.ts < ?")
+        args.append(float(until))
+    if bots:
+        bots = list(bots)
+        clauses.append(f"{table}.bot IN ({','.join('?' * len(bots))})")
+        args.extend(bots)
+    return (" WHERE " + " AND ".join(clauses)) if clauses else "", args
+
+
+def win_rate_by_payout(conn, width: float = 100.0, days=None, bots=None, mode=None):
+    """
+    [(payout_lo, payout_hi, spins, wins, win_rate, fair_rate)] по корзинам payout шириной width;
+    fair_rate — среднее 1/payout (ожидаемая доля WIN без house edge).
+    """
+    where, args = _where(days, bots)
+    if mode:
+        where += (" AND " if where else " WHERE ") + "mode = ?"
+        args.append(mode)
+    w = float(width)
+    sql = (f"SELECT CAST(payout / ? AS INTEGER) AS b, COUNT(*), SUM(win), AVG(1.0 / payout) "
+           f"FROM spins{where} GROUP BY b ORDER BY b")
+    out = []
+    for b, n, wins, fair in conn.execute(sql, [w] + args):
+        out.append((b * w, (b + 1) * w, n, wins, wins / n if n else 0.0, fair or 0.0))
+    return out
+
+
+def stats_by(conn, column: str = "mode", days=None, bots=None):
+    """[(значение, spins, wins, profit, bet_sum)] по mode / bot / recovery."""
+    if column not in ("mode", "bot", "recovery"):
+        raise ValueError(column)
+    where, args = _where(days, bots)
+    sql = (f"SELECT {column}, COUNT(*), SUM(win), SUM(profit), SUM(bet) FROM spins{where} "
+           f"GROUP BY {column} ORDER BY COUNT(*) DESC")
+    return conn.execute(sql, args).fetchall()
+
+
+def list_events(conn, kind=None, days=None, bots=None, limit: int = 100):
+    """[(ts, bot, kind, detail, balance)] — последние события, новые первыми."""
+    where, args = _where(days, bots, table="events")
+    if kind:
+        where += (" AND " if where else " WHERE ") + "kind = ?"
+        args.append(kind)
+    sql = f"SELECT ts, bot, kind, detail, balance FROM events{where} ORDER BY ts DESC LIMIT ?"
+    return conn.execute(sql, args + [int(limit)]).fetchall()
+
+
+def import_journal(store: SpinStore, path: str, bot: str = None) -> int:
+    """Загрузить бинарный журнал спинов (.cgj) в хранилище."""
+    from crypto_games_journal import F_RECOVERY, F_WIN, MODES, iter_records
+    bot = bot or os.path.splitext(os.path.basename(path))[0]
+    n = 0
+    for r in iter_records(path):
+        store.add_spin(r["ts"], bot, MODES[r["mode"]] if r["mode"] < len(MODES) else "OTHER", r["payout"],
+                       r["roll"], r["bet"], r["profit"], r["balance"], r["flags"] & F_WIN, r["flags"] & F_RECOVERY)
+        n += 1
+        if n % 50000 == 0:
+            store.flush(60)
+    return n
+
+
+def _fmt_ts(ts) -> str:
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Crypto.Games SQLite spin store")
+    ap.add_argument("--db", default=store_path_from_env() or DEFAULT_PATH)
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    w = sub.add_parser("winrate", help="win rate по корзинам payout")
+    w.add_argument("--width", type=float, default=100.0)
+    w.add_argument("--mode", default="")
+    for name in ("modes", "bots", "events"):
+        sub.add_parser(name)
+    for p in sub.choices.values():
+        p.add_argument("--days", type=float, default=None, help="только последние N дней")
+        p.add_argument("--bot", action="append", default=None)
+    sub.choices["events"].add_argument("--kind", default="")
+    im = sub.add_parser("import", help="журналы спинов .cgj → база")
+    im.add_argument("journals", nargs="+")
+    b = sub.add_parser("bench", help="вставка N спинов и запрос winrate")
+    b.add_argument("n", type=int, nargs="?", default=200000)
+    args = ap.parse_args(argv)
+
+    if sqlite3 is None:
+        print("sqlite3 недоступен")
+        return 1
+    if args.cmd == "import":
+        store = SpinStore(args.db)
+        for path in args.journals:
+            t0 = time.perf_counter()
+            n = import_journal(store, path)
+            store.flush(120)
+            print(f"{path}: {n} spins ({time.perf_counter() - t0:.2f}s)")
+        store.close()
+        return 0
+    if args.cmd == "bench":
+        path = args.db if args.db != DEFAULT_PATH else "bench_spins.db"
+        store = SpinStore(path)
+        t0 = time.perf_counter()
+        now = time.time()
+        for k in range(args.n):
+            payout = 100 + (k * 37) % 9900
+            store.add_spin(now - (args.n - k), f"Bot-{k % 8 + 1}", "BASE" if k % 5 else "PR", payout, 50.0,
+                           1e-6, -1e-6, 1.0, (k * 7919) % payout == 0, k % 5 == 0)
+        t_add = time.perf_counter() - t0
+        store.close(300)
+        t_all = time.perf_counter() - t0
+        conn = _open(path, readonly=True)
+        t1 = time.perf_counter()
+        rows = win_rate_by_payout(conn, width=1000, days=7)
+        t_q = time.perf_counter() - t1
+        conn.close()
+        print(f"spins={args.n} add={t_add / args.n * 1e6:.2f} µs/spin total={t_all:.2f}s "
+              f"winrate query={t_q * 1e3:.1f} ms buckets={len(rows)} stats={store.stats()}")
+        return 0
+
+    conn = _open(args.db, readonly=True)
+    if args.cmd == "winrate":
+        print(f"{'payout':>15} {'spins':>10} {'wins':>7} {'win%':>8} {'fair%':>8}")
+        for lo, hi, n, wins, wr, fair in win_rate_by_payout(conn, args.width, args.days, args.bot, args.mode):
+            print(f"{lo:>7.0f}-{hi:<7.0f} {n:>10} {wins:>7} {wr * 100:>8.3f} {fair * 100:>8.3f}")
+    elif args.cmd in ("modes", "bots"):
+        for key, n, wins, profit, bets in stats_by(conn, args.cmd[:-1], args.days, args.bot):
+            print(f"{key:<16} spins={n:<9} wins={wins:<6} profit={profit:+.8f} wagered={bets:.8f}")
+    else:
+        for ts, bot, kind, detail, bal in list_events(conn, args.kind, args.days, args.bot):
+            print(f"{_fmt_ts(ts)} {bot:<12} {kind:<15} {detail} {'' if bal is None else f'bal={bal:.8f}'}")
+    conn.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
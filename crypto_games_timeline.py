@@ -0,0 +1,364 @@
+#!/usr/bin/env python3
+# Crypto.Games — общая лента флота: слияние логов всех ботов по времени (heap merge) + индекс времени
+#
+# Зачем:
+# - Глобальные события ([RESET-ALL], глобальный TP/SL, общий recovery) задевают всех ботов, а каждый
+#   бот пишет свой logs/Bot-N.txt: чтобы понять, что делал флот вокруг события, приходилось
+#   открывать N файлов и сводить время вручную.
+# - merge(paths, start, end) — поток (ts, bot, line) по всем логам в порядке времени: heapq.merge по
+#   одному потоку на бота, ротированные части (<bot>.YYYYmmdd-HHMMSS.txt[.gz], crypto_games_filelog)
+#   идут цепочкой перед текущим файлом. В памяти — по одной строке и одному буферу чтения на бота.
+# - TimeIndex: рядом с логом <log>.tsx — разреженный индекс «время → смещение» (запись на каждые
+#   STEP байт) и первое/последнее время файла. Строится прыжками по файлу (не читая его целиком),
+#   дописывается при росте лога, перестраивается при ротации/усечении (в заголовке — отпечаток
+#   первой строки со временем: лог подменён новым файлом — индекс строится заново). Поиск по времени —
+#   bisect по индексу + скан не больше STEP байт; файлы вне диапазона не открываются.
+# - Время — префикс строки «YYYY-mm-dd HH:MM:SS» (так пишут BotTab и filelog); сравнивается как
+#   байты, без разбора дат. Строки без времени (трейсбеки) идут со временем предыдущей строки.
+#
+# Запуск: python crypto_games_timeline.py logs --around "2025-12-07 16:15:17" --window 30
+#         python crypto_games_timeline.py logs --event "RESET-ALL" --window 10 --limit 3
+#         python crypto_games_timeline.py logs/Bot-*.txt --from "2025-12-07 16:00" --to "2025-12-07 17:00" --grep WIN
+
+import argparse
+import glob
+import gzip
+import hashlib
+import heapq
+import os
+import re
+import struct
+import sys
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Optional
+
+TSX_MAGIC = b"CGTI"
+TSX_VERSION = 2
+TS_LEN = 19
+TS_FMT = "%Y-%m-%d %H:%M:%S"
+HEADER = struct.Struct("<4sIQQ19s19s2xQ")  # magic, version, indexed_bytes, count, first_ts, last_ts, отпечаток
+RECORD = struct.Struct("<19s5xQ")         # ts, offset строки
+STEP = 64 << 10
+EXT = ".tsx"
+
+_ROTATED_RE = re.compile(r"^(?P<bot>.+?)\.(?P<stamp>\d{8}-\d{6})(?:-(?P<n>\d+))?\.txt(?:\.gz)?$")
+_LOG_RE = re.compile(r"^(?P<bot>.+?)\.txt(?:\.gz)?$")
+
+
+def line_ts(line: bytes) -> Optional[bytes]:
+    """Префикс времени строки или None."""
+    if len(line) >= TS_LEN and line[4] == 45 and line[10] == 32 and line[13] == 58 and line[:4].isdigit():
+        return line[:TS_LEN]
+    return None
+
+
+def parse_ts(s: str) -> bytes:
+    """'2025-12-07 16:15' / '2025-12-07T16:15:17' / '2025-12-07' → b'2025-12-07 16:15:00'."""
+    s = s.strip().replace("T", " ")
+    for fmt in (TS_FMT, "%Y-%m-%d %H:%M", "%Y-%m-%d %H", "%Y-%m-%d"):
+        try:
+            return datetime.strptime(s, fmt).strftime(TS_FMT).encode("ascii")
+        except ValueError:
+            pass
+    raise ValueError(f"не время: {s!r}")
+
+
+def shift_ts(ts: bytes, seconds: float) -> bytes:
+    dt = datetime.strptime(ts.decode("ascii"), TS_FMT) + timedelta(seconds=seconds)
+    return dt.strftime(TS_FMT).encode("ascii")
+
+
+def _line_hash(line: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(line, digest_size=8).digest(), "little") or 1
+
+
+def _open(path: str):
+    return gzip.open(path, "rb") if path.endswith(".gz") else open(path, "rb", buffering=1 << 16)
+
+
+# ------------------ Index ------------------
+class TimeIndex:
+    """
+    Разреженный индекс времени лога в <path>.tsx. .gz-части неизменны: индекс строится один раз
+    (seek в gzip — распаковка без разбора строк). Файл без строк со временем — count == 0.
+    """
+
+    def __init__(self, path: str, index_path: Optional[str] = None):
+        self.path = path
+        self.index_path = index_path or (path + EXT)
+        self.indexed_bytes = 0
+        self.first_ts = b""
+        self.last_ts = b""
+        self.fingerprint = 0                    # хеш первой строки со временем; 0 — ещё нет
+        self.ts = []                            # времена записей (для bisect)
+        self.offsets = []
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+    def _load(self):
+        try:
+            with open(self.index_path, "rb") as f:
+                data = f.read()
+            magic, ver, indexed, count, first, last, fp = HEADER.unpack_from(data)
+            if magic != TSX_MAGIC or ver != TSX_VERSION or len(data) < HEADER.size + count * RECORD.size:
+                return
+            body = data[HEADER.size:HEADER.size + count * RECORD.size]
+            self.ts = [ts for ts, _ in RECORD.iter_unpack(body)]
+            self.offsets = [off for _, off in RECORD.iter_unpack(body)]
+            self.indexed_bytes, self.first_ts, self.last_ts, self.fingerprint = indexed, first, last, fp
+        except (OSError, struct.error):
+            pass
+
+    def _reset(self):
+        self.indexed_bytes = 0
+        self.first_ts = self.last_ts = b""
+        self.fingerprint = 0
+        self.ts, self.offsets = [], []
+
+    def _save(self):
+        tmp = self.index_path + ".tmp"
+        try:
+            with open(tmp, "wb") as f:
+                f.write(HEADER.pack(TSX_MAGIC, TSX_VERSION, self.indexed_bytes, len(self.ts),
+                                    self.first_ts, self.last_ts, self.fingerprint))
+                f.write(b"".join(RECORD.pack(ts, off) for ts, off in zip(self.ts, self.offsets)))
+            os.replace(tmp, self.index_path)
+        except OSError:
+            pass                                # каталог только для чтения — индекс живёт в памяти
+
+    def refresh(self) -> int:
+        """Дописать индекс по выросшему логу; вернуть число новых записей."""
+        gz = self.path.endswith(".gz")
+        if gz and self.indexed_bytes:
+            return 0
+        if not gz:
+            try:
+                size = os.path.getsize(self.path)
+            except OSError:
+                return 0
+            fp = self._fingerprint()
+            if self.fingerprint and fp != self.fingerprint:
+                self._reset()                   # ротация: под тем же именем уже другой файл
+            elif size < self.indexed_bytes:     # очистка
+                self._reset()
+            elif size == self.indexed_bytes:
+                return 0
+        before = len(self.ts)
+        with _open(self.path) as f:
+            pos = self.offsets[-1] + STEP if self.offsets else 0
+            while True:
+                f.seek(pos)
+                if pos:
+                    f.readline()                # хвост строки, в которую попали
+                found = self._next_stamped(f)
+                if found is None:
+                    break
+                ts, off = found
+                self.ts.append(ts)
+                self.offsets.append(off)
+                pos = off + STEP
+            if self.offsets:                    # хвост после последней записи — last_ts и конец
+                f.seek(self.offsets[-1])
+                end = self.offsets[-1]
+                for line in f:
+                    if not line.endswith(b"\n"):
+                        break
+                    end += len(line)
+                    ts = line_ts(line)
+                    if ts is not None:
+                        self.last_ts = ts
+                self.indexed_bytes = end
+                self.first_ts = self.ts[0]
+                if not self.fingerprint:
+                    f.seek(self.offsets[0])
+                    self.fingerprint = _line_hash(f.readline())
+        if len(self.ts) != before or self.indexed_bytes:
+            self._save()
+        return len(self.ts) - before
+
+    def _fingerprint(self) -> int:
+        try:
+            with _open(self.path) as f:
+                found = self._next_stamped(f)
+                if found is None:
+                    return 0
+                f.seek(found[1])
+                return _line_hash(f.readline())
+        except OSError:
+            return 0
+
+    @staticmethod
+    def _next_stamped(f):
+        """(ts, offset) первой полной строки со временем от текущей позиции."""
+        off = f.tell()
+        for line in f:
+            if not line.endswith(b"\n"):
+                return None
+            ts = line_ts(line)
+            if ts is not None:
+                return ts, off
+            off += len(line)
+        return None
+
+    def seek_offset(self, start: Optional[bytes]) -> int:
+        """Смещение, с которого нет строк со временем < start (с точностью до STEP)."""
+        if not start or not self.ts:
+            return 0
+        i = bisect_left(self.ts, start) - 1
+        return self.offsets[i] if i >= 0 else 0
+
+    def overlaps(self, start: Optional[bytes], end: Optional[bytes]) -> bool:
+        if not self.ts:
+            return False
+        if start and self.last_ts and self.last_ts < start:
+            return False
+        return not (end and self.first_ts > end)
+
+
+# ------------------ Discovery ------------------
+def bot_name(path: str) -> str:
+    """logs/Bot-3.20251207-161517.txt.gz → Bot-3; logs/Bot-3.txt → Bot-3."""
+    name = os.path.basename(path)
+    m = _ROTATED_RE.match(name) or _LOG_RE.match(name)
+    return m.group("bot") if m else name
+
+
+def _part_key(path: str):
+    m = _ROTATED_RE.match(os.path.basename(path))
+    if m is None:
+        return 1, "", 0                                 # текущий файл — последним
+    return 0, m.group("stamp"), int(m.group("n") or 0)  # ротированные части по времени и номеру коллизии
+
+
+def discover(paths: Iterable[str]) -> dict:
+    """Файлы/каталоги/маски → {bot: [части лога по порядку]}. Отчёты (*.report.txt) не берутся."""
+    files = []
+    for p in paths:
+        if os.path.isdir(p):
+            files += glob.glob(os.path.join(p, "*.txt")) + glob.glob(os.path.join(p, "*.txt.gz"))
+        else:
+            files += glob.glob(p) or [p]
+    groups = {}
+    for path in sorted(set(files)):
+        if path.endswith((".report.txt", EXT)) or not os.path.isfile(path):
+            continue
+        groups.setdefault(bot_name(path), []).append(path)
+    return {bot: sorted(parts, key=_part_key) for bot, parts in sorted(groups.items())}
+
+
+# ------------------ Merge ------------------
+def _iter_part(path: str, index: TimeIndex, start: Optional[bytes], end: Optional[bytes], rank: int):
+    with _open(path) as f:
+        f.seek(index.seek_offset(start))
+        ts = None
+        for line in f:
+            stamp = line_ts(line)
+            if stamp is not None:
+                ts = stamp
+                if end and ts > end:
+                    return
+            if ts is None or (start and ts < start):
+                continue
+            yield ts, rank, line
+
+
+def _iter_bot(parts: list, start, end, rank: int):
+    for path in parts:
+        index = TimeIndex(path)
+        index.refresh()
+        if index.overlaps(start, end):
+            yield from _iter_part(path, index, start, end, rank)
+
+
+def merge(paths: Iterable[str], start: Optional[bytes] = None, end: Optional[bytes] = None,
+          bots: Optional[Iterable[str]] = None, grep: Optional[str] = None) -> Iterator[tuple]:
+    """
+    (ts, bot, line) по всем логам в порядке времени; start/end — байты 'YYYY-mm-dd HH:MM:SS' (включительно).
+    При равном времени — порядок ботов по имени, внутри бота — порядок строк файла.
+    """
+    groups = discover(paths)
+    if bots:
+        wanted = set(bots)
+        groups = {b: p for b, p in groups.items() if b in wanted}
+    names = list(groups)
+    streams = [_iter_bot(parts, start, end, rank) for rank, parts in enumerate(groups.values())]
+    rx = re.compile(grep.encode("utf-8")) if grep else None
+    for ts, rank, line in heapq.merge(*streams):
+        if rx is not None and rx.search(line) is None:
+            continue
+        yield ts.decode("ascii"), names[rank], line.rstrip(b"\r\n").decode("utf-8", "replace")
+
+
+def around(paths: Iterable[str], ts, before: float = 30, after: float = 30, **kw) -> Iterator[tuple]:
+    """Лента флота в окне [ts − before, ts + after] секунд."""
+    ts = ts if isinstance(ts, bytes) else parse_ts(ts)
+    return merge(paths, shift_ts(ts, -before), shift_ts(ts, after), **kw)
+
+
+def find_events(paths: Iterable[str], pattern: str, limit: int = 10, **kw) -> list:
+    """Времена первых limit строк, совпавших с pattern (по всему флоту, по порядку)."""
+    found = []
+    for ts, bot, line in merge(paths, grep=pattern, **kw):
+        found.append((ts, bot, line))
+        if len(found) >= limit:
+            break
+    return found
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description="Crypto.Games fleet timeline: time-ordered merge of per-bot logs")
+    ap.add_argument("logs", nargs="*", default=["logs"], help="логи, маски или каталоги (по умолчанию logs)")
+    ap.add_argument("--from", dest="start", help="начало 'YYYY-mm-dd HH:MM[:SS]'")
+    ap.add_argument("--to", dest="end", help="конец (включительно)")
+    ap.add_argument("--around", help="центр окна (время)")
+    ap.add_argument("--event", help="regex события: окна --window вокруг первых --limit совпадений")
+    ap.add_argument("--window", type=float, default=30.0, help="полуширина окна, с")
+    ap.add_argument("--limit", type=int, default=1)
+    ap.add_argument("--grep", help="regex фильтр строк")
+    ap.add_argument("--bots", help="боты через запятую")
+    ap.add_argument("--head", type=int, default=0, help="не больше N строк (0 — все)")
+    ap.add_argument("--tag", action="store_true", help="префикс имени бота у каждой строки")
+    ap.add_argument("--index", action="store_true", help="только построить/обновить индексы .tsx")
+    args = ap.parse_args(argv)
+
+    if args.index:
+        for bot, parts in discover(args.logs).items():
+            for path in parts:
+                idx = TimeIndex(path)
+                added = idx.refresh()
+                print(f"{path}: entries={len(idx)} (+{added}) {idx.first_ts.decode()} .. {idx.last_ts.decode()}")
+        return 0
+
+    bots = [b.strip() for b in args.bots.split(",") if b.strip()] if args.bots else None
+    if args.event:
+        windows = [ts for ts, _, _ in find_events(args.logs, args.event, max(1, args.limit), bots=bots)]
+        if not windows:
+            print(f"событие {args.event!r} не найдено")
+            return 1
+    elif args.around:
+        windows = [args.around]
+    else:
+        windows = [None]
+
+    shown = 0
+    for center in windows:
+        if center is None:
+            start = parse_ts(args.start) if args.start else None
+            end = parse_ts(args.end) if args.end else None
+        else:
+            c = parse_ts(center)
+            start, end = shift_ts(c, -args.window), shift_ts(c, args.window)
+            print(f"==== {c.decode()} ±{args.window:g}s ====")
+        for ts, bot, line in merge(args.logs, start, end, bots=bots, grep=args.grep):
+            print(f"{bot:<8} {line}" if args.tag else line)
+            shown += 1
+            if args.head and shown >= args.head:
+                return 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
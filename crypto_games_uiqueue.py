@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+# Crypto.Games — ограниченная очередь событий UI с учётом типа события
+#
+# Зачем:
+# - BotManagerApp.ui_queue была неограниченной queue.Queue, а _process_ui_queue разбирает не больше
+#   600 событий за 100 мс: при десятке быстрых ботов очередь и память росли без предела,
+#   а баланс на экране отставал от реального на минуты.
+# - UIEventQueue:
+#   * 'bank' / 'stats' — схлопываются до последнего значения на бота (старые снимки не нужны);
+#   * 'log' — кольцо ограниченного размера: при переполнении старые строки выбрасываются,
+#     считаются по ботам, и в лог вкладки приходит одна строка «dropped N»;
+#   * 'trace' и прочие типы — никогда не выбрасываются;
+#   * drain(n) — пачка событий за один захват блокировки (сначала trace, потом снимки, потом логи).
+# - Совместима с прежним использованием: put_nowait / get_nowait (queue.Empty) / qsize / empty.
+# - stats() / describe() — глубина очереди, число схлопнутых и выброшенных событий.
+
+import queue
+import threading
+from collections import deque
+
+COALESCED_TYPES = frozenset({"bank", "stats"})
+DROPPABLE_TYPES = frozenset({"log"})
+
+
+class UIEventQueue:
+    def __init__(self, max_logs: int = 5000, coalesce=COALESCED_TYPES, droppable=DROPPABLE_TYPES):
+        self.max_logs = max(1, int(max_logs))
+        self.coalesce = frozenset(coalesce)
+        self.droppable = frozenset(droppable)
+        self._lock = threading.Lock()
+        self._control = deque()                 # trace и прочее — без потерь
+        self._latest = {}                       # (typ, bot_id) → последний payload, порядок — первое появление
+        self._logs = deque()
+        self._dropped_unreported = {}           # bot_id → выброшено с прошлого отчёта
+        self.dropped_by_bot = {}
+        self.dropped = 0
+        self.coalesced = 0
+        self.put_count = 0
+        self.ticks = 0                          # число вызовов drain (для редких обновлений UI)
+        self.max_depth = 0
+
+    # -- производители (потоки ботов) --
+    def put_nowait(self, item):
+        typ, bot_id, payload = item
+        with self._lock:
+            self.put_count += 1
+            if typ in self.coalesce:
+                key = (typ, bot_id)
+                if key in self._latest:
+                    self.coalesced += 1
+                self._latest[key] = payload
+            elif typ in self.droppable:
+                if len(self._logs) >= self.max_logs:
+                    _, old_bot, _ = self._logs.popleft()
+                    self.dropped += 1
+                    self.dropped_by_bot[old_bot] = self.dropped_by_bot.get(old_bot, 0) + 1
+                    self._dropped_unreported[old_bot] = self._dropped_unreported.get(old_bot, 0) + 1
+                self._logs.append(item)
+            else:
+                self._control.append(item)
+            depth = len(self._control) + len(self._latest) + len(self._logs)
+            if depth > self.max_depth:
+                self.max_depth = depth
+
+    put = put_nowait
+
+    # -- потребитель (UI-поток) --
+    def _pop_locked(self):
+        if self._control:
+            return self._control.popleft()
+        if self._dropped_unreported:
+            bot_id = next(iter(self._dropped_unreported))
+            n = self._dropped_unreported.pop(bot_id)
+            return ("log", bot_id, f"[UI] dropped {n} log lines (UI queue full)")
+        if self._latest:
+            key = next(iter(self._latest))
+            payload = self._latest.pop(key)
+            return (key[0], key[1], payload)
+        if self._logs:
+            return self._logs.popleft()
+        return None
+
+    def get_nowait(self):
+        with self._lock:
+            item = self._pop_locked()
+        if item is None:
+            raise queue.Empty
+        return item
+
+    def drain(self, max_items: int = 600) -> list:
+        """До max_items событий одной пачкой."""
+        out = []
+        with self._lock:
+            self.ticks += 1
+            while len(out) < max_items:
+                item = self._pop_locked()
+                if item is None:
+                    break
+                out.append(item)
+        return out
+
+    def qsize(self) -> int:
+        with self._lock:
+            return len(self._control) + len(self._latest) + len(self._logs)
+
+    def empty(self) -> bool:
+        return self.qsize() == 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "depth": len(self._control) + len(self._latest) + len(self._logs),
+                "logs": len(self._logs),
+                "coalesced_pending": len(self._latest),
+                "control": len(self._control),
+                "max_depth": self.max_depth,
+                "put": self.put_count,
+                "coalesced": self.coalesced,
+                "dropped": self.dropped,
+                "dropped_by_bot": dict(self.dropped_by_bot),
+            }
+
+    def describe(self) -> str:
+        s = self.stats()
+        return f"UI queue: {s['depth']} (max {s['max_depth']}) coalesced={s['coalesced']} dropped={s['dropped']}"